@@ -0,0 +1,24 @@
+"""
+Performance benchmarks
+
+The suite measures the hot paths of the application against synthetic
+accounts of various sizes and records the results in a JSON baseline
+file. A later run can then be compared against that baseline in order
+to catch regressions.
+
+Run the suite and save a baseline::
+
+    python -m benchmarks run --output baseline.json
+
+Run it again after making changes, and compare::
+
+    python -m benchmarks run --output current.json
+    python -m benchmarks compare baseline.json current.json
+
+Pass ``--memory`` to ``run`` to also record the memory held per unit,
+e.g. bytes per constructed object, and the peak memory of a run.
+
+Benchmarks are defined in the ``bench_*`` modules of this package via
+the :func:`~benchmarks.harness.benchmark` decorator, and are discovered
+automatically.
+"""
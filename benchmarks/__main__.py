@@ -0,0 +1,144 @@
+"""
+Benchmark command line
+"""
+
+from pathlib import Path
+
+import click
+
+from benchmarks import compare, const, harness
+
+
+def _parse_sizes(context, param, value: str | None) -> tuple[int, ...]:
+    if value is None:
+        return const.SIZES
+    try:
+        return tuple(int(size) for size in value.split(","))
+    except ValueError:
+        raise click.BadParameter("Expected comma-separated integers") from None
+
+
+def _echo_result(key: str, entry: dict) -> None:
+    throughput = entry["throughput"]
+    rate = f"{throughput:,.0f} {entry['unit']}/s" if throughput else "-"
+    line = f"{key:<45} {entry['seconds']:>10.4f}s  {rate}"
+    if (held := entry.get("bytes_per_unit")) is not None:
+        line += f"  {held:,.0f} B/unit  peak {entry['peak_bytes'] / 2**20:,.1f} MiB"
+    click.echo(line)
+
+
+def _echo_comparisons(comparisons: list[compare.Comparison]) -> None:
+    for comparison in comparisons:
+        flag = "REGRESSION" if comparison.regressed else ""
+        click.echo(
+            f"{comparison.key:<45} {comparison.baseline:>10.4f}s "
+            f"-> {comparison.current:>10.4f}s  {comparison.change:>+7.1%}  {flag}"
+        )
+
+
+@click.group()
+def main():
+    """Run and compare performance benchmarks"""
+    pass
+
+
+@main.command("list")
+def list_benchmarks():
+    """List available benchmarks"""
+    for name, bench in sorted(harness.discover().items()):
+        click.echo(f"{name} ({bench.unit})")
+
+
+@main.command()
+@click.option(
+    "-k",
+    "--select",
+    "patterns",
+    multiple=True,
+    help="Glob pattern selecting benchmarks by name. May be repeated.",
+)
+@click.option(
+    "-s",
+    "--sizes",
+    callback=_parse_sizes,
+    help="Comma-separated account sizes, defaults to "
+    f"{','.join(str(size) for size in const.SIZES)}",
+)
+@click.option(
+    "-r",
+    "--repeat",
+    type=click.IntRange(min=1),
+    default=const.REPEAT,
+    show_default=True,
+    help="Timed rounds per benchmark and size",
+)
+@click.option(
+    "-o",
+    "--output",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Write results to this JSON file",
+)
+@click.option(
+    "-b",
+    "--baseline",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="Compare results against this baseline file",
+)
+@click.option(
+    "-t",
+    "--threshold",
+    type=float,
+    default=const.THRESHOLD,
+    show_default=True,
+    help="Relative slowdown counted as a regression",
+)
+@click.option(
+    "-m",
+    "--memory",
+    is_flag=True,
+    help="Also measure memory held per unit, and peak memory",
+)
+def run(patterns, sizes, repeat, output, baseline, threshold, memory):
+    """Run benchmarks"""
+    document = harness.run_benchmarks(
+        list(patterns), sizes, repeat, report=_echo_result, memory=memory
+    )
+    if output is not None:
+        harness.save(document, output)
+    if baseline is not None:
+        comparisons = compare.compare(harness.load(baseline), document, threshold)
+        click.echo("")
+        _echo_comparisons(comparisons)
+        if compare.regressions(comparisons):
+            raise SystemExit(1)
+
+
+@main.command("compare")
+@click.argument(
+    "baseline",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+)
+@click.argument(
+    "current",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+)
+@click.option(
+    "-t",
+    "--threshold",
+    type=float,
+    default=const.THRESHOLD,
+    show_default=True,
+    help="Relative slowdown counted as a regression",
+)
+def compare_results(baseline, current, threshold):
+    """Compare CURRENT results against BASELINE"""
+    comparisons = compare.compare(
+        harness.load(baseline), harness.load(current), threshold
+    )
+    _echo_comparisons(comparisons)
+    if compare.regressions(comparisons):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Run the application in isolation
+"""
+
+import contextlib
+import tempfile
+from collections.abc import Iterator
+from pathlib import Path
+from unittest import mock
+
+from click.testing import CliRunner
+from sqlalchemy import insert
+
+from benchmarks import const as bench_const
+from simplelogincmd import const
+from simplelogincmd.cli.main import cli
+from simplelogincmd.config import Config
+from simplelogincmd.database import DatabaseAccessLayer
+from simplelogincmd.database.models import Alias, Mailbox
+
+
+@contextlib.contextmanager
+def isolated_app(
+    pager_threshold: int = 0, requests_per_second: float = 0
+) -> Iterator[Path]:
+    """
+    Point the application at a temporary, logged-in app directory
+
+    The configuration file and database live in a temporary directory
+    for the duration of the context, and the configuration holds an API
+    key so that commands run without prompting for a login.
+
+    :param pager_threshold: The `display.pager-threshold` setting,
+        defaults to 0 (never page)
+    :type pager_threshold: int, optional
+    :param requests_per_second: The `sync.requests-per-second` setting,
+        defaults to 0 (no limit)
+    :type requests_per_second: float, optional
+
+    :return: The temporary app directory
+    :rtype: Iterator[:class:`pathlib.Path`]
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        app_dir = Path(tmp)
+        with (
+            mock.patch.object(const, "FILE_CONFIG", app_dir / "config.json"),
+            mock.patch.object(const, "FILE_DB", app_dir / "db.sqlite"),
+            mock.patch.object(const, "FILE_COMPLETION", app_dir / "completion.idx"),
+        ):
+            cfg = Config()
+            cfg.set("api.api-key", bench_const.API_KEY)
+            cfg.set("display.pager-threshold", pager_threshold)
+            cfg.set("sync.requests-per-second", requests_per_second)
+            cfg.save()
+            yield app_dir
+
+
+def invoke(*args: str) -> str:
+    """
+    Invoke the CLI and return its output
+
+    :raise RuntimeError: If the command exits with a non-zero code
+
+    :rtype: str
+    """
+    result = CliRunner().invoke(cli, args, catch_exceptions=False)
+    if result.exit_code != 0:
+        raise RuntimeError(f"`{' '.join(args)}` failed:\n{result.output}")
+    return result.output
+
+
+def open_db() -> DatabaseAccessLayer:
+    """
+    Open, initializing if necessary, the application database
+
+    Must be called within :func:`isolated_app`.
+
+    :rtype: :class:`~simplelogincmd.database.DatabaseAccessLayer`
+    """
+    db = DatabaseAccessLayer()
+    db.initialize()
+    return db
+
+
+def _columns(model_cls, infos: list[dict]) -> list[dict]:
+    keys = model_cls.__table__.columns.keys()
+    return [{key: info.get(key) for key in keys} for info in infos]
+
+
+def populate(db: DatabaseAccessLayer, mailboxes: list[dict], aliases: list[dict]):
+    """
+    Bulk-load mailboxes and aliases into the database
+
+    This bypasses the code under test, so that setup stays cheap.
+    """
+    db.session.execute(insert(Mailbox), _columns(Mailbox, mailboxes))
+    db.session.execute(insert(Alias), _columns(Alias, aliases))
+    db.session.commit()
@@ -0,0 +1,94 @@
+"""
+End-to-end command benchmarks against the stand-in server
+"""
+
+import itertools
+
+from benchmarks.app import invoke, isolated_app
+from benchmarks.harness import benchmark
+from benchmarks.server import StandInServer
+
+
+def _fresh_sync(app_dir, *options: str) -> None:
+    (app_dir / "db.sqlite").unlink(missing_ok=True)
+    invoke("database", "sync", *options)
+
+
+@benchmark("cli.database_sync", unit="aliases")
+def database_sync(size):
+    # Every round starts from an empty database.
+    with StandInServer(aliases=size), isolated_app() as app_dir:
+        yield lambda: _fresh_sync(app_dir)
+
+
+@benchmark("cli.database_resync", unit="aliases")
+def database_resync(size):
+    # Every round syncs an account that has not changed since the last.
+    with StandInServer(aliases=size), isolated_app():
+        invoke("database", "sync")
+        yield lambda: invoke("database", "sync")
+
+
+@benchmark("cli.alias_list", unit="aliases")
+def alias_list(size):
+    with StandInServer(aliases=size), isolated_app():
+        yield lambda: invoke("alias", "list")
+
+
+@benchmark("cli.database_sync_latency", unit="aliases", sizes=(1_000, 10_000))
+def database_sync_latency(size):
+    # Five milliseconds per request makes network and disk time comparable.
+    with StandInServer(aliases=size, latency=0.005), isolated_app() as app_dir:
+        yield lambda: _fresh_sync(app_dir)
+
+
+@benchmark("cli.database_sync_deep", unit="aliases", sizes=(1_000,))
+def database_sync_deep(size):
+    # Per-alias requests dominate, so latency is what the workers hide.
+    server = StandInServer(
+        aliases=size, contacts_per_alias=3, activities_per_alias=3, latency=0.005
+    )
+    with server, isolated_app() as app_dir:
+        yield lambda: _fresh_sync(app_dir, "--activities")
+
+
+@benchmark("cli.alias_import", unit="aliases", sizes=(100, 1_000))
+def alias_import(size):
+    # Every round imports new aliases, one request each, over half as
+    # many hostnames, with as much latency as `cli.database_sync_deep`.
+    rounds = itertools.count()
+    with StandInServer(latency=0.005), isolated_app() as app_dir:
+        rows = app_dir / "rows.csv"
+
+        def run():
+            n = next(rounds)
+            lines = (f"r{n}a{i},site{i // 2}.test,1\n" for i in range(size))
+            rows.write_text("prefix,hostname,mailboxes\n" + "".join(lines))
+            invoke("alias", "import", str(rows))
+
+        yield run
+
+
+@benchmark("cli.export", unit="aliases", sizes=(1_000,))
+def export(size):
+    # The same account and latency as `cli.database_sync_deep`.
+    server = StandInServer(
+        aliases=size, contacts_per_alias=3, activities_per_alias=3, latency=0.005
+    )
+    with server, isolated_app() as app_dir:
+        yield lambda: invoke("export", str(app_dir / "export.ndjson.gz"))
+
+
+@benchmark("cli.import_local", unit="aliases", sizes=(1_000, 10_000))
+def import_local(size):
+    # Every round loads the archive into an empty database.
+    server = StandInServer(aliases=size, contacts_per_alias=3, activities_per_alias=3)
+    with server, isolated_app() as app_dir:
+        archive = app_dir / "export.ndjson.gz"
+        invoke("export", str(archive))
+
+        def run():
+            (app_dir / "db.sqlite").unlink(missing_ok=True)
+            invoke("import-local", str(archive))
+
+        yield run
@@ -0,0 +1,61 @@
+"""
+JSON decoding benchmarks
+
+Large alias and activity pages are decoded with every installed codec,
+and with :meth:`requests.Response.json`, which the REST client used to
+call, for reference.
+"""
+
+import json
+
+import requests
+
+from benchmarks import data
+from benchmarks.harness import benchmark
+from simplelogincmd import codec
+
+
+def _alias_page(size: int) -> bytes:
+    aliases = data.alias_dicts(size, data.mailbox_dicts(3))
+    return json.dumps({"aliases": aliases}).encode("utf-8")
+
+
+def _activity_page(size: int) -> bytes:
+    activities = data.activity_dicts(size)
+    return json.dumps({"activities": activities}).encode("utf-8")
+
+
+def _response(content: bytes) -> requests.Response:
+    response = requests.Response()
+    response._content = content
+    response.encoding = "utf-8"
+    response.status_code = 200
+    return response
+
+
+def _register(json_codec: codec.Codec) -> None:
+    @benchmark(f"codec.{json_codec.name}.alias_page", unit="aliases")
+    def alias_page(size):
+        content = _alias_page(size)
+        yield lambda: json_codec.loads(content)
+
+    @benchmark(f"codec.{json_codec.name}.activity_page", unit="activities")
+    def activity_page(size):
+        content = _activity_page(size)
+        yield lambda: json_codec.loads(content)
+
+
+for _codec in codec.available():
+    _register(_codec)
+
+
+@benchmark("codec.response_json.alias_page", unit="aliases")
+def response_json_alias_page(size):
+    response = _response(_alias_page(size))
+    yield response.json
+
+
+@benchmark("codec.response_json.activity_page", unit="activities")
+def response_json_activity_page(size):
+    response = _response(_activity_page(size))
+    yield response.json
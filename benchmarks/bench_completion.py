@@ -0,0 +1,78 @@
+"""
+Shell completion benchmarks
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from benchmarks import data
+from benchmarks.app import isolated_app, open_db, populate
+from benchmarks.harness import benchmark
+from simplelogincmd import completion, const
+
+
+# Prefixes as typed at a Tab press: a whole word, part of an address,
+# the start of a note, and one character.
+_PREFIXES = ("amber", "cedar.12", "note 4", "b", "Bison.9")
+_QUERIES = 1_000
+
+
+def _indexed(size: int):
+    mailboxes = data.mailbox_dicts(3)
+    db = open_db()
+    populate(db, mailboxes, data.alias_dicts(size, mailboxes))
+    completion.write_index(db.session)
+    return db
+
+
+@benchmark("completion.write_index", unit="aliases")
+def write_index(size):
+    with isolated_app():
+        db = _indexed(size)
+        yield lambda: completion.write_index(db.session)
+        db.session.close()
+
+
+@benchmark("completion.complete", unit="queries")
+def complete(size):
+    # Each query maps the index anew, as each Tab press is a new process.
+    with isolated_app():
+        _indexed(size).session.close()
+
+        def run():
+            for i in range(_QUERIES):
+                completion.complete(completion.ALIAS, _PREFIXES[i % len(_PREFIXES)])
+            return _QUERIES
+
+        yield run
+
+
+@benchmark("completion.tab", unit="presses", sizes=(100_000,))
+def tab(size):
+    # A fresh process completing `alias get amber.1`, as a shell does.
+    # Python itself takes about 60 ms of each run here.
+    with tempfile.TemporaryDirectory() as tmp:
+        app_dir = Path(tmp) / Path(const.DIR_APPDATA).name
+        app_dir.mkdir()
+        with isolated_app() as isolated:
+            _indexed(size).session.close()
+            os.replace(isolated / "completion.idx", app_dir / "completion.idx")
+        env = dict(
+            os.environ,
+            XDG_CONFIG_HOME=tmp,
+            _CLI_COMPLETE="zsh_complete",
+            COMP_WORDS="simplelogin alias get amber.1",
+            COMP_CWORD="3",
+        )
+        code = "from simplelogincmd.cli.main import cli; cli(prog_name='cli')"
+        command = [sys.executable, "-c", code]
+
+        def run():
+            for _ in range(10):
+                subprocess.run(command, env=env, check=True, capture_output=True)
+            return 10
+
+        yield run
@@ -0,0 +1,170 @@
+"""
+Local database benchmarks
+"""
+
+from sqlalchemy import insert, select
+
+from benchmarks import const, data
+from benchmarks.app import isolated_app, open_db, populate
+from benchmarks.harness import benchmark
+from simplelogincmd.cli.util.input import resolve_id
+from simplelogincmd.database import expression, report
+from simplelogincmd.database.models import Activity, Alias
+
+
+def _identifiers(aliases: list[dict], count: int) -> list[str]:
+    """
+    Pick identifiers, each matching exactly one alias, spread over the account
+
+    Ids, full email addresses, and notes are used in turn.
+    """
+    step = max(len(aliases) // count, 1)
+    identifiers = []
+    for i, alias in enumerate(aliases[::step][:count]):
+        kind = i % 3
+        if kind == 0:
+            identifiers.append(str(alias["id"]))
+        elif kind == 1:
+            identifiers.append(alias["email"])
+        else:
+            identifiers.append(alias["note"])
+    return identifiers
+
+
+@benchmark("database.resolve_id", unit="lookups")
+def resolve_lookups(size):
+    mailboxes = data.mailbox_dicts(3)
+    aliases = data.alias_dicts(size, mailboxes)
+    identifiers = _identifiers(aliases, const.LOOKUPS)
+    with isolated_app():
+        db = open_db()
+        populate(db, mailboxes, aliases)
+
+        def run():
+            # Start cold, without the rankings of the previous round.
+            db.session.rollback()
+            for identifier in identifiers:
+                resolve_id(db, Alias, identifier)
+            return len(identifiers)
+
+        yield run
+        db.session.close()
+
+
+@benchmark("database.resolve_id_repeated", unit="lookups")
+def resolve_repeated(size):
+    mailboxes = data.mailbox_dicts(3)
+    aliases = data.alias_dicts(size, mailboxes)
+    identifiers = _identifiers(aliases, const.LOOKUPS)
+    with isolated_app():
+        db = open_db()
+        populate(db, mailboxes, aliases)
+        # As a batch or long-running process would, having already
+        # looked them all up once.
+        for identifier in identifiers:
+            resolve_id(db, Alias, identifier)
+
+        def run():
+            for identifier in identifiers:
+                resolve_id(db, Alias, identifier)
+            return len(identifiers)
+
+        yield run
+        db.session.close()
+
+
+# Ambiguous identifiers, from a common word matching a fifth of the
+# aliases by prefix, down to a scattering of letters and no match.
+_FUZZY = ("amber", "note 12", "bsn9", "zzz")
+
+
+@benchmark("database.rank_identifier", unit="queries")
+def rank_identifier(size):
+    mailboxes = data.mailbox_dicts(3)
+    aliases = data.alias_dicts(size, mailboxes)
+    with isolated_app():
+        db = open_db()
+        populate(db, mailboxes, aliases)
+
+        def run():
+            db.session.rollback()
+            for identifier in _FUZZY:
+                Alias.rank_identifier(db.session, identifier, limit=20)
+            return len(_FUZZY)
+
+        yield run
+        db.session.close()
+
+
+# Selections as made with `alias list --where/--sort/--limit`.
+_SELECTIONS = (
+    ("nb_forward > 990", None, None),
+    ('nb_forward > 100 and enabled and note ~ "amber"', "-nb_forward", 50),
+    ("not enabled", "-creation_timestamp", 20),
+    ("nb_block < 5 or pinned", "nb_reply", 100),
+)
+
+
+@benchmark("database.alias_where", unit="queries")
+def alias_where(size):
+    mailboxes = data.mailbox_dicts(3)
+    aliases = data.alias_dicts(size, mailboxes)
+    with isolated_app():
+        db = open_db()
+        populate(db, mailboxes, aliases)
+
+        def run():
+            for where, sort, limit in _SELECTIONS:
+                statement = select(Alias).where(expression.compile_where(Alias, where))
+                if sort is not None:
+                    ordering = expression.compile_sort(Alias, sort)
+                    statement = statement.order_by(*ordering)
+                db.session.scalars(statement.order_by(Alias.id).limit(limit)).all()
+            return len(_SELECTIONS)
+
+        yield run
+        db.session.close()
+
+
+@benchmark("database.report", unit="activities")
+def activity_report(size):
+    rows = [
+        dict(info, sender=info["from"], recipient=info["to"], alias_id=1)
+        for info in data.activity_dicts(size)
+    ]
+    for row in rows:
+        del row["id"], row["from"], row["to"]
+    until = max(row["timestamp"] for row in rows) + 1
+    since = until - 90 * 24 * 60 * 60
+    with isolated_app():
+        db = open_db()
+        db.session.execute(insert(Activity), rows)
+        db.session.commit()
+        db.analyze()
+
+        def run():
+            report.histogram(db.session, since, until, 24 * 60 * 60)
+            report.senders(db.session, since, until, "block", 10)
+
+        yield run
+        db.session.close()
+
+
+@benchmark("database.upsert", unit="aliases")
+def upsert(size):
+    mailboxes = data.mailbox_dicts(3)
+    infos = data.alias_dicts(size, mailboxes)
+    with isolated_app():
+        db = open_db()
+        populate(db, mailboxes, infos)
+
+        def run():
+            # Fresh, detached objects every round, as produced by an
+            # API call, updating rows that already exist.
+            for alias in [Alias(**info) for info in infos]:
+                db.session.upsert(alias)
+            db.session.commit()
+            db.session.expunge_all()
+
+        yield run
+        db.session.close()
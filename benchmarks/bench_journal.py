@@ -0,0 +1,56 @@
+"""
+Offline journal benchmarks against the stand-in server
+"""
+
+from benchmarks import data
+from benchmarks.app import isolated_app, open_db, populate
+from benchmarks.harness import benchmark
+from benchmarks.server import StandInServer
+from simplelogincmd import journal
+from simplelogincmd.journal import Journal
+from simplelogincmd.rest import SimpleLogin
+
+
+def _client() -> SimpleLogin:
+    sl = SimpleLogin()
+    sl.api_key = "benchmark"
+    return sl
+
+
+@benchmark("journal.record", unit="changes", sizes=(100, 1_000))
+def record(size):
+    mailboxes = data.mailbox_dicts(3)
+    aliases = data.alias_dicts(size, mailboxes)
+    with isolated_app():
+        db = open_db()
+        populate(db, mailboxes, aliases)
+        queue = Journal(_client(), db)
+
+        def run():
+            # Each change is committed on its own, as when queued by a
+            # command.
+            for alias in aliases:
+                queue.record(journal.UPDATE, alias["id"], dict(note="offline"))
+            return len(aliases)
+
+        yield run
+        db.session.close()
+
+
+@benchmark("journal.replay", unit="changes", sizes=(100, 1_000))
+def replay(size):
+    # Every round queues a toggle of each alias, then replays them all.
+    # Each change costs two requests of five milliseconds.
+    with StandInServer(aliases=size, latency=0.005) as server, isolated_app():
+        db = open_db()
+        populate(db, server.mailboxes, server.aliases)
+        queue = Journal(_client(), db)
+
+        def run():
+            for alias in server.aliases:
+                queue.record(journal.TOGGLE, alias["id"])
+            queue.replay()
+            return len(server.aliases)
+
+        yield run
+        db.session.close()
@@ -0,0 +1,36 @@
+"""
+Model construction benchmarks
+"""
+
+from benchmarks import data
+from benchmarks.harness import benchmark
+from simplelogincmd.database.models import (
+    Activity,
+    Alias,
+    Contact,
+    Mailbox,
+)
+
+
+@benchmark("models.alias", unit="objects")
+def alias_construction(size):
+    infos = data.alias_dicts(size, data.mailbox_dicts(3))
+    yield lambda: [Alias(**info) for info in infos]
+
+
+@benchmark("models.contact", unit="objects")
+def contact_construction(size):
+    infos = data.contact_dicts(size)
+    yield lambda: [Contact(**info) for info in infos]
+
+
+@benchmark("models.activity", unit="objects")
+def activity_construction(size):
+    infos = data.activity_dicts(size)
+    yield lambda: [Activity(**info) for info in infos]
+
+
+@benchmark("models.mailbox", unit="objects")
+def mailbox_construction(size):
+    infos = data.mailbox_dicts(size)
+    yield lambda: [Mailbox(**info) for info in infos]
@@ -0,0 +1,16 @@
+"""
+Table rendering benchmarks
+"""
+
+from benchmarks import data
+from benchmarks.harness import benchmark
+from simplelogincmd.cli import const
+from simplelogincmd.cli.util.output import _generate_model_list
+from simplelogincmd.database.models import Alias
+
+
+@benchmark("output.alias_table", unit="rows")
+def alias_table(size):
+    aliases = [Alias(**info) for info in data.alias_dicts(size)]
+    fields = list(const.ALIAS_FIELD_ORDER)
+    yield lambda: "".join(_generate_model_list(aliases, fields))
@@ -0,0 +1,48 @@
+"""
+Response record construction benchmarks
+
+Counterparts of :mod:`benchmarks.bench_models`, for comparing the
+lightweight records of the REST layer against the database models.
+"""
+
+from benchmarks import data
+from benchmarks.harness import benchmark
+from simplelogincmd.rest.records import (
+    ActivityRecord,
+    AliasRecord,
+    ContactRecord,
+    MailboxRecord,
+)
+
+
+@benchmark("records.alias", unit="objects")
+def alias_construction(size):
+    infos = data.alias_dicts(size, data.mailbox_dicts(3))
+    yield lambda: [AliasRecord.from_json(info) for info in infos]
+
+
+@benchmark("records.contact", unit="objects")
+def contact_construction(size):
+    infos = data.contact_dicts(size)
+    yield lambda: [ContactRecord.from_json(info) for info in infos]
+
+
+@benchmark("records.activity", unit="objects")
+def activity_construction(size):
+    infos = data.activity_dicts(size)
+    yield lambda: [ActivityRecord.from_json(info) for info in infos]
+
+
+@benchmark("records.mailbox", unit="objects")
+def mailbox_construction(size):
+    infos = data.mailbox_dicts(size)
+    yield lambda: [MailboxRecord.from_json(info) for info in infos]
+
+
+@benchmark("records.alias_to_model", unit="objects")
+def alias_conversion(size):
+    records = [
+        AliasRecord.from_json(info)
+        for info in data.alias_dicts(size, data.mailbox_dicts(3))
+    ]
+    yield lambda: [record.to_model() for record in records]
@@ -0,0 +1,80 @@
+"""
+Command startup benchmarks
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.app import invoke, isolated_app
+from benchmarks.harness import benchmark
+from simplelogincmd.config import Config
+
+
+def _command(*args: str) -> list[str]:
+    """
+    Build the command line that runs the CLI in a fresh interpreter
+    """
+    code = "from simplelogincmd.cli.main import cli; cli()"
+    return [sys.executable, "-c", code, *args]
+
+
+@benchmark("cli.startup", unit="runs", sizes=(10,))
+def startup(size):
+    # Each run is a fresh process that reads one config value, so the
+    # time is mostly imports and config loading.
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, XDG_CONFIG_HOME=tmp)
+        command = _command("config", "display.pager-threshold")
+
+        def run():
+            for _ in range(size):
+                subprocess.run(command, env=env, check=True, capture_output=True)
+            return size
+
+        # The first run writes the config file, as a user's first
+        # `config` command would.
+        subprocess.run([*command, "0"], env=env, check=True, capture_output=True)
+        yield run
+
+
+@benchmark("cli.help_startup", unit="runs", sizes=(10,))
+def help_startup(size):
+    # A fresh process printing the help of the nested `alias contact`
+    # group. Python itself takes about 60 ms of each run here.
+    command = _command("alias", "contact", "--help")
+
+    def run():
+        for _ in range(size):
+            subprocess.run(command, check=True, capture_output=True)
+        return size
+
+    yield run
+
+
+@benchmark("cli.help", unit="runs", sizes=(100,))
+def help(size):
+    # Help of every group, in process. Only the groups along the way
+    # should be imported, and only once.
+    groups = ((), ("alias",), ("alias", "contact"), ("database",))
+
+    def run():
+        for _ in range(size):
+            for group in groups:
+                invoke(*group, "--help")
+        return size * len(groups)
+
+    yield run
+
+
+@benchmark("config.load", unit="loads", sizes=(100,))
+def load(size):
+    with isolated_app():
+
+        def run():
+            for _ in range(size):
+                Config()
+            return size
+
+        yield run
@@ -0,0 +1,77 @@
+"""
+Compare benchmark results against a baseline
+"""
+
+from dataclasses import dataclass
+
+from benchmarks import const
+
+
+@dataclass(frozen=True)
+class Comparison:
+    """
+    The change in one benchmark result relative to its baseline
+
+    :ivar key: Benchmark name and size, e.g. "models.alias[1000]"
+    :ivar baseline: Baseline median time, in seconds
+    :ivar current: Current median time, in seconds
+    :ivar regressed: Whether the slowdown exceeds the threshold
+    """
+
+    key: str
+    baseline: float
+    current: float
+    regressed: bool
+
+    @property
+    def change(self) -> float:
+        """
+        Relative change in time; positive values are slowdowns
+
+        :rtype: float
+        """
+        if self.baseline == 0:
+            return 0.0
+        return self.current / self.baseline - 1
+
+
+def compare(
+    baseline: dict,
+    current: dict,
+    threshold: float = const.THRESHOLD,
+) -> list[Comparison]:
+    """
+    Compare the results common to two results documents
+
+    Results that appear in only one of the documents are ignored, so a
+    quick run of a few benchmarks can be checked against a full
+    baseline.
+
+    :param baseline: The reference results document
+    :type baseline: dict
+    :param current: The results document to check
+    :type current: dict
+    :param threshold: Relative slowdown beyond which a result counts as
+        a regression, defaults to :data:`~benchmarks.const.THRESHOLD`
+    :type threshold: float, optional
+
+    :rtype: list[Comparison]
+    """
+    base_results = baseline.get("results", {})
+    current_results = current.get("results", {})
+    comparisons = []
+    for key in sorted(base_results.keys() & current_results.keys()):
+        before = base_results[key]["seconds"]
+        after = current_results[key]["seconds"]
+        regressed = after > before * (1 + threshold)
+        comparisons.append(Comparison(key, before, after, regressed))
+    return comparisons
+
+
+def regressions(comparisons: list[Comparison]) -> list[Comparison]:
+    """
+    Filter comparisons down to regressions
+
+    :rtype: list[Comparison]
+    """
+    return [comparison for comparison in comparisons if comparison.regressed]
@@ -0,0 +1,21 @@
+"""
+Benchmark constants
+"""
+
+# Synthetic account sizes (number of aliases, contacts, etc.) against
+# which every benchmark is run unless told otherwise.
+SIZES = (1_000, 10_000, 100_000)
+
+# Number of times each benchmark is timed. The median is recorded.
+REPEAT = 3
+
+# Relative slowdown beyond which a result counts as a regression, e.g.
+# 0.10 means "more than 10% slower than the baseline".
+THRESHOLD = 0.10
+
+# Number of identifier lookups timed per round of the resolve benchmark.
+LOOKUPS = 200
+
+# API key written to the isolated configuration used by end-to-end
+# benchmarks. The stand-in server accepts any key.
+API_KEY = "benchmark-api-key"
@@ -0,0 +1,203 @@
+"""
+Synthetic SimpleLogin data
+
+Every generator produces dicts shaped like the corresponding SimpleLogin
+API responses. Output is deterministic for a given set of arguments so
+that results are comparable between runs.
+"""
+
+import random
+
+
+_WORDS = (
+    "amber",
+    "bison",
+    "cedar",
+    "delta",
+    "ember",
+    "fjord",
+    "gecko",
+    "heron",
+    "iris",
+    "juniper",
+    "koala",
+    "lotus",
+)
+#: The domains of generated aliases.
+DOMAINS = (
+    "sl.local",
+    "aleeas.test",
+    "slmail.test",
+)
+_ACTIONS = (
+    "forward",
+    "forward",
+    "forward",
+    "block",
+    "reply",
+    "bounced",
+)
+
+# 2020-01-01T00:00:00Z. Timestamps are spread out after this point.
+_EPOCH = 1577836800
+
+
+def mailbox_dicts(count: int, start: int = 1) -> list[dict]:
+    """
+    Generate mailboxes
+
+    :param count: The number of mailboxes to generate
+    :type count: int
+    :param start: The id of the first mailbox, defaults to 1
+    :type start: int, optional
+
+    :rtype: list[dict]
+    """
+    return [
+        dict(
+            id=start + i,
+            email=f"mailbox{start + i}@example.com",
+            default=i == 0,
+            creation_timestamp=_EPOCH + i,
+            nb_alias=0,
+            verified=True,
+        )
+        for i in range(count)
+    ]
+
+
+def alias_dicts(
+    count: int,
+    mailboxes: list[dict] | None = None,
+    start: int = 1,
+    seed: int = 0,
+) -> list[dict]:
+    """
+    Generate aliases
+
+    Every alias has a unique email address and a unique note, so any
+    of them can be used to identify exactly one alias.
+
+    :param count: The number of aliases to generate
+    :type count: int
+    :param mailboxes: Mailboxes to which the aliases are assigned in
+        turn, defaults to a single generated mailbox
+    :type mailboxes: list[dict], optional
+    :param start: The id of the first alias, defaults to 1
+    :type start: int, optional
+    :param seed: Seed for the pseudo-random counters, defaults to 0
+    :type seed: int, optional
+
+    :rtype: list[dict]
+    """
+    rng = random.Random(seed)
+    mailboxes = mailboxes or mailbox_dicts(1)
+    aliases = []
+    for i in range(count):
+        alias_id = start + i
+        word = _WORDS[i % len(_WORDS)]
+        domain = DOMAINS[i % len(DOMAINS)]
+        mailbox = mailboxes[i % len(mailboxes)]
+        created = _EPOCH + alias_id * 60
+        aliases.append(
+            dict(
+                id=alias_id,
+                email=f"{word}.{alias_id}@{domain}",
+                name=None if i % 3 else f"Name {alias_id}",
+                note=f"note {alias_id} {word}",
+                enabled=i % 10 != 0,
+                nb_block=rng.randrange(50),
+                nb_forward=rng.randrange(1000),
+                nb_reply=rng.randrange(20),
+                support_pgp=False,
+                disable_pgp=False,
+                pinned=i % 50 == 0,
+                creation_timestamp=created,
+                mailboxes=[
+                    dict(id=mailbox["id"], email=mailbox["email"]),
+                ],
+                latest_activity=dict(
+                    action="forward",
+                    timestamp=created + 3600,
+                    contact=dict(
+                        name=None,
+                        email=f"sender{alias_id}@example.net",
+                        reverse_alias=f"sender{alias_id}@example.net <ra@sl.local>",
+                    ),
+                ),
+            )
+        )
+    return aliases
+
+
+def contact_dicts(count: int, alias_id: int = 0, start: int = 1) -> list[dict]:
+    """
+    Generate contacts for a single alias
+
+    :param count: The number of contacts to generate
+    :type count: int
+    :param alias_id: The alias to which the contacts belong. Only used
+        to make the addresses unique, defaults to 0
+    :type alias_id: int, optional
+    :param start: The id of the first contact, defaults to 1
+    :type start: int, optional
+
+    :rtype: list[dict]
+    """
+    contacts = []
+    for i in range(count):
+        contact_id = start + i
+        address = f"contact{contact_id}.{alias_id}@example.org"
+        reverse = f"ra+{alias_id}.{contact_id}@sl.local"
+        contacts.append(
+            dict(
+                id=contact_id,
+                contact=address,
+                creation_timestamp=_EPOCH + contact_id,
+                last_email_sent_timestamp=None if i % 2 else _EPOCH + contact_id,
+                reverse_alias=f"{address} <{reverse}>",
+                reverse_alias_address=reverse,
+                block_forward=i % 7 == 0,
+            )
+        )
+    return contacts
+
+
+def activity_dicts(count: int, alias_id: int = 0, seed: int = 0) -> list[dict]:
+    """
+    Generate activities for a single alias, newest first
+
+    Like the real API, activities have no id and use the keys "from"
+    and "to".
+
+    :param count: The number of activities to generate
+    :type count: int
+    :param alias_id: The alias to which the activities belong. Only
+        used to make the addresses unique, defaults to 0
+    :type alias_id: int, optional
+    :param seed: Seed for the pseudo-random actions and senders,
+        defaults to 0
+    :type seed: int, optional
+
+    :rtype: list[dict]
+    """
+    rng = random.Random(seed + alias_id)
+    activities = []
+    # Spread activities over the last ~90 days before `_EPOCH + 1y`.
+    newest = _EPOCH + 365 * 86400
+    for i in range(count):
+        sender = f"sender{rng.randrange(25)}@example.net"
+        reverse = f"ra+{alias_id}.{i}@sl.local"
+        activities.append(
+            {
+                "id": None,
+                "action": rng.choice(_ACTIONS),
+                "timestamp": newest - i * 7919 % (90 * 86400),
+                "from": sender,
+                "to": f"alias{alias_id}@sl.local",
+                "reverse_alias": f"{sender} <{reverse}>",
+                "reverse_alias_address": reverse,
+            }
+        )
+    activities.sort(key=lambda activity: activity["timestamp"], reverse=True)
+    return activities
@@ -0,0 +1,227 @@
+"""
+Benchmark registration, timing, and result storage
+"""
+
+import contextlib
+import fnmatch
+import gc
+import importlib
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from pkgutil import iter_modules
+
+from benchmarks import const
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    """
+    A registered benchmark
+
+    :ivar name: Dotted name, unique within the suite
+    :ivar setup: Context manager factory that takes the synthetic
+        account size, performs any setup, and yields the callable to be
+        timed
+    :ivar unit: What the size counts (e.g. "aliases"). Used to report
+        throughput
+    :ivar sizes: The sizes to which the benchmark is limited, if any
+    """
+
+    name: str
+    setup: Callable
+    unit: str
+    sizes: tuple[int, ...] | None = None
+
+
+_registry: dict[str, Benchmark] = {}
+
+
+def benchmark(name: str, unit: str, sizes: tuple[int, ...] | None = None):
+    """
+    Decorate a generator function to register it as a benchmark
+
+    The function receives the synthetic account size, sets up whatever
+    it needs, and yields a callable which is then timed. Anything after
+    the `yield` is run as teardown. Throughput is reported as `size`
+    units per second, unless the timed callable returns the number of
+    operations it performed::
+
+        @benchmark("models.alias", unit="aliases")
+        def alias_construction(size):
+            infos = data.alias_dicts(size)
+            yield lambda: [Alias(**info) for info in infos]
+
+    :param name: Dotted name of the benchmark
+    :type name: str
+    :param unit: What `size` counts
+    :type unit: str
+    :param sizes: Restrict the benchmark to these sizes, defaults to
+        running at every size requested
+    :type sizes: tuple[int, ...], optional
+
+    :raise ValueError: If a benchmark with this name already exists
+    """
+
+    def decorator(f):
+        if name in _registry:
+            raise ValueError(f"Duplicate benchmark name: {name}")
+        setup = contextlib.contextmanager(f)
+        _registry[name] = Benchmark(name, setup, unit, sizes)
+        return f
+
+    return decorator
+
+
+def discover() -> dict[str, Benchmark]:
+    """
+    Import every ``bench_*`` module of the package and list the benchmarks
+
+    :rtype: dict[str, Benchmark]
+    """
+    import benchmarks
+
+    for _, module, _ in iter_modules(benchmarks.__path__):
+        if module.startswith("bench_"):
+            importlib.import_module(f"{benchmarks.__name__}.{module}")
+    return dict(_registry)
+
+
+def time_rounds(run: Callable, repeat: int) -> tuple[list[float], int | None]:
+    """
+    Time several calls of `run`
+
+    Garbage collection is forced before, and disabled during, each
+    round so that rounds do not pay for each other's garbage.
+
+    :return: The duration of each round, and what the last call of
+        `run` returned if that was a count of operations performed
+    :rtype: tuple[list[float], int | None]
+    """
+    rounds = []
+    count = None
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            count = run()
+            rounds.append(time.perf_counter() - start)
+        finally:
+            gc.enable()
+    if isinstance(count, bool) or not isinstance(count, int):
+        count = None
+    return rounds, count
+
+
+def measure_memory(run: Callable) -> tuple[int, int]:
+    """
+    Measure the memory used by one call of `run`
+
+    Allocations made by setup are not counted.
+
+    :return: The number of bytes allocated by the call and still held
+        by what it returned, and the peak number of bytes allocated at
+        any point during the call
+    :rtype: tuple[int, int]
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = run()  # noqa: F841 (held until measured)
+        held, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return held, peak
+
+
+def run_benchmarks(
+    patterns: list[str] | None = None,
+    sizes: tuple[int, ...] = const.SIZES,
+    repeat: int = const.REPEAT,
+    report: Callable[[str, dict], None] | None = None,
+    memory: bool = False,
+) -> dict:
+    """
+    Run benchmarks and collect their results
+
+    :param patterns: Glob patterns selecting benchmarks by name,
+        defaults to running all of them
+    :type patterns: list[str], optional
+    :param sizes: Synthetic account sizes at which to run, defaults to
+        :data:`~benchmarks.const.SIZES`
+    :type sizes: tuple[int, ...], optional
+    :param repeat: The number of timed rounds per benchmark and size
+    :type repeat: int, optional
+    :param report: Called with the key and entry of each result as soon
+        as it is available
+    :type report: Callable[[str, dict], None], optional
+    :param memory: Whether to also measure memory held per unit and
+        peak memory, in an extra untimed round, defaults to False
+    :type memory: bool, optional
+
+    :return: A results document, suitable for :func:`save`
+    :rtype: dict
+    """
+    results = {}
+    for name, bench in sorted(discover().items()):
+        if patterns and not any(fnmatch.fnmatch(name, p) for p in patterns):
+            continue
+        for size in sizes:
+            if bench.sizes is not None and size not in bench.sizes:
+                continue
+            with bench.setup(size) as run:
+                rounds, count = time_rounds(run, repeat)
+                usage = measure_memory(run) if memory else None
+            median = statistics.median(rounds)
+            operations = size if count is None else count
+            key = f"{name}[{size}]"
+            entry = dict(
+                seconds=median,
+                best=min(rounds),
+                rounds=len(rounds),
+                unit=bench.unit,
+                throughput=operations / median if median else None,
+            )
+            if usage is not None:
+                held, peak = usage
+                entry["bytes_per_unit"] = held / operations if operations else None
+                entry["peak_bytes"] = peak
+            results[key] = entry
+            if report is not None:
+                report(key, entry)
+    return dict(meta=_meta(), results=results)
+
+
+def _meta() -> dict:
+    return dict(
+        created=datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        python=platform.python_version(),
+        implementation=platform.python_implementation(),
+        machine=platform.machine(),
+        system=platform.system(),
+    )
+
+
+def save(document: dict, path: Path) -> None:
+    """
+    Write a results document to a JSON file
+    """
+    with path.open("w", encoding="utf-8") as file:
+        json.dump(document, file, indent=2, sort_keys=True)
+
+
+def load(path: Path) -> dict:
+    """
+    Read a results document from a JSON file
+
+    :rtype: dict
+    """
+    with path.open("r", encoding="utf-8") as file:
+        return json.load(file)
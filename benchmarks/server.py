@@ -0,0 +1,267 @@
+"""
+Stand-in SimpleLogin API server
+
+Requests made through :mod:`requests` are intercepted by
+:mod:`responses` and answered from a synthetic account held in memory,
+so end-to-end benchmarks measure the application rather than the
+network.
+"""
+
+import json
+import re
+import threading
+import time
+from urllib.parse import parse_qs, urlsplit
+
+import responses
+
+from benchmarks import data
+from simplelogincmd.rest import const
+
+
+def _url(endpoint: str) -> re.Pattern:
+    """
+    Compile a pattern matching the full URL of an API endpoint
+
+    Placeholders like ``{alias_id}`` become numeric capture groups.
+    """
+    pattern = re.escape(const.BASE_URL + endpoint)
+    pattern = re.sub(r"\\\{\w+\\\}", r"(\\d+)", pattern)
+    return re.compile(f"^{pattern}(?:\\?.*)?$")
+
+
+def _page_id(request) -> int:
+    query = parse_qs(urlsplit(request.url).query)
+    return int(query.get("page_id", ["0"])[0])
+
+
+def _path_id(request, pattern: re.Pattern) -> int:
+    return int(pattern.match(request.url).group(1))
+
+
+class StandInServer:
+    """
+    An in-memory SimpleLogin account answering API requests
+
+    Use instances as context managers. While active, every request to
+    the SimpleLogin API is answered by the instance::
+
+        with StandInServer(aliases=1000):
+            sl.get_all_aliases()
+
+    Response bodies are encoded once and cached, so repeated runs
+    measure only the client side.
+    """
+
+    def __init__(
+        self,
+        aliases: int = 0,
+        mailboxes: int = 3,
+        contacts_per_alias: int = 0,
+        activities_per_alias: int = 0,
+        latency: float = 0.0,
+    ) -> None:
+        """
+        Constructor
+
+        :param aliases: The number of aliases in the account, defaults
+            to 0
+        :type aliases: int, optional
+        :param mailboxes: The number of mailboxes in the account,
+            defaults to 3
+        :type mailboxes: int, optional
+        :param contacts_per_alias: The number of contacts each alias
+            has, defaults to 0
+        :type contacts_per_alias: int, optional
+        :param activities_per_alias: The number of activities each
+            alias has, defaults to 0
+        :type activities_per_alias: int, optional
+        :param latency: Simulated network latency of every request, in
+            seconds, defaults to 0
+        :type latency: float, optional
+        """
+        self.mailboxes = data.mailbox_dicts(mailboxes)
+        self.aliases = data.alias_dicts(aliases, self.mailboxes)
+        self.contacts_per_alias = contacts_per_alias
+        self.activities_per_alias = activities_per_alias
+        self.latency = latency
+        self.requests = 0
+        self._cache = {}
+        self._lock = threading.Lock()
+        self._mock = None
+
+    def __enter__(self) -> "StandInServer":
+        mock = responses.RequestsMock(assert_all_requests_are_fired=False)
+        routes = (
+            ("GET", const.ENDPOINT.MAILBOXES, self._get_mailboxes),
+            ("GET", const.ENDPOINT.ALIASES, self._get_aliases),
+            ("GET", const.ENDPOINT.ALIAS, self._get_alias),
+            ("GET", const.ENDPOINT.ALIAS_CONTACTS, self._get_contacts),
+            ("GET", const.ENDPOINT.ALIAS_ACTIVITIES, self._get_activities),
+            ("GET", const.ENDPOINT.ALIAS_OPTIONS, self._get_alias_options),
+            ("POST", const.ENDPOINT.ALIAS_CUSTOM, self._create_custom_alias),
+            ("POST", const.ENDPOINT.ALIAS_RANDOM, self._create_random_alias),
+            ("POST", const.ENDPOINT.ALIAS_TOGGLE, self._toggle_alias),
+            ("PATCH", const.ENDPOINT.ALIAS, self._update_alias),
+        )
+        for method, endpoint, handler in routes:
+            mock.add_callback(
+                method,
+                _url(endpoint),
+                callback=self._wrap(handler, _url(endpoint)),
+                content_type="application/json",
+            )
+        mock.start()
+        self._mock = mock
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._mock.stop()
+        self._mock.reset()
+        self._mock = None
+
+    def _wrap(self, handler, pattern: re.Pattern):
+        def callback(request):
+            # `responses` records every call; drop them, or they would
+            # count against the memory of the code being measured.
+            self._mock.calls.reset()
+            for route in self._mock.registered():
+                route.calls.reset()
+            self.requests += 1
+            if self.latency:
+                time.sleep(self.latency)
+            return handler(request, pattern)
+
+        return callback
+
+    def _cached(self, key: tuple, build) -> tuple[int, dict, str]:
+        """
+        Produce a 200 response whose body is built, and encoded, only once
+        """
+        if (body := self._cache.get(key)) is None:
+            body = self._cache[key] = json.dumps(build())
+        return 200, {}, body
+
+    def _page(self, items: list, page_id: int) -> list:
+        start = page_id * const.MAX_MODELS_PER_PAGE
+        end = start + const.MAX_MODELS_PER_PAGE
+        return items[start:end]
+
+    def alias(self, alias_id: int) -> dict | None:
+        """
+        Look up an alias of the account by id
+
+        :rtype: dict, optional
+        """
+        index = alias_id - self.aliases[0]["id"] if self.aliases else -1
+        if 0 <= index < len(self.aliases):
+            return self.aliases[index]
+        return None
+
+    def _get_mailboxes(self, request, pattern):
+        return self._cached(("mailboxes",), lambda: {"mailboxes": self.mailboxes})
+
+    def _get_aliases(self, request, pattern):
+        page_id = _page_id(request)
+        return self._cached(
+            ("aliases", page_id),
+            lambda: {"aliases": self._page(self.aliases, page_id)},
+        )
+
+    def _get_alias(self, request, pattern):
+        alias_id = _path_id(request, pattern)
+        if (alias := self.alias(alias_id)) is None:
+            return 400, {}, json.dumps({"error": "Unknown error"})
+        return self._cached(("alias", alias_id), lambda: alias)
+
+    def _get_alias_options(self, request, pattern):
+        hostname = parse_qs(urlsplit(request.url).query).get("hostname", [""])[0]
+
+        def build():
+            prefix = hostname.split(".")[0]
+            return dict(
+                can_create=True,
+                prefix_suggestion=prefix,
+                suffixes=[
+                    dict(suffix=f"@{domain}", signed_suffix=f"@{domain}.sig")
+                    for domain in data.DOMAINS
+                ],
+            )
+
+        return self._cached(("options", hostname), build)
+
+    def _create(self, email, note: str | None = None):
+        """
+        Add an alias to the account, and drop responses it invalidates
+
+        `email` makes the new alias's address from its id.
+        """
+        with self._lock:
+            start = self.aliases[-1]["id"] + 1 if self.aliases else 1
+            address = email(start)
+            if any(alias["email"] == address for alias in self.aliases):
+                return 409, {}, json.dumps({"error": f"{address} already exists"})
+            (alias,) = data.alias_dicts(1, self.mailboxes, start=start)
+            alias.update(email=address, note=note, latest_activity=None)
+            alias.update(nb_block=0, nb_forward=0, nb_reply=0)
+            self.aliases.append(alias)
+            self._cache.clear()
+        return 201, {}, json.dumps(alias)
+
+    def _create_custom_alias(self, request, pattern):
+        body = json.loads(request.body)
+        email = body["alias_prefix"] + body["signed_suffix"].removesuffix(".sig")
+        return self._create(lambda alias_id: email, body.get("note"))
+
+    def _create_random_alias(self, request, pattern):
+        note = json.loads(request.body).get("note") if request.body else None
+        domain = data.DOMAINS[0]
+        return self._create(lambda alias_id: f"random.{alias_id}@{domain}", note)
+
+    def _mutate(self, request, pattern, change):
+        """
+        Apply a change to an alias, and drop responses it invalidates
+        """
+        alias_id = _path_id(request, pattern)
+        if (alias := self.alias(alias_id)) is None:
+            return 400, {}, json.dumps({"error": "Unknown error"})
+        self._cache.clear()
+        return 200, {}, json.dumps(change(alias))
+
+    def _toggle_alias(self, request, pattern):
+        def toggle(alias):
+            alias["enabled"] = not alias["enabled"]
+            return {"enabled": alias["enabled"]}
+
+        return self._mutate(request, pattern, toggle)
+
+    def _update_alias(self, request, pattern):
+        changes = json.loads(request.body)
+        changes.pop("mailbox_ids", None)
+
+        def update(alias):
+            alias.update(changes)
+            return {"ok": True}
+
+        return self._mutate(request, pattern, update)
+
+    def _get_contacts(self, request, pattern):
+        alias_id = _path_id(request, pattern)
+        page_id = _page_id(request)
+
+        def build():
+            start = alias_id * self.contacts_per_alias + 1
+            contacts = data.contact_dicts(self.contacts_per_alias, alias_id, start)
+            return {"contacts": self._page(contacts, page_id)}
+
+        return self._cached(("contacts", alias_id, page_id), build)
+
+    def _get_activities(self, request, pattern):
+        alias_id = _path_id(request, pattern)
+        page_id = _page_id(request)
+
+        def build():
+            activities = data.activity_dicts(self.activities_per_alias, alias_id)
+            return {"activities": self._page(activities, page_id)}
+
+        return self._cached(("activities", alias_id, page_id), build)
@@ -0,0 +1,408 @@
+"""
+Export an account to an archive, and load archives locally
+
+An archive holds an account's mailboxes, aliases, and the contacts and
+activities of every alias, as newline-delimited JSON: a header line,
+then an object per line, each with its `type`, its `data` as returned
+by the API, with every field kept, and, for contacts and activities,
+the `alias_id` of their alias, which the API leaves out. Every alias
+comes before its contacts and activities.
+
+Archives are compressed by gzip or, if the `zstandard` package is
+installed, by zstd, and are read back whichever they use.
+
+Exports are streamed. Alias pages are fetched ahead on a background
+thread, as by :mod:`.sync`, and the pages of contacts and activities by
+a pool of worker threads, at a limited rate. Each task fetches a single
+page, and the next page of an alias is only asked for once its previous
+one is in, so however many contacts or activities an alias has, no more
+than a bounded window of pages is held in memory before being written.
+"""
+
+import collections
+import gzip
+import importlib
+import itertools
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import IO, Any
+
+from sqlalchemy import delete, insert
+
+from simplelogincmd import codec, const
+from simplelogincmd.database import DatabaseAccessLayer
+from simplelogincmd.database.models import (
+    Activity,
+    Alias,
+    Contact,
+    SyncCheckpoint,
+    alias_counter,
+    alias_fetched,
+    alias_rate,
+    sync_page,
+    sync_run,
+)
+from simplelogincmd.database.session import SimpleLoginSession
+from simplelogincmd.rest import SimpleLogin
+from simplelogincmd.rest import const as const_rest
+from simplelogincmd.rest.records import (
+    ActivityRecord,
+    AliasRecord,
+    ContactRecord,
+    MailboxRecord,
+)
+from simplelogincmd.sync import limited, prefetch
+
+
+# Types of the objects of an archive, in the order in which they are
+# loaded.
+MAILBOX = "mailbox"
+ALIAS = "alias"
+CONTACT = "contact"
+ACTIVITY = "activity"
+
+_RECORDS = {
+    MAILBOX: MailboxRecord,
+    ALIAS: AliasRecord,
+    CONTACT: ContactRecord,
+    ACTIVITY: ActivityRecord,
+}
+
+# The endpoint of the pages of each type of an alias's objects, and the
+# key of the response holding them.
+_ALIAS_PAGES = {
+    CONTACT: (const_rest.ENDPOINT.ALIAS_CONTACTS, "contacts"),
+    ACTIVITY: (const_rest.ENDPOINT.ALIAS_ACTIVITIES, "activities"),
+}
+
+# The first bytes of files compressed by each compression.
+_MAGIC = {
+    b"\x1f\x8b": "gzip",
+    b"\x28\xb5\x2f\xfd": "zstd",
+}
+
+
+def compression_of(path: str | Path) -> str:
+    """
+    Tell the compression of an archive to write from its file name
+
+    :param path: The archive's path
+    :type path: str | Path
+
+    :return: One of the values of
+        :data:`~simplelogincmd.const.EXPORT_COMPRESSIONS`, by the suffix
+        of `path`, or "gzip"
+    :rtype: str
+    """
+    return const.EXPORT_COMPRESSIONS.get(Path(path).suffix.lower(), "gzip")
+
+
+def _zstandard():
+    try:
+        return importlib.import_module("zstandard")
+    except ImportError:
+        raise ValueError("zstd compression needs the `zstandard` package") from None
+
+
+def open_archive(
+    path: str | Path, mode: str = "rb", compression: str | None = None
+) -> IO[bytes]:
+    """
+    Open an archive for reading or writing
+
+    :param path: The archive's path
+    :type path: str | Path
+    :param mode: "rb" or "wb", defaults to "rb"
+    :type mode: str, optional
+    :param compression: "gzip" or "zstd". When reading, it is told
+        from the archive's contents, and when writing, defaults to
+        :func:`compression_of` `path`
+    :type compression: str, optional
+
+    :raise ValueError: If the compression is unknown, or zstd and the
+        `zstandard` package is not installed
+    :raise OSError: If the file cannot be opened
+
+    :return: A binary file, which decompresses what is read from it or
+        compresses what is written to it
+    :rtype: IO[bytes]
+    """
+    if mode == "rb":
+        with open(path, "rb") as file:
+            magic = file.read(4)
+        compression = next(
+            (name for prefix, name in _MAGIC.items() if magic.startswith(prefix)),
+            None,
+        )
+        if compression is None:
+            raise ValueError("Not a gzip or zstd archive")
+    elif compression is None:
+        compression = compression_of(path)
+    if compression == "gzip":
+        return gzip.open(path, mode, compresslevel=6)
+    if compression == "zstd":
+        return _zstandard().open(path, mode)
+    raise ValueError(f"Unknown compression '{compression}'")
+
+
+def _line(obj: dict[str, Any]) -> bytes:
+    return codec.default().dumps(obj) + b"\n"
+
+
+def _drain(tasks: collections.deque) -> Iterator:
+    while tasks:
+        yield tasks.popleft()
+
+
+class Exporter:
+    """
+    Write an account to an archive
+    """
+
+    def __init__(
+        self,
+        sl: SimpleLogin,
+        workers: int = 4,
+        rate: float = 0,
+        activities: bool = True,
+    ) -> None:
+        """
+        Constructor
+
+        :param sl: An authenticated SimpleLogin client
+        :type sl: :class:`~simplelogincmd.rest.SimpleLogin`
+        :param workers: The number of pages of contacts and activities
+            fetched at once, defaults to 4
+        :type workers: int, optional
+        :param rate: The most requests per second, defaults to 0 (no
+            limit)
+        :type rate: float, optional
+        :param activities: Whether to export the activities of aliases,
+            defaults to True
+        :type activities: bool, optional
+        """
+        self.sl = sl
+        self.workers = workers
+        self.rate = rate
+        self.types = (CONTACT, ACTIVITY) if activities else (CONTACT,)
+        #: The number of objects written of each type.
+        self.counts = collections.Counter()
+
+    def run(self, file: IO[bytes]) -> collections.Counter:
+        """
+        Fetch the account and write it to an archive
+
+        At most twice as many pages of contacts and activities as there
+        are workers are fetched ahead of being written, and they are
+        written as they arrive, so their order is not that of the API.
+
+        :param file: The archive, open for writing bytes, such as by
+            :func:`open_archive`
+        :type file: IO[bytes]
+
+        :raise APIError: If the API answers with an error
+
+        :return: The number of objects written of each type
+        :rtype: collections.Counter
+        """
+        self.counts = collections.Counter()
+        header = dict(
+            format=const.EXPORT_FORMAT,
+            version=const.EXPORT_VERSION,
+            created=int(time.time()),
+        )
+        file.write(_line(header))
+        with limited(self.sl, self.rate):
+            mailboxes = self.sl.get_json_page(
+                const_rest.ENDPOINT.MAILBOXES, "mailboxes", page_id=None
+            )
+            self._write(file, MAILBOX, mailboxes)
+            aliases = self._aliases(file)
+            try:
+                self._write_alias_pages(file, aliases)
+            finally:
+                aliases.close()
+        return self.counts
+
+    def _write(
+        self,
+        file: IO[bytes],
+        type: str,
+        infos: Iterable[dict],
+        alias_id: int | None = None,
+    ) -> None:
+        lines = []
+        for info in infos:
+            obj = dict(type=type, data=info)
+            if alias_id is not None:
+                obj["alias_id"] = alias_id
+            lines.append(_line(obj))
+        file.write(b"".join(lines))
+        self.counts[type] += len(lines)
+
+    def _aliases(self, file: IO[bytes]) -> Iterator[tuple[str, int, int]]:
+        """
+        Write the aliases, and yield the first page of each type of
+        their objects to fetch
+        """
+        pages = self.sl.iter_json_pages(const_rest.ENDPOINT.ALIASES, "aliases")
+        for page in prefetch(pages):
+            self._write(file, ALIAS, page)
+            for info in page:
+                for type in self.types:
+                    yield type, info["id"], 0
+
+    def _fetch(self, type: str, alias_id: int, page_id: int) -> tuple:
+        endpoint, key = _ALIAS_PAGES[type]
+        endpoint = endpoint.format(alias_id=alias_id)
+        return type, alias_id, page_id, self.sl.get_json_page(endpoint, key, page_id)
+
+    def _write_alias_pages(
+        self, file: IO[bytes], tasks: Iterator[tuple[str, int, int]]
+    ) -> None:
+        """
+        Fetch pages of the aliases' objects on the pool of worker
+        threads, and write them as they arrive
+
+        The next page of an alias's objects of a type is fetched before
+        any other, if the previous one was full.
+        """
+        follow_ups = collections.deque()
+        pending = set()
+        with ThreadPoolExecutor(self.workers, thread_name_prefix="export") as executor:
+            try:
+                while True:
+                    room = 2 * self.workers - len(pending)
+                    ready = itertools.chain(_drain(follow_ups), tasks)
+                    for task in itertools.islice(ready, room):
+                        pending.add(executor.submit(self._fetch, *task))
+                    if not pending:
+                        return
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        type, alias_id, page_id, infos = future.result()
+                        self._write(file, type, infos, alias_id)
+                        if len(infos) >= const_rest.MAX_MODELS_PER_PAGE:
+                            follow_ups.append((type, alias_id, page_id + 1))
+            finally:
+                for future in pending:
+                    future.cancel()
+
+
+def read(file: IO[bytes]) -> Iterator[tuple[str, Any]]:
+    """
+    Read the objects of an archive
+
+    :param file: The archive, open for reading bytes, such as by
+        :func:`open_archive`
+    :type file: IO[bytes]
+
+    :raise ValueError: If the file is not an archive, or one of a later
+        version, or a line cannot be read
+
+    :return: The type of each object, and its record
+    :rtype: Iterator[tuple[str, Record]]
+    """
+    json = codec.default()
+    header = None
+    for number, line in enumerate(file, 1):
+        if not line.strip():
+            continue
+        try:
+            obj = json.loads(line)
+        except ValueError as error:
+            raise ValueError(f"Line {number}: {error}") from None
+        if header is None:
+            header = obj
+            if not isinstance(obj, dict) or obj.get("format") != const.EXPORT_FORMAT:
+                raise ValueError("Not an archive written by `export`")
+            if obj.get("version", 0) > const.EXPORT_VERSION:
+                raise ValueError(f"Unsupported archive version {obj['version']}")
+            continue
+        record = _RECORDS.get(obj.get("type")) if isinstance(obj, dict) else None
+        if record is None or not isinstance(obj.get("data"), dict):
+            raise ValueError(f"Line {number}: Not an object of an archive")
+        info = obj["data"]
+        if (alias_id := obj.get("alias_id")) is not None:
+            info = dict(info, alias_id=alias_id)
+        yield obj["type"], record.from_json(info)
+    if header is None:
+        raise ValueError("Not an archive written by `export`")
+
+
+def load(db: DatabaseAccessLayer, file: IO[bytes]) -> collections.Counter:
+    """
+    Load an archive into the local database
+
+    Objects are written in bulk, :data:`~simplelogincmd.const.EXPORT_BATCH_ROWS`
+    of each type per statement, and committed together, so that a
+    failed load changes nothing. Objects of the archive replace those
+    of the database with the same id, and the contacts and activities
+    of its aliases replace theirs; other objects are kept.
+
+    Loaded aliases are not marked as fetched, their counters' history
+    and rates are dropped, and so is the state of past syncs, so that
+    the next sync rewrites every page rather than take any for
+    unchanged.
+
+    :param db: The local database
+    :type db: :class:`~simplelogincmd.database.DatabaseAccessLayer`
+    :param file: The archive, open for reading bytes, such as by
+        :func:`open_archive`
+    :type file: IO[bytes]
+
+    :raise ValueError: If the archive cannot be read
+
+    :return: The number of objects loaded of each type
+    :rtype: collections.Counter
+    """
+    session = db.session
+    counts = collections.Counter()
+    batches = {type: [] for type in _RECORDS}
+
+    def flush() -> None:
+        # Every type is flushed at once, in order, so that the objects
+        # of an alias are never written before it replaces its own.
+        for type, batch in batches.items():
+            if batch:
+                _write_batch(session, type, batch)
+                batch.clear()
+
+    try:
+        for type, record in read(file):
+            batches[type].append(record)
+            counts[type] += 1
+            if len(batches[type]) >= const.EXPORT_BATCH_ROWS:
+                flush()
+        flush()
+        session.execute(delete(sync_page))
+        session.execute(delete(sync_run))
+        session.execute(delete(SyncCheckpoint))
+    except BaseException:
+        session.rollback()
+        raise
+    session.commit()
+    return counts
+
+
+def _write_batch(session: SimpleLoginSession, type: str, records: list) -> None:
+    if type == ACTIVITY:
+        # Activities have no id of their own, so they are only added.
+        rows = [record.to_row() for record in records]
+        session.execute(insert(Activity.__table__), rows)
+        return
+    if type != ALIAS:
+        session.upsert_records(records)
+        return
+    # Counters are not recorded: the change from those kept to those
+    # loaded did not happen over the time between them. The next sync
+    # starts the aliases' records over instead.
+    rows = [record.to_row() for record in records]
+    session.execute(insert(Alias.__table__).prefix_with("OR REPLACE"), rows)
+    ids = [row["id"] for row in rows]
+    for table in (alias_fetched, alias_counter, alias_rate):
+        session.execute(delete(table).where(table.c.alias_id.in_(ids)))
+    session.execute(delete(Contact).where(Contact.alias_id.in_(ids)))
+    session.execute(delete(Activity).where(Activity.alias_id.in_(ids)))
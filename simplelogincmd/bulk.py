@@ -0,0 +1,419 @@
+"""
+Create aliases in bulk
+
+Rows describing aliases are read from a CSV or NDJSON file, and each
+alias is created by its own request, on the pool of worker threads and
+within the rate limit used by :mod:`.sync`. The options of custom
+aliases are fetched once per hostname, and shared by every row of that
+hostname and, through :mod:`.database.alias_options`, by later
+commands. Created aliases are written to the local database in batches,
+and their results reported as they complete.
+
+Imports can be re-run. A row is skipped if its alias already exists: a
+custom alias whose email address is in the local database, or that
+SimpleLogin refuses to create because it already exists, or an alias
+with no prefix for a hostname on which SimpleLogin recommends an
+existing one. Random aliases without a hostname cannot be told apart,
+and are created anew on every run.
+"""
+
+import csv
+import re
+import threading
+import time
+from collections import namedtuple
+from collections.abc import Iterable, Iterator
+from typing import IO, Any
+
+from sqlalchemy import select
+
+from simplelogincmd import codec, const
+from simplelogincmd.database import DatabaseAccessLayer, alias_options
+from simplelogincmd.database.models import Alias, FieldAccess
+from simplelogincmd.rest import SimpleLogin
+from simplelogincmd.rest.records import AliasRecord
+from simplelogincmd.sync import concurrently, limited
+
+
+# Kinds of aliases.
+CUSTOM = "custom"
+RANDOM = "random"
+
+# Outcomes of rows.
+CREATED = "created"
+EXISTS = "exists"
+FAILED = "failed"
+
+_MODES = ("uuid", "word")
+
+_MAILBOX_SEPARATOR = re.compile(r"[\s,;]+")
+
+# The end of SimpleLogin's error for a custom alias that already exists.
+_ALREADY_EXISTS = " already exists"
+
+
+class Row(
+    namedtuple(
+        "Row",
+        (
+            "line",
+            "kind",
+            "hostname",
+            "prefix",
+            "suffix",
+            "mailboxes",
+            "note",
+            "name",
+            "mode",
+        ),
+    )
+):
+    """
+    An alias to create, as read from line `line` of a file
+
+    `mailboxes` holds the identifiers of the custom alias's mailboxes,
+    and `mode` the mode of the random alias. Random aliases are
+    forwarded to the default mailbox, and have no name.
+    """
+
+    __slots__ = ()
+
+
+class Result(
+    FieldAccess,
+    namedtuple("Result", ("line", "status", "id", "email", "message")),
+):
+    """
+    The outcome of a row: :data:`CREATED`, :data:`EXISTS` or
+    :data:`FAILED`
+
+    `id` and `email` are those of the alias created, or of the alias
+    that already exists, if known.
+    """
+
+    __slots__ = ()
+
+
+def _row(line: int, fields: dict[str, Any] | str) -> Row:
+    """
+    Make a row of the fields read from a line, or the error reading it
+
+    :raise ValueError: If the fields do not describe an alias
+    """
+    if not isinstance(fields, dict):
+        raise ValueError(fields if isinstance(fields, str) else "Expected an object")
+    values = {}
+    for name in Row._fields[1:]:
+        value = fields.get(name)
+        if isinstance(value, str):
+            value = value.strip() or None
+        values[name] = value
+    mailboxes = values["mailboxes"] or []
+    if isinstance(mailboxes, str):
+        mailboxes = _MAILBOX_SEPARATOR.split(mailboxes)
+    values["mailboxes"] = tuple(str(mailbox) for mailbox in mailboxes)
+    kind = values["kind"] = values["kind"] or (CUSTOM if values["prefix"] else RANDOM)
+    if kind not in (CUSTOM, RANDOM):
+        raise ValueError(f"Unknown kind of alias '{kind}'")
+    if values["mode"] not in (None, *_MODES):
+        raise ValueError(f"Unknown mode '{values['mode']}'")
+    return Row(line, **values)
+
+
+def read_rows(file: IO[str], format: str) -> Iterator[Row | Result]:
+    """
+    Read the aliases to create from a file
+
+    Each row has any of the fields of :class:`Row` after `line`, all
+    optional. A CSV file names them in its header, and an NDJSON file
+    holds an object per line. The mailboxes of a CSV row are separated
+    by commas, semicolons or spaces. A row's kind defaults to
+    :data:`CUSTOM` if it has a prefix, and :data:`RANDOM` otherwise.
+
+    :param file: The file, open for reading text
+    :type file: IO[str]
+    :param format: "csv" or "ndjson"
+    :type format: str
+
+    :return: The rows, in order, lazily. Lines that cannot be read, or
+        describe no alias, are failed results instead
+    :rtype: Iterator[Row | Result]
+    """
+    if format == "csv":
+        reader = csv.DictReader(file)
+        lines = ((reader.line_num, fields) for fields in reader)
+    else:
+        lines = _json_lines(file)
+    for line, fields in lines:
+        try:
+            yield _row(line, fields)
+        except ValueError as error:
+            yield Result(line, FAILED, None, None, str(error))
+
+
+def _json_lines(file: IO[str]) -> Iterator[tuple[int, dict | str]]:
+    json = codec.default()
+    for line, text in enumerate(file, 1):
+        if text.strip():
+            try:
+                yield line, json.loads(text)
+            except ValueError as error:
+                yield line, str(error)
+
+
+class Importer:
+    """
+    Create the aliases described by rows
+    """
+
+    def __init__(
+        self,
+        sl: SimpleLogin,
+        db: DatabaseAccessLayer,
+        workers: int = 4,
+        rate: float = 0,
+        options_max_age: int = 0,
+    ) -> None:
+        """
+        Constructor
+
+        :param sl: An authenticated SimpleLogin client
+        :type sl: :class:`~simplelogincmd.rest.SimpleLogin`
+        :param db: The local database
+        :type db: :class:`~simplelogincmd.database.DatabaseAccessLayer`
+        :param workers: The number of aliases created at once, defaults
+            to 4
+        :type workers: int, optional
+        :param rate: The most requests per second, defaults to 0 (no
+            limit)
+        :type rate: float, optional
+        :param options_max_age: How long the options of new custom
+            aliases kept in the local database are used, in seconds,
+            defaults to 0 (only those fetched by the run)
+        :type options_max_age: int, optional
+        """
+        self.sl = sl
+        self.db = db
+        self.workers = workers
+        self.rate = rate
+        self.options_max_age = options_max_age
+        self._lock = threading.Lock()
+        # The lowercased email addresses of the aliases known to exist.
+        self._emails = set()
+        # The options of each hostname, and when they were fetched.
+        self._options = {}
+        # The hostnames whose options were kept by earlier commands.
+        self._loaded = set()
+        self._option_locks = {}
+        # Options fetched but not yet kept in the local database.
+        self._fetched = []
+
+    def run(self, rows: Iterable[Row | Result]) -> Iterator[Result]:
+        """
+        Create an alias for each row, unless it already exists
+
+        Rows whose mailboxes are not numeric ids fail, so identifiers
+        are to be resolved first. Created aliases are committed to the
+        local database in batches, and when the run ends or is
+        interrupted, so that it can be re-run.
+
+        :param rows: The rows, read lazily, among which the results of
+            rows that failed to be read are passed through
+        :type rows: Iterable[Row | Result]
+
+        :return: The result of each row, in order of completion
+        :rtype: Iterator[Result]
+        """
+        session = self.db.session
+        self._emails = {email.lower() for email in session.scalars(select(Alias.email))}
+        self._options = alias_options.load(session, self.options_max_age)
+        self._loaded = set(self._options)
+        created = []
+        try:
+            with limited(self.sl, self.rate):
+                results = concurrently(self._create, rows, self.workers)
+                for result, record in results:
+                    if record is not None:
+                        created.append(record)
+                        if len(created) == const.SYNC_BATCH_ALIASES:
+                            self._write(created)
+                    yield result
+        finally:
+            self._write(created)
+
+    def _write(self, records: list[AliasRecord]) -> None:
+        """
+        Write created aliases, and the options fetched, and commit them
+        """
+        session = self.db.session
+        session.upsert_records(records)
+        records.clear()
+        self._keep_options()
+        session.commit()
+
+    def _keep_options(self) -> None:
+        with self._lock:
+            fetched, self._fetched = self._fetched, []
+        for hostname, options, taken in fetched:
+            alias_options.put(self.db.session, hostname, options, taken)
+
+    def options(self, hostname: str | None) -> tuple[bool, dict | str]:
+        """
+        Get the options of new custom aliases for a hostname
+
+        They are fetched once, however many threads ask at once, and
+        again only once they expire, as set by `options_max_age` and
+        :func:`.alias_options.lifetime`. Errors are not kept, so that
+        the next to ask tries again.
+
+        :param hostname: The hostname, if any
+        :type hostname: str, optional
+
+        :return: What :meth:`~simplelogincmd.rest.SimpleLogin.get_alias_options`
+            returns
+        :rtype: tuple[bool, dict | str]
+        """
+        with self._lock:
+            lock = self._option_locks.setdefault(hostname, threading.Lock())
+        with lock:
+            now = int(time.time())
+            # Within a run, options are shared for as long as they can be.
+            max_age = self.options_max_age or const.SIGNED_SUFFIX_MAX_AGE
+            options, fetched = self._options.get(hostname, (None, None))
+            if fetched is not None and fetched > now - alias_options.lifetime(max_age):
+                return True, options
+            success, options = self.sl.get_alias_options(hostname)
+            if success:
+                self._options[hostname] = options, now
+                with self._lock:
+                    self._fetched.append((hostname, options, now))
+            return success, options
+
+    def _forget_loaded_options(self, hostname: str | None) -> bool:
+        """
+        Forget the options of a hostname if they were kept by an earlier
+        command, so that they are fetched anew
+
+        :return: Whether they were
+        """
+        with self._lock:
+            lock = self._option_locks.setdefault(hostname, threading.Lock())
+        with lock:
+            if hostname not in self._loaded:
+                return False
+            self._loaded.discard(hostname)
+            self._options.pop(hostname, None)
+            return True
+
+    def _exists(self, email: str) -> bool:
+        with self._lock:
+            return email.lower() in self._emails
+
+    def _claim(self, email: str) -> bool:
+        """
+        Tell whether an alias is not known to exist, and from now on
+        that it does
+        """
+        email = email.lower()
+        with self._lock:
+            if email in self._emails:
+                return False
+            self._emails.add(email)
+            return True
+
+    def _recommended(self, row: Row) -> Result | None:
+        """
+        Find the alias that SimpleLogin recommends for the row's
+        hostname, which may fail to be fetched
+        """
+        if row.hostname is None:
+            return None
+        success, options = self.options(row.hostname)
+        if not success:
+            return Result(row.line, FAILED, None, None, options)
+        if (recommendation := options.get("recommendation")) is None:
+            return None
+        email = recommendation.get("alias")
+        message = f"Already used on {recommendation.get('hostname', row.hostname)}"
+        return Result(row.line, EXISTS, None, email, message)
+
+    def _create(self, row: Row | Result) -> tuple[Result, AliasRecord | None]:
+        """
+        Create the alias of a row, on a worker thread
+        """
+        if isinstance(row, Result):
+            return row, None
+        if row.kind == CUSTOM:
+            success, outcome = self._create_custom(row)
+        elif (result := self._recommended(row)) is not None:
+            return result, None
+        else:
+            success, outcome = self.sl.create_random_alias(
+                row.hostname, row.mode, row.note
+            )
+        if isinstance(outcome, Result):
+            return outcome, None
+        if not success:
+            return Result(row.line, FAILED, None, None, outcome), None
+        self._claim(outcome.email)
+        return Result(row.line, CREATED, outcome.id, outcome.email, None), outcome
+
+    def _create_custom(self, row: Row) -> tuple[bool, AliasRecord | Result | str]:
+        if not row.mailboxes:
+            return False, "No mailbox given"
+        unresolved = [mailbox for mailbox in row.mailboxes if not mailbox.isdigit()]
+        if unresolved:
+            return False, f"No mailbox matches '{unresolved[0]}'"
+        if row.prefix and row.suffix and self._exists(row.prefix + row.suffix):
+            return True, Result(row.line, EXISTS, None, row.prefix + row.suffix, None)
+        # A recommendation names whichever alias is used on the hostname,
+        # which tells nothing of the address that an explicit prefix names.
+        if not row.prefix and (result := self._recommended(row)) is not None:
+            return True, result
+        success, outcome = self._create_custom_with_options(row)
+        if (
+            not success
+            and isinstance(outcome, str)
+            and alias_options.rejected(outcome)
+            and self._forget_loaded_options(row.hostname)
+        ):
+            # The suffix kept may have expired since, so try once more with
+            # fresh options.
+            success, outcome = self._create_custom_with_options(row)
+        return success, outcome
+
+    def _create_custom_with_options(
+        self, row: Row
+    ) -> tuple[bool, AliasRecord | Result | str]:
+        success, options = self.options(row.hostname)
+        if not success:
+            return False, options
+        if not options.get("can_create"):
+            return False, "You are unable to create custom aliases."
+        suffixes = options.get("suffixes") or []
+        if row.suffix is not None:
+            suffixes = [s for s in suffixes if s.get("suffix") == row.suffix]
+            if not suffixes:
+                return False, f"Suffix {row.suffix} is not available"
+        elif not suffixes:
+            return False, "Error retrieving alias suffixes"
+        if not (prefix := row.prefix or options.get("prefix_suggestion")):
+            return False, "No prefix given"
+        email = prefix + suffixes[0]["suffix"]
+        if not self._claim(email):
+            return True, Result(row.line, EXISTS, None, email, None)
+        success, record = self.sl.create_custom_alias(
+            alias_prefix=prefix,
+            signed_suffix=suffixes[0]["signed_suffix"],
+            mailbox_ids=[int(mailbox) for mailbox in row.mailboxes],
+            note=row.note,
+            name=row.name,
+            hostname=row.hostname,
+        )
+        if not success:
+            if isinstance(record, str) and record.endswith(_ALREADY_EXISTS):
+                return True, Result(row.line, EXISTS, None, email, record)
+            # Let a later row of the same alias try again.
+            with self._lock:
+                self._emails.discard(email.lower())
+        return success, record
@@ -0,0 +1,228 @@
+"""
+The commands of every lazy group
+
+Generated by `python -m simplelogincmd.cli.lazy_group`. Do not edit.
+"""
+
+COMMANDS = {
+    "simplelogincmd.cli.commands": {
+        "account": (
+            "simplelogincmd.cli.commands.account",
+            {
+                "help": "Account management and authentication",
+            },
+        ),
+        "alias": (
+            "simplelogincmd.cli.commands.alias",
+            {
+                "help": "CRUD operations on your aliases",
+            },
+        ),
+        "config": (
+            "simplelogincmd.cli.commands.config",
+            {
+                "short_help": "Manage application configuration",
+            },
+        ),
+        "database": (
+            "simplelogincmd.cli.commands.database",
+            {
+                "help": "Manage the local database",
+            },
+        ),
+        "export": (
+            "simplelogincmd.cli.commands.export",
+            {
+                "short_help": "Back up your account to an archive",
+            },
+        ),
+        "import-local": (
+            "simplelogincmd.cli.commands.import_local",
+            {
+                "short_help": "Load an archive into the local database",
+            },
+        ),
+        "mailbox": (
+            "simplelogincmd.cli.commands.mailbox",
+            {
+                "help": "CRUD operations on your mailboxes",
+            },
+        ),
+        "report": (
+            "simplelogincmd.cli.commands.report",
+            {
+                "help": "Report on the activities of all your aliases",
+            },
+        ),
+    },
+    "simplelogincmd.cli.commands.account_commands": {
+        "login": (
+            "simplelogincmd.cli.commands.account_commands.login",
+            {
+                "help": "Log in to your account",
+            },
+        ),
+        "logout": (
+            "simplelogincmd.cli.commands.account_commands.logout",
+            {
+                "help": "Log out of your account",
+            },
+        ),
+        "mfa": (
+            "simplelogincmd.cli.commands.account_commands.mfa",
+            {
+                "help": "Multi-factor authentication",
+                "hidden": True,
+            },
+        ),
+    },
+    "simplelogincmd.cli.commands.alias_commands": {
+        "activity": (
+            "simplelogincmd.cli.commands.alias_commands.activity",
+            {
+                "short_help": "List alias activity",
+            },
+        ),
+        "contact": (
+            "simplelogincmd.cli.commands.alias_commands.contact",
+            {
+                "help": "CRUD operations on alias contacts",
+            },
+        ),
+        "custom": (
+            "simplelogincmd.cli.commands.alias_commands.custom",
+            {
+                "help": "Create a new custom alias",
+            },
+        ),
+        "delete": (
+            "simplelogincmd.cli.commands.alias_commands.delete",
+            {
+                "short_help": "Delete an alias",
+            },
+        ),
+        "get": (
+            "simplelogincmd.cli.commands.alias_commands.get",
+            {
+                "short_help": "View specific aliases",
+            },
+        ),
+        "import": (
+            "simplelogincmd.cli.commands.alias_commands.import_",
+            {
+                "short_help": "Create aliases in bulk from a file",
+            },
+        ),
+        "list": (
+            "simplelogincmd.cli.commands.alias_commands.list",
+            {
+                "short_help": "List all your aliases",
+            },
+        ),
+        "random": (
+            "simplelogincmd.cli.commands.alias_commands.random",
+            {
+                "help": "Create a new random alias",
+            },
+        ),
+        "spikes": (
+            "simplelogincmd.cli.commands.alias_commands.spikes",
+            {
+                "short_help": "Show aliases receiving sudden bursts of email",
+            },
+        ),
+        "stats": (
+            "simplelogincmd.cli.commands.alias_commands.stats",
+            {
+                "short_help": "Show which aliases' counters changed most",
+            },
+        ),
+        "toggle": (
+            "simplelogincmd.cli.commands.alias_commands.toggle",
+            {
+                "short_help": "Enable or disable an alias",
+            },
+        ),
+        "update": (
+            "simplelogincmd.cli.commands.alias_commands.update",
+            {
+                "short_help": "Modify an existing alias",
+            },
+        ),
+    },
+    "simplelogincmd.cli.commands.alias_commands.contact_commands": {
+        "create": (
+            "simplelogincmd.cli.commands.alias_commands.contact_commands.create",
+            {
+                "short_help": "Create a new contact",
+            },
+        ),
+        "list": (
+            "simplelogincmd.cli.commands.alias_commands.contact_commands.list",
+            {
+                "short_help": "List alias contacts",
+            },
+        ),
+    },
+    "simplelogincmd.cli.commands.config_commands": {},
+    "simplelogincmd.cli.commands.database_commands": {
+        "delete": (
+            "simplelogincmd.cli.commands.database_commands.delete",
+            {
+                "help": "Delete the db",
+            },
+        ),
+        "flush": (
+            "simplelogincmd.cli.commands.database_commands.flush",
+            {
+                "short_help": "Replay changes queued while offline",
+            },
+        ),
+        "sync": (
+            "simplelogincmd.cli.commands.database_commands.sync",
+            {
+                "short_help": "Synchronize the DB",
+            },
+        ),
+    },
+    "simplelogincmd.cli.commands.mailbox_commands": {
+        "create": (
+            "simplelogincmd.cli.commands.mailbox_commands.create",
+            {
+                "help": "Create a new mailbox",
+            },
+        ),
+        "delete": (
+            "simplelogincmd.cli.commands.mailbox_commands.delete",
+            {
+                "short_help": "Delete an existing mailbox",
+            },
+        ),
+        "list": (
+            "simplelogincmd.cli.commands.mailbox_commands.list",
+            {
+                "help": "Display all your mailboxes",
+            },
+        ),
+        "update": (
+            "simplelogincmd.cli.commands.mailbox_commands.update",
+            {
+                "short_help": "Update a mailbox's attributes",
+            },
+        ),
+    },
+    "simplelogincmd.cli.commands.report_commands": {
+        "activity": (
+            "simplelogincmd.cli.commands.report_commands.activity",
+            {
+                "short_help": "Count activities over time",
+            },
+        ),
+        "senders": (
+            "simplelogincmd.cli.commands.report_commands.senders",
+            {
+                "short_help": "Count activities by sender",
+            },
+        ),
+    },
+}
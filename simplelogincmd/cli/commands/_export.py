@@ -0,0 +1,55 @@
+import os
+import time
+
+import click
+import requests
+
+from simplelogincmd.cli.util import init
+
+
+def _summary(counts):
+    from simplelogincmd.archive import ACTIVITY, ALIAS, CONTACT, MAILBOX
+
+    return (
+        f"{counts[MAILBOX]} mailboxes, {counts[ALIAS]} aliases, "
+        f"{counts[CONTACT]} contacts and {counts[ACTIVITY]} activities"
+    )
+
+
+def _discard(partial):
+    if os.path.exists(partial):
+        os.remove(partial)
+
+
+def _export(file, compression, no_activities):
+    from simplelogincmd.archive import Exporter, compression_of, open_archive
+    from simplelogincmd.rest.exceptions import APIError
+
+    cfg = init.cfg()
+    sl = init.sl(cfg)
+    exporter = Exporter(
+        sl,
+        workers=cfg.get("sync.workers"),
+        rate=cfg.get("sync.requests-per-second"),
+        activities=not no_activities,
+    )
+    # The archive is written under another name until it is complete,
+    # so that an interrupted export never passes for a whole one.
+    partial = f"{file}.part"
+    started = time.monotonic()
+    try:
+        with open_archive(partial, "wb", compression or compression_of(file)) as out:
+            counts = exporter.run(out)
+    except ValueError as error:
+        _discard(partial)
+        raise click.ClickException(str(error))
+    except (KeyboardInterrupt, requests.RequestException, APIError) as error:
+        _discard(partial)
+        click.echo("Interrupted", err=True)
+        if not isinstance(error, KeyboardInterrupt):
+            click.echo(f"Network error: {error}", err=True)
+        return False
+    os.replace(partial, file)
+    elapsed = time.monotonic() - started
+    click.echo(f"Exported {_summary(counts)} in {elapsed:.1f}s.")
+    return True
@@ -0,0 +1,25 @@
+import time
+
+import click
+
+from simplelogincmd import completion
+from simplelogincmd.cli.commands._export import _summary
+from simplelogincmd.cli.util import init
+
+
+def _import_local(file):
+    from simplelogincmd.archive import load, open_archive
+
+    cfg = init.cfg()
+    db = init.db(cfg)
+    started = time.monotonic()
+    try:
+        with open_archive(file) as archive:
+            counts = load(db, archive)
+    except (ValueError, EOFError, OSError) as error:
+        raise click.ClickException(f"Cannot load {file}: {error}")
+    db.analyze()
+    completion.write_index(db.session)
+    elapsed = time.monotonic() - started
+    click.echo(f"Loaded {_summary(counts)} in {elapsed:.1f}s.")
+    return True
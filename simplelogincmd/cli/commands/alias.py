@@ -10,8 +10,11 @@ Subcommands:
 - custom
 - delete
 - get
+- import
 - list
 - random
+- spikes
+- stats
 - toggle
 - update
 """
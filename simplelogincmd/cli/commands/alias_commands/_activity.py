@@ -1,10 +1,35 @@
 import click
+from sqlalchemy import select
 
 from simplelogincmd.cli import const, util
 from simplelogincmd.database.models import Alias
 
 
-def _activity(id, include, exclude):
+def _follow(sl, cfg, alias_ids, fields):
+    import requests
+
+    from simplelogincmd.follow import Follower
+    from simplelogincmd.rest.client import RateLimiter
+    from simplelogincmd.rest.exceptions import APIError
+
+    if rate := cfg.get("sync.requests-per-second"):
+        sl.client.limiter = RateLimiter(rate)
+    count = len(alias_ids)
+    click.echo(
+        f"Following {count} alias{'es' if count != 1 else ''}. "
+        "Press Ctrl+C to stop.",
+        err=True,
+    )
+    try:
+        follower = Follower(sl, alias_ids, workers=cfg.get("sync.workers"))
+        util.output.stream_model_list(follower, fields)
+    except KeyboardInterrupt:
+        pass
+    except (requests.RequestException, APIError) as error:
+        click.echo(f"Network error: {error}", err=True)
+
+
+def _activity(id, include, exclude, first, follow=False):
     fields = util.output.get_display_fields_from_options(
         const.ACTIVITY_FIELD_ORDER, include, exclude
     )
@@ -13,7 +38,15 @@ def _activity(id, include, exclude):
     cfg = util.init.cfg()
     sl = util.init.sl(cfg)
     db = util.init.db(cfg)
-    id = util.input.resolve_id(db, Alias, id)
+    if id is None:
+        alias_ids = db.session.scalars(select(Alias.id).order_by(Alias.id)).all()
+        if len(alias_ids) == 0:
+            click.echo("No aliases found. Run `database sync` first.")
+            return
+        return _follow(sl, cfg, alias_ids, ["alias_id", *fields])
+    id = util.input.resolve_id(db, Alias, id, first=first)
+    if follow:
+        return _follow(sl, cfg, [id], fields)
     activities = sl.get_all_alias_activities(id)
     if len(activities) == 0:
         click.echo("No activities found")
@@ -1,9 +1,20 @@
+import functools
+
 import click
 
 from simplelogincmd.cli.util import init, input
+from simplelogincmd.database import alias_options
 from simplelogincmd.database.models import Mailbox
 
 
+def _fetch_options(sl, db, hostname):
+    success, data = sl.get_alias_options(hostname)
+    if success:
+        alias_options.put(db.session, hostname, data)
+        db.session.commit()
+    return success, data
+
+
 def _custom(
     hostname,
     prefix,
@@ -12,15 +23,21 @@ def _custom(
     name,
     select_suffix,
     bypass_confirmation,
+    first,
 ):
     cfg = init.cfg()
     sl = init.sl(cfg)
     db = init.db(cfg)
-    # Get suffix, recommendation, and other info before creating anything.
-    success, data = sl.get_alias_options(hostname)
-    if not success:
-        click.echo(data)
-        return False
+    # Get suffix, recommendation, and other info before creating anything,
+    # unless they were fetched lately.
+    max_age = cfg.get("cache.options-max-age")
+    data = alias_options.get(db.session, hostname, max_age)
+    cached = data is not None
+    if not cached:
+        success, data = _fetch_options(sl, db, hostname)
+        if not success:
+            click.echo(data)
+            return False
     if not data.get("can_create"):
         click.echo("You are unable to create custom aliases.")
         return False
@@ -35,7 +52,9 @@ def _custom(
         if not bypass_confirmation:
             click.confirm("Create a new alias anyway?", abort=True)
 
-    mailbox_ids = {input.resolve_id(db, Mailbox, mb_id) for mb_id in mailboxes}
+    mailbox_ids = {
+        input.resolve_id(db, Mailbox, mb_id, first=first) for mb_id in mailboxes
+    }
     if note == "_EDIT":
         note = input.edit()
 
@@ -72,17 +91,30 @@ def _custom(
         click.confirm(f"Create alias {prefix}{suffix}?", abort=True)
 
     # Finally, do the actual creation and display results.
-    success, obj = sl.create_custom_alias(
+    create = functools.partial(
+        sl.create_custom_alias,
         alias_prefix=prefix,
-        signed_suffix=signed_suffix,
         mailbox_ids=mailbox_ids,
         note=note,
         name=name,
         hostname=hostname,
     )
+    success, obj = create(signed_suffix=signed_suffix)
+    if not success and cached and alias_options.rejected(obj):
+        # The cached suffix may have expired since it was kept, so try
+        # once more with fresh options.
+        alias_options.drop(db.session, hostname)
+        db.session.commit()
+        refetched, data = _fetch_options(sl, db, hostname)
+        suffixes = (data.get("suffixes") or []) if refetched else []
+        signed = [s.get("signed_suffix") for s in suffixes if s.get("suffix") == suffix]
+        if signed:
+            success, obj = create(signed_suffix=signed[0])
     if not success:
         click.echo(obj)
         return False
+    # The new alias changes the recommendation for its hostname.
+    alias_options.drop(db.session, hostname)
     db.session.upsert(obj)
     db.session.commit()
     click.echo(obj.email)
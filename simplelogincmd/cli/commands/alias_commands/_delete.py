@@ -1,26 +1,35 @@
 import click
 
-from simplelogincmd.cli.util import init, input
+from simplelogincmd.cli.util import init, input, offline
 from simplelogincmd.database.models import Alias
+from simplelogincmd.journal import DELETE
 
 
-def _delete(id, bypass_confirmation):
+def _delete(id, bypass_confirmation, first):
     cfg = init.cfg()
     sl = init.sl(cfg)
     db = init.db(cfg)
-    id = input.resolve_id(db, Alias, id)
+    id = input.resolve_id(db, Alias, id, first=first)
     if not bypass_confirmation:
-        success, obj = sl.get_alias(id)
-        if not success:
-            # Clarify the somewhat vague error message for invalid ID
-            msg = f"Unknown ID {id}" if "Unknown" in obj else obj
-            click.echo(msg)
-            return False
+        # Confirm from the local copy if there is one, which also works
+        # offline.
+        if (obj := db.session.get(Alias, id)) is None:
+            success, obj = sl.get_alias(id)
+            if not success:
+                # Clarify the somewhat vague error message for invalid ID
+                msg = f"Unknown ID {id}" if "Unknown" in obj else obj
+                click.echo(msg)
+                return False
         click.confirm(f"Delete {obj.email}?", abort=True)
-    success, msg = sl.delete_alias(id)
+    outcome = offline.attempt(cfg, sl, db, DELETE, id, lambda: sl.delete_alias(id))
+    if outcome is None:
+        return True
+    success, msg = outcome
     if not success:
         # Clarify the somewhat vague error message
         msg = f"Unknown ID {id}" if msg == "Forbidden" else msg
         click.echo(msg)
         return False
+    db.session.remove(Alias, id)
+    db.session.commit()
     return True
@@ -1,23 +1,71 @@
+import sys
+import time
+
 import click
+from sqlalchemy import select
 
 from simplelogincmd.cli import const, util
 from simplelogincmd.database.models import Alias
+from simplelogincmd.sync import Synchronizer, fetched_since
+
+
+def _read_ids(ids):
+    """
+    Replace `-`, or no ids at all, with the ids on standard input
+    """
+    if ids and "-" not in ids:
+        return list(ids)
+    if sys.stdin.isatty():
+        raise click.UsageError("Give at least one alias ID, or pipe them in.")
+    lines = [line.strip() for line in click.get_text_stream("stdin")]
+    piped = [line for line in lines if line]
+    if not ids:
+        return piped
+    return [read for id in ids for read in (piped if id == "-" else [id])]
 
 
-def _get(id, include, exclude):
+def _fresh(db, alias_ids, max_age):
+    """
+    Load the local copies of aliases fetched less than `max_age` ago
+    """
+    if not max_age:
+        return {}
+    fresh = fetched_since(db.session, alias_ids, int(time.time()) - max_age)
+    aliases = db.session.scalars(select(Alias).where(Alias.id.in_(fresh)))
+    return {alias.id: alias for alias in aliases}
+
+
+def _get(ids, include, exclude, first):
     fields = util.output.get_display_fields_from_options(
         const.ALIAS_FIELD_ORDER, include, exclude
     )
     if len(fields) == 0:
         return
+    ids = _read_ids(ids)
     cfg = util.init.cfg()
     sl = util.init.sl(cfg)
     db = util.init.db(cfg)
-    id = util.input.resolve_id(db, Alias, id)
-    success, obj = sl.get_alias(id)
-    if not success:
-        click.echo(obj)
-        return None
-    db.session.upsert(obj)
-    db.session.commit()
-    util.output.display_model_list([obj], fields, pager_threshold=0)
+    resolved = util.input.resolve_ids(db, Alias, ids, first=first)
+    alias_ids = []
+    for id, alias_id in zip(ids, resolved):
+        # Numbers that are the id of no local alias, which resolve_ids
+        # returns as they are, are fetched as such.
+        if isinstance(alias_id, int) or str(alias_id).isdigit():
+            alias_ids.append(int(alias_id))
+        else:
+            click.echo(f"No alias matches '{id}'.")
+    alias_ids = list(dict.fromkeys(alias_ids))
+    aliases = _fresh(db, alias_ids, cfg.get("cache.max-age"))
+    synchronizer = Synchronizer(
+        sl,
+        db,
+        workers=cfg.get("sync.workers"),
+        rate=cfg.get("sync.requests-per-second"),
+    )
+    stale = [id for id in alias_ids if id not in aliases]
+    aliases.update(synchronizer.run_aliases(stale))
+    for id in alias_ids:
+        if isinstance(aliases[id], str):
+            click.echo(aliases[id])
+    found = [aliases[id] for id in alias_ids if not isinstance(aliases[id], str)]
+    util.output.display_model_list(found, fields, pager_threshold=0)
@@ -0,0 +1,80 @@
+import time
+from collections import Counter
+
+import click
+
+from simplelogincmd.cli import const, util
+from simplelogincmd.database.models import Mailbox
+
+
+def _format(file, format):
+    if format is not None:
+        return format
+    for name, suffixes in const.ALIAS_IMPORT_FORMATS.items():
+        if file.name.lower().endswith(suffixes):
+            return name
+    raise click.UsageError("Give the format of `FILE` with `--format`.")
+
+
+def _resolve_mailboxes(db, rows, mailboxes, first):
+    """
+    Replace the mailbox identifiers of custom rows with ids
+    """
+    from simplelogincmd.bulk import CUSTOM, Row
+
+    resolved = {}
+    for row in rows:
+        if not isinstance(row, Row) or row.kind != CUSTOM:
+            yield row
+            continue
+        identifiers = row.mailboxes or mailboxes
+        for identifier in identifiers:
+            if identifier not in resolved:
+                id = util.input.resolve_id(db, Mailbox, identifier, first=first)
+                resolved[identifier] = str(id)
+        yield row._replace(mailboxes=tuple(resolved[id] for id in identifiers))
+
+
+def _import(file, format, mailboxes, include, exclude, first):
+    import requests
+
+    from simplelogincmd.bulk import CREATED, EXISTS, FAILED, Importer, read_rows
+    from simplelogincmd.rest.exceptions import APIError
+
+    fields = util.output.get_display_fields_from_options(
+        const.ALIAS_IMPORT_FIELD_ORDER, include, exclude
+    )
+    if len(fields) == 0:
+        return
+    format = _format(file, format)
+    cfg = util.init.cfg()
+    sl = util.init.sl(cfg)
+    db = util.init.db(cfg)
+    importer = Importer(
+        sl,
+        db,
+        workers=cfg.get("sync.workers"),
+        rate=cfg.get("sync.requests-per-second"),
+        options_max_age=cfg.get("cache.options-max-age"),
+    )
+    rows = _resolve_mailboxes(db, read_rows(file, format), mailboxes, first)
+    statuses = Counter()
+
+    def results():
+        for result in importer.run(rows):
+            statuses[result.status] += 1
+            yield result
+
+    started = time.monotonic()
+    try:
+        util.output.stream_model_list(results(), fields)
+    except KeyboardInterrupt:
+        pass
+    except (requests.RequestException, APIError) as error:
+        click.echo(f"Network error: {error}", err=True)
+    elapsed = time.monotonic() - started
+    click.echo(
+        f"Created {statuses[CREATED]}, skipped {statuses[EXISTS]} and "
+        f"failed {statuses[FAILED]} in {elapsed:.1f}s.",
+        err=True,
+    )
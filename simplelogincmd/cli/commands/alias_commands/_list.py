@@ -1,15 +1,63 @@
 import click
+from sqlalchemy import select
 
+from simplelogincmd import completion
 from simplelogincmd.cli import const
 from simplelogincmd.cli.util import init, output
+from simplelogincmd.database import expression
+from simplelogincmd.database.models import Alias
 
 
-def _list(include, exclude, query):
+# The conditions on local aliases equivalent to SimpleLogin's filters,
+# written as `--where` compiles them, so that they use the same indexes.
+_LOCAL_FILTERS = dict(
+    pinned=Alias.pinned.is_(True),
+    enabled=Alias.enabled.is_(True),
+    disabled=Alias.enabled.is_not(True),
+)
+
+
+def _compile(query, where, sort, limit):
+    """
+    Compile the selection of local aliases the options describe
+    """
+    statement = select(Alias)
+    if query is not None:
+        statement = statement.where(_LOCAL_FILTERS[query])
+    try:
+        if where is not None:
+            statement = statement.where(expression.compile_where(Alias, where))
+    except ValueError as error:
+        raise click.BadParameter(str(error), param_hint="'--where'") from None
+    try:
+        if sort is not None:
+            statement = statement.order_by(*expression.compile_sort(Alias, sort))
+    except ValueError as error:
+        raise click.BadParameter(str(error), param_hint="'--sort'") from None
+    # Ties, and aliases when no order is given, go by id.
+    return statement.order_by(Alias.id).limit(limit)
+
+
+def _list_local(fields, statement):
+    cfg = init.cfg()
+    db = init.db(cfg)
+    aliases = db.session.scalars(statement).all()
+    if len(aliases) == 0:
+        click.echo("No aliases found.")
+        return
+    pager_threshold = cfg.get("display.pager-threshold")
+    output.display_model_list(aliases, fields, pager_threshold)
+
+
+def _list(include, exclude, query, where=None, sort=None, limit=None):
     fields = output.get_display_fields_from_options(
         const.ALIAS_FIELD_ORDER, include, exclude
     )
     if len(fields) == 0:
         return
+    if where is not None or sort is not None or limit is not None:
+        statement = _compile(query, where, sort, limit)
+        return _list_local(fields, statement)
     cfg = init.cfg()
     sl = init.sl(cfg)
     db = init.db(cfg)
@@ -17,8 +65,8 @@ def _list(include, exclude, query):
     if len(aliases) == 0:
         click.echo("No aliases found.")
         return
-    for alias in aliases:
-        db.session.upsert(alias)
+    db.session.upsert_records(aliases)
     db.session.commit()
+    completion.write_index(db.session)
     pager_threshold = cfg.get("display.pager-threshold")
     output.display_model_list(aliases, fields, pager_threshold)
@@ -0,0 +1,19 @@
+import time
+
+import click
+
+from simplelogincmd.cli import const
+from simplelogincmd.cli.util import init, output
+from simplelogincmd.database import rates
+
+
+def _spikes(window, factor, min_delta):
+    cfg = init.cfg()
+    db = init.db(cfg)
+    since = int(time.time()) - window
+    spikes = rates.spikes(db.session, since, factor, min_delta)
+    if len(spikes) == 0:
+        click.echo("No spikes found in this window.")
+        return
+    pager_threshold = cfg.get("display.pager-threshold")
+    output.display_model_list(spikes, const.ALIAS_SPIKES_FIELD_ORDER, pager_threshold)
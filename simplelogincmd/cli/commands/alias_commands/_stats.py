@@ -0,0 +1,17 @@
+import click
+
+from simplelogincmd.cli import const
+from simplelogincmd.cli.util import init, output
+from simplelogincmd.database import counters
+
+
+def _stats(window, by, top):
+    cfg = init.cfg()
+    db = init.db(cfg)
+    counter = const.ALIAS_STATS_COUNTERS[by]
+    movements = counters.movers(db.session, window, counter, top)
+    if len(movements) == 0:
+        click.echo("No changes recorded in this window.")
+        return
+    pager_threshold = cfg.get("display.pager-threshold")
+    output.display_model_list(movements, const.ALIAS_STATS_FIELD_ORDER, pager_threshold)
@@ -1,17 +1,23 @@
 import click
 
-from simplelogincmd.cli.util import init, input
+from simplelogincmd.cli.util import init, input, offline
 from simplelogincmd.database.models import Alias
+from simplelogincmd.journal import TOGGLE
 
 
-def _toggle(id):
+def _toggle(id, first):
     cfg = init.cfg()
     sl = init.sl(cfg)
     db = init.db(cfg)
-    id = input.resolve_id(db, Alias, id)
-    success, result = sl.toggle_alias(id)
+    id = input.resolve_id(db, Alias, id, first=first)
+    outcome = offline.attempt(cfg, sl, db, TOGGLE, id, lambda: sl.toggle_alias(id))
+    if outcome is None:
+        return True
+    success, result = outcome
     if not success:
         click.echo(result)
         return False
+    db.session.apply(Alias, id, enabled=result)
+    db.session.commit()
     click.echo("Enabled" if result else "Disabled")
     return True
@@ -1,29 +1,54 @@
 import click
 
-from simplelogincmd.cli.util import init, input
+from simplelogincmd.cli.util import init, input, offline
 from simplelogincmd.database.models import (
     Alias,
     Mailbox,
 )
+from simplelogincmd.journal import UPDATE
 
 
-def _update(id, note, name, mailboxes, disable_pgp, pinned):
+def _update(id, note, name, mailboxes, disable_pgp, pinned, first):
     cfg = init.cfg()
     sl = init.sl(cfg)
     db = init.db(cfg)
-    id = input.resolve_id(db, Alias, id)
-    mailbox_ids = {input.resolve_id(db, Mailbox, mb_id) for mb_id in mailboxes}
+    id = input.resolve_id(db, Alias, id, first=first)
+    mailbox_ids = set()
+    for mb_id in mailboxes:
+        mailbox_id = input.resolve_id(db, Mailbox, mb_id, first=first)
+        if not str(mailbox_id).isdigit():
+            raise click.BadParameter(
+                f"No mailbox matches '{mb_id}'", param_hint="'-m' / '--mailbox'"
+            )
+        mailbox_ids.add(int(mailbox_id))
     if note == "_EDIT":
         note = input.edit()
-    success, msg = sl.update_alias(
-        alias_id=id,
+    changes = dict(
         note=note,
         name=name,
-        mailbox_ids=mailbox_ids,
+        mailbox_ids=sorted(mailbox_ids),
         disable_pgp=disable_pgp,
         pinned=pinned,
     )
+    changes = {key: value for key, value in changes.items() if value is not None}
+    outcome = offline.attempt(
+        cfg,
+        sl,
+        db,
+        UPDATE,
+        id,
+        lambda: sl.update_alias(alias_id=id, **changes),
+        changes,
+    )
+    if outcome is None:
+        return True
+    success, msg = outcome
     if not success:
         click.echo(msg)
         return False
+    # Mailboxes are not stored with aliases, so only the other changes
+    # apply locally.
+    del changes["mailbox_ids"]
+    db.session.apply(Alias, id, **changes)
+    db.session.commit()
     return True
@@ -1,6 +1,6 @@
 import click
 
-from simplelogincmd.cli import const
+from simplelogincmd.cli import complete, const
 
 
 @click.command(
@@ -11,6 +11,8 @@ from simplelogincmd.cli import const
 )
 @click.argument(
     "id",
+    required=False,
+    shell_complete=complete.alias,
 )
 @click.option(
     "-i",
@@ -22,8 +24,35 @@ from simplelogincmd.cli import const
     "--exclude",
     help=const.HELP.ALIAS.ACTIVITY.OPTION.EXCLUDE,
 )
-def activity(id: str, include: str | None, exclude: str | None) -> None:
+@click.option(
+    "--first",
+    is_flag=True,
+    help=const.HELP.ALIAS.ACTIVITY.OPTION.FIRST,
+)
+@click.option(
+    "-f",
+    "--follow",
+    is_flag=True,
+    help=const.HELP.ALIAS.ACTIVITY.OPTION.FOLLOW,
+)
+@click.option(
+    "-a",
+    "--all",
+    "all_",
+    is_flag=True,
+    help=const.HELP.ALIAS.ACTIVITY.OPTION.ALL,
+)
+def activity(
+    id: str | None,
+    include: str | None,
+    exclude: str | None,
+    first: bool,
+    follow: bool,
+    all_: bool,
+) -> None:
     """Display alias activities in a tabular format"""
+    if (id is None) != all_:
+        raise click.UsageError("Give an alias ID or `--all`, but not both.")
     from simplelogincmd.cli.commands.alias_commands._activity import _activity
 
-    return _activity(id, include, exclude)
+    return _activity(id, include, exclude, first, follow or all_)
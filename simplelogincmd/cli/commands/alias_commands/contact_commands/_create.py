@@ -4,11 +4,11 @@ from simplelogincmd.cli.util import init, input
 from simplelogincmd.database.models import Alias
 
 
-def _create(id, email):
+def _create(id, email, first):
     cfg = init.cfg()
     sl = init.sl(cfg)
     db = init.db(cfg)
-    id = input.resolve_id(db, Alias, id)
+    id = input.resolve_id(db, Alias, id, first=first)
     success, obj = sl.create_contact(id, email)
     if not success:
         click.echo(obj)
@@ -4,7 +4,7 @@ from simplelogincmd.cli import const, util
 from simplelogincmd.database.models import Alias
 
 
-def _list(id, include, exclude):
+def _list(id, include, exclude, first):
     fields = util.output.get_display_fields_from_options(
         const.CONTACT_FIELD_ORDER, include, exclude
     )
@@ -13,13 +13,12 @@ def _list(id, include, exclude):
     cfg = util.init.cfg()
     sl = util.init.sl(cfg)
     db = util.init.db(cfg)
-    id = util.input.resolve_id(db, Alias, id)
+    id = util.input.resolve_id(db, Alias, id, first=first)
     contacts = sl.get_all_alias_contacts(id)
     if len(contacts) == 0:
         click.echo("No contacts found")
         return
-    for contact in contacts:
-        db.session.upsert(contact)
+    db.session.upsert_records(contacts)
     db.session.commit()
     pager_threshold = cfg.get("display.pager-threshold")
     util.output.display_model_list(contacts, fields, pager_threshold)
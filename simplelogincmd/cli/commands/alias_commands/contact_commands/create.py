@@ -1,6 +1,6 @@
 import click
 
-from simplelogincmd.cli import const
+from simplelogincmd.cli import complete, const
 
 
 @click.command(
@@ -10,16 +10,22 @@ from simplelogincmd.cli import const
 )
 @click.argument(
     "id",
+    shell_complete=complete.alias,
 )
 @click.option(
     "-e",
     "--email",
     help=const.HELP.ALIAS.CONTACT.CREATE.OPTION.EMAIL,
 )
-def create(id: str, email: str) -> bool:
+@click.option(
+    "--first",
+    is_flag=True,
+    help=const.HELP.ALIAS.CONTACT.CREATE.OPTION.FIRST,
+)
+def create(id: str, email: str, first: bool) -> bool:
     """Create a new contact"""
     from simplelogincmd.cli.commands.alias_commands.contact_commands._create import (
         _create,
     )
 
-    return _create(id, email)
+    return _create(id, email, first)
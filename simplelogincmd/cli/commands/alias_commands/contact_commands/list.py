@@ -1,6 +1,6 @@
 import click
 
-from simplelogincmd.cli import const
+from simplelogincmd.cli import complete, const
 
 
 @click.command(
@@ -11,6 +11,7 @@ from simplelogincmd.cli import const
 )
 @click.argument(
     "id",
+    shell_complete=complete.alias,
 )
 @click.option(
     "-i",
@@ -22,8 +23,13 @@ from simplelogincmd.cli import const
     "--exclude",
     help=const.HELP.ALIAS.CONTACT.LIST.OPTION.EXCLUDE,
 )
-def list(id: str, include: str | None, exclude: str | None) -> None:
+@click.option(
+    "--first",
+    is_flag=True,
+    help=const.HELP.ALIAS.CONTACT.LIST.OPTION.FIRST,
+)
+def list(id: str, include: str | None, exclude: str | None, first: bool) -> None:
     """List contacts in a tabular format"""
     from simplelogincmd.cli.commands.alias_commands.contact_commands._list import _list
 
-    return _list(id, include, exclude)
+    return _list(id, include, exclude, first)
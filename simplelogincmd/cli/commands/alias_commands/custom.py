@@ -1,6 +1,6 @@
 import click
 
-from simplelogincmd.cli import const
+from simplelogincmd.cli import complete, const
 
 
 @click.command(
@@ -24,6 +24,7 @@ from simplelogincmd.cli import const
     "mailboxes",
     required=True,
     multiple=True,
+    shell_complete=complete.mailbox,
     help=const.HELP.ALIAS.CUSTOM.OPTION.MAILBOXES,
 )
 @click.option(
@@ -53,6 +54,11 @@ from simplelogincmd.cli import const
     default=False,
     help=const.HELP.ALIAS.CUSTOM.OPTION.YES,
 )
+@click.option(
+    "--first",
+    is_flag=True,
+    help=const.HELP.ALIAS.CUSTOM.OPTION.FIRST,
+)
 def custom(
     hostname: str | None,
     prefix: str,
@@ -61,6 +67,7 @@ def custom(
     name: str | None,
     select_suffix: int | None,
     bypass_confirmation: bool,
+    first: bool,
 ) -> bool:
     """Create a new custom alias"""
     from simplelogincmd.cli.commands.alias_commands._custom import _custom
@@ -73,4 +80,5 @@ def custom(
         name,
         select_suffix,
         bypass_confirmation,
+        first,
     )
@@ -1,6 +1,6 @@
 import click
 
-from simplelogincmd.cli import const
+from simplelogincmd.cli import complete, const
 
 
 @click.command(
@@ -10,6 +10,7 @@ from simplelogincmd.cli import const
 )
 @click.argument(
     "id",
+    shell_complete=complete.alias,
 )
 @click.option(
     "-y",
@@ -20,8 +21,13 @@ from simplelogincmd.cli import const
     default=False,
     help=const.HELP.ALIAS.DELETE.OPTION.YES,
 )
-def delete(id: str, bypass_confirmation: bool) -> bool:
+@click.option(
+    "--first",
+    is_flag=True,
+    help=const.HELP.ALIAS.DELETE.OPTION.FIRST,
+)
+def delete(id: str, bypass_confirmation: bool, first: bool) -> bool:
     """Delete an alias"""
     from simplelogincmd.cli.commands.alias_commands._delete import _delete
 
-    return _delete(id, bypass_confirmation)
+    return _delete(id, bypass_confirmation, first)
@@ -1,15 +1,19 @@
 import click
 
-from simplelogincmd.cli import const
+from simplelogincmd.cli import complete, const
 
 
 @click.command(
     "get",
     short_help=const.HELP.ALIAS.GET.SHORT,
     help=const.HELP.ALIAS.GET.LONG,
+    epilog=const.HELP.ALIAS.GET.EPILOG,
 )
 @click.argument(
-    "id",
+    "ids",
+    metavar="[ID]...",
+    nargs=-1,
+    shell_complete=complete.alias,
 )
 @click.option(
     "-i",
@@ -21,8 +25,15 @@ from simplelogincmd.cli import const
     "--exclude",
     help=const.HELP.ALIAS.GET.OPTION.EXCLUDE,
 )
-def get(id: str, include: str | None, exclude: str | None) -> None:
-    """Display a single alias in a tabular format"""
+@click.option(
+    "--first",
+    is_flag=True,
+    help=const.HELP.ALIAS.GET.OPTION.FIRST,
+)
+def get(
+    ids: tuple[str, ...], include: str | None, exclude: str | None, first: bool
+) -> None:
+    """Display aliases in a tabular format"""
     from simplelogincmd.cli.commands.alias_commands._get import _get
 
-    return _get(id, include, exclude)
+    return _get(ids, include, exclude, first)
@@ -0,0 +1,53 @@
+import click
+
+from simplelogincmd.cli import complete, const
+
+
+@click.command(
+    "import",
+    short_help=const.HELP.ALIAS.IMPORT.SHORT,
+    help=const.HELP.ALIAS.IMPORT.LONG,
+    epilog=const.HELP.ALIAS.IMPORT.EPILOG,
+)
+@click.argument("file", type=click.File(encoding="utf-8"))
+@click.option(
+    "-F",
+    "--format",
+    type=click.Choice(tuple(const.ALIAS_IMPORT_FORMATS)),
+    help=const.HELP.ALIAS.IMPORT.OPTION.FORMAT,
+)
+@click.option(
+    "-m",
+    "--mailbox",
+    "mailboxes",
+    multiple=True,
+    shell_complete=complete.mailbox,
+    help=const.HELP.ALIAS.IMPORT.OPTION.MAILBOXES,
+)
+@click.option(
+    "-i",
+    "--include",
+    help=const.HELP.ALIAS.IMPORT.OPTION.INCLUDE,
+)
+@click.option(
+    "-e",
+    "--exclude",
+    help=const.HELP.ALIAS.IMPORT.OPTION.EXCLUDE,
+)
+@click.option(
+    "--first",
+    is_flag=True,
+    help=const.HELP.ALIAS.IMPORT.OPTION.FIRST,
+)
+def import_(
+    file,
+    format: str | None,
+    mailboxes: tuple[str, ...],
+    include: str | None,
+    exclude: str | None,
+    first: bool,
+) -> None:
+    """Create aliases from the rows of a file"""
+    from simplelogincmd.cli.commands.alias_commands._import import _import
+
+    return _import(file, format, mailboxes, include, exclude, first)
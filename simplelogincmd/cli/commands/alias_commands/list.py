@@ -40,8 +40,31 @@ from simplelogincmd.cli import const
     flag_value="disabled",
     help=const.HELP.ALIAS.LIST.OPTION.DISABLED,
 )
-def list(include: str | None, exclude: str | None, query: str | None) -> None:
+@click.option(
+    "-w",
+    "--where",
+    help=const.HELP.ALIAS.LIST.OPTION.WHERE,
+)
+@click.option(
+    "-s",
+    "--sort",
+    help=const.HELP.ALIAS.LIST.OPTION.SORT,
+)
+@click.option(
+    "-l",
+    "--limit",
+    type=click.IntRange(min=1),
+    help=const.HELP.ALIAS.LIST.OPTION.LIMIT,
+)
+def list(
+    include: str | None,
+    exclude: str | None,
+    query: str | None,
+    where: str | None,
+    sort: str | None,
+    limit: int | None,
+) -> None:
     """Display aliases in a tabular format"""
     from simplelogincmd.cli.commands.alias_commands._list import _list
 
-    return _list(include, exclude, query)
+    return _list(include, exclude, query, where, sort, limit)
@@ -0,0 +1,40 @@
+import click
+
+from simplelogincmd.cli import const
+from simplelogincmd.cli.util.input import Duration
+
+
+@click.command(
+    "spikes",
+    short_help=const.HELP.ALIAS.SPIKES.SHORT,
+    help=const.HELP.ALIAS.SPIKES.LONG,
+)
+@click.option(
+    "-w",
+    "--window",
+    type=Duration(),
+    default="7d",
+    show_default=True,
+    help=const.HELP.ALIAS.SPIKES.OPTION.WINDOW,
+)
+@click.option(
+    "-f",
+    "--factor",
+    type=click.FloatRange(min=1),
+    default=5.0,
+    show_default=True,
+    help=const.HELP.ALIAS.SPIKES.OPTION.FACTOR,
+)
+@click.option(
+    "-m",
+    "--min-delta",
+    type=click.IntRange(min=1),
+    default=10,
+    show_default=True,
+    help=const.HELP.ALIAS.SPIKES.OPTION.MIN_DELTA,
+)
+def spikes(window: int, factor: float, min_delta: int) -> None:
+    """Display the aliases whose rate of email spiked"""
+    from simplelogincmd.cli.commands.alias_commands._spikes import _spikes
+
+    return _spikes(window, factor, min_delta)
@@ -0,0 +1,40 @@
+import click
+
+from simplelogincmd.cli import const
+from simplelogincmd.cli.util.input import Duration
+
+
+@click.command(
+    "stats",
+    short_help=const.HELP.ALIAS.STATS.SHORT,
+    help=const.HELP.ALIAS.STATS.LONG,
+)
+@click.option(
+    "-w",
+    "--window",
+    type=Duration(),
+    default="7d",
+    show_default=True,
+    help=const.HELP.ALIAS.STATS.OPTION.WINDOW,
+)
+@click.option(
+    "-b",
+    "--by",
+    type=click.Choice(list(const.ALIAS_STATS_COUNTERS)),
+    default="block",
+    show_default=True,
+    help=const.HELP.ALIAS.STATS.OPTION.BY,
+)
+@click.option(
+    "-n",
+    "--top",
+    type=click.IntRange(min=1),
+    default=10,
+    show_default=True,
+    help=const.HELP.ALIAS.STATS.OPTION.TOP,
+)
+def stats(window: int, by: str, top: int) -> None:
+    """Display the aliases whose counters changed most"""
+    from simplelogincmd.cli.commands.alias_commands._stats import _stats
+
+    return _stats(window, by, top)
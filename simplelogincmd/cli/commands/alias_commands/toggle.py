@@ -1,6 +1,6 @@
 import click
 
-from simplelogincmd.cli import const
+from simplelogincmd.cli import complete, const
 
 
 @click.command(
@@ -10,9 +10,15 @@ from simplelogincmd.cli import const
 )
 @click.argument(
     "id",
+    shell_complete=complete.alias,
 )
-def toggle(id: str) -> bool:
+@click.option(
+    "--first",
+    is_flag=True,
+    help=const.HELP.ALIAS.TOGGLE.OPTION.FIRST,
+)
+def toggle(id: str, first: bool) -> bool:
     """Enable or disable an alias"""
     from simplelogincmd.cli.commands.alias_commands._toggle import _toggle
 
-    return _toggle(id)
+    return _toggle(id, first)
@@ -1,6 +1,6 @@
 import click
 
-from simplelogincmd.cli import const
+from simplelogincmd.cli import complete, const
 
 
 @click.command(
@@ -10,6 +10,7 @@ from simplelogincmd.cli import const
 )
 @click.argument(
     "id",
+    shell_complete=complete.alias,
 )
 @click.option(
     "-n",
@@ -29,6 +30,7 @@ from simplelogincmd.cli import const
     "mailboxes",
     required=True,
     multiple=True,
+    shell_complete=complete.mailbox,
     help=const.HELP.ALIAS.UPDATE.OPTION.MAILBOXES,
 )
 @click.option(
@@ -43,6 +45,11 @@ from simplelogincmd.cli import const
     default=None,
     help=const.HELP.ALIAS.UPDATE.OPTION.PINNED,
 )
+@click.option(
+    "--first",
+    is_flag=True,
+    help=const.HELP.ALIAS.UPDATE.OPTION.FIRST,
+)
 def update(
     id: str,
     note: str | None,
@@ -50,8 +57,9 @@ def update(
     mailboxes: tuple[str],
     disable_pgp: bool | None,
     pinned: bool | None,
+    first: bool,
 ) -> bool:
     """Modify an alias's fields"""
     from simplelogincmd.cli.commands.alias_commands._update import _update
 
-    return _update(id, note, name, mailboxes, disable_pgp, pinned)
+    return _update(id, note, name, mailboxes, disable_pgp, pinned, first)
@@ -3,6 +3,8 @@ CLI commands for managing the local database
 
 Subcommands:
 
+    - delete
+    - flush
     - sync
 """
 
@@ -1,12 +1,19 @@
 import click
 
+from simplelogincmd import const
 from simplelogincmd.cli.util import init
 
 
-def _delete():
+def _delete(force):
     cfg = init.cfg()
     db = init.db(cfg)
+    if (pending := db.pending()) and not force:
+        raise click.ClickException(
+            f"{pending} change(s) queued while offline would be lost. Run "
+            "`database flush` to replay them first, or delete with `--force`."
+        )
     if not db.destroy():
         click.echo("Failed to delete database.")
         return False
+    const.FILE_COMPLETION.unlink(missing_ok=True)
     return True
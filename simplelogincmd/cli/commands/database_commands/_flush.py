@@ -0,0 +1,26 @@
+import click
+import requests
+
+from simplelogincmd.cli.util import init, offline
+from simplelogincmd.rest.exceptions import APIError
+
+
+def _flush():
+    cfg = init.cfg()
+    sl = init.sl(cfg)
+    db = init.db(cfg)
+    try:
+        counts = offline.replay(cfg, sl, db)
+    except (requests.RequestException, APIError) as error:
+        remaining = offline.journal(cfg, sl, db).pending()
+        click.echo(f"Network error: {error}")
+        click.echo(f"{remaining} change(s) remain queued.")
+        return False
+    if counts is None:
+        click.echo("No queued changes")
+        return True
+    click.echo(
+        f"{counts['applied']} applied, {counts['conflict']} conflicting, "
+        f"{counts['failed']} failed"
+    )
+    return True
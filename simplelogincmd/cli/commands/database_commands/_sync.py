@@ -1,27 +1,111 @@
+import time
+
 import click
+import requests
+from sqlalchemy import select
+
+from simplelogincmd import completion
+from simplelogincmd.cli.util import init, offline
+from simplelogincmd.database import rates
+from simplelogincmd.database.models import Alias
+from simplelogincmd.rest.exceptions import APIError
+from simplelogincmd.sync import Synchronizer
+
+
+_CHANGE_MARKS = dict(added="+", updated="~", removed="-")
+
+_TABLES = (
+    ("mailbox", "Mailboxes"),
+    ("alias", "Aliases"),
+    ("contact", "Contacts"),
+    ("activity", "Activities"),
+)
+
+
+def _echo_change(table, kind, name):
+    click.echo(f"{_CHANGE_MARKS[kind]} {table} {name}")
+
+
+def _echo_interrupted(error, deep_started):
+    click.echo("Interrupted")
+    if isinstance(error, (requests.RequestException, APIError)):
+        click.echo(f"Network error: {error}")
+    if deep_started:
+        click.echo("Contacts and activities written so far have been kept.")
+    else:
+        click.echo("Run `database sync --resume` to continue the sync.")
+
+
+def _echo_spikes(db, since):
+    spiked = sorted({spike.id for spike in rates.spikes(db.session, since)})
+    if spiked:
+        ids = ", ".join(str(id) for id in spiked)
+        click.echo(
+            f"Spikes in forwarded or blocked email: aliases {ids}. "
+            "See `alias spikes` for details."
+        )
+
+
+def _run_deep(synchronizer, db, activities):
+    alias_ids = db.session.scalars(select(Alias.id)).all()
+    start = time.perf_counter()
+    label = "Syncing contacts and activities" if activities else "Syncing contacts"
+    with click.progressbar(
+        length=len(alias_ids),
+        label=label,
+        show_eta=True,
+        show_pos=True,
+        item_show_func=lambda rate: rate,
+    ) as bar:
+
+        def on_progress(count):
+            rate = bar.pos / max(time.perf_counter() - start, 1e-9)
+            bar.update(count, current_item=f"{rate:,.1f} aliases/s")
 
-from simplelogincmd.cli.util import init
+        return synchronizer.run_deep(alias_ids, activities, on_progress)
 
 
-def _sync():
+def _sync(resume, verbose, deep, activities):
     cfg = init.cfg()
     sl = init.sl(cfg)
     db = init.db(cfg)
-    objects = []
-    click.echo("Retrieving mailboxes... ", nl=False)
-    mailboxes = sl.get_mailboxes()
-    objects.extend(mailboxes)
-    click.echo("Done")
-    click.echo("Retrieving aliases... ", nl=False)
-    aliases = sl.get_all_aliases()
-    objects.extend(aliases)
-    click.echo("Done")
-    click.echo("Refreshing local database... ", nl=False)
-    db.clear()
-    for obj in objects:
-        db.session.upsert(obj)
-    db.session.commit()
-    click.echo("Done")
+    on_change = _echo_change if verbose else None
+    synchronizer = Synchronizer(
+        sl,
+        db,
+        on_change=on_change,
+        workers=cfg.get("sync.workers"),
+        rate=cfg.get("sync.requests-per-second"),
+    )
+    deep_started = False
+    started = int(time.time())
+    try:
+        # Queued changes go first, or the sync would undo them locally.
+        offline.replay(cfg, sl, db)
+        click.echo("Syncing mailboxes and aliases... ", nl=verbose)
+        counts = synchronizer.run(resume=resume)
+        click.echo("Done")
+        if deep:
+            deep_started = True
+            counts.update(_run_deep(synchronizer, db, activities))
+    except (KeyboardInterrupt, requests.RequestException, APIError) as error:
+        db.session.rollback()
+        _echo_interrupted(error, deep_started)
+        return False
+    db.analyze()
+    completion.write_index(db.session)
+    if synchronizer.resumed:
+        click.echo("Resumed the previous sync.")
     click.echo("")
     click.echo("Local database synced successfully.")
+    # Contacts are shown after a deep sync, and activities if synced.
+    shown = 2 + deep + activities
+    for table, plural in _TABLES[:shown]:
+        changes = counts.get(table, {})
+        click.echo(
+            f"{plural}: {changes.get('added', 0)} added, "
+            f"{changes.get('updated', 0)} updated, "
+            f"{changes.get('removed', 0)} removed"
+        )
+    _echo_spikes(db, started)
     return True
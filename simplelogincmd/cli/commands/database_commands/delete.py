@@ -8,8 +8,14 @@ from simplelogincmd.cli import const
     short_help=const.HELP.DATABASE.DELETE.SHORT,
     help=const.HELP.DATABASE.DELETE.LONG,
 )
-def delete() -> bool:
+@click.option(
+    "-f",
+    "--force",
+    is_flag=True,
+    help=const.HELP.DATABASE.DELETE.OPTION.FORCE,
+)
+def delete(force: bool) -> bool:
     """Delete the database"""
     from simplelogincmd.cli.commands.database_commands._delete import _delete
 
-    return _delete()
+    return _delete(force)
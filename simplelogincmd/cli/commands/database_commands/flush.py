@@ -0,0 +1,16 @@
+import click
+
+from simplelogincmd.cli import const
+
+
+@click.command(
+    "flush",
+    short_help=const.HELP.DATABASE.FLUSH.SHORT,
+    help=const.HELP.DATABASE.FLUSH.LONG,
+    epilog=const.HELP.DATABASE.FLUSH.EPILOG,
+)
+def flush() -> bool:
+    """Replay queued offline changes"""
+    from simplelogincmd.cli.commands.database_commands._flush import _flush
+
+    return _flush()
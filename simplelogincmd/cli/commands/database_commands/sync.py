@@ -9,8 +9,32 @@ from simplelogincmd.cli import const
     help=const.HELP.DATABASE.SYNC.LONG,
     epilog=const.HELP.DATABASE.SYNC.EPILOG,
 )
-def sync() -> bool:
+@click.option(
+    "-r",
+    "--resume",
+    is_flag=True,
+    help=const.HELP.DATABASE.SYNC.OPTION.RESUME,
+)
+@click.option(
+    "-v",
+    "--verbose",
+    is_flag=True,
+    help=const.HELP.DATABASE.SYNC.OPTION.VERBOSE,
+)
+@click.option(
+    "-d",
+    "--deep",
+    is_flag=True,
+    help=const.HELP.DATABASE.SYNC.OPTION.DEEP,
+)
+@click.option(
+    "-a",
+    "--activities",
+    is_flag=True,
+    help=const.HELP.DATABASE.SYNC.OPTION.ACTIVITIES,
+)
+def sync(resume: bool, verbose: bool, deep: bool, activities: bool) -> bool:
     """Populate the local db with SL's data"""
     from simplelogincmd.cli.commands.database_commands._sync import _sync
 
-    return _sync()
+    return _sync(resume, verbose, deep or activities, activities)
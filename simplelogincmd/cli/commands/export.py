@@ -0,0 +1,28 @@
+import click
+
+from simplelogincmd.cli import const
+
+
+@click.command(
+    "export",
+    short_help=const.HELP.EXPORT.SHORT,
+    help=const.HELP.EXPORT.LONG,
+    epilog=const.HELP.EXPORT.EPILOG,
+)
+@click.argument("file", type=click.Path(dir_okay=False, writable=True))
+@click.option(
+    "-c",
+    "--compression",
+    type=click.Choice(("gzip", "zstd")),
+    help=const.HELP.EXPORT.OPTION.COMPRESSION,
+)
+@click.option(
+    "--no-activities",
+    is_flag=True,
+    help=const.HELP.EXPORT.OPTION.NO_ACTIVITIES,
+)
+def export(file: str, compression: str | None, no_activities: bool) -> None:
+    """Write the account to a compressed archive"""
+    from simplelogincmd.cli.commands._export import _export
+
+    return _export(file, compression, no_activities)
@@ -0,0 +1,17 @@
+import click
+
+from simplelogincmd.cli import const
+
+
+@click.command(
+    "import-local",
+    short_help=const.HELP.IMPORT_LOCAL.SHORT,
+    help=const.HELP.IMPORT_LOCAL.LONG,
+    epilog=const.HELP.IMPORT_LOCAL.EPILOG,
+)
+@click.argument("file", type=click.Path(exists=True, dir_okay=False))
+def import_local(file: str) -> None:
+    """Load an archive into the local database"""
+    from simplelogincmd.cli.commands._import_local import _import_local
+
+    return _import_local(file)
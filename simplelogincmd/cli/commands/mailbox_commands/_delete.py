@@ -1,20 +1,60 @@
 import click
+import requests
 
 from simplelogincmd.cli.util import init, input
-from simplelogincmd.database.models import Mailbox
+from simplelogincmd.database.models import Alias, Mailbox
+from simplelogincmd.rest import const as const_rest
+from simplelogincmd.rest.exceptions import APIError
 
 
-def _delete(id, transfer_aliases_to, bypass_confirm):
+def _deleted_aliases(sl, mailbox_id):
+    """
+    List the aliases that SimpleLogin deletes along with a mailbox, those
+    whose only mailbox it is
+
+    The local database does not store an alias's mailboxes, so they are
+    listed from SimpleLogin.
+    """
+    pages = sl.iter_json_pages(const_rest.ENDPOINT.ALIASES, "aliases")
+    return [
+        info["id"]
+        for page in pages
+        for info in page
+        if [mailbox.get("id") for mailbox in info.get("mailboxes") or ()]
+        == [mailbox_id]
+    ]
+
+
+def _delete(id, transfer_aliases_to, bypass_confirm, first):
     cfg = init.cfg()
     sl = init.sl(cfg)
     db = init.db(cfg)
-    id = input.resolve_id(db, Mailbox, id)
-    if transfer_aliases_to == -1 and not bypass_confirm:
-        click.confirm(
-            "This will delete all of the mailbox's aliases. Are you sure?", abort=True
-        )
+    id = input.resolve_id(db, Mailbox, id, first=first)
+    deleted = []
+    if transfer_aliases_to == -1:
+        if not bypass_confirm:
+            click.confirm(
+                "This will delete all of the mailbox's aliases. Are you sure?",
+                abort=True,
+            )
+        try:
+            deleted = _deleted_aliases(sl, id)
+        except (requests.RequestException, APIError) as error:
+            click.echo(f"Network error: {error}")
+            return False
     success, msg = sl.delete_mailbox(id, transfer_aliases_to)
     if not success:
         click.echo(msg)
         return False
+    mailbox = db.session.get(Mailbox, id)
+    if mailbox is not None and transfer_aliases_to != -1:
+        if (target := db.session.get(Mailbox, transfer_aliases_to)) is not None:
+            db.session.apply(
+                Mailbox, target.id, nb_alias=target.nb_alias + mailbox.nb_alias
+            )
+    # Their contacts and activities go with them.
+    for alias_id in deleted:
+        db.session.remove(Alias, alias_id)
+    db.session.remove(Mailbox, id)
+    db.session.commit()
     return True
@@ -1,17 +1,18 @@
+from simplelogincmd import completion
 from simplelogincmd.cli import const
 from simplelogincmd.cli.util import init, output
-from simplelogincmd.database.models import Mailbox
+from simplelogincmd.rest.records import MailboxRecord
 
 
-def _mailbox_sort_key(mailbox: Mailbox) -> tuple[int, str]:
+def _mailbox_sort_key(mailbox: MailboxRecord) -> tuple[int, str]:
     """
     Provide a sorting key for mailbox lists
 
     Sorts using the key will sort first by `nb_alias` descending, and then
     by `email` ascending.
 
-    :param mailbox: The Mailbox to be sorted
-    :type Mailbox: :class:`~simplelogincmd.database.models.Mailbox`
+    :param mailbox: The mailbox to be sorted
+    :type mailbox: :class:`~simplelogincmd.rest.records.MailboxRecord`
 
     :rtype: tuple[int, str]
     """
@@ -31,7 +32,7 @@ def _list(include, exclude):
         return
     mailboxes.sort(key=_mailbox_sort_key)
     db = init.db(cfg)
-    for mailbox in mailboxes:
-        db.session.upsert(mailbox)
+    db.session.upsert_records(mailboxes)
     db.session.commit()
+    completion.write_index(db.session)
     output.display_model_list(mailboxes, fields, pager_threshold=0)
@@ -1,16 +1,24 @@
 import click
+from sqlalchemy import update
 
 from simplelogincmd.cli.util import init, input
 from simplelogincmd.database.models import Mailbox
 
 
-def _update(id, email, default, cancel_email_change):
+def _update(id, email, default, cancel_email_change, first):
     cfg = init.cfg()
     sl = init.sl(cfg)
     db = init.db(cfg)
-    id = input.resolve_id(db, Mailbox, id)
+    id = input.resolve_id(db, Mailbox, id, first=first)
     success, msg = sl.update_mailbox(id, email, default, cancel_email_change)
     if not success:
         click.echo(msg)
         return False
+    # A new email address takes effect only once verified, so only a
+    # new default applies locally.
+    if default:
+        others = update(Mailbox).where(Mailbox.id != id).values(default=False)
+        db.session.execute(others)
+        db.session.apply(Mailbox, id, default=True)
+        db.session.commit()
     return True
@@ -1,6 +1,6 @@
 import click
 
-from simplelogincmd.cli import const
+from simplelogincmd.cli import complete, const
 
 
 @click.command(
@@ -10,6 +10,7 @@ from simplelogincmd.cli import const
 )
 @click.argument(
     "id",
+    shell_complete=complete.mailbox,
 )
 @click.option(
     "-t",
@@ -27,8 +28,15 @@ from simplelogincmd.cli import const
     default=False,
     help=const.HELP.MAILBOX.DELETE.OPTION.YES,
 )
-def delete(id: str, transfer_aliases_to: int, bypass_confirm: bool) -> bool:
+@click.option(
+    "--first",
+    is_flag=True,
+    help=const.HELP.MAILBOX.DELETE.OPTION.FIRST,
+)
+def delete(
+    id: str, transfer_aliases_to: int, bypass_confirm: bool, first: bool
+) -> bool:
     """Delete a mailbox"""
     from simplelogincmd.cli.commands.mailbox_commands._delete import _delete
 
-    return _delete(id, transfer_aliases_to, bypass_confirm)
+    return _delete(id, transfer_aliases_to, bypass_confirm, first)
@@ -1,6 +1,6 @@
 import click
 
-from simplelogincmd.cli import const
+from simplelogincmd.cli import complete, const
 
 
 @click.command(
@@ -10,6 +10,7 @@ from simplelogincmd.cli import const
 )
 @click.argument(
     "id",
+    shell_complete=complete.mailbox,
 )
 @click.option(
     "-e",
@@ -28,13 +29,19 @@ from simplelogincmd.cli import const
     default=None,
     help=const.HELP.MAILBOX.UPDATE.OPTION.CANCEL_EMAIL_CHANGE,
 )
+@click.option(
+    "--first",
+    is_flag=True,
+    help=const.HELP.MAILBOX.UPDATE.OPTION.FIRST,
+)
 def update(
     id: str,
     email: str | None,
     default: bool | None,
     cancel_email_change: bool | None,
+    first: bool,
 ) -> bool:
     """Modify a mailbox's attributes"""
     from simplelogincmd.cli.commands.mailbox_commands._update import _update
 
-    return _update(id, email, default, cancel_email_change)
+    return _update(id, email, default, cancel_email_change, first)
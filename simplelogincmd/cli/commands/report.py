@@ -0,0 +1,25 @@
+"""
+CLI commands reporting on the activities of all aliases
+
+Subcommands:
+
+    - activity
+    - senders
+"""
+
+import click
+
+from simplelogincmd.cli import const
+from simplelogincmd.cli.lazy_group import LazyGroup, cmd_path
+
+
+@click.group(
+    "report",
+    cls=LazyGroup,
+    cmd_path=cmd_path(__file__, "report_commands"),
+    short_help=const.HELP.REPORT.SHORT,
+    help=const.HELP.REPORT.LONG,
+    epilog=const.HELP.REPORT.EPILOG,
+)
+def report():
+    pass
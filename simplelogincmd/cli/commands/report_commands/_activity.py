@@ -0,0 +1,21 @@
+import time
+
+import click
+
+from simplelogincmd.cli import const
+from simplelogincmd.cli.util import init, output
+from simplelogincmd.database import report
+
+
+def _activity(window, bucket):
+    cfg = init.cfg()
+    db = init.db(cfg)
+    now = int(time.time())
+    buckets = report.histogram(db.session, now - window, now + 1, bucket)
+    if len(buckets) == 0:
+        click.echo("No activities found in this window.")
+        return
+    pager_threshold = cfg.get("display.pager-threshold")
+    output.display_model_list(
+        buckets, const.REPORT_ACTIVITY_FIELD_ORDER, pager_threshold
+    )
@@ -0,0 +1,21 @@
+import time
+
+import click
+
+from simplelogincmd.cli import const
+from simplelogincmd.cli.util import init, output
+from simplelogincmd.database import report
+
+
+def _senders(window, by, top):
+    cfg = init.cfg()
+    db = init.db(cfg)
+    now = int(time.time())
+    senders = report.senders(db.session, now - window, now + 1, by, top)
+    if len(senders) == 0:
+        click.echo("No activities found in this window.")
+        return
+    pager_threshold = cfg.get("display.pager-threshold")
+    output.display_model_list(
+        senders, const.REPORT_SENDERS_FIELD_ORDER, pager_threshold
+    )
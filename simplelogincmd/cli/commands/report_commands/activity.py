@@ -0,0 +1,32 @@
+import click
+
+from simplelogincmd.cli import const
+from simplelogincmd.cli.util.input import Duration
+
+
+@click.command(
+    "activity",
+    short_help=const.HELP.REPORT.ACTIVITY.SHORT,
+    help=const.HELP.REPORT.ACTIVITY.LONG,
+)
+@click.option(
+    "-w",
+    "--window",
+    type=Duration(),
+    default="90d",
+    show_default=True,
+    help=const.HELP.REPORT.ACTIVITY.OPTION.WINDOW,
+)
+@click.option(
+    "-b",
+    "--bucket",
+    type=Duration(),
+    default="1d",
+    show_default=True,
+    help=const.HELP.REPORT.ACTIVITY.OPTION.BUCKET,
+)
+def activity(window: int, bucket: int) -> None:
+    """Display the activities of all aliases in each interval"""
+    from simplelogincmd.cli.commands.report_commands._activity import _activity
+
+    return _activity(window, bucket)
@@ -0,0 +1,40 @@
+import click
+
+from simplelogincmd.cli import const
+from simplelogincmd.cli.util.input import Duration
+
+
+@click.command(
+    "senders",
+    short_help=const.HELP.REPORT.SENDERS.SHORT,
+    help=const.HELP.REPORT.SENDERS.LONG,
+)
+@click.option(
+    "-w",
+    "--window",
+    type=Duration(),
+    default="90d",
+    show_default=True,
+    help=const.HELP.REPORT.SENDERS.OPTION.WINDOW,
+)
+@click.option(
+    "-b",
+    "--by",
+    type=click.Choice(const.REPORT_SENDERS_BY),
+    default="total",
+    show_default=True,
+    help=const.HELP.REPORT.SENDERS.OPTION.BY,
+)
+@click.option(
+    "-n",
+    "--top",
+    type=click.IntRange(min=1),
+    default=10,
+    show_default=True,
+    help=const.HELP.REPORT.SENDERS.OPTION.TOP,
+)
+def senders(window: int, by: str, top: int) -> None:
+    """Display the senders of the most activities of all aliases"""
+    from simplelogincmd.cli.commands.report_commands._senders import _senders
+
+    return _senders(window, by, top)
@@ -0,0 +1,36 @@
+"""
+Shell completion of command parameters
+
+The completion functions read the index of
+:mod:`simplelogincmd.completion`, so completing an identifier imports
+neither SQLAlchemy nor the database models.
+"""
+
+
+def _items(kind: str, incomplete: str) -> list:
+    from click.shell_completion import CompletionItem
+
+    from simplelogincmd import completion
+
+    return [
+        CompletionItem(value, help=help or None)
+        for value, help in completion.complete(kind, incomplete)
+    ]
+
+
+def alias(context, param, incomplete: str) -> list:
+    """
+    Complete an alias identifier, by email address or note
+    """
+    from simplelogincmd.completion import ALIAS
+
+    return _items(ALIAS, incomplete)
+
+
+def mailbox(context, param, incomplete: str) -> list:
+    """
+    Complete a mailbox identifier, by email address
+    """
+    from simplelogincmd.completion import MAILBOX
+
+    return _items(MAILBOX, incomplete)
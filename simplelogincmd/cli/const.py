@@ -44,6 +44,48 @@ ALIAS_FIELD_ORDER = (
     "pinned",
     "creation_timestamp",
 )
+ALIAS_STATS_FIELD_ORDER = (
+    "id",
+    "email",
+    "nb_forward",
+    "nb_block",
+    "nb_reply",
+    "per_day",
+)
+REPORT_ACTIVITY_FIELD_ORDER = (
+    "start",
+    "forward",
+    "block",
+    "reply",
+    "bounced",
+    "total",
+    "block_ratio",
+)
+REPORT_SENDERS_FIELD_ORDER = (
+    "sender",
+    "forward",
+    "block",
+    "reply",
+    "bounced",
+    "total",
+    "block_ratio",
+)
+ALIAS_SPIKES_FIELD_ORDER = (
+    "id",
+    "email",
+    "counter",
+    "delta",
+    "observed",
+    "baseline",
+    "updated",
+)
+ALIAS_IMPORT_FIELD_ORDER = (
+    "line",
+    "status",
+    "id",
+    "email",
+    "message",
+)
 CONTACT_FIELD_ORDER = (
     "id",
     "contact",
@@ -62,18 +104,51 @@ MAILBOX_FIELD_ORDER = (
     "creation_timestamp",
 )
 
+# When an identifier matches several objects, at most this many of the
+# best matches are offered to choose from.
+RESOLVE_CHOICES = 20
+
+# The values of `alias stats --by`, and the counters they stand for.
+ALIAS_STATS_COUNTERS = dict(
+    forward="nb_forward",
+    block="nb_block",
+    reply="nb_reply",
+)
+
+# The values of `report senders --by`: all activities, or those of an
+# action.
+REPORT_SENDERS_BY = ("total", "forward", "block", "reply", "bounced")
+
+# The formats of the files read by `alias import`, and the file name
+# suffixes from which each is told.
+ALIAS_IMPORT_FORMATS = dict(
+    csv=(".csv",),
+    ndjson=(".ndjson", ".jsonl"),
+)
+
 
 # Help texts common to multiple commands/options
 _HELP_ALIAS_ID = (
     "`ID` can be the alias's numeric id or, if you have a local data"
-    "base, either its email address or note. In the latter cases, if "
-    "more than one alias matches, you will be prompted to choose one."
+    "base, all or part of its email address, name, or note. Matches are "
+    "ranked, best first: the whole text, its start, the start of a "
+    "word, then anywhere in it. If no alias contains `ID`, those that "
+    "contain its letters in order match. Unless one alias matches "
+    "exactly, if more than one matches, you will be prompted to choose "
+    "one."
 )
 _HELP_MAILBOX_ID = (
     "`ID` can be the mailbox's numeric id or, if you have a local data"
-    "base, its email address. In the latter case, if more than one "
-    "mailbox matches, you will be prompted to choose one."
+    "base, all or part of its email address. Unless one mailbox matches "
+    "exactly, if more than one matches, you will be prompted to choose "
+    "one."
+)
+_HELP_OPTION_FIRST = (
+    "If more than one item matches an identifier, or only one does but "
+    "loosely, take the best match rather than prompt for one. Without a "
+    "terminal to prompt in, the command fails instead, unless this is set."
 )
+_HELP_OPTION_WINDOW = "How far back to look, such as 12h, 7d or 2w"
 _HELP_OPTION_NOTE = (
     "Attach a note to the item. Setting this switch with"
     "out providing any value will open an editor in which you can enter "
@@ -150,10 +225,21 @@ HELP = NS(
                 field2=ACTIVITY_FIELD_ORDER[1],
                 field3=ACTIVITY_FIELD_ORDER[4],
                 valid_fields=", ".join(field for field in ACTIVITY_FIELD_ORDER),
-            ),
+            )
+            + "\n\nWhen following, each alias is polled more often while it "
+            "has new activity, and less often while it is idle, at a pace "
+            "no faster than the `sync.requests-per-second` config option. "
+            "On starting, the aliases are read several at a time, as set by "
+            "the `sync.workers` config option.",
             OPTION=NS(
                 INCLUDE=_HELP_LIST_INCLUDE,
                 EXCLUDE=_HELP_LIST_EXCLUDE,
+                FIRST=_HELP_OPTION_FIRST,
+                FOLLOW="Rather than list past activity, keep printing new "
+                "activity as it happens, until interrupted",
+                ALL="Follow the activity of every alias in your local "
+                "database, rather than one, with the alias_id of each "
+                "activity in the first column. Implies `--follow`",
             ),
         ),
         CONTACT=NS(
@@ -164,11 +250,12 @@ HELP = NS(
                 LONG=f"Add a contact to the alias with the given ID`. {_HELP_ALIAS_ID}",
                 OPTION=NS(
                     EMAIL="The contact's email address",
+                    FIRST=_HELP_OPTION_FIRST,
                 ),
             ),
             LIST=NS(
                 SHORT="List alias contacts",
-                LONG="List contacts for the alias with the given `ID`",
+                LONG=f"List contacts for the alias with the given ID. {_HELP_ALIAS_ID}",
                 EPILOG=_HELP_LIST_EPILOG.format(
                     field1=CONTACT_FIELD_ORDER[0],
                     field2=CONTACT_FIELD_ORDER[1],
@@ -178,6 +265,7 @@ HELP = NS(
                 OPTION=NS(
                     INCLUDE=_HELP_LIST_INCLUDE,
                     EXCLUDE=_HELP_LIST_EXCLUDE,
+                    FIRST=_HELP_OPTION_FIRST,
                 ),
             ),
         ),
@@ -203,6 +291,7 @@ HELP = NS(
                 "number of suffixes offered. A value of 0 refers to "
                 "the first suffix.",
                 YES="Bypass confirmation prompts where possible",
+                FIRST=_HELP_OPTION_FIRST,
             ),
         ),
         DELETE=NS(
@@ -210,37 +299,89 @@ HELP = NS(
             LONG=f"Delete the alias with the given ID. {_HELP_ALIAS_ID}",
             OPTION=NS(
                 YES="Bypass the confirmation prompt",
+                FIRST=_HELP_OPTION_FIRST,
             ),
         ),
         GET=NS(
-            SHORT="View a specific alias",
-            LONG=f"View the alias with the given ID. {_HELP_ALIAS_ID}",
-            EPILOG=_HELP_LIST_EPILOG.format(
-                field1=ALIAS_FIELD_ORDER[0],
-                field2=ALIAS_FIELD_ORDER[1],
-                field3=ALIAS_FIELD_ORDER[2],
-                valid_fields=", ".join(ALIAS_FIELD_ORDER),
+            SHORT="View specific aliases",
+            LONG="View the aliases with the given IDs, in the order given. "
+            "With no ID, or an ID of `-`, IDs are read from standard input, "
+            f"one per line. {_HELP_ALIAS_ID}",
+            EPILOG="Aliases are fetched from SimpleLogin several at a time, "
+            "as set by the `sync.workers` and `sync.requests-per-second` "
+            "config options. Those fetched less than `cache.max-age` seconds "
+            "ago are shown from your local database instead.",
+            OPTION=NS(
+                INCLUDE=_HELP_LIST_INCLUDE,
+                EXCLUDE=_HELP_LIST_EXCLUDE,
+                FIRST=_HELP_OPTION_FIRST,
             ),
+        ),
+        IMPORT=NS(
+            SHORT="Create aliases in bulk from a file",
+            LONG="Create an alias for each row of `FILE`, a CSV file with a "
+            "header or an NDJSON file with an object per line, or standard "
+            "input if `FILE` is `-`. Each row may have the fields `kind` "
+            "(custom or random), `hostname`, `prefix`, `suffix`, "
+            "`mailboxes`, `note`, `name` and `mode` (uuid or word), which "
+            "mean the same as the options of `alias custom` and `alias "
+            "random`. A row with a prefix is a custom alias unless its "
+            "kind says otherwise. Custom aliases take the first suffix "
+            "offered if none is given, and the prefix suggested by "
+            "SimpleLogin if none is given either.",
+            EPILOG="Aliases are created several at a time, as set by the "
+            "`sync.workers` and `sync.requests-per-second` config options, "
+            "and each result is shown as soon as its alias is created. "
+            "Rows whose alias already exists are skipped, so an import can "
+            "safely be run again: a custom alias whose address is in your "
+            "local database, or any alias for a hostname on which "
+            "SimpleLogin recommends one you have already used. Random "
+            "aliases without a hostname are created on every run.",
             OPTION=NS(
+                FORMAT="The format of `FILE`. If not given, it is told from "
+                "the file name.",
+                MAILBOXES="The ID or email address of a mailbox of the custom "
+                "aliases whose rows give none. Use this multiple times to "
+                "enter multiple mailboxes.",
                 INCLUDE=_HELP_LIST_INCLUDE,
                 EXCLUDE=_HELP_LIST_EXCLUDE,
+                FIRST=_HELP_OPTION_FIRST,
             ),
         ),
         LIST=NS(
-            SHORT=None,
-            LONG="List all your aliases",
+            SHORT="List all your aliases",
+            LONG="List all your aliases. With `--where`, `--sort` or "
+            "`--limit`, they are selected from the local database, "
+            "rather than fetched from SimpleLogin, so run `database sync` "
+            "first.",
             EPILOG=_HELP_LIST_EPILOG.format(
                 field1=ALIAS_FIELD_ORDER[0],
                 field2=ALIAS_FIELD_ORDER[1],
                 field3=ALIAS_FIELD_ORDER[2],
                 valid_fields=", ".join(ALIAS_FIELD_ORDER),
-            ),
+            )
+            + "\n\n"
+            "Show enabled aliases with over 100 forwards and a note "
+            'containing "shop", most forwarded first:\n'
+            "`list -w 'nb_forward > 100 and enabled and note ~ \"shop\"' "
+            "-s -nb_forward`",
             OPTION=NS(
                 INCLUDE=_HELP_LIST_INCLUDE,
                 EXCLUDE=_HELP_LIST_EXCLUDE,
                 PINNED="Get only pinned aliases",
                 ENABLED="Get only enabled aliases",
                 DISABLED="Get only disabled aliases",
+                WHERE="Show only aliases meeting a condition, made of "
+                "comparisons such as `nb_forward > 100` joined with "
+                "`and`, `or` and `not`. The operators are =, !=, <, <=, "
+                ">, >=, and ~ and !~, which test whether a text field "
+                "contains a string, ignoring case. A field on its own, "
+                "such as `enabled`, is true if it is set and not false, "
+                "zero or empty.",
+                SORT="A comma-separated list of fields by which to order "
+                "aliases, lowest first, or highest first for fields "
+                "prefixed with `-`.",
+                LIMIT="Show at most this many aliases",
             ),
         ),
         RANDOM=NS(
@@ -258,9 +399,43 @@ HELP = NS(
                 NOTE=_HELP_OPTION_NOTE,
             ),
         ),
+        SPIKES=NS(
+            SHORT="Show aliases receiving sudden bursts of email",
+            LONG="Show the aliases whose rate of forwarded or blocked "
+            "emails jumped well above its average when their counters "
+            "last changed, which usually means that an address has "
+            "leaked. Rates are averages weighted toward recent changes, "
+            "updated whenever `database sync` or `alias list` writes "
+            "aliases to the local database. `observed` is the rate of the "
+            "last change, and `baseline` the average before it, both per "
+            "day.",
+            OPTION=NS(
+                WINDOW="How far back to look for spikes, such as 12h, 7d " "or 2w",
+                FACTOR="How many times its average the rate of a change must "
+                "be to count as a spike",
+                MIN_DELTA="How many emails a change must be of at least to "
+                "count as a spike",
+            ),
+        ),
+        STATS=NS(
+            SHORT="Show which aliases' counters changed most",
+            LONG="Show the aliases whose counters changed most over a "
+            "window of time, and how fast. Counters are recorded whenever "
+            "`database sync` or `alias list` writes aliases to the local "
+            "database, so only changes between such writes are seen.",
+            OPTION=NS(
+                WINDOW=_HELP_OPTION_WINDOW,
+                BY="The counter by which to rank aliases: forwarded, "
+                "blocked, or replied-to emails",
+                TOP="Show at most this many aliases",
+            ),
+        ),
         TOGGLE=NS(
             SHORT="Enable or disable an alias",
             LONG=f"Enable or disable the aliase with the given ID. {_HELP_ALIAS_ID}",
+            OPTION=NS(
+                FIRST=_HELP_OPTION_FIRST,
+            ),
         ),
         UPDATE=NS(
             SHORT="Modify an existing alias",
@@ -274,6 +449,7 @@ HELP = NS(
                 "one is required.",
                 DISABLE_PGP="Whether to disable PGP",
                 PINNED="Whether to pin the alias",
+                FIRST=_HELP_OPTION_FIRST,
             ),
         ),
     ),
@@ -292,16 +468,70 @@ HELP = NS(
         DELETE=NS(
             SHORT=None,
             LONG="Delete the db",
+            OPTION=NS(
+                FORCE="Delete it even if changes queued while offline "
+                "have not been replayed, discarding them",
+            ),
+        ),
+        FLUSH=NS(
+            SHORT="Replay changes queued while offline",
+            LONG="Apply to SimpleLogin the alias changes queued while it "
+            "was unreachable",
+            EPILOG="Changes are queued only if the `offline.queue` config "
+            "option is set, and are also replayed by the next command that "
+            "changes an alias or syncs the database. A change is dropped as "
+            "a conflict if the alias has been changed differently on "
+            "SimpleLogin in the meantime.",
         ),
         SYNC=NS(
             SHORT="Synchronize the DB",
             LONG="Synchronize the local database with that of SimpleLogin",
-            EPILOG="Note that this command will wipe any data "
-            "currently stored in your local database. This should "
-            "not matter to most people, so no confirmation is "
-            "required.",
+            EPILOG="Mailboxes and aliases that no longer exist on "
+            "SimpleLogin are removed from your local database. If a sync "
+            "is interrupted, run it again with `--resume` to continue "
+            "where it left off. A deep sync makes at least one request per "
+            "alias; its pace is set by the `sync.workers` and "
+            "`sync.requests-per-second` config options.",
+            OPTION=NS(
+                RESUME="Continue the last sync, if it was interrupted",
+                VERBOSE="List every object added, updated, or removed",
+                DEEP="Also sync the contacts of every alias",
+                ACTIVITIES="Also sync the activities of every alias. Implies "
+                "`--deep`",
+            ),
+        ),
+    ),
+    EXPORT=NS(
+        SHORT="Back up your account to an archive",
+        LONG="Write your mailboxes and aliases, and the contacts and "
+        "activities of every alias, with every field SimpleLogin gives, to "
+        "`FILE`, a newline-delimited JSON archive compressed by gzip, or by "
+        "zstd if its name ends in `.zst`. Load the archive into your local "
+        "database with `import-local`.",
+        EPILOG="Contacts and activities take at least one request per "
+        "alias. Their pages are fetched several at a time, as set by the "
+        "`sync.workers` and `sync.requests-per-second` config options, and "
+        "written as they arrive, so that an account of any size is "
+        "exported in bounded memory. `FILE` only appears once the export "
+        "is complete. zstd needs the `zstandard` package.",
+        OPTION=NS(
+            COMPRESSION="How to compress `FILE`. If not given, it is told "
+            "from the file name.",
+            NO_ACTIVITIES="Leave out the activities of aliases",
         ),
     ),
+    IMPORT_LOCAL=NS(
+        SHORT="Load an archive into the local database",
+        LONG="Load the mailboxes, aliases, contacts and activities of "
+        "`FILE`, an archive written by `export`, into your local "
+        "database, for use offline. Its compression is told from its "
+        "contents.",
+        EPILOG="Objects of the archive replace those of your local "
+        "database, and the contacts and activities of its aliases replace "
+        "theirs. Other objects are kept. Nothing is loaded if the archive "
+        "cannot be read whole. Run `database sync` to bring the loaded "
+        "objects up to date with SimpleLogin.",
+    ),
     MAILBOX=NS(
         SHORT=None,
         LONG="CRUD operations on your mailboxes",
@@ -329,6 +559,7 @@ HELP = NS(
                 YES="if `--transfer-aliases-to` is -1, set this flag "
                 "to bypass a confirmation prompt. It has no effect "
                 "if `-t` has another value.",
+                FIRST=_HELP_OPTION_FIRST,
             ),
         ),
         LIST=NS(
@@ -352,6 +583,35 @@ HELP = NS(
                 EMAIL="A new email address to assign to this mailbox",
                 DEFAULT="Whether to make this the default mailbox",
                 CANCEL_EMAIL_CHANGE=None,  # What does this do?
+                FIRST=_HELP_OPTION_FIRST,
+            ),
+        ),
+    ),
+    REPORT=NS(
+        SHORT=None,
+        LONG="Report on the activities of all your aliases",
+        EPILOG="Reports are made from the activities in your local "
+        "database, which are stored by `database sync --activities`.",
+        ACTIVITY=NS(
+            SHORT="Count activities over time",
+            LONG="Count the activities of all your aliases in each "
+            "interval of a window of time, by action, with the share of "
+            "them that were blocked. Each interval starts at a multiple "
+            "of its length since the epoch, so that days are days in UTC.",
+            OPTION=NS(
+                WINDOW=_HELP_OPTION_WINDOW,
+                BUCKET="The length of each interval, such as 1h or 1d",
+            ),
+        ),
+        SENDERS=NS(
+            SHORT="Count activities by sender",
+            LONG="Count the activities of all your aliases over a window "
+            "of time by sender, by action, with the share of them that "
+            "were blocked, for the senders with the most.",
+            OPTION=NS(
+                WINDOW=_HELP_OPTION_WINDOW,
+                BY="The action by which to rank senders, or all of them",
+                TOP="Show at most this many senders",
             ),
         ),
     ),
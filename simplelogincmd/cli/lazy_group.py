@@ -1,10 +1,36 @@
 """
 Lazy-loading Click group and utils
+
+The commands of every lazy group are listed in a generated manifest,
+:mod:`simplelogincmd.cli._manifest`, along with the module that defines
+each and its short help. Listing commands, printing a group's help and
+completing command names are then done without importing any command
+module. Only the command being run is imported. Regenerate the manifest
+after adding, removing or renaming a command, or changing its short
+help:
+
+.. code-block:: sh
+
+   python -m simplelogincmd.cli.lazy_group
+
+Commands missing from the manifest can still be run, but are not listed
+until it is regenerated. Groups missing from it altogether list their
+commands from disk.
+
+A command is defined by the function of its name in the module of its
+name, except that hyphens become underscores, as in `import_local`, and
+names that are Python keywords gain a trailing underscore, as in
+`import_`.
 """
 
 import click
 
 
+# The package of the commands of each group is this package's name
+# joined with the path of the group's `cmd_path` relative to it.
+_ROOT = __name__.rpartition(".")[0]
+
+
 def cmd_path(file: str, *args: str) -> str:
     """
     Util to construct a path to a LazyGroup's subcommands
@@ -41,6 +67,16 @@ def cmd_path(file: str, *args: str) -> str:
     return os.path.join(os.path.dirname(file), *args)
 
 
+def _module_name(command: str) -> str:
+    """
+    Get the name of the module, and function, that define a command
+    """
+    import keyword
+
+    name = command.replace("-", "_")
+    return f"{name}_" if keyword.iskeyword(name) else name
+
+
 class LazyGroup(click.Group):
     """
     A Click group that lazily loads its subcommands
@@ -49,8 +85,11 @@ class LazyGroup(click.Group):
 
     - list_commands
     - get_command
+    - format_commands
+    - shell_complete
 
-    Both are overridden by lazy implementations
+    All are overridden by lazy implementations, which read the command
+    manifest rather than import every subcommand
     """
 
     def __init__(self, *args, cmd_path: str, **kwargs) -> None:
@@ -64,23 +103,186 @@ class LazyGroup(click.Group):
         super().__init__(*args, **kwargs)
         self._cmd_path = cmd_path
 
-    def list_commands(self, context) -> list[str]:
+    @property
+    def _package(self) -> str:
+        """
+        The dotted name of the package holding the group's subcommands
+        """
+        import os
+
+        root = os.path.dirname(__file__)
+        relative = os.path.relpath(self._cmd_path, root)
+        return ".".join((_ROOT, *relative.split(os.sep)))
+
+    @property
+    def _manifest(self) -> dict[str, tuple[str, dict]]:
+        """
+        The manifest entries of the group's subcommands
+
+        Each subcommand's name maps to the module defining it and the
+        attributes that its help is made of. The manifest is empty if it
+        has not been generated.
+        """
+        try:
+            from simplelogincmd.cli._manifest import COMMANDS
+        except ImportError:
+            return {}
+        return COMMANDS.get(self._package, {})
+
+    def _scan(self) -> list[str]:
+        """
+        List the group's subcommands found on disk
+        """
         import os
 
         commands = []
         for file in os.listdir(self._cmd_path):
             if file.endswith(".py") and not file.startswith("_"):
                 module = file[:-3]
-                commands.append(module)
+                command = module.removesuffix("_").replace("_", "-")
+                commands.append(command if _module_name(command) == module else module)
         commands.sort()
         return commands
 
+    def list_commands(self, context) -> list[str]:
+        if manifest := self._manifest:
+            return list(manifest)
+        return self._scan()
+
     def get_command(self, context, name):
-        import importlib.util
-        import os
+        import importlib
+
+        if (entry := self._manifest.get(name)) is not None:
+            module = entry[0]
+        elif name in self._scan():
+            module = f"{self._package}.{_module_name(name)}"
+        else:
+            return None
+        return getattr(importlib.import_module(module), _module_name(name))
+
+    def _listed(self, context) -> list[click.Command]:
+        """
+        Get the group's visible subcommands, for help and completion
+
+        Subcommands in the manifest are stand-ins, carrying only the
+        attributes that help is made of. Only those not in the manifest
+        are imported.
+        """
+        manifest = self._manifest
+        commands = []
+        for name in self.list_commands(context):
+            if (entry := manifest.get(name)) is not None:
+                command = click.Command(name, **entry[1])
+            else:
+                command = self.get_command(context, name)
+            if command is not None and not command.hidden:
+                commands.append(command)
+        return commands
+
+    def format_commands(self, context, formatter) -> None:
+        if not (commands := self._listed(context)):
+            return
+        # Mirror `click.Group.format_commands`.
+        limit = formatter.width - 6 - max(len(command.name) for command in commands)
+        rows = [
+            (command.name, command.get_short_help_str(limit)) for command in commands
+        ]
+        with formatter.section("Commands"):
+            formatter.write_dl(rows)
+
+    def shell_complete(self, context, incomplete):
+        from click.shell_completion import CompletionItem
+
+        results = [
+            CompletionItem(command.name, help=command.get_short_help_str())
+            for command in self._listed(context)
+            if command.name.startswith(incomplete)
+        ]
+        # Skip `click.Group`'s completion of subcommands, which imports
+        # each of them.
+        results.extend(click.Command.shell_complete(self, context, incomplete))
+        return results
+
+
+# The attributes of a command that its help is made of.
+_HELP_ATTRIBUTES = ("short_help", "help", "hidden", "deprecated")
+
+
+def _entries(group: LazyGroup) -> dict[str, dict[str, tuple[str, dict]]]:
+    """
+    Collect the manifest entries of a group and its nested groups
+
+    Subcommands are found on disk, not in any existing manifest.
+    """
+    import importlib
+
+    entries = {}
+    commands = entries[group._package] = {}
+    for name in group._scan():
+        module = f"{group._package}.{_module_name(name)}"
+        command = getattr(importlib.import_module(module), _module_name(name))
+        attributes = {}
+        for attribute in _HELP_ATTRIBUTES:
+            if value := getattr(command, attribute):
+                attributes[attribute] = value
+        if "short_help" in attributes:
+            # Help is only shortened in the absence of short help.
+            attributes.pop("help", None)
+        commands[name] = (module, attributes)
+        if isinstance(command, LazyGroup):
+            entries.update(_entries(command))
+    return entries
+
+
+def generate_manifest(group: LazyGroup) -> str:
+    """
+    Generate the source of the command manifest
+
+    The source is laid out as black would format it.
+
+    :param group: The root group
+    :type group: :class:`LazyGroup`
+
+    :return: The source of :mod:`simplelogincmd.cli._manifest`
+    :rtype: str
+    """
+    import json
+
+    lines = [
+        '"""',
+        "The commands of every lazy group",
+        "",
+        "Generated by `python -m simplelogincmd.cli.lazy_group`. Do not edit.",
+        '"""',
+        "",
+        "COMMANDS = {",
+    ]
+    for package, commands in _entries(group).items():
+        if not commands:
+            lines.append(f"    {json.dumps(package)}: {{}},")
+            continue
+        lines.append(f"    {json.dumps(package)}: {{")
+        for name, (module, attributes) in commands.items():
+            lines.append(f"        {json.dumps(name)}: (")
+            lines.append(f"            {json.dumps(module)},")
+            lines.append("            {")
+            for attribute, value in attributes.items():
+                value = "True" if value is True else json.dumps(value)
+                lines.append(f"                {json.dumps(attribute)}: {value},")
+            lines.append("            },")
+            lines.append("        ),")
+        lines.append("    },")
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+if __name__ == "__main__":
+    import os
+
+    from simplelogincmd.cli import lazy_group
+    from simplelogincmd.cli.main import cli
 
-        path = os.path.join(self._cmd_path, f"{name}.py")
-        spec = importlib.util.spec_from_file_location(name, path)
-        module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(module)
-        return getattr(module, name)
+    # Use this module as imported, whose `LazyGroup` the groups are.
+    path = os.path.join(os.path.dirname(__file__), "_manifest.py")
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(lazy_group.generate_manifest(cli))
@@ -2,4 +2,4 @@
 CLI utilities
 """
 
-from simplelogincmd.cli.util import init, input, output
+from simplelogincmd.cli.util import init, input, offline, output
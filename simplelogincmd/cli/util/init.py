@@ -1,7 +1,23 @@
+# The configuration loaded in this process, by config file path, along
+# with the file's modification time and size when it was loaded.
+_configs = {}
+
+
+def _signature(path):
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
 def cfg():
     """
     Initialize application configuration
 
+    The configuration is loaded once per process, and shared by every
+    caller. It is loaded again if the config file changes on disk.
+
     :raise jsonschema.SchemaError: If the app's configuration schema
         is invalid
     :raise jsonschema.ValidationError: If the app's base configuration
@@ -10,9 +26,16 @@ def cfg():
     :return: Application configuration
     :rtype: :class:`~simplelogincmd.config.Config`
     """
-    from simplelogincmd.config import Config
+    from simplelogincmd import const
+
+    path = const.FILE_CONFIG
+    signature = _signature(path)
+    cached = _configs.get(path)
+    if cached is None or cached[0] != signature:
+        from simplelogincmd.config import Config
 
-    return Config()
+        cached = _configs[path] = (signature, Config(path))
+    return cached[1]
 
 
 def sl(cfg):
@@ -62,11 +85,18 @@ def db(cfg):
         db
     :type cfg: :class:`~simplelogincmd.config.Config`
 
+    :raise click.ClickException: If the database cannot be initialized,
+        such as when changes queued while offline cannot be carried
+        over a rebuild
+
     :rtype: :class:`~simplelogincmd.database.DatabaseAccessLayer`
     """
     from simplelogincmd.database import DatabaseAccessLayer
 
     db = DatabaseAccessLayer()
     cfg.ensure_directory()
-    db.initialize()
+    if not db.initialize():
+        import click
+
+        raise click.ClickException("Failed to initialize the local database.")
     return db
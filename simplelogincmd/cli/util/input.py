@@ -1,6 +1,30 @@
+import sys
+
 import click
 
 
+class Duration(click.ParamType):
+    """
+    A length of time, such as `90s`, `30m`, `12h`, `7d` or `2w`
+
+    Converted into a number of seconds. A number without a unit is a
+    number of seconds.
+    """
+
+    name = "duration"
+
+    _UNITS = dict(s=1, m=60, h=60 * 60, d=24 * 60 * 60, w=7 * 24 * 60 * 60)
+
+    def convert(self, value, param, ctx) -> int:
+        if isinstance(value, int):
+            return value
+        text = value.strip().lower()
+        number, unit = (text[:-1], text[-1]) if text[-1:].isalpha() else (text, "s")
+        if not number.isdigit() or unit not in self._UNITS or int(number) == 0:
+            self.fail(f"{value!r} is not a duration such as 12h or 7d", param, ctx)
+        return int(number) * self._UNITS[unit]
+
+
 def edit(msg: str | None = None, *args, **kwargs) -> str | None:
     """
     Allow the user to enter a message via their editor of choice
@@ -59,16 +83,19 @@ def prompt_choice(text: str, options: list) -> int:
     return choice - 1
 
 
-def resolve_id(db, model_cls, id):
+def resolve_id(db, model_cls, id, first: bool = False):
     """
     Search for a single db object id given an identifier
 
-    Call the model classes :meth:`~Object.resolve_identifier` method to
+    Call the model class's :meth:`~Object.rank_identifier` method to
     locate db objects based on the given identifier, which can be any
-    value. If multiple results match, ask the user to choose one and
-    return the id of the selected object. If one result matches, return
-    its id directly. If no matches were found, return the id as it was
-    provided.
+    value, best match first. If one result matches, or only one matches
+    exactly, or `first` is set, return the id of the best match. If
+    multiple results match, ask the user to choose one of the best
+    :data:`~simplelogincmd.cli.const.RESOLVE_CHOICES` and return the id
+    of the selected object. So too if even the best match is only a
+    subsequence, which is too loose to be taken unasked. If no matches
+    were found, return the id as it was provided.
 
     :param db: The access layer instance to use for the lookup
     :type db: :class:`~simplelogincmd.database.DatabaseAccessLayer`
@@ -78,16 +105,97 @@ def resolve_id(db, model_cls, id):
     :param id: The id to look up
     :type id: Any, usually int or str, as defined by the model class's
         :meth:`~simplelogincmd.database.models.Object.identifier_query`
+    :param first: Whether to take the best match rather than prompt,
+        defaults to False
+    :type first: bool, optional
+
+    :raise click.UsageError: If the user would be prompted to choose,
+        but standard input is not a terminal
 
     :return: The numeric id of the matched object, or the given id if
         none matched
     :rtype: int | type(id)
     """
-    results = model_cls.resolve_identifier(db.session, id)
-    count = len(results)
-    if count == 0:
+    from simplelogincmd.cli.const import RESOLVE_CHOICES
+    from simplelogincmd.database.matching import EXACT, SUBSTRING
+
+    ranked = model_cls.rank_identifier(db.session, id, limit=RESOLVE_CHOICES)
+    if len(ranked) == 0:
         return id
-    if count == 1:
-        return results[0].id
-    choice = prompt_choice(f"Select {model_cls.__name__}", results)
-    return results[choice].id
+    loose = ranked[0][0] < SUBSTRING
+    if first or (
+        not loose and (len(ranked) == 1 or ranked[1][0] < EXACT <= ranked[0][0])
+    ):
+        return ranked[0][1].id
+    name = model_cls.__name__
+    if not sys.stdin.isatty():
+        if loose:
+            problem = f"No {name.lower()} matches '{id}' closely"
+        else:
+            problem = f"More than one {name.lower()} matches '{id}'"
+        raise click.UsageError(
+            f"{problem}. Use a more specific identifier, or `--first` to take "
+            "the best match."
+        )
+    choice = prompt_choice(f"Select {name}", [obj for _, obj in ranked])
+    return ranked[choice][1].id
+
+
+def resolve_ids(db, model_cls, ids, first: bool = False) -> list:
+    """
+    Search for the db object ids of several identifiers
+
+    Numeric ids, and identifiers that name an object exactly by one of
+    its :attr:`~simplelogincmd.database.models.Object.unique_identifier_columns`,
+    ignoring case, are all looked up by a single query. Numeric ids not
+    found are returned as they are, and the rest resolved one by one by
+    :func:`resolve_id`.
+
+    :param db: The access layer instance to use for the lookup
+    :type db: :class:`~simplelogincmd.database.DatabaseAccessLayer`
+    :param model_cls: The type of db object for which to search
+    :type model_cls: Type, subclass of
+        :class:`~simplelogincmd.database.models.Object`
+    :param ids: The ids to look up
+    :type ids: Sequence
+    :param first: Whether to take the best match rather than prompt,
+        defaults to False
+    :type first: bool, optional
+
+    :raise click.UsageError: If the user would be prompted to choose,
+        but standard input is not a terminal
+
+    :return: What :func:`resolve_id` would return for each id, in order
+    :rtype: list
+    """
+    from sqlalchemy import or_, select
+
+    from simplelogincmd.database import matching
+
+    kinds = [matching.classify(id) for id in ids]
+    numbers = {int(str(id)) for id, kind in zip(ids, kinds) if kind == matching.INTEGER}
+    texts = {str(id).lower() for id, kind in zip(ids, kinds) if kind == matching.EMAIL}
+    names = model_cls.unique_identifier_columns
+    columns = [getattr(model_cls, name) for name in names]
+    conditions = [model_cls.id.in_(numbers)]
+    conditions.extend(column.collate("NOCASE").in_(texts) for column in columns)
+    query = select(model_cls.id, *columns).where(or_(*conditions))
+    found = set()
+    named = {}
+    for object_id, *values in db.session.execute(query):
+        found.add(object_id)
+        for value in values:
+            if value is not None and value.lower() in texts:
+                named.setdefault(value.lower(), set()).add(object_id)
+    resolved = []
+    for id, kind in zip(ids, kinds):
+        text = str(id)
+        if kind == matching.INTEGER:
+            resolved.append(int(text) if int(text) in found else id)
+        elif (
+            kind == matching.EMAIL and len(matches := named.get(text.lower(), ())) == 1
+        ):
+            resolved.append(next(iter(matches)))
+        else:
+            resolved.append(resolve_id(db, model_cls, id, first=first))
+    return resolved
@@ -0,0 +1,105 @@
+from collections.abc import Callable
+from typing import Any
+
+import click
+
+
+def journal(cfg, sl, db):
+    """
+    Open the journal of changes queued while offline
+
+    :rtype: :class:`~simplelogincmd.journal.Journal`
+    """
+    from simplelogincmd.journal import Journal
+
+    return Journal(sl, db, workers=cfg.get("sync.workers"))
+
+
+def _echo_result(description: str, fate: str, message: str | None) -> None:
+    line = f"{fate.capitalize()}: {description}"
+    if message:
+        line += f" ({message})"
+    click.echo(line)
+
+
+def replay(cfg, sl, db) -> dict[str, int] | None:
+    """
+    Replay the changes queued while offline, if there are any
+
+    :raise requests.RequestException: If SimpleLogin cannot be reached.
+        Changes not yet replayed remain queued
+    :raise simplelogincmd.rest.exceptions.APIError: If SimpleLogin
+        answers with an error. Changes not yet replayed remain queued
+
+    :return: The number of changes that met each fate, or `None` if
+        none were queued
+    :rtype: dict[str, int], optional
+    """
+    queue = journal(cfg, sl, db)
+    if not (pending := queue.pending()):
+        return None
+    click.echo(f"Replaying {pending} queued change(s)...")
+    return queue.replay(on_result=_echo_result)
+
+
+def attempt(
+    cfg,
+    sl,
+    db,
+    action: str,
+    alias_id: int,
+    request: Callable[[], tuple[bool, Any]],
+    changes: dict[str, Any] | None = None,
+) -> tuple[bool, Any] | None:
+    """
+    Change an alias on SimpleLogin, or queue the change if offline
+
+    Changes queued earlier are replayed first, so that changes reach
+    SimpleLogin in the order in which they were made. If SimpleLogin
+    cannot be reached and the `offline.queue` config option is set, the
+    change is queued, and applied to the local database right away.
+
+    :param cfg: The application configuration
+    :type cfg: :class:`~simplelogincmd.config.Config`
+    :param sl: An authenticated SimpleLogin client
+    :type sl: :class:`~simplelogincmd.rest.SimpleLogin`
+    :param db: The local database
+    :type db: :class:`~simplelogincmd.database.DatabaseAccessLayer`
+    :param action: The kind of change, see
+        :meth:`~simplelogincmd.journal.Journal.record`
+    :type action: str
+    :param alias_id: The id of the alias to change
+    :type alias_id: int
+    :param request: Makes the change on SimpleLogin
+    :type request: Callable[[], tuple[bool, Any]]
+    :param changes: The change, if `action` is an update
+    :type changes: dict[str, Any], optional
+
+    :raise requests.RequestException: If SimpleLogin cannot be reached
+        and changes are not to be queued
+    :raise click.ClickException: If SimpleLogin cannot be reached and
+        the change cannot be queued, such as a toggle of an alias not in
+        the local database
+
+    :return: What `request` returned, or `None` if the change was
+        queued
+    :rtype: tuple[bool, Any], optional
+    """
+    from simplelogincmd.journal import OFFLINE_ERRORS
+
+    try:
+        replay(cfg, sl, db)
+        return request()
+    except OFFLINE_ERRORS:
+        if not cfg.get("offline.queue"):
+            raise
+    try:
+        entry = journal(cfg, sl, db).record(action, alias_id, changes)
+    except ValueError as error:
+        raise click.ClickException(
+            f"SimpleLogin is unreachable, and the {action} cannot be queued: "
+            f"{error}. Run `database sync` once online first."
+        ) from None
+    click.echo(f"SimpleLogin is unreachable. Queued: {entry}")
+    click.echo("Run `database flush` to apply queued changes once online.")
+    return None
@@ -1,3 +1,5 @@
+from collections.abc import Iterable
+
 import click
 
 
@@ -96,3 +98,24 @@ def display_model_list(
     for entry in table:
         # Entries come with newline appended, so suppress them here
         click.echo(entry, nl=False)
+
+
+def stream_model_list(models: Iterable, fields: list[str]) -> None:
+    """
+    Print a simple table detailing each item to stdout as it arrives
+
+    The heading is printed at once, and each item as soon as `models`
+    yields it, so the table is never shown via a pager.
+
+    :param models: Series of :class:`~simplelogincmd.database.models.Object`
+        to be included in the output, which may never end
+    :type models: Iterable[Object]
+    :param fields: The field names to display for each item, in left-
+        to-right order
+    :type fields: list[str]
+
+    :rtype: None
+    """
+    click.echo("|".join(fields))
+    for model in models:
+        click.echo("|".join(model.get_string(field) for field in fields))
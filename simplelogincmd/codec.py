@@ -0,0 +1,159 @@
+"""
+Pluggable JSON encoding and decoding
+
+The application reads and writes JSON through a :class:`Codec` rather
+than the standard library directly, so that a faster JSON library is
+used whenever one is installed. Libraries are tried in the order of
+:data:`~simplelogincmd.const.JSON_CODECS`, and the standard library,
+which is always available, comes last.
+
+Every codec decodes straight from bytes, which lets API responses be
+decoded without first copying them into text, and encodes to UTF-8
+bytes. Decoding errors of every codec are instances of
+:exc:`ValueError`.
+"""
+
+import importlib
+import json
+from collections.abc import Callable
+from typing import Any
+
+from simplelogincmd import const
+
+
+class Codec:
+    """
+    A JSON library adapted to a common interface
+    """
+
+    def __init__(
+        self,
+        name: str,
+        loads: Callable[[bytes | str], Any],
+        dumps: Callable[[Any, bool], bytes],
+    ) -> None:
+        """
+        Constructor
+
+        :param name: The name of the underlying library
+        :type name: str
+        :param loads: Decode a JSON document given as bytes or text
+        :type loads: Callable[[bytes | str], Any]
+        :param dumps: Encode an object into UTF-8 JSON bytes, indented
+            if the second argument is true
+        :type dumps: Callable[[Any, bool], bytes]
+        """
+        self.name = name
+        self._loads = loads
+        self._dumps = dumps
+
+    def __repr__(self) -> str:
+        return f"Codec('{self.name}')"
+
+    def loads(self, data: bytes | str) -> Any:
+        """
+        Decode a JSON document
+
+        :param data: The encoded document
+        :type data: bytes | str
+
+        :raise ValueError: If `data` is not valid JSON
+
+        :rtype: Any
+        """
+        return self._loads(data)
+
+    def dumps(self, obj: Any, pretty: bool = False) -> bytes:
+        """
+        Encode an object as JSON
+
+        :param obj: The object to encode
+        :type obj: Any
+        :param pretty: Whether to indent the output for human readers,
+            defaults to False
+        :type pretty: bool, optional
+
+        :return: The UTF-8 encoded document
+        :rtype: bytes
+        """
+        return self._dumps(obj, pretty)
+
+
+def _orjson(module) -> Codec:
+    def dumps(obj, pretty):
+        return module.dumps(obj, option=module.OPT_INDENT_2 if pretty else 0)
+
+    return Codec("orjson", module.loads, dumps)
+
+
+def _ujson(module) -> Codec:
+    def dumps(obj, pretty):
+        text = module.dumps(obj, ensure_ascii=False, indent=2 if pretty else 0)
+        return text.encode("utf-8")
+
+    return Codec("ujson", module.loads, dumps)
+
+
+def _json(module) -> Codec:
+    def dumps(obj, pretty):
+        if pretty:
+            text = module.dumps(obj, ensure_ascii=False, indent=2)
+        else:
+            text = module.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+        return text.encode("utf-8")
+
+    return Codec("json", module.loads, dumps)
+
+
+_ADAPTERS = {
+    "orjson": _orjson,
+    "ujson": _ujson,
+    "json": _json,
+}
+
+_codecs: dict[str, Codec | None] = {}
+
+
+def get(name: str) -> Codec | None:
+    """
+    Get the codec of a particular JSON library
+
+    :param name: One of :data:`~simplelogincmd.const.JSON_CODECS`
+    :type name: str
+
+    :raise KeyError: If no codec by that name exists
+
+    :return: The codec, or `None` if its library is not installed
+    :rtype: Codec, optional
+    """
+    if name not in _codecs:
+        adapter = _ADAPTERS[name]
+        try:
+            module = json if name == "json" else importlib.import_module(name)
+        except ImportError:
+            _codecs[name] = None
+        else:
+            _codecs[name] = adapter(module)
+    return _codecs[name]
+
+
+def available() -> list[Codec]:
+    """
+    List the codecs whose libraries are installed, in order of preference
+
+    :rtype: list[Codec]
+    """
+    return [codec for name in const.JSON_CODECS if (codec := get(name)) is not None]
+
+
+def default() -> Codec:
+    """
+    Get the preferred codec among those installed
+
+    :rtype: Codec
+    """
+    for name in const.JSON_CODECS:
+        if (codec := get(name)) is not None:
+            return codec
+    # The standard library is always available.
+    return get("json")
@@ -0,0 +1,149 @@
+"""
+Index of alias and mailbox identifiers for shell completion
+
+Completion runs on every press of Tab, in a fresh process, so it must
+answer quickly. Rather than query the database through the ORM, it
+reads a small index file, written whenever the local database is synced
+or aliases or mailboxes are listed.
+
+The index is a text file of sorted lines, one per key::
+
+    <kind><key>\\t<value>\\t<help>\\n
+
+where `kind` is :data:`ALIAS` or :data:`MAILBOX`, `key` is a lowercase
+alias email, alias note, or mailbox email, `value` is what completes
+the identifier being typed (the email address), and `help` describes
+it. The file is memory-mapped, and a prefix is found by binary search
+over its lines, without reading the rest of it. This module imports
+neither SQLAlchemy nor the models until an index is written.
+"""
+
+import mmap
+import os
+from pathlib import Path
+
+from simplelogincmd import const
+
+
+ALIAS = "a"
+MAILBOX = "m"
+
+# Identifiers offered for a single completion at most.
+LIMIT = 100
+
+_SEPARATORS = str.maketrans("\t\n\r", "   ")
+
+
+def _field(text: str | None) -> str:
+    """
+    Make text safe to store as a field of an index line
+    """
+    return (text or "").translate(_SEPARATORS)
+
+
+def _line(kind: str, key: str, value: str, help: str | None) -> bytes:
+    line = f"{kind}{_field(key).lower()}\t{_field(value)}\t{_field(help)}\n"
+    return line.encode("utf-8")
+
+
+def write_index(session, path: Path | None = None) -> int:
+    """
+    Write the index of the aliases and mailboxes in the local database
+
+    The file is replaced atomically, so a completion running meanwhile
+    reads either the old index or the new one.
+
+    :param session: A session of the local database
+    :type session: :class:`~simplelogincmd.database.session.SimpleLoginSession`
+    :param path: Where to write the index, defaults to the application's
+        index file
+    :type path: :class:`pathlib.Path`, optional
+
+    :return: The number of keys indexed
+    :rtype: int
+    """
+    from sqlalchemy import select
+
+    from simplelogincmd.database.models import Alias, Mailbox
+
+    path = path or const.FILE_COMPLETION
+    lines = []
+    for email, note in session.execute(select(Alias.email, Alias.note)):
+        lines.append(_line(ALIAS, email, email, note))
+        if note:
+            lines.append(_line(ALIAS, note, email, note))
+    for (email,) in session.execute(select(Mailbox.email)):
+        lines.append(_line(MAILBOX, email, email, None))
+    lines.sort()
+    temporary = path.with_name(path.name + ".tmp")
+    temporary.write_bytes(b"".join(lines))
+    os.replace(temporary, path)
+    return len(lines)
+
+
+def _lower_bound(index: mmap.mmap, target: bytes) -> int:
+    """
+    Find the offset of the first line of the index not less than `target`
+
+    Every line starting before `low` is less than `target`, and every
+    line starting at or after `high` is not.
+    """
+    low, high = 0, len(index)
+    while low < high:
+        middle = (low + high) // 2
+        newline = index.rfind(b"\n", low, middle)
+        start = low if newline < 0 else newline + 1
+        end = index.find(b"\n", start)
+        if index[start:end] < target:
+            low = end + 1
+        else:
+            high = start
+    return low
+
+
+def complete(
+    kind: str,
+    prefix: str,
+    path: Path | None = None,
+    limit: int = LIMIT,
+) -> list[tuple[str, str]]:
+    """
+    Find the identifiers whose key starts with a prefix
+
+    Matching ignores case. Each identifier is offered once, however many
+    of its keys match.
+
+    :param kind: :data:`ALIAS` or :data:`MAILBOX`
+    :type kind: str
+    :param prefix: What has been typed so far
+    :type prefix: str
+    :param path: The index file, defaults to the application's
+    :type path: :class:`pathlib.Path`, optional
+    :param limit: The most identifiers to find, defaults to
+        :data:`LIMIT`
+    :type limit: int, optional
+
+    :return: Each matching identifier with its help, in key order. Empty
+        if there is no index
+    :rtype: list[tuple[str, str]]
+    """
+    path = path or const.FILE_COMPLETION
+    target = f"{kind}{prefix.lower()}".encode("utf-8")
+    try:
+        with open(path, "rb") as file:
+            index = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        # Missing or empty.
+        return []
+    matches = {}
+    with index:
+        position = _lower_bound(index, target)
+        while len(matches) < limit and position < len(index):
+            end = index.find(b"\n", position)
+            line = index[position:end]
+            if not line.startswith(target):
+                break
+            _, value, help = line.decode("utf-8").split("\t")
+            matches.setdefault(value, help)
+            position = end + 1
+    return list(matches.items())
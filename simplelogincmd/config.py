@@ -3,14 +3,47 @@ Module for handling application configuration
 """
 
 import copy
+import hashlib
 import json
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from jsonschema import ValidationError
-from jsonschema.validators import validator_for
+from simplelogincmd import codec, const
 
-from simplelogincmd import const
+
+if TYPE_CHECKING:
+    from jsonschema import ValidationError
+    from jsonschema.protocols import Validator
+
+
+# Validators already built in this process, keyed by schema fingerprint.
+_validators: dict[str, "Validator"] = {}
+
+
+def _fingerprint(*objs: Any) -> str:
+    """
+    Digest the representation of some JSON-compatible objects
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for obj in objs:
+        digest.update(repr(obj).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _validator(schema: dict, key: str) -> "Validator":
+    """
+    Get a validator for a schema, building it on first use
+
+    :raise jsonschema.SchemaError: If the schema itself is invalid
+    """
+    if (validator := _validators.get(key)) is None:
+        from jsonschema.validators import validator_for
+
+        validator_cls = validator_for(schema)
+        # This will raise if `schema` is invalid.
+        validator_cls.check_schema(schema)
+        validator = _validators[key] = validator_cls(schema)
+    return validator
 
 
 class Config:
@@ -52,6 +85,11 @@ class Config:
         feel free to use them elsewhere without fear of modification
         by this class.
 
+        Validation is skipped when a stamp file beside the user config
+        file records that the same file has already passed validation
+        against the same schema and base config. jsonschema is then not
+        even imported until a value is :meth:`set`.
+
         :param user_config_path: Path to the user's configuration file,
             defaults to a path defined by the application
         :type user_config_path: :class:`pathlib.Path`, optional
@@ -68,34 +106,78 @@ class Config:
         :raise jsonschema.SchemaError: If the schema itself is invalid
         """
         schema = copy.deepcopy(schema_obj or const.CONFIG_SCHEMA)
-        validator_cls = validator_for(schema)
-        # This will raise if `schema` is invalid.
-        validator_cls.check_schema(schema)
-        validator = validator_cls(schema)
-
         base = copy.deepcopy(base_obj or const.CONFIG_BASE)
-        # This will raise if `base` is invalid.
-        validator.validate(base)
-
         path = user_config_path or const.FILE_CONFIG
         try:
-            with path.open("r", encoding="utf-8") as config_file:
-                config = json.load(config_file)
-        except (OSError, json.JSONDecodeError):
-            # TODO: Implement logging.
-            config = {}
+            data = path.read_bytes()
+        except OSError:
+            data = b""
+
+        self._schema = schema
+        self._schema_key = _fingerprint(schema)
+        self._base = base
+        self._path = path
+        self._cache = {}
+        stamp = self._stamp(data)
+
         try:
-            validator.validate(config)
-        except ValidationError:
+            config = codec.default().loads(data) if data else {}
+        except ValueError:
             # TODO: Implement logging.
             config = {}
+        if stamp != self._read_stamp():
+            from jsonschema import ValidationError
+
+            # This will raise if `base` is invalid.
+            self._validator.validate(base)
+            try:
+                self._validator.validate(config)
+            except ValidationError:
+                # TODO: Implement logging.
+                config = {}
+            else:
+                self._write_stamp(stamp)
 
-        self._validator = validator
         self._config = self._merge_configs(base, config)
-        self._base = base
-        self._schema = schema
-        self._path = path
-        self._cache = {}
+
+    @property
+    def _validator(self) -> "Validator":
+        return _validator(self._schema, self._schema_key)
+
+    @property
+    def _stamp_path(self) -> Path:
+        return self._path.with_name(self._path.name + ".validated")
+
+    def _stamp(self, data: bytes) -> str:
+        """
+        Digest a config file's contents, along with the schema and base
+        config against which it is validated
+        """
+        digest = hashlib.blake2b(data, digest_size=16)
+        digest.update(_fingerprint(self._schema_key, self._base).encode("ascii"))
+        return digest.hexdigest()
+
+    def _read_stamp(self) -> str | None:
+        """
+        Read the digest of the last config file known to be valid
+        """
+        try:
+            return self._stamp_path.read_text(encoding="ascii").strip()
+        except (OSError, ValueError):
+            return None
+
+    def _write_stamp(self, stamp: str) -> None:
+        """
+        Record that the config file with the given digest is valid
+
+        Nothing is written if the config directory does not exist.
+        """
+        if not self._stamp_path.parent.is_dir():
+            return
+        try:
+            self._stamp_path.write_text(stamp, encoding="ascii")
+        except OSError:
+            pass
 
     def _merge_configs(self, base: dict, config: dict) -> dict:
         """
@@ -135,7 +217,7 @@ class Config:
                 items.append(sub_item)
         return dict(items)
 
-    def validate(self, config) -> ValidationError | None:
+    def validate(self, config) -> "ValidationError | None":
         """
         Validate a configuration
 
@@ -146,6 +228,8 @@ class Config:
             ValidationError instance that was raised during validation
         :rtype: :class:`jsonschema.ValidationError`, optional
         """
+        from jsonschema import ValidationError
+
         try:
             self._validator.validate(config)
         except ValidationError as error:
@@ -254,12 +338,16 @@ class Config:
         """
         if not self.ensure_directory():
             return False
+        # Written by the standard library, as the file is meant to be
+        # edited by hand, indented as it always was, which orjson cannot.
+        data = json.dumps(self._config, indent=4).encode("utf-8")
         try:
-            with self._path.open("w", encoding="utf-8") as file:
-                json.dump(self._config, file, indent=4)
+            self._path.write_bytes(data)
         except OSError:
             return False
         self._path.chmod(0o600)  # -rw-------
+        # Everything saved has been validated by `set` or on load.
+        self._write_stamp(self._stamp(data))
         return True
 
     def all(self) -> dict:
@@ -13,6 +13,46 @@ DIR_ROOT = Path(__file__).parent.parent
 DIR_APPDATA = Path(get_app_dir(APP_NAME))
 FILE_CONFIG = DIR_APPDATA / "config.json"
 FILE_DB = DIR_APPDATA / "db.sqlite"
+# Index of alias and mailbox identifiers read by shell completion.
+FILE_COMPLETION = DIR_APPDATA / "completion.idx"
+# Version of the database schema, stored in the database file. Bump it
+# whenever the models change; databases of other versions are rebuilt.
+DB_SCHEMA_VERSION = 12
+
+# JSON libraries used for encoding and decoding, in order of preference.
+# Those not installed are skipped; "json" is the standard library.
+JSON_CODECS = ("orjson", "ujson", "json")
+
+# `database sync` writes this many pages of results per commit, and
+# fetches at most this many pages ahead of writing them.
+SYNC_BATCH_PAGES = 10
+SYNC_QUEUE_PAGES = 4
+# `database sync --deep` writes the contacts and activities of this
+# many aliases per commit.
+SYNC_BATCH_ALIASES = 100
+
+# `alias activity --follow` polls each alias at intervals, in seconds,
+# of at least and at most these. Intervals are divided by the factor
+# after a poll finds new activities, and multiplied by it otherwise.
+FOLLOW_MIN_INTERVAL = 5
+FOLLOW_MAX_INTERVAL = 300
+FOLLOW_BACKOFF = 2
+
+# SimpleLogin accepts the signed suffixes of new custom aliases for this
+# many seconds after they are fetched. Alias options are not used once
+# they are within the margin of that, to leave time for the request
+# that uses them.
+SIGNED_SUFFIX_MAX_AGE = 600
+SIGNED_SUFFIX_MARGIN = 60
+
+# `export` writes archives of this format and version, which
+# `import-local` reads. The archive is compressed by the compression of
+# its suffix, or gzip; zstd needs the `zstandard` package.
+EXPORT_FORMAT = "simplelogin-export"
+EXPORT_VERSION = 1
+EXPORT_COMPRESSIONS = {".gz": "gzip", ".zst": "zstd"}
+# `import-local` writes this many objects of each kind per statement.
+EXPORT_BATCH_ROWS = 1000
 
 
 CONFIG_SCHEMA = {
@@ -41,6 +81,43 @@ CONFIG_SCHEMA = {
                 },
             },
         },
+        "sync": {
+            "type": "object",
+            "additionalProperties": False,
+            "properties": {
+                "workers": {
+                    "type": "integer",
+                    "minimum": 1,
+                },
+                "requests-per-second": {
+                    "type": "number",
+                    "minimum": 0,
+                },
+            },
+        },
+        "cache": {
+            "type": "object",
+            "additionalProperties": False,
+            "properties": {
+                "max-age": {
+                    "type": "integer",
+                    "minimum": 0,
+                },
+                "options-max-age": {
+                    "type": "integer",
+                    "minimum": 0,
+                },
+            },
+        },
+        "offline": {
+            "type": "object",
+            "additionalProperties": False,
+            "properties": {
+                "queue": {
+                    "type": "boolean",
+                },
+            },
+        },
     },
 }
 
@@ -51,4 +128,15 @@ CONFIG_BASE = {
     "display": {
         "pager-threshold": 20,
     },
+    "sync": {
+        "workers": 4,
+        "requests-per-second": 10,
+    },
+    "cache": {
+        "max-age": 0,
+        "options-max-age": 300,
+    },
+    "offline": {
+        "queue": False,
+    },
 }
@@ -9,7 +9,13 @@ from sqlalchemy import (
     URL,
     Engine,
     create_engine,
+    func,
+    insert,
+    inspect,
+    select,
+    text,
 )
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 from sqlalchemy_utils import (
     create_database,
@@ -18,7 +24,7 @@ from sqlalchemy_utils import (
 )
 
 from simplelogincmd import const
-from simplelogincmd.database.models import Object
+from simplelogincmd.database.models import JournalEntry, Object
 from simplelogincmd.database.session import SimpleLoginSession
 
 
@@ -75,17 +81,56 @@ class DatabaseAccessLayer:
         self.base = declarative_base
         self.session = session_cls(self.engine)
 
+    def schema_version(self) -> int:
+        """
+        Get the schema version stored in the database
+
+        :return: The version, which is 0 for databases created before
+            schema versions were introduced
+        :rtype: int
+        """
+        with self.engine.connect() as connection:
+            return connection.execute(text("PRAGMA user_version")).scalar_one()
+
+    def _journal(self) -> list[dict]:
+        """
+        Read the changes queued while offline, in order
+
+        :raise sqlalchemy.exc.SQLAlchemyError: If the journal's table
+            does not match its model
+        """
+        table = JournalEntry.__table__
+        with self.engine.connect() as connection:
+            if not inspect(connection).has_table(table.name):
+                return []
+            query = select(table).order_by(table.c.id)
+            return [row._asdict() for row in connection.execute(query)]
+
     def initialize(self) -> bool:
         """
         Initialize the database if it does not already exist
 
         Create the database, as well as all its tables, if it does not
-        already exist. If it does, do nothing.
+        already exist. If it does, do nothing, unless its schema
+        version differs from :data:`~simplelogincmd.const.DB_SCHEMA_VERSION`.
+        The database then holds tables the models no longer match, and
+        since it only caches data from SimpleLogin, it is dropped and
+        created anew. Changes queued while offline are the exception:
+        they are carried over, and if they cannot be, the database is
+        left as it is.
 
         :return: Whether initialization succeeds
         :rtype: bool
         """
         url = self.engine.url
+        journal = []
+        if database_exists(url) and self.schema_version() != const.DB_SCHEMA_VERSION:
+            try:
+                journal = self._journal()
+            except SQLAlchemyError:
+                return False
+            if not self.destroy():
+                return False
         if not database_exists(url):
             try:
                 create_database(url)
@@ -95,8 +140,42 @@ class DatabaseAccessLayer:
                 return False
             os.chmod(url.database, 0o600)  # -rw-------
             self.base.metadata.create_all(self.engine)
+            with self.engine.begin() as connection:
+                # PRAGMA does not accept bound parameters.
+                version = int(const.DB_SCHEMA_VERSION)
+                connection.execute(text(f"PRAGMA user_version = {version}"))
+                if journal:
+                    connection.execute(insert(JournalEntry.__table__), journal)
         return True
 
+    def pending(self) -> int:
+        """
+        Count the changes queued while offline
+
+        :return: The number of changes, which is 0 if the database does
+            not exist
+        :rtype: int
+        """
+        if not database_exists(self.engine.url):
+            return 0
+        table = JournalEntry.__table__
+        with self.engine.connect() as connection:
+            if not inspect(connection).has_table(table.name):
+                return 0
+            query = select(func.count()).select_from(table)
+            return connection.execute(query).scalar_one()
+
+    def analyze(self) -> None:
+        """
+        Gather the statistics by which SQLite chooses among indexes
+
+        Without them, SQLite takes any index on a column compared for
+        equality to be selective, such as one on a flag most rows share.
+        Call this after writing many objects, as a sync does.
+        """
+        self.session.execute(text("ANALYZE"))
+        self.session.commit()
+
     def destroy(self) -> bool:
         """
         Drop the entire database
@@ -0,0 +1,173 @@
+"""
+A cache of the options of new custom aliases
+
+Before a custom alias is created, SimpleLogin is asked for the options
+of new aliases for its hostname: whether one can be created, a prefix
+suggestion, and the suffixes that may be used, each signed so that it
+cannot be forged. These rarely change between creations, so they are
+kept in the local database for a short while, and shared by every
+command creating aliases in the meantime.
+
+SimpleLogin only accepts a signed suffix for
+:data:`~simplelogincmd.const.SIGNED_SUFFIX_MAX_AGE` seconds after
+signing it, so options are never kept that long, however long they are
+asked to be. The window is counted from when the options were fetched,
+rather than from the time of signing carried by the suffixes, which is
+that of SimpleLogin's clock rather than the local one.
+"""
+
+import re
+import time
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+from simplelogincmd import const
+from simplelogincmd.database.models import alias_options
+
+
+# SimpleLogin's errors for a signed suffix past its time, or not signed
+# as it should be.
+_REJECTED_SUFFIX = re.compile(
+    r"\bexpired\b"
+    r"|\b(invalid|tampered)\b.*\bsuffix\b"
+    r"|\bsuffix\b.*\b(invalid|tampered)\b",
+    re.IGNORECASE,
+)
+
+
+def lifetime(max_age: int) -> int:
+    """
+    Tell how long options may be kept
+
+    :param max_age: How long they are asked to be kept, in seconds
+    :type max_age: int
+
+    :return: `max_age`, unless their signed suffixes would expire sooner
+    :rtype: int
+    """
+    window = const.SIGNED_SUFFIX_MAX_AGE - const.SIGNED_SUFFIX_MARGIN
+    return min(max_age, window)
+
+
+def _fresh(max_age: int, now: int | None):
+    now = int(time.time()) if now is None else now
+    return alias_options.c.fetched > now - lifetime(max_age)
+
+
+def load(
+    session: Session, max_age: int, now: int | None = None
+) -> dict[str | None, tuple]:
+    """
+    Load all the options that are still fresh
+
+    :param session: A session of the local database
+    :type session: :class:`sqlalchemy.orm.Session`
+    :param max_age: How long options are kept, in seconds, subject to
+        :func:`lifetime`
+    :type max_age: int
+    :param now: The time, in seconds since the epoch, defaults to now
+    :type now: int, optional
+
+    :return: The options of each hostname, or None, and when they were
+        fetched
+    :rtype: dict[str | None, tuple[dict, int]]
+    """
+    query = select(alias_options).where(_fresh(max_age, now))
+    return {
+        row.hostname or None: (row.options, row.fetched)
+        for row in session.execute(query)
+    }
+
+
+def get(
+    session: Session, hostname: str | None, max_age: int, now: int | None = None
+) -> dict | None:
+    """
+    Get the options of a hostname, if they are still fresh
+
+    :param session: A session of the local database
+    :type session: :class:`sqlalchemy.orm.Session`
+    :param hostname: The hostname, if any
+    :type hostname: str, optional
+    :param max_age: How long options are kept, in seconds, subject to
+        :func:`lifetime`
+    :type max_age: int
+    :param now: The time, in seconds since the epoch, defaults to now
+    :type now: int, optional
+
+    :rtype: dict, optional
+    """
+    query = select(alias_options.c.options).where(
+        alias_options.c.hostname == (hostname or ""), _fresh(max_age, now)
+    )
+    return session.scalar(query)
+
+
+def put(
+    session: Session,
+    hostname: str | None,
+    options: dict,
+    fetched: int | None = None,
+) -> None:
+    """
+    Keep the options of a hostname, and drop those that can no longer
+    be used
+
+    :param session: A session of the local database
+    :type session: :class:`sqlalchemy.orm.Session`
+    :param hostname: The hostname, if any
+    :type hostname: str, optional
+    :param options: The options, as returned by SimpleLogin
+    :type options: dict
+    :param fetched: When they were fetched, in seconds since the epoch,
+        defaults to now
+    :type fetched: int, optional
+    """
+    fetched = int(time.time()) if fetched is None else fetched
+    expired = alias_options.c.fetched <= fetched - const.SIGNED_SUFFIX_MAX_AGE
+    session.execute(delete(alias_options).where(expired))
+    statement = insert(alias_options).values(
+        hostname=hostname or "", fetched=fetched, options=options
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=[alias_options.c.hostname],
+        set_=dict(
+            fetched=statement.excluded.fetched, options=statement.excluded.options
+        ),
+    )
+    session.execute(statement)
+
+
+def drop(session: Session, hostname: str | None) -> None:
+    """
+    Forget the options of a hostname, once they may no longer hold
+
+    Creating an alias changes SimpleLogin's recommendation for its
+    hostname, and a failure may mean that the options have gone stale.
+
+    :param session: A session of the local database
+    :type session: :class:`sqlalchemy.orm.Session`
+    :param hostname: The hostname, if any
+    :type hostname: str, optional
+    """
+    session.execute(
+        delete(alias_options).where(alias_options.c.hostname == (hostname or ""))
+    )
+
+
+def rejected(error: str) -> bool:
+    """
+    Tell whether a custom alias was not created because its signed
+    suffix was refused, as one from options kept too long may be
+
+    Options fetched anew may then succeed where those kept did not,
+    whereas any other failure would only happen again.
+
+    :param error: SimpleLogin's error
+    :type error: str
+
+    :rtype: bool
+    """
+    return _REJECTED_SUFFIX.search(error) is not None
@@ -0,0 +1,160 @@
+"""
+The history of alias counters
+
+SimpleLogin only reports how many emails each alias has forwarded,
+blocked and replied to in total. Whenever aliases are written in bulk,
+the changes of their counters are recorded in the `alias_counter`
+table, so that how fast they change, and which aliases have lately
+started receiving more email, can be told from the local database
+alone.
+"""
+
+import time
+from collections import namedtuple
+from collections.abc import Sequence
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+from simplelogincmd.database import rates
+from simplelogincmd.database.models import Alias, FieldAccess, alias_counter
+
+
+#: The counters of an alias, recorded by :func:`record`.
+COUNTERS = ("nb_forward", "nb_block", "nb_reply")
+
+SECONDS_PER_DAY = 24 * 60 * 60
+
+
+class Movement(
+    FieldAccess,
+    namedtuple("Movement", ("id", "email", *COUNTERS, "per_day")),
+):
+    """
+    The changes of an alias's counters over a window of time
+
+    `per_day` is the average daily change of the counter by which
+    aliases were ranked.
+    """
+
+    __slots__ = ()
+
+
+def record(session: Session, rows: Sequence[dict], taken: int | None = None) -> int:
+    """
+    Record the changes of the counters of aliases about to be written
+
+    Each alias's counters are compared with the sum of its recorded
+    changes, and a row is added for those that differ. The rates of
+    the aliases with a row are then updated by :func:`.rates.update`.
+
+    :param session: A session of the local database
+    :type session: :class:`sqlalchemy.orm.Session`
+    :param rows: The alias rows, each with the alias's `id` and
+        :data:`COUNTERS`
+    :type rows: Sequence[dict]
+    :param taken: When the counters were read, in seconds since the
+        epoch, defaults to now
+    :type taken: int, optional
+
+    :return: The number of aliases whose counters changed
+    :rtype: int
+    """
+    if not rows:
+        return 0
+    taken = int(time.time()) if taken is None else taken
+    columns = [func.sum(alias_counter.c[name]) for name in COUNTERS]
+    query = (
+        select(alias_counter.c.alias_id, *columns)
+        .where(alias_counter.c.alias_id.in_([row["id"] for row in rows]))
+        .group_by(alias_counter.c.alias_id)
+    )
+    recorded = {alias_id: totals for alias_id, *totals in session.execute(query)}
+    changes = []
+    for row in rows:
+        counters = [row[name] or 0 for name in COUNTERS]
+        totals = recorded.get(row["id"])
+        if totals is None:
+            deltas, initial = counters, True
+        else:
+            deltas = [new - old for new, old in zip(counters, totals)]
+            initial = False
+            if not any(deltas):
+                continue
+        changes.append(
+            dict(
+                zip(COUNTERS, deltas),
+                alias_id=row["id"],
+                taken=taken,
+                initial=initial,
+            )
+        )
+    if changes:
+        statement = insert(alias_counter)
+        # Changes recorded twice in the same second add up.
+        statement = statement.on_conflict_do_update(
+            index_elements=[alias_counter.c.alias_id, alias_counter.c.taken],
+            set_={
+                name: alias_counter.c[name] + statement.excluded[name]
+                for name in COUNTERS
+            },
+        )
+        session.execute(statement, changes)
+        created = {row["id"]: row.get("creation_timestamp") for row in rows}
+        rates.update(session, changes, created, taken)
+    return len(changes)
+
+
+def movers(
+    session: Session,
+    window: int,
+    by: str = "nb_block",
+    limit: int | None = None,
+    now: int | None = None,
+) -> list[Movement]:
+    """
+    Find the aliases whose counters changed most over a window of time
+
+    The changes are summed by a single aggregate query. Initial rows
+    are left out, as they hold counters, not changes.
+
+    :param session: A session of the local database
+    :type session: :class:`sqlalchemy.orm.Session`
+    :param window: The length of the window, in seconds, ending now
+    :type window: int
+    :param by: The counter by which to rank the aliases, one of
+        :data:`COUNTERS`, defaults to "nb_block"
+    :type by: str, optional
+    :param limit: The most aliases to find, defaults to all
+    :type limit: int, optional
+    :param now: The end of the window, in seconds since the epoch,
+        defaults to now
+    :type now: int, optional
+
+    :return: The movements of the aliases, largest change of `by` first
+    :rtype: list[Movement]
+    """
+    now = int(time.time()) if now is None else now
+    since = now - window
+    # If counters have not been recorded for the whole window, their
+    # changes took place since the first were.
+    first = session.scalar(select(func.min(alias_counter.c.taken)))
+    if first is None:
+        return []
+    days = max(now - max(since, first), 1) / SECONDS_PER_DAY
+    sums = [func.sum(alias_counter.c[name]).label(name) for name in COUNTERS]
+    query = (
+        select(Alias.id, Alias.email, *sums)
+        .select_from(alias_counter)
+        .join(Alias, Alias.id == alias_counter.c.alias_id)
+        .where(alias_counter.c.taken > since, alias_counter.c.initial.is_(False))
+        .group_by(Alias.id)
+        .having(func.sum(alias_counter.c[by]) > 0)
+        .order_by(func.sum(alias_counter.c[by]).desc(), Alias.id)
+        .limit(limit)
+    )
+    return [
+        Movement(*row, per_day=round(getattr(row, by) / days, 1))
+        for row in session.execute(query)
+    ]
@@ -0,0 +1,259 @@
+"""
+Expressions selecting and ordering model objects
+
+A `where` expression is a condition on the columns of a model's table,
+such as::
+
+    nb_forward > 100 and enabled and note ~ "shop"
+
+It is made of comparisons, ``field op value``, joined with `and`, `or`
+and `not`, and grouped with parentheses. The operators are `=` (or
+`==`), `!=`, `<`, `<=`, `>`, `>=`, and `~` and `!~`, which test whether
+a text field contains a value, ignoring case. A value is an integer, a
+quoted string, `true`, `false`, `null`, or another field. A field on its
+own is true if it is set and neither false, zero nor empty.
+
+A `sort` expression is a comma-separated list of fields, each ordering
+from lowest to highest, or if prefixed with `-`, from highest to lowest.
+
+Both compile to SQLAlchemy clauses, in which values are bound
+parameters, never SQL text.
+"""
+
+import operator
+import re
+from typing import Any
+
+from sqlalchemy import Boolean, ColumnElement, Integer, String, and_, not_, or_
+
+from simplelogincmd.database import matching
+from simplelogincmd.database.models import Object
+
+
+_TOKEN = re.compile(
+    r"""
+    \s*(?:
+        (?P<number>-?\d+)(?![\w.])
+      | (?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+      | (?P<op>==|!=|<=|>=|!~|[=<>~])
+      | (?P<paren>[()])
+      | (?P<word>[A-Za-z_]\w*)
+      | (?P<error>\S)
+    )
+    """,
+    re.VERBOSE,
+)
+
+_OPERATORS = {
+    "=": operator.eq,
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+_KEYWORDS = {"and", "or", "not"}
+_CONSTANTS = {"true": True, "false": False, "null": None}
+
+
+def _tokenize(text: str) -> list[tuple[str, str]]:
+    tokens = []
+    position = 0
+    while match := _TOKEN.match(text, position):
+        position = match.end()
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == "error":
+            raise ValueError(f"Unexpected character {value!r}")
+        tokens.append((kind, value))
+    return tokens
+
+
+def _unquote(text: str) -> str:
+    return re.sub(r"\\(.)", r"\1", text[1:-1])
+
+
+class _Parser:
+    """
+    Recursive-descent parser of a `where` expression::
+
+        disjunction := conjunction ("or" conjunction)*
+        conjunction := negation ("and" negation)*
+        negation    := "not" negation | atom
+        atom        := "(" disjunction ")" | field [op value]
+    """
+
+    def __init__(self, model: type[Object], text: str) -> None:
+        self.model = model
+        self.tokens = _tokenize(text)
+        self.position = 0
+
+    def peek(self) -> tuple[str, str] | None:
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return None
+
+    def next(self, expected: str) -> tuple[str, str]:
+        token = self.peek()
+        if token is None:
+            raise ValueError(f"Expected {expected}, found the end")
+        self.position += 1
+        return token
+
+    def keyword(self, word: str) -> bool:
+        if self.peek() == ("word", word):
+            self.position += 1
+            return True
+        return False
+
+    def parse(self) -> ColumnElement:
+        condition = self.disjunction()
+        if (token := self.peek()) is not None:
+            raise ValueError(f"Unexpected {token[1]!r}")
+        return condition
+
+    def disjunction(self) -> ColumnElement:
+        terms = [self.conjunction()]
+        while self.keyword("or"):
+            terms.append(self.conjunction())
+        return terms[0] if len(terms) == 1 else or_(*terms)
+
+    def conjunction(self) -> ColumnElement:
+        terms = [self.negation()]
+        while self.keyword("and"):
+            terms.append(self.negation())
+        return terms[0] if len(terms) == 1 else and_(*terms)
+
+    def negation(self) -> ColumnElement:
+        if self.keyword("not"):
+            return not_(self.negation())
+        return self.atom()
+
+    def atom(self) -> ColumnElement:
+        kind, text = self.next("a field")
+        if (kind, text) == ("paren", "("):
+            condition = self.disjunction()
+            if self.next("')'") != ("paren", ")"):
+                raise ValueError("Expected ')'")
+            return condition
+        if kind != "word" or text in _KEYWORDS or text in _CONSTANTS:
+            raise ValueError(f"Expected a field, found {text!r}")
+        column = _column(self.model, text)
+        token = self.peek()
+        if token is None or token[0] != "op":
+            return _truth(column)
+        self.position += 1
+        return _compare(column, token[1], self.value())
+
+    def value(self) -> Any:
+        kind, text = self.next("a value")
+        if kind == "number":
+            return int(text)
+        if kind == "string":
+            return _unquote(text)
+        if kind == "word" and text in _CONSTANTS:
+            return _CONSTANTS[text]
+        if kind == "word" and text not in _KEYWORDS:
+            return _column(self.model, text)
+        raise ValueError(f"Expected a value, found {text!r}")
+
+
+def fields(model: type[Object]) -> list[str]:
+    """
+    List the fields that expressions on a model can refer to
+
+    :param model: The model class
+    :type model: type[Object]
+
+    :rtype: list[str]
+    """
+    return [name for name in model.__table__.columns.keys() if name != "content_hash"]
+
+
+def _column(model: type[Object], name: str) -> ColumnElement:
+    if name not in fields(model):
+        valid = ", ".join(fields(model))
+        raise ValueError(f"Unknown field {name!r}. Valid fields: {valid}")
+    return model.__table__.columns[name]
+
+
+def _truth(column: ColumnElement) -> ColumnElement:
+    if isinstance(column.type, Boolean):
+        return column.is_(True)
+    if isinstance(column.type, String):
+        return and_(column.is_not(None), column != "")
+    return and_(column.is_not(None), column != 0)
+
+
+def _check_type(column: ColumnElement, value: Any) -> None:
+    if value is None or isinstance(value, ColumnElement):
+        return
+    if isinstance(column.type, Boolean):
+        valid = isinstance(value, bool)
+    elif isinstance(column.type, Integer):
+        valid = isinstance(value, int) and not isinstance(value, bool)
+    else:
+        valid = isinstance(value, str)
+    if not valid:
+        raise ValueError(f"{column.key} cannot be compared with {value!r}")
+
+
+def _compare(column: ColumnElement, op: str, value: Any) -> ColumnElement:
+    _check_type(column, value)
+    if op in ("~", "!~"):
+        if not isinstance(value, str) or not isinstance(column.type, String):
+            raise ValueError(f"'{op}' compares a text field with a string")
+        pattern = matching.substring_pattern(value)
+        contains = column.like(pattern, escape="\\")
+        # A missing value contains nothing, and so does not contain `value`.
+        return contains if op == "~" else or_(column.is_(None), not_(contains))
+    if value is None:
+        if op in ("=", "=="):
+            return column.is_(None)
+        if op == "!=":
+            return column.is_not(None)
+        raise ValueError(f"null cannot be compared with '{op}'")
+    return _OPERATORS[op](column, value)
+
+
+def compile_where(model: type[Object], text: str) -> ColumnElement:
+    """
+    Compile a `where` expression into a condition on a model's table
+
+    :param model: The model class
+    :type model: type[Object]
+    :param text: The expression
+    :type text: str
+
+    :return: The condition, to be passed to
+        :meth:`sqlalchemy.Select.where`
+    :rtype: :class:`sqlalchemy.ColumnElement`
+
+    :raise ValueError: If the expression is invalid
+    """
+    return _Parser(model, text).parse()
+
+
+def compile_sort(model: type[Object], text: str) -> list[ColumnElement]:
+    """
+    Compile a `sort` expression into an ordering of a model's table
+
+    :param model: The model class
+    :type model: type[Object]
+    :param text: The expression
+    :type text: str
+
+    :return: The ordering, to be passed to
+        :meth:`sqlalchemy.Select.order_by`
+    :rtype: list[:class:`sqlalchemy.ColumnElement`]
+
+    :raise ValueError: If the expression is invalid
+    """
+    ordering = []
+    for item in text.split(","):
+        name = item.strip()
+        descending = name.startswith("-")
+        column = _column(model, name.lstrip("-+").strip())
+        ordering.append(column.desc() if descending else column.asc())
+    return ordering
@@ -0,0 +1,137 @@
+"""
+Fuzzy matching of identifiers against text
+
+An identifier typed by the user matches a piece of text, such as an
+alias's email address or note, in one of several ways, from best to
+worst: the whole text, the start of it, the start of one of its words,
+anywhere within it, or as a subsequence of its characters (each in
+order, though not necessarily adjacent). Case is ignored.
+
+The score of a match is its tier, plus a fraction for how much of the
+text the identifier covers, so that among matches of a tier, those of
+shorter texts rank first.
+
+Before matching, an identifier is classified as an integer, an email
+address, part of one, or other text, so that each can be looked up by
+the query best suited to it.
+"""
+
+import re
+from typing import Any
+
+
+#: The identifier is the object's id.
+ID = 6
+EXACT = 5
+PREFIX = 4
+TOKEN = 3
+SUBSTRING = 2
+SUBSEQUENCE = 1
+
+
+# Kinds of identifiers. See `classify`.
+INTEGER = "integer"
+EMAIL = "email"
+FRAGMENT = "fragment"
+TEXT = "text"
+
+_EMAIL = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s.]+")
+
+
+def classify(query: Any) -> str:
+    """
+    Tell what kind of identifier a user has typed
+
+    :param query: The identifier
+    :type query: Any
+
+    :return: :data:`INTEGER` for a whole number, which may be an id,
+        :data:`EMAIL` for a complete email address, :data:`FRAGMENT` for
+        part of one, i.e. other text with an `@` and no whitespace, and
+        :data:`TEXT` for anything else
+    :rtype: str
+    """
+    text = str(query)
+    # Larger numbers cannot be stored as SQLite integers.
+    if text.isascii() and text.isdigit() and int(text) < 2**63:
+        return INTEGER
+    if _EMAIL.fullmatch(text):
+        return EMAIL
+    if "@" in text and not any(char.isspace() for char in text):
+        return FRAGMENT
+    return TEXT
+
+
+def _tier(query: str, text: str) -> int:
+    if text == query:
+        return EXACT
+    if text.startswith(query):
+        return PREFIX
+    start = text.find(query)
+    if start >= 0:
+        while start >= 0:
+            if not text[start - 1].isalnum():
+                return TOKEN
+            start = text.find(query, start + 1)
+        return SUBSTRING
+    remaining = iter(text)
+    if all(char in remaining for char in query):
+        return SUBSEQUENCE
+    return 0
+
+
+def score(query: str, text: str | None) -> float:
+    """
+    Score how well an identifier matches a piece of text
+
+    :param query: The identifier
+    :type query: str
+    :param text: The text, if any
+    :type text: str, optional
+
+    :return: The tier of the match (one of :data:`EXACT`,
+        :data:`PREFIX`, :data:`TOKEN`, :data:`SUBSTRING` and
+        :data:`SUBSEQUENCE`) plus a fraction below 1, or 0 if there is
+        no match
+    :rtype: float
+    """
+    if not query or not text:
+        return 0
+    query = query.casefold()
+    text = text.casefold()
+    if not (tier := _tier(query, text)):
+        return 0
+    return tier + len(query) / (len(text) + 1)
+
+
+def _escape(query: str) -> list[str]:
+    return ["\\" + char if char in "\\%_" else char for char in query.casefold()]
+
+
+def substring_pattern(query: str) -> str:
+    """
+    Make a `LIKE` pattern matching every text containing an identifier
+
+    The pattern is to be used with a backslash as the escape character.
+
+    :param query: The identifier
+    :type query: str
+
+    :rtype: str
+    """
+    return "%" + "".join(_escape(query)) + "%"
+
+
+def subsequence_pattern(query: str) -> str:
+    """
+    Make a `LIKE` pattern matching every text of which an identifier is
+    a subsequence
+
+    The pattern is to be used with a backslash as the escape character.
+
+    :param query: The identifier
+    :type query: str
+
+    :rtype: str
+    """
+    return "%" + "%".join(_escape(query)) + "%"
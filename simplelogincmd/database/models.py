@@ -2,21 +2,35 @@
 SimpleLogin object models
 """
 
-from typing import Any
+import heapq
+from typing import Any, ClassVar
 
 from sqlalchemy import (
+    JSON,
+    Boolean,
+    Column,
+    Float,
+    Index,
+    Integer,
     Select,
-    inspect,
+    String,
+    Table,
+    event,
+    or_,
     select,
 )
-from sqlalchemy.exc import InvalidRequestError
 from sqlalchemy.orm import (
     DeclarativeBase,
     Mapped,
+    Mapper,
+    ORMExecuteState,
     Session,
+    configure_mappers,
     mapped_column,
 )
 
+from simplelogincmd.database import matching
+
 
 class LenientInit:
     """
@@ -24,34 +38,108 @@ class LenientInit:
 
     Usually, the model object constructor raises :exc:TypeError when
     it receives invalid keyword arguments. This lenient constructor
-    simply ensures that no invalid keyword arguments are given to the
-    default constructor, and returns any invalid arguments back to the
-    caller for processing.
+    simply ignores invalid keyword arguments, and returns them back to
+    the caller for processing.
 
     Subclasses can have `__init__` methods like this::
 
         def __init__(self, **kwargs):
             extra_kwargs = self._lenient_init(**kwargs)
             # Do something with the rest of the keyword args.
+
+    The set of valid arguments is computed once per class, when its
+    mapper is configured, rather than on every construction.
     """
 
+    # Names of the mapped attributes, i.e. the valid constructor
+    # arguments, and each of them mapped to None. Set on each subclass
+    # by `_plan_lenient_init`.
+    _lenient_keys: frozenset[str]
+    _lenient_blank: dict[str, None]
+
     def _lenient_init(self, **kwargs) -> dict:
         """
         Initialize `self` with valid arguments only
 
-        Remaining arguments are returned unchanged.
+        Remaining arguments are returned unchanged. Attributes for
+        which no argument is given are set to `None`, so that merging
+        the object clears them, as it does values the API left out.
 
         :rtype: dict
         """
         cls = type(self)
-        mapper = inspect(cls)
-        attrs = [attr.key for attr in mapper.attrs]
-        valid = {attr: kwargs.pop(attr, None) for attr in attrs}
-        super().__init__(**valid)
+        if (keys := cls.__dict__.get("_lenient_keys")) is None:
+            # Mappers are normally configured before the first object
+            # is constructed, but make sure.
+            configure_mappers()
+            keys = cls._lenient_keys
+        valid = {key: kwargs.pop(key) for key in keys & kwargs.keys()}
+        # `self` is brand new and transient, so the values can go
+        # straight into its instance dict, skipping the attribute events
+        # that the default constructor would fire for every one of them.
+        # Flushes and merges of transient objects read that dict
+        # directly, so nothing downstream needs those events.
+        self.__dict__.update(cls._lenient_blank)
+        self.__dict__.update(valid)
         return kwargs
 
 
-class Object(DeclarativeBase):
+class FieldAccess:
+    """
+    Mixin class that provides uniform access to an object's fields
+
+    Shared by the database models and the lightweight records of the
+    REST layer, so that either can be displayed the same way.
+    """
+
+    __slots__ = ()
+
+    def get(self, field: str) -> str | None:
+        """
+        Retrieve the value of the given field
+
+        :param field: The name of the field to get
+        :type field: str
+
+        :return: The field's value, or None if the field is undefined
+        :rtype: str | None
+        """
+        return getattr(self, field, None)
+
+    def get_string(self, field: str) -> str:
+        """
+        Retrieve a string representation of the field
+
+        :param field: The name of the field to get
+        :type field: str
+
+        :return: String representation of the field's value
+
+            - if value is string, then return value
+            - if value is None, then ""
+            - if value is bool, then "Y" or "N"
+            - if value is iterable, then each element as a string,
+              separated by commas
+            - otherwise return str(value)
+
+        :rtype: str
+        """
+        value = self.get(field)
+        if isinstance(value, str):
+            return value
+        if value is None:
+            return ""
+        if isinstance(value, bool):
+            return "Y" if value else "N"
+        if not isinstance(value, dict):
+            try:
+                return ", ".join(str(elem) for elem in value)
+            except TypeError:
+                pass
+        return str(value)
+
+
+class Object(FieldAccess, DeclarativeBase):
     """
     Base class of all other SimpleLogin objects
     """
@@ -62,6 +150,13 @@ class Object(DeclarativeBase):
     def __eq__(self, other) -> bool:
         return type(self) is type(other) and self.id == other.id
 
+    #: The text columns that identifiers are matched against. See
+    #: :meth:`rank_identifier`.
+    identifier_columns: ClassVar[tuple[str, ...]] = ()
+    #: Those of the :attr:`identifier_columns` whose values each
+    #: identify a single object, and are indexed ignoring case.
+    unique_identifier_columns: ClassVar[tuple[str, ...]] = ()
+
     @classmethod
     def identifier_query(cls, query: Select, id: Any) -> Select:
         """
@@ -72,10 +167,10 @@ class Object(DeclarativeBase):
         how to find the objects to which `id` refers. Overriding
         implementations should restrict `query`, as via a call to
         :meth:`sqlalchemy.Select.where` or similar, to a condition that
-        identifies one (ideally) or more objects. For example, a
-        Mailbox model might allow to search through email addresses,
-        while an Alias model might search emails and alias notes for
-        a match.
+        identifies one (ideally) or more objects.
+
+        By default, the query is restricted to objects one of whose
+        :attr:`identifier_columns` contains `id`, ignoring case.
 
         :param query: The query to be conditioned
         :type query: :class:`sqlalchemy.Select`
@@ -86,19 +181,187 @@ class Object(DeclarativeBase):
         :return: The modified query
         :rtype: :class:`sqlalchemy.Select`
         """
-        return query
+        return cls._where_identifier_like(query, matching.substring_pattern(str(id)))
+
+    @classmethod
+    def fuzzy_identifier_query(cls, query: Select, id: Any) -> Select:
+        """
+        Restrict a query to objects an identifier loosely refers to
+
+        This is the fallback of :meth:`identifier_query`, for when it
+        finds nothing. By default, the query is restricted to objects of
+        which `id`, ignoring case, is a subsequence of any of the
+        :attr:`identifier_columns`.
+
+        :param query: The query to be conditioned
+        :type query: :class:`sqlalchemy.Select`
+        :param id: The identifier
+        :type id: Any
+
+        :return: The modified query
+        :rtype: :class:`sqlalchemy.Select`
+        """
+        return cls._where_identifier_like(query, matching.subsequence_pattern(str(id)))
+
+    @classmethod
+    def _where_identifier_like(
+        cls,
+        query: Select,
+        pattern: str,
+        columns: list | None = None,
+    ) -> Select:
+        if columns is None:
+            columns = [getattr(cls, name) for name in cls.identifier_columns]
+        if not columns:
+            return query
+        # SQLite's LIKE already ignores case, which `ilike` would spend
+        # a call to `lower` per value on.
+        return query.where(or_(*(c.like(pattern, escape="\\") for c in columns)))
+
+    @classmethod
+    def exact_identifier(cls, session: Session, id: Any) -> "Object | None":
+        """
+        Retrieve the model object an identifier names exactly
+
+        The object is the only one whose value of any of the
+        :attr:`unique_identifier_columns` is `id`, ignoring case. This is
+        an indexed lookup, so it is cheap to try before scanning for
+        partial matches.
+
+        :param session: The database session which is to search for the
+            object
+        :type session: :class:`sqlalchemy.orm.Session`
+        :param id: The identifier for which to search
+        :type id: Any
+
+        :return: The object, or `None` if there is none, or more than one
+        :rtype: Object, optional
+        """
+        if not cls.unique_identifier_columns:
+            return None
+        text = str(id)
+        columns = (getattr(cls, name) for name in cls.unique_identifier_columns)
+        condition = or_(*(c.collate("NOCASE") == text for c in columns))
+        objects = session.scalars(select(cls).where(condition).limit(2)).all()
+        return objects[0] if len(objects) == 1 else None
+
+    @classmethod
+    def rank_identifier(
+        cls,
+        session: Session,
+        id: Any,
+        limit: int | None = None,
+    ) -> list[tuple[float, "Object"]]:
+        """
+        Retrieve model objects matching a generic identifier, best first
+
+        `id` is first classified by
+        :func:`~simplelogincmd.database.matching.classify`, and looked up
+        by the cheapest query for its kind:
+
+        - An integer is looked up as a primary key, and nothing else.
+          Its object, if any, is the only match, scored
+          :data:`~simplelogincmd.database.matching.ID`.
+        - An email address is looked up by :meth:`exact_identifier`, its
+          object being the only match.
+        - An email fragment is matched against the
+          :attr:`unique_identifier_columns` only.
+
+        Addresses and fragments these find nothing for, and free text,
+        are matched against all the :attr:`identifier_columns`: the
+        objects selected by :meth:`identifier_query`, or if there are
+        none, by :meth:`fuzzy_identifier_query`, are scored by how well `id`
+        matches the best of their columns, as described in
+        :mod:`~simplelogincmd.database.matching`. Ties are ranked by id.
+
+        Rankings are remembered by `session` until it next writes to
+        the database, by a flush, a commit or a bulk statement, so an
+        identifier looked up again costs no query beyond loading its
+        objects.
+
+        :param session: The database session which is to search for
+            object(s)
+        :type session: :class:`sqlalchemy.orm.Session`
+        :param id: The identifier for which to search
+        :type id: Any
+        :param limit: The most objects to retrieve, defaults to all
+        :type limit: int, optional
+
+        :return: Each matching object with its score
+        :rtype: list[tuple[float, Object]]
+        """
+        memo = session.info.setdefault(_RANKINGS, {})
+        key = (cls, str(id), limit)
+        if (ranking := memo.get(key)) is None:
+            ranking = memo[key] = cls._rank_ids(session, id, limit)
+        if len(ranking) == 1:
+            # Likely already in the session's identity map.
+            by_id = {ranking[0][1]: session.get(cls, ranking[0][1])}
+        else:
+            ids = [object_id for _, object_id in ranking]
+            objects = session.scalars(select(cls).where(cls.id.in_(ids)))
+            by_id = {obj.id: obj for obj in objects}
+        return [
+            (score, by_id[object_id])
+            for score, object_id in ranking
+            if by_id.get(object_id) is not None
+        ]
+
+    @classmethod
+    def _rank_ids(
+        cls,
+        session: Session,
+        id: Any,
+        limit: int | None,
+    ) -> list[tuple[float, Any]]:
+        """
+        Rank the ids of the objects an identifier matches, best first
+        """
+        text = str(id)
+        kind = matching.classify(id)
+        if kind == matching.INTEGER:
+            # An id that is not found is not taken for text, which would
+            # match unrelated objects, as 4821 does shop.1a4b8c2d1@sl.com.
+            if (obj := session.get(cls, int(text))) is not None:
+                return [(matching.ID, obj.id)]
+            return []
+        if kind == matching.EMAIL:
+            if (obj := cls.exact_identifier(session, text)) is not None:
+                values = (obj.get(name) for name in cls.identifier_columns)
+                return [(max(matching.score(text, value) for value in values), obj.id)]
+        rows = []
+        if (
+            kind in (matching.EMAIL, matching.FRAGMENT)
+            and cls.unique_identifier_columns
+        ):
+            columns = [getattr(cls, name) for name in cls.unique_identifier_columns]
+            pattern = matching.substring_pattern(text)
+            query = select(cls.id, *columns)
+            query = cls._where_identifier_like(query, pattern, columns)
+            rows = session.execute(query).all()
+        if not rows:
+            columns = [getattr(cls, name) for name in cls.identifier_columns]
+            query = select(cls.id, *columns)
+            rows = session.execute(cls.identifier_query(query, id)).all()
+        if not rows:
+            rows = session.execute(cls.fuzzy_identifier_query(query, id)).all()
+        scored = []
+        for object_id, *values in rows:
+            best = max((matching.score(text, value) for value in values), default=0)
+            scored.append((best, -object_id))
+        if limit is None:
+            scored.sort(reverse=True)
+        else:
+            scored = heapq.nlargest(limit, scored)
+        return [(score, -object_id) for score, object_id in scored]
 
     @classmethod
     def resolve_identifier(cls, session: Session, id: Any) -> list["Object"]:
         """
         Retrieve a list of model objects based on a generic identifier
 
-        Attempt to produce a single model object by passing `id`
-        directly on to :meth:`sqlalchemy.orm.Session.get_one`. If
-        that fails, then fall back to
-        :meth:`~simplelogincmd.database.models.identifier_query`, which
-        subclasses can override in order to determine how that
-        particular model should interpret the identifier.
+        The objects are those found by :meth:`rank_identifier`, best
+        match first.
 
         :param session: The database session which is to search for
             object(s)
@@ -112,57 +375,42 @@ class Object(DeclarativeBase):
         :return: A list of zero or more matching model objects
         :rtype: list[Object]
         """
-        try:
-            return [session.get_one(cls, id)]
-        # Catch bad `id` value as well as no result found.
-        except InvalidRequestError:
-            query = select(cls)
-            query = cls.identifier_query(query, id)
-            return session.scalars(query).all()
+        return [obj for _, obj in cls.rank_identifier(session, id)]
 
-    def get(self, field: str) -> str | None:
-        """
-        Retrieve the value of the given field
 
-        :param field: The name of the field to get
-        :type field: str
+# Key of `Session.info` under which `Object.rank_identifier` remembers
+# rankings.
+_RANKINGS = "identifier_rankings"
 
-        :return: The field's value, or None if the field is undefined
-        :rtype: str | None
-        """
-        return getattr(self, field, None)
 
-    def get_string(self, field: str) -> str:
-        """
-        Retrieve a string representation of the field
+@event.listens_for(Session, "after_flush")
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_soft_rollback")
+def _forget_rankings(session: Session, *args) -> None:
+    """
+    Forget the rankings of identifiers once the database may differ
+    """
+    session.info.pop(_RANKINGS, None)
 
-        :param field: The name of the field to get
-        :type field: str
 
-        :return: String representation of the field's value
+@event.listens_for(Session, "do_orm_execute")
+def _forget_rankings_on_write(state: ORMExecuteState) -> None:
+    """
+    Forget the rankings of identifiers on writes that bypass flushes,
+    such as the bulk statements of :mod:`.session` and :mod:`.sync`
+    """
+    if state.is_insert or state.is_update or state.is_delete:
+        _forget_rankings(state.session)
 
-            - if value is string, then return value
-            - if value is None, then ""
-            - if value is bool, then "Y" or "N"
-            - if value is iterable, then each element as a string,
-              separated by commas
-            - otherwise return str(value)
 
-        :rtype: str
-        """
-        value = self.get(field)
-        if isinstance(value, str):
-            return value
-        if value is None:
-            return ""
-        if isinstance(value, bool):
-            return "Y" if value else "N"
-        if not isinstance(value, dict):
-            try:
-                return ", ".join(str(elem) for elem in value)
-            except TypeError:
-                pass
-        return str(value)
+@event.listens_for(Object, "mapper_configured", propagate=True)
+def _plan_lenient_init(mapper: Mapper, cls: type) -> None:
+    """
+    Precompute the valid constructor arguments of a lenient model class
+    """
+    if issubclass(cls, LenientInit):
+        cls._lenient_keys = frozenset(attr.key for attr in mapper.attrs)
+        cls._lenient_blank = dict.fromkeys(cls._lenient_keys)
 
 
 class Mailbox(LenientInit, Object):
@@ -171,6 +419,8 @@ class Mailbox(LenientInit, Object):
     """
 
     __tablename__ = "mailbox"
+    identifier_columns = ("email",)
+    unique_identifier_columns = ("email",)
 
     id: Mapped[int] = mapped_column(primary_key=True)
     email: Mapped[str] = mapped_column(unique=True)
@@ -178,6 +428,8 @@ class Mailbox(LenientInit, Object):
     verified: Mapped[bool]
     default: Mapped[bool]
     creation_timestamp: Mapped[int]
+    # Digest of the other columns. See `Record.content_hash`.
+    content_hash: Mapped[int] = mapped_column(nullable=True)
 
     def __init__(self, **kwargs) -> None:
         self._lenient_init(**kwargs)
@@ -185,12 +437,6 @@ class Mailbox(LenientInit, Object):
     def __str__(self) -> str:
         return self.email
 
-    @classmethod
-    def identifier_query(cls, query: Select, id: Any) -> Select:
-        like_string = f"%{id}%"
-        email_like = cls.email.ilike(like_string)
-        return query.where(email_like)
-
 
 class Alias(LenientInit, Object):
     """
@@ -198,19 +444,25 @@ class Alias(LenientInit, Object):
     """
 
     __tablename__ = "alias"
+    identifier_columns = ("email", "name", "note")
+    unique_identifier_columns = ("email",)
 
     id: Mapped[int] = mapped_column(primary_key=True)
     email: Mapped[str] = mapped_column(unique=True)
     name: Mapped[str] = mapped_column(nullable=True)
     note: Mapped[str] = mapped_column(nullable=True)
-    nb_block: Mapped[int]
-    nb_forward: Mapped[int]
-    nb_reply: Mapped[int]
+    # The counters and creation time are indexed, as `alias list
+    # --where` and `--sort` commonly filter and order by them.
+    nb_block: Mapped[int] = mapped_column(index=True)
+    nb_forward: Mapped[int] = mapped_column(index=True)
+    nb_reply: Mapped[int] = mapped_column(index=True)
     enabled: Mapped[bool]
     support_pgp: Mapped[bool]
     disable_pgp: Mapped[bool]
     pinned: Mapped[bool]
-    creation_timestamp: Mapped[int]
+    creation_timestamp: Mapped[int] = mapped_column(index=True)
+    # Digest of the other columns. See `Record.content_hash`.
+    content_hash: Mapped[int] = mapped_column(nullable=True)
 
     def __init__(self, **kwargs) -> None:
         extras = self._lenient_init(**kwargs)
@@ -228,13 +480,28 @@ class Alias(LenientInit, Object):
     def __str__(self) -> str:
         return self.email
 
-    @classmethod
-    def identifier_query(cls, query: Select, id: Any) -> Select:
-        like_string = f"%{id}%"
-        email_like = cls.email.ilike(like_string)
-        note_like = cls.note.ilike(like_string)
-        condition = email_like | note_like
-        return query.where(condition)
+
+# Email addresses are looked up ignoring case, by `exact_identifier`.
+Index("ix_mailbox_email_nocase", Mailbox.email.collate("NOCASE"))
+Index("ix_alias_email_nocase", Alias.email.collate("NOCASE"))
+# Identifiers are matched against these columns by a scan, which reads
+# this narrower index rather than the table. So does writing the
+# completion index.
+Index("ix_alias_identifiers", Alias.email, Alias.name, Alias.note)
+# Disabled and pinned aliases are few, and often listed on their own,
+# newest or oldest first. Most aliases are enabled, and an index of
+# them would be slower than a scan of the table. A query uses a partial
+# index only if its condition is written the same way as the index's.
+Index(
+    "ix_alias_disabled_created",
+    Alias.creation_timestamp,
+    sqlite_where=Alias.enabled.is_not(True),
+)
+Index(
+    "ix_alias_pinned_created",
+    Alias.creation_timestamp,
+    sqlite_where=Alias.pinned.is_(True),
+)
 
 
 class Contact(LenientInit, Object):
@@ -243,6 +510,7 @@ class Contact(LenientInit, Object):
     """
 
     __tablename__ = "contact"
+    identifier_columns = ("contact",)
 
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(nullable=True)
@@ -252,6 +520,10 @@ class Contact(LenientInit, Object):
     block_forward: Mapped[bool]
     last_email_sent_timestamp: Mapped[int] = mapped_column(nullable=True)
     creation_timestamp: Mapped[int]
+    # The alias to which the contact belongs.
+    alias_id: Mapped[int] = mapped_column(nullable=True, index=True)
+    # Digest of the other columns. See `Record.content_hash`.
+    content_hash: Mapped[int] = mapped_column(nullable=True)
 
     def __init__(self, **kwargs) -> None:
         self._lenient_init(**kwargs)
@@ -259,12 +531,6 @@ class Contact(LenientInit, Object):
     def __str__(self) -> str:
         return self.contact  # email address
 
-    @classmethod
-    def identifier_query(cls, query: Select, id: Any) -> Select:
-        like_string = f"%{id}%"
-        email_like = cls.contact.ilike(like_string)
-        return query.where(email_like)
-
 
 class Activity(LenientInit, Object):
     """
@@ -272,6 +538,7 @@ class Activity(LenientInit, Object):
     """
 
     __tablename__ = "activity"
+    identifier_columns = ("sender", "recipient")
 
     id: Mapped[int] = mapped_column(primary_key=True)
     action: Mapped[str]
@@ -280,6 +547,8 @@ class Activity(LenientInit, Object):
     reverse_alias: Mapped[str]
     reverse_alias_address: Mapped[str]
     timestamp: Mapped[int]
+    # The alias to which the activity belongs.
+    alias_id: Mapped[int] = mapped_column(nullable=True, index=True)
 
     def __init__(self, **kwargs):
         # SimpleLogin API sends "from" and "to" keys. Rename these to
@@ -293,10 +562,154 @@ class Activity(LenientInit, Object):
     def __str__(self) -> str:
         return self.action
 
-    @classmethod
-    def identifier_query(cls, query: Select, id: Any) -> Select:
-        like_string = f"%{id}%"
-        sender_like = cls.sender.ilike(like_string)
-        recipient_like = cls.recipient.ilike(like_string)
-        condition = sender_like | recipient_like
-        return query.where(condition)
+
+# Covers the reports of `simplelogincmd.database.report`, which count
+# activities by sender and action, or by time and action, so that they
+# read the index rather than the table.
+Index(
+    "ix_activity_sender_action_timestamp",
+    Activity.sender,
+    Activity.action,
+    Activity.timestamp,
+)
+
+
+class SyncCheckpoint(Object):
+    """
+    The progress of an unfinished `database sync` through one endpoint
+
+    Checkpoints are committed together with the pages they record, so
+    an interrupted sync can continue after the last page written.
+    """
+
+    __tablename__ = "sync_checkpoint"
+
+    # The API endpoint being synchronized.
+    id: Mapped[str] = mapped_column(primary_key=True)
+    run_id: Mapped[str]
+    # The `page_id` of the last page written.
+    page_id: Mapped[int]
+    # When the run began, in seconds since the epoch, which no page of
+    # it was fetched before, even if it was resumed.
+    started: Mapped[int]
+
+
+class JournalEntry(Object):
+    """
+    A change to an alias made while offline, waiting to be replayed
+
+    Entries are replayed in the order of their ids. `base` holds the
+    values, before the change, of the fields it changes, so that changes
+    made on SimpleLogin in the meantime are detected as conflicts.
+    """
+
+    __tablename__ = "journal"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    # The alias changed. Not named `alias_id`, so that removing the
+    # alias locally does not remove its entries along with it.
+    object_id: Mapped[int] = mapped_column(index=True)
+    action: Mapped[str]
+    changes: Mapped[dict] = mapped_column(JSON)
+    base: Mapped[dict] = mapped_column(JSON)
+    created: Mapped[int]
+
+    def __str__(self) -> str:
+        return f"{self.action} alias {self.object_id}"
+
+
+# The pages of each endpoint as last written by `database sync`: the
+# digest of each page, and the ids of the objects on it. Unchanged pages
+# are recognized by their digests and skipped, and objects on no page
+# no longer exist on SimpleLogin. Contacts and activities, which are
+# fetched per alias, are digested per alias, the alias id standing in
+# for `page_id`.
+sync_page = Table(
+    "sync_page",
+    Object.metadata,
+    Column("endpoint", String, primary_key=True),
+    Column("page_id", Integer, primary_key=True),
+    Column("digest", Integer, nullable=False),
+)
+
+sync_item = Table(
+    "sync_item",
+    Object.metadata,
+    Column("endpoint", String, primary_key=True),
+    Column("page_id", Integer, primary_key=True),
+    Column("item_id", Integer, primary_key=True),
+)
+
+# When the last complete `database sync` of each endpoint began, in
+# seconds since the epoch. Every object then listed on the endpoint's
+# pages was fetched since, so the run is recorded once rather than on
+# each object.
+sync_run = Table(
+    "sync_run",
+    Object.metadata,
+    Column("endpoint", String, primary_key=True),
+    Column("fetched", Integer, nullable=False),
+)
+
+# When aliases were last read from SimpleLogin other than by a sync that
+# found them unchanged, in seconds since the epoch, so that `alias get`
+# can tell, together with `sync_run`, which local copies are fresh
+# enough to show without fetching them.
+alias_fetched = Table(
+    "alias_fetched",
+    Object.metadata,
+    Column("alias_id", Integer, primary_key=True),
+    Column("fetched", Integer, nullable=False),
+)
+
+# The options of new custom aliases last fetched for each hostname, ""
+# standing for none, and when they were fetched, in seconds since the
+# epoch. See `simplelogincmd.database.alias_options`.
+alias_options = Table(
+    "alias_options",
+    Object.metadata,
+    Column("hostname", String, primary_key=True),
+    Column("fetched", Integer, nullable=False),
+    Column("options", JSON, nullable=False),
+)
+
+# The changes of each alias's counters, as recorded whenever aliases
+# are written in bulk. A row is added only for aliases whose counters
+# have changed, and holds the change since the alias's previous row,
+# so the sum of an alias's rows is its counters as last recorded. The
+# first row of an alias holds the counters themselves, and is marked
+# `initial`, as they changed over an unknown time.
+alias_counter = Table(
+    "alias_counter",
+    Object.metadata,
+    Column("alias_id", Integer, primary_key=True),
+    # When the counters were read, in seconds since the epoch.
+    Column("taken", Integer, primary_key=True),
+    Column("nb_forward", Integer, nullable=False),
+    Column("nb_block", Integer, nullable=False),
+    Column("nb_reply", Integer, nullable=False),
+    Column("initial", Boolean, nullable=False),
+    Index("ix_alias_counter_taken", "taken"),
+)
+
+
+# The exponentially weighted rate of each alias's counters, by which
+# `simplelogincmd.database.rates` detects spikes. Unlike `alias_counter`,
+# a counter's row is replaced on each change, so there is only ever one
+# per alias and counter. Rates are per day.
+alias_rate = Table(
+    "alias_rate",
+    Object.metadata,
+    Column("alias_id", Integer, primary_key=True),
+    # The counter, as named in `alias_counter`.
+    Column("counter", String, primary_key=True),
+    # When the rate was last updated, in seconds since the epoch.
+    Column("updated", Integer, nullable=False),
+    Column("rate", Float, nullable=False),
+    # The rate before the last update.
+    Column("baseline", Float, nullable=False),
+    # The last change, and the rate it was observed at.
+    Column("delta", Integer, nullable=False),
+    Column("observed", Float, nullable=False),
+    Index("ix_alias_rate_updated", "updated"),
+)
@@ -0,0 +1,183 @@
+"""
+Spikes in the rates at which aliases receive email
+
+The rates at which each alias forwards and blocks email are kept as
+exponentially weighted moving averages. Each average is updated from
+the changes of the alias's counters whenever :mod:`.counters` records
+them, rather than recomputed from their history. An update costs the
+same however long that history, and only one row is kept per alias and
+counter.
+
+A counter spikes when the rate of its latest change is a multiple of
+its average rate before that change. A jump like this in blocked or
+forwarded email usually means that an alias's address has leaked.
+"""
+
+import math
+from collections import namedtuple
+from collections.abc import Sequence
+
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+from simplelogincmd.database.models import Alias, FieldAccess, alias_rate
+
+
+#: The counters whose rates are kept.
+MONITORED = ("nb_forward", "nb_block")
+
+SECONDS_PER_DAY = 24 * 60 * 60
+
+#: How long it takes for a change to weigh half as much in an average.
+HALF_LIFE = 7 * SECONDS_PER_DAY
+
+# A change is taken to have happened over at least this long, so that
+# counters read in quick succession do not make for huge rates.
+_MIN_INTERVAL = 60 * 60
+
+#: By default, a counter spikes if its latest rate is this many times
+#: its average...
+FACTOR = 5.0
+#: ...and it has changed by at least this much.
+MIN_DELTA = 10
+
+
+class Spike(
+    FieldAccess,
+    namedtuple(
+        "Spike",
+        ("id", "email", "counter", "delta", "observed", "baseline", "updated"),
+    ),
+):
+    """
+    The latest change of an alias's counter, at a rate well above its
+    average
+
+    `observed` is the rate of the change, and `baseline` the average
+    rate before it, both per day.
+    """
+
+    __slots__ = ()
+
+
+def _initial_rate(total: int, created: int | None, taken: int) -> float:
+    # Until a change is seen, the average is that over the alias's life.
+    if created is None:
+        return 0.0
+    return total * SECONDS_PER_DAY / max(taken - created, SECONDS_PER_DAY)
+
+
+def update(
+    session: Session,
+    changes: Sequence[dict],
+    created: dict[int, int | None],
+    taken: int,
+) -> None:
+    """
+    Update the rates of aliases from the changes of their counters
+
+    :param session: A session of the local database
+    :type session: :class:`sqlalchemy.orm.Session`
+    :param changes: The changes, as recorded in the `alias_counter`
+        table, each with the alias's `alias_id`, the changes of the
+        :data:`MONITORED` counters, and whether they are `initial`
+    :type changes: Sequence[dict]
+    :param created: The creation time of each alias, by id, if known
+    :type created: dict[int, int | None]
+    :param taken: When the counters were read, in seconds since the
+        epoch
+    :type taken: int
+    """
+    query = select(alias_rate).where(
+        alias_rate.c.alias_id.in_([change["alias_id"] for change in changes])
+    )
+    stored = {(row.alias_id, row.counter): row for row in session.execute(query)}
+    rows = []
+    for change in changes:
+        alias_id = change["alias_id"]
+        for counter in MONITORED:
+            delta = change[counter]
+            previous = stored.get((alias_id, counter))
+            if change["initial"] or previous is None:
+                rate = _initial_rate(delta, created.get(alias_id), taken)
+                baseline, delta, observed = rate, 0, rate
+            elif delta == 0:
+                # The time until the next change is weighed then.
+                continue
+            else:
+                interval = max(taken - previous.updated, _MIN_INTERVAL)
+                observed = delta * SECONDS_PER_DAY / interval
+                weight = 1 - math.exp(-math.log(2) * interval / HALF_LIFE)
+                baseline = previous.rate
+                rate = baseline + weight * (observed - baseline)
+            rows.append(
+                dict(
+                    alias_id=alias_id,
+                    counter=counter,
+                    updated=taken,
+                    rate=rate,
+                    baseline=baseline,
+                    delta=delta,
+                    observed=observed,
+                )
+            )
+    if rows:
+        statement = insert(alias_rate)
+        statement = statement.on_conflict_do_update(
+            index_elements=[alias_rate.c.alias_id, alias_rate.c.counter],
+            set_={
+                name: statement.excluded[name]
+                for name in ("updated", "rate", "baseline", "delta", "observed")
+            },
+        )
+        session.execute(statement, rows)
+
+
+def spikes(
+    session: Session,
+    since: int,
+    factor: float = FACTOR,
+    min_delta: int = MIN_DELTA,
+) -> list[Spike]:
+    """
+    Find the counters of aliases that have spiked
+
+    :param session: A session of the local database
+    :type session: :class:`sqlalchemy.orm.Session`
+    :param since: The earliest time of spikes to find, in seconds since
+        the epoch
+    :type since: int
+    :param factor: How many times its average rate the rate of a
+        counter's latest change must be, defaults to :data:`FACTOR`
+    :type factor: float, optional
+    :param min_delta: How much a counter's latest change must be at
+        least, defaults to :data:`MIN_DELTA`
+    :type min_delta: int, optional
+
+    :return: The spikes, latest first
+    :rtype: list[Spike]
+    """
+    query = (
+        select(
+            Alias.id,
+            Alias.email,
+            alias_rate.c.counter,
+            alias_rate.c.delta,
+            alias_rate.c.observed,
+            alias_rate.c.baseline,
+            alias_rate.c.updated,
+        )
+        .select_from(alias_rate)
+        .join(Alias, Alias.id == alias_rate.c.alias_id)
+        .where(
+            alias_rate.c.updated >= since,
+            alias_rate.c.delta >= min_delta,
+            alias_rate.c.observed >= factor * alias_rate.c.baseline,
+        )
+        .order_by(alias_rate.c.updated.desc(), Alias.id, alias_rate.c.counter)
+    )
+    return [
+        Spike(*row[:4], round(row.observed, 1), round(row.baseline, 1), row.updated)
+        for row in session.execute(query)
+    ]
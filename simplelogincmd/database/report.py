@@ -0,0 +1,143 @@
+"""
+Reports on the activities of all aliases
+
+Activities are stored locally by `database sync --activities`. Each
+report is computed by a single grouped aggregate, so SQLite counts the
+activities and only one row per group is read into Python, however many
+activities there are.
+"""
+
+from collections import namedtuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from simplelogincmd.database.models import Activity, FieldAccess
+
+
+#: The actions of activities, each counted by the reports.
+ACTIONS = ("forward", "block", "reply", "bounced")
+
+
+class Bucket(
+    FieldAccess,
+    namedtuple("Bucket", ("start", *ACTIONS, "total", "block_ratio")),
+):
+    """
+    The activities of all aliases within an interval of time
+
+    `start` is when the interval starts, in seconds since the epoch, and
+    `block_ratio` the share of its activities that were blocks.
+    """
+
+    __slots__ = ()
+
+
+class Sender(
+    FieldAccess,
+    namedtuple("Sender", ("sender", *ACTIONS, "total", "block_ratio")),
+):
+    """
+    The activities of all aliases with email from one sender
+    """
+
+    __slots__ = ()
+
+
+def _counts() -> list:
+    counts = [
+        func.count().filter(Activity.action == action).label(action)
+        for action in ACTIONS
+    ]
+    return [*counts, func.count().label("total")]
+
+
+def _block_ratio(block: int, total: int) -> float:
+    return round(block / total, 3) if total else 0.0
+
+
+def histogram(session: Session, since: int, until: int, bucket: int) -> list[Bucket]:
+    """
+    Count the activities of all aliases in each interval of time
+
+    Intervals are aligned to multiples of `bucket` since the epoch, so
+    that with a bucket of a day, each is a day in UTC. Intervals without
+    activities between the first and last with some are included.
+
+    :param session: A session of the local database
+    :type session: :class:`sqlalchemy.orm.Session`
+    :param since: The earliest time of activities to count, in seconds
+        since the epoch
+    :type since: int
+    :param until: The time before which activities are counted, in
+        seconds since the epoch
+    :type until: int
+    :param bucket: The length of each interval, in seconds
+    :type bucket: int
+
+    :return: The activities of each interval, earliest first
+    :rtype: list[Bucket]
+    """
+    index = (Activity.timestamp // bucket).label("slot")
+    query = (
+        select(index, *_counts())
+        .where(Activity.timestamp >= since, Activity.timestamp < until)
+        .group_by(index)
+        .order_by(index)
+    )
+    counted = {row.slot: row for row in session.execute(query)}
+    if not counted:
+        return []
+    buckets = []
+    for i in range(min(counted), max(counted) + 1):
+        if (row := counted.get(i)) is None:
+            counts = [0] * (len(ACTIONS) + 1)
+        else:
+            counts = [getattr(row, name) for name in (*ACTIONS, "total")]
+        ratio = _block_ratio(counts[ACTIONS.index("block")], counts[-1])
+        buckets.append(Bucket(i * bucket, *counts, ratio))
+    return buckets
+
+
+def senders(
+    session: Session,
+    since: int,
+    until: int,
+    by: str = "total",
+    limit: int | None = None,
+) -> list[Sender]:
+    """
+    Count the activities of all aliases by sender
+
+    :param session: A session of the local database
+    :type session: :class:`sqlalchemy.orm.Session`
+    :param since: The earliest time of activities to count, in seconds
+        since the epoch
+    :type since: int
+    :param until: The time before which activities are counted, in
+        seconds since the epoch
+    :type until: int
+    :param by: The count by which to rank senders, "total" or one of
+        :data:`ACTIONS`, defaults to "total"
+    :type by: str, optional
+    :param limit: The most senders to count, defaults to all
+    :type limit: int, optional
+
+    :return: The activities of each sender with any counted by `by`,
+        most first
+    :rtype: list[Sender]
+    """
+    counts = _counts()
+    rank = counts[(*ACTIONS, "total").index(by)].element
+    query = (
+        select(Activity.sender, *counts)
+        .where(Activity.timestamp >= since, Activity.timestamp < until)
+        .group_by(Activity.sender)
+        .having(rank > 0)
+        .order_by(rank.desc(), Activity.sender)
+        .limit(limit)
+    )
+    return [
+        Sender(*row, block_ratio=_block_ratio(row.block, row.total))
+        for row in session.execute(query)
+    ]
@@ -2,9 +2,15 @@
 Augmented SQLAlchemy database session
 """
 
+import time
+from collections.abc import Sequence
+from typing import Any
+
+from sqlalchemy import delete, insert, select
 from sqlalchemy.orm import Session
 
-from simplelogincmd.database.models import Object
+from simplelogincmd.database import counters
+from simplelogincmd.database.models import Alias, Object, alias_fetched
 
 
 class SimpleLoginSession(Session):
@@ -12,7 +18,7 @@ class SimpleLoginSession(Session):
     An extended database session
     """
 
-    def upsert(self, obj: Object) -> Object:
+    def upsert(self, obj) -> Object:
         """
         Approximate insert-or-update functionality
 
@@ -24,11 +30,142 @@ class SimpleLoginSession(Session):
         modifications to those objects will be persisted on next commit
         regardless.
 
-        :param obj: The model object to be added/updated
-        :type obj: Object
+        Records from the REST layer are first converted into model
+        objects with :meth:`~simplelogincmd.rest.records.Record.to_model`.
+
+        :param obj: The model object or record to be added/updated
+        :type obj: Object | Record
 
         :return: The created/modified object. Note that in the event of
             a merge, this is *not* the same object that was passed in.
         :rtype: Object
         """
+        if not isinstance(obj, Object):
+            obj = obj.to_model()
         return obj if obj in self else self.merge(obj)
+
+    def apply(self, model: type[Object], id: Any, **values) -> Object | None:
+        """
+        Apply a change already made on SimpleLogin to the local copy
+
+        Commands that modify an object through the API call this once
+        the API has confirmed the change, so that the local database
+        stays current without fetching the object again. Nothing
+        happens if there is no local copy.
+
+        The object's `content_hash`, if its model stores one, is
+        cleared, as it no longer describes the object's content. The
+        next sync then rewrites the object from SimpleLogin's copy.
+
+        :param model: The model class of the object
+        :type model: type[Object]
+        :param id: The object's primary key
+        :type id: Any
+        :param values: The new values of the object's attributes
+        :type values: Any
+
+        :return: The modified object, or `None` if there is none
+        :rtype: Object, optional
+        """
+        if (obj := self.get(model, id)) is None:
+            return None
+        for key, value in values.items():
+            setattr(obj, key, value)
+        if "content_hash" in model.__table__.columns:
+            obj.content_hash = None
+        return obj
+
+    def remove(self, model: type[Object], id: Any) -> bool:
+        """
+        Remove the local copy of an object deleted from SimpleLogin
+
+        Objects that belong to the removed one, i.e. those whose table
+        has a column named for it, such as the `alias_id` of an alias's
+        contacts and activities, are removed along with it.
+
+        :param model: The model class of the object
+        :type model: type[Object]
+        :param id: The object's primary key
+        :type id: Any
+
+        :return: Whether there was a local copy to remove
+        :rtype: bool
+        """
+        owner_key = f"{model.__tablename__}_id"
+        for table in Object.metadata.sorted_tables:
+            if owner_key in table.columns:
+                self.execute(delete(table).where(table.c[owner_key] == id))
+        if (obj := self.get(model, id)) is None:
+            return False
+        self.delete(obj)
+        return True
+
+    def upsert_records(self, records: Sequence) -> tuple[list, list]:
+        """
+        Insert-or-replace rows in bulk from records of the REST layer
+
+        Rows whose stored `content_hash` matches that of their record
+        are left untouched, so that writing records which have not
+        changed costs only a read. The rest are written by a single
+        ``INSERT OR REPLACE`` statement, bypassing the unit of work, so
+        no model objects are created, and objects of the same rows
+        already in the session are not updated until they are expired,
+        e.g. on commit. For aliases written, the changes of their
+        counters are first recorded by
+        :func:`~simplelogincmd.database.counters.record`, and they are
+        marked as fetched by :meth:`mark_fetched`. Unchanged aliases are
+        not, as a row written for each of them would undo the savings.
+
+        :param records: :class:`~simplelogincmd.rest.records.Record`
+            objects, all of the same type, whose model stores a
+            `content_hash`
+        :type records: Sequence[Record]
+
+        :return: The records that were new, and those that had changed
+        :rtype: tuple[list[Record], list[Record]]
+        """
+        if not records:
+            return [], []
+        table = records[0].model.__table__
+        rows = [record.to_row() for record in records]
+        ids = [row["id"] for row in rows]
+        query = select(table.c.id, table.c.content_hash).where(table.c.id.in_(ids))
+        stored = dict(self.execute(query).all())
+        added, updated, changed = [], [], []
+        for record, row in zip(records, rows):
+            if row["id"] not in stored:
+                added.append(record)
+            elif stored[row["id"]] != row["content_hash"]:
+                updated.append(record)
+            else:
+                continue
+            changed.append(row)
+        if table is Alias.__table__ and changed:
+            fetched = int(time.time())
+            counters.record(self, changed, fetched)
+            self.mark_fetched([row["id"] for row in changed], fetched)
+        if changed:
+            # Insert into the table rather than the model, so that the
+            # ORM does not split the rows into groups by which values
+            # are NULL.
+            statement = insert(table).prefix_with("OR REPLACE")
+            self.execute(statement, changed)
+        return added, updated
+
+    def mark_fetched(
+        self, alias_ids: Sequence[int], fetched: int | None = None
+    ) -> None:
+        """
+        Record when aliases were last read from SimpleLogin
+
+        :param alias_ids: The ids of the aliases
+        :type alias_ids: Sequence[int]
+        :param fetched: When they were read, in seconds since the epoch,
+            defaults to now
+        :type fetched: int, optional
+        """
+        if not alias_ids:
+            return
+        fetched = int(time.time()) if fetched is None else fetched
+        rows = [dict(alias_id=id, fetched=fetched) for id in alias_ids]
+        self.execute(insert(alias_fetched).prefix_with("OR REPLACE"), rows)
@@ -0,0 +1,237 @@
+"""
+Follow the activities of aliases as they happen
+
+SimpleLogin does not push activities, so they are polled for. The first
+page of an alias's activities, which lists the newest first, is read up
+to the newest activity already seen, and the next page is fetched only
+if every activity on it was new. Activities have no id, so those seen
+are told apart by their contents.
+
+Each alias is polled at its own interval, which shrinks while the alias
+has new activities and grows while it has none, so that busy aliases
+are polled often and idle ones rarely.
+"""
+
+import heapq
+import time
+from collections.abc import Callable, Iterator, Sequence
+
+from simplelogincmd import const
+from simplelogincmd.rest import SimpleLogin
+from simplelogincmd.rest.records import ActivityRecord
+from simplelogincmd.sync import concurrently
+
+
+def _key(activity: ActivityRecord) -> tuple:
+    return (
+        activity.action,
+        activity.sender,
+        activity.recipient,
+        activity.reverse_alias_address,
+    )
+
+
+class Cursor:
+    """
+    The newest activity seen of an alias
+    """
+
+    __slots__ = ("timestamp", "keys")
+
+    def __init__(self) -> None:
+        self.timestamp = None
+        # Those of the activities at `timestamp`, as several may share it.
+        self.keys = set()
+
+    def is_new(self, activity: ActivityRecord) -> bool:
+        """
+        Tell whether an activity is newer than those seen
+
+        :param activity: The activity
+        :type activity: :class:`~simplelogincmd.rest.records.ActivityRecord`
+
+        :rtype: bool
+        """
+        if self.timestamp is None or activity.timestamp > self.timestamp:
+            return True
+        return activity.timestamp == self.timestamp and _key(activity) not in self.keys
+
+    def advance(self, activities: Sequence[ActivityRecord]) -> None:
+        """
+        Mark activities as seen
+
+        :param activities: The new activities, in any order
+        :type activities: Sequence[ActivityRecord]
+        """
+        for activity in activities:
+            if self.timestamp is None or activity.timestamp > self.timestamp:
+                self.timestamp = activity.timestamp
+                self.keys = set()
+            if activity.timestamp == self.timestamp:
+                self.keys.add(_key(activity))
+
+
+class Interval:
+    """
+    An interval between polls that adapts to how often they find anything
+    """
+
+    __slots__ = ("minimum", "maximum", "backoff", "seconds")
+
+    def __init__(
+        self,
+        minimum: float = const.FOLLOW_MIN_INTERVAL,
+        maximum: float = const.FOLLOW_MAX_INTERVAL,
+        backoff: float = const.FOLLOW_BACKOFF,
+    ) -> None:
+        """
+        Constructor
+
+        :param minimum: The shortest interval, in seconds, at which the
+            interval starts, defaults to
+            :data:`~simplelogincmd.const.FOLLOW_MIN_INTERVAL`
+        :type minimum: float, optional
+        :param maximum: The longest interval, in seconds, defaults to
+            :data:`~simplelogincmd.const.FOLLOW_MAX_INTERVAL`
+        :type maximum: float, optional
+        :param backoff: The factor by which the interval shrinks or
+            grows, defaults to :data:`~simplelogincmd.const.FOLLOW_BACKOFF`
+        :type backoff: float, optional
+        """
+        self.minimum = minimum
+        self.maximum = maximum
+        self.backoff = backoff
+        self.seconds = minimum
+
+    def update(self, found: int) -> float:
+        """
+        Adapt the interval to the outcome of a poll
+
+        :param found: The number of new activities the poll found
+        :type found: int
+
+        :return: The new interval, in seconds
+        :rtype: float
+        """
+        if found:
+            self.seconds = max(self.seconds / self.backoff, self.minimum)
+        else:
+            self.seconds = min(self.seconds * self.backoff, self.maximum)
+        return self.seconds
+
+
+class Follower:
+    """
+    Poll aliases for new activities
+    """
+
+    def __init__(
+        self,
+        sl: SimpleLogin,
+        alias_ids: Sequence[int],
+        make_interval: Callable[[], Interval] = Interval,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        workers: int = 1,
+    ) -> None:
+        """
+        Constructor
+
+        :param sl: An authenticated SimpleLogin client
+        :type sl: :class:`~simplelogincmd.rest.SimpleLogin`
+        :param alias_ids: The ids of the aliases to follow
+        :type alias_ids: Sequence[int]
+        :param make_interval: Makes the interval of each alias, defaults
+            to :class:`Interval`
+        :type make_interval: Callable[[], Interval], optional
+        :param clock: Tells the time, in seconds, defaults to
+            :func:`time.monotonic`
+        :type clock: Callable[[], float], optional
+        :param sleep: Waits a number of seconds, defaults to
+            :func:`time.sleep`
+        :type sleep: Callable[[float], None], optional
+        :param workers: The number of aliases whose activities are first
+            read at once, defaults to 1
+        :type workers: int, optional
+        """
+        self.sl = sl
+        self.cursors = {alias_id: Cursor() for alias_id in alias_ids}
+        self.intervals = {alias_id: make_interval() for alias_id in alias_ids}
+        self.clock = clock
+        self.sleep = sleep
+        self.workers = workers
+        self._due = []
+
+    def fetch(self, alias_id: int) -> list[ActivityRecord]:
+        """
+        Fetch the activities of an alias newer than those seen
+
+        :param alias_id: The alias's id
+        :type alias_id: int
+
+        :raise APIError: If the API answers with an error
+
+        :return: The new activities, oldest first
+        :rtype: list[ActivityRecord]
+        """
+        cursor = self.cursors[alias_id]
+        new = []
+        for page in self.sl.iter_alias_activity_pages(alias_id):
+            fresh = [activity for activity in page if cursor.is_new(activity)]
+            new.extend(fresh)
+            if len(fresh) < len(page):
+                break
+        cursor.advance(new)
+        new.reverse()
+        return new
+
+    def _newest(self, alias_id: int) -> tuple[int, list[ActivityRecord]]:
+        # Only the newest page matters, as nothing is new yet.
+        pages = self.sl.iter_alias_activity_pages(alias_id)
+        try:
+            return alias_id, next(pages, [])
+        finally:
+            pages.close()
+
+    def start(self) -> None:
+        """
+        Mark the activities the aliases already have as seen
+
+        Only the first page of each alias's activities, which holds the
+        newest, is fetched, rather than its whole history. The aliases
+        are read several at a time, and each is due to be polled an
+        interval after its own page arrived.
+
+        :raise APIError: If the API answers with an error
+        """
+        for alias_id, page in concurrently(self._newest, self.cursors, self.workers):
+            self.cursors[alias_id].advance(page)
+            due = self.clock() + self.intervals[alias_id].seconds
+            heapq.heappush(self._due, (due, alias_id))
+
+    def poll(self) -> list[ActivityRecord]:
+        """
+        Wait for the next alias to be due, and fetch its new activities
+
+        :raise APIError: If the API answers with an error
+
+        :return: The new activities, oldest first
+        :rtype: list[ActivityRecord]
+        """
+        due, alias_id = heapq.heappop(self._due)
+        if (wait := due - self.clock()) > 0:
+            self.sleep(wait)
+        new = self.fetch(alias_id)
+        due = self.clock() + self.intervals[alias_id].update(len(new))
+        heapq.heappush(self._due, (due, alias_id))
+        return new
+
+    def __iter__(self) -> Iterator[ActivityRecord]:
+        """
+        Yield new activities as they are fetched, until interrupted
+
+        :raise APIError: If the API answers with an error
+        """
+        self.start()
+        while True:
+            yield from self.poll()
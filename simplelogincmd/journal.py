@@ -0,0 +1,254 @@
+"""
+Queue alias changes made offline, and replay them later
+
+While SimpleLogin cannot be reached, changes to aliases can be recorded
+in a journal in the local database, and applied to the local rows right
+away, as if they had succeeded. Once back online, the journal is
+replayed in order. Changes to different aliases are replayed
+concurrently, those to the same alias one after another.
+
+Before replaying a change, the alias is fetched. If a field the change
+sets has, in the meantime, been given a value on SimpleLogin other than
+the one it had locally when the change was made, or the new one, the
+change is a conflict: it is dropped, and SimpleLogin's copy of the
+alias wins.
+"""
+
+import time
+from collections import defaultdict, namedtuple
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import requests
+from sqlalchemy import delete, func, select
+
+from simplelogincmd.database import DatabaseAccessLayer
+from simplelogincmd.database.models import Alias, JournalEntry
+from simplelogincmd.rest import SimpleLogin
+from simplelogincmd.rest.exceptions import APIError
+
+
+TOGGLE = "toggle"
+UPDATE = "update"
+DELETE = "delete"
+
+#: What can become of a replayed entry.
+APPLIED = "applied"
+CONFLICT = "conflict"
+FAILED = "failed"
+
+# The fields of an alias that changes may set, and which are stored
+# locally. Of the fields `alias update` sets, only the mailboxes are
+# not.
+_FIELDS = frozenset(("enabled", "note", "name", "disable_pgp", "pinned"))
+
+# The network errors that mean SimpleLogin cannot be reached.
+OFFLINE_ERRORS = (requests.ConnectionError, requests.Timeout)
+
+_Queued = namedtuple("_Queued", ("id", "alias_id", "action", "changes", "base"))
+
+
+class Journal:
+    """
+    The journal of alias changes waiting to be replayed
+    """
+
+    def __init__(
+        self,
+        sl: SimpleLogin,
+        db: DatabaseAccessLayer,
+        workers: int = 4,
+    ) -> None:
+        """
+        Constructor
+
+        :param sl: An authenticated SimpleLogin client
+        :type sl: :class:`~simplelogincmd.rest.SimpleLogin`
+        :param db: The local database
+        :type db: :class:`~simplelogincmd.database.DatabaseAccessLayer`
+        :param workers: The number of aliases whose changes are replayed
+            at once, defaults to 4
+        :type workers: int, optional
+        """
+        self.sl = sl
+        self.db = db
+        self.workers = workers
+
+    def pending(self) -> int:
+        """
+        Count the entries waiting to be replayed
+
+        :rtype: int
+        """
+        query = select(func.count()).select_from(JournalEntry)
+        return self.db.session.scalar(query)
+
+    def record(
+        self,
+        action: str,
+        alias_id: int,
+        changes: dict[str, Any] | None = None,
+    ) -> JournalEntry:
+        """
+        Queue a change, and apply it to the local database
+
+        :param action: One of :data:`TOGGLE`, :data:`UPDATE`, and
+            :data:`DELETE`
+        :type action: str
+        :param alias_id: The id of the alias to change
+        :type alias_id: int
+        :param changes: For :data:`UPDATE`, the keyword arguments of
+            :meth:`~simplelogincmd.rest.SimpleLogin.update_alias` other
+            than `alias_id`
+        :type changes: dict[str, Any], optional
+
+        :raise ValueError: If a toggle is queued for an alias not in
+            the local database, whose state is therefore unknown
+
+        :return: The new entry
+        :rtype: :class:`~simplelogincmd.database.models.JournalEntry`
+        """
+        session = self.db.session
+        alias = session.get(Alias, alias_id)
+        if action == TOGGLE:
+            if alias is None:
+                raise ValueError(f"Alias {alias_id} is not in the local database")
+            # Record the state toggled to, as toggling is not idempotent.
+            changes = dict(enabled=not alias.enabled)
+        changes = dict(changes or {})
+        base = {}
+        if alias is not None:
+            base = {key: getattr(alias, key) for key in _FIELDS & changes.keys()}
+        entry = JournalEntry(
+            object_id=alias_id,
+            action=action,
+            changes=changes,
+            base=base,
+            created=int(time.time()),
+        )
+        session.add(entry)
+        if action == DELETE:
+            session.remove(Alias, alias_id)
+        else:
+            local = {key: changes[key] for key in _FIELDS & changes.keys()}
+            session.apply(Alias, alias_id, **local)
+        session.commit()
+        return entry
+
+    def replay(
+        self,
+        on_result: Callable[[str, str, str | None], None] | None = None,
+    ) -> dict[str, int]:
+        """
+        Replay every queued entry
+
+        Entries are removed from the journal as they are replayed,
+        whatever becomes of them. If SimpleLogin cannot be reached, or
+        answers with an error before the alias being changed could be
+        fetched, the entries not yet replayed are kept, and the error is
+        raised once the others have been.
+
+        :param on_result: Called with the description of each entry
+            replayed, what became of it (:data:`APPLIED`,
+            :data:`CONFLICT`, or :data:`FAILED`), and any error message
+        :type on_result: Callable[[str, str, str | None], None], optional
+
+        :raise requests.RequestException: If SimpleLogin cannot be
+            reached
+        :raise APIError: If SimpleLogin answers with an error while
+            fetching an alias
+
+        :return: The number of entries that met each fate
+        :rtype: dict[str, int]
+        """
+        session = self.db.session
+        query = select(JournalEntry).order_by(JournalEntry.id)
+        groups = defaultdict(list)
+        descriptions = {}
+        for entry in session.scalars(query):
+            queued = _Queued(
+                entry.id, entry.object_id, entry.action, entry.changes, entry.base
+            )
+            groups[entry.object_id].append(queued)
+            descriptions[entry.id] = str(entry)
+        counts = {APPLIED: 0, CONFLICT: 0, FAILED: 0}
+        error = None
+        with ThreadPoolExecutor(self.workers, thread_name_prefix="journal") as pool:
+            results = pool.map(self._replay_alias, groups.values())
+            for outcomes, group_error in results:
+                for entry_id, alias_id, fate, alias, message in outcomes:
+                    self._settle(entry_id, alias_id, alias)
+                    counts[fate] += 1
+                    if on_result is not None:
+                        on_result(descriptions[entry_id], fate, message)
+                error = error or group_error
+        session.commit()
+        if error is not None:
+            raise error
+        return counts
+
+    def _settle(self, entry_id: int, alias_id: int, alias) -> None:
+        """
+        Drop a replayed entry, and store SimpleLogin's copy of its alias
+        """
+        session = self.db.session
+        session.execute(delete(JournalEntry).where(JournalEntry.id == entry_id))
+        if alias is None:
+            session.remove(Alias, alias_id)
+        else:
+            session.upsert_records([alias])
+
+    def _replay_alias(self, entries: list[_Queued]) -> tuple[list, Exception | None]:
+        """
+        Replay the entries of one alias in order, on a worker thread
+
+        :return: The outcome of each entry replayed, and the error that
+            stopped the replay, if any
+        :rtype: tuple[list, Exception | None]
+        """
+        outcomes = []
+        try:
+            for entry in entries:
+                fate, alias, message = self._replay_entry(entry)
+                outcomes.append((entry.id, entry.alias_id, fate, alias, message))
+        except (requests.RequestException, APIError) as error:
+            return outcomes, error
+        return outcomes, None
+
+    def _replay_entry(self, entry: _Queued) -> tuple[str, Any, str | None]:
+        """
+        Replay one entry
+
+        :return: What became of the entry, SimpleLogin's copy of the
+            alias afterwards, or `None` if it no longer exists, and any
+            error message
+        :rtype: tuple[str, AliasRecord | None, str | None]
+        """
+        sl = self.sl
+        success, alias = sl.get_alias(entry.alias_id)
+        if not success:
+            if "Unknown" not in alias:
+                raise APIError(alias)
+            # Deleted on SimpleLogin in the meantime.
+            if entry.action == DELETE:
+                return APPLIED, None, None
+            return CONFLICT, None, "The alias no longer exists"
+        for key, value in entry.base.items():
+            if getattr(alias, key) not in (value, entry.changes[key]):
+                return CONFLICT, alias, f"The alias's {key} has changed"
+        if entry.action == DELETE:
+            success, message = sl.delete_alias(entry.alias_id)
+            return (APPLIED, None, None) if success else (FAILED, alias, message)
+        if entry.action == TOGGLE:
+            if alias.enabled == entry.changes["enabled"]:
+                return APPLIED, alias, None
+            success, enabled = sl.toggle_alias(entry.alias_id)
+            if not success:
+                return FAILED, alias, enabled
+            return APPLIED, alias._replace(enabled=enabled), None
+        success, message = sl.update_alias(alias_id=entry.alias_id, **entry.changes)
+        if not success:
+            return FAILED, alias, message
+        local = {key: entry.changes[key] for key in _FIELDS & entry.changes.keys()}
+        return APPLIED, alias._replace(**local), None
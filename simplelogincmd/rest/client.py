@@ -2,15 +2,75 @@
 Module for handling REST API requests
 """
 
+import threading
+import time
 from urllib.parse import urljoin
 
 import requests
+from requests.adapters import HTTPAdapter
+
+from simplelogincmd import codec as json_codec
+from simplelogincmd.rest import const
+
+
+class RateLimiter:
+    """
+    Limit the rate of requests made by any number of threads
+
+    A token bucket: tokens accrue at a steady rate up to a maximum, and
+    each request takes one, waiting until there is one to take.
+    """
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        """
+        Constructor
+
+        :param rate: The number of requests allowed per second
+        :type rate: float
+        :param burst: The number of requests that may be made at once
+            after a lull, defaults to 1
+        :type burst: int, optional
+        """
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """
+        Take a token, waiting for one if there is none
+        """
+        with self._lock:
+            now = time.monotonic()
+            tokens = self._tokens + (now - self._updated) * self.rate
+            # Taking a token that has yet to accrue reserves it, so that
+            # waiting threads are served in turn.
+            self._tokens = min(tokens, self.burst) - 1
+            self._updated = now
+            wait = -self._tokens / self.rate
+        if wait > 0:
+            time.sleep(wait)
 
 
 class Client:
-    """A REST API client that ensures JSON responses"""
+    """
+    A REST API client that ensures JSON responses
+
+    Requests go through a single :class:`requests.Session`, so that
+    connections to the API are kept alive and reused rather than opened
+    anew for every request. The session may be shared by several
+    threads at once.
+    """
 
-    def __init__(self, base_url: str, verify: bool = True) -> None:
+    def __init__(
+        self,
+        base_url: str,
+        verify: bool = True,
+        codec: json_codec.Codec | None = None,
+        pool_size: int = const.POOL_SIZE,
+        limiter: RateLimiter | None = None,
+    ) -> None:
         """
         Constructor
 
@@ -19,9 +79,26 @@ class Client:
         :type base_url: str
         :param verify: Whether to verify certificates, defaults to True
         :type verify: bool, optional
+        :param codec: The codec with which responses are decoded,
+            defaults to the fastest one installed
+        :type codec: :class:`~simplelogincmd.codec.Codec`, optional
+        :param pool_size: The number of connections kept open for reuse,
+            which should be at least the number of threads making
+            requests at once, defaults to
+            :data:`~simplelogincmd.rest.const.POOL_SIZE`
+        :type pool_size: int, optional
+        :param limiter: Limits the rate of requests, defaults to no
+            limit
+        :type limiter: RateLimiter, optional
         """
         self.base_url = base_url
         self.verify = verify
+        self.codec = codec or json_codec.default()
+        self.limiter = limiter
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
 
     def __repr__(self) -> str:
         return f"RESTClient('{self.base_url}')"
@@ -41,8 +118,8 @@ class Client:
             comes after the base URL, defaults to ""
         :type endpoint: str, optional
         :param kwargs: Keyword arguments passed directly on to the
-            :func:`requests.request` function. Here is where you provide
-            JSON, headers, etc.
+            :meth:`requests.Session.request` method. Here is where you
+            provide JSON, headers, etc.
         :type kwargs: dict
 
         :return: Whether the request succeeded (status code was < 400),
@@ -53,11 +130,15 @@ class Client:
         """
         method = method.upper()
         url = urljoin(self.base_url, endpoint)
-        response = requests.request(method, url, verify=self.verify, **kwargs)
+        if self.limiter is not None:
+            self.limiter.acquire()
+        response = self.session.request(method, url, verify=self.verify, **kwargs)
         success = response.status_code < 400
         try:
-            return success, response.json()
-        except requests.exceptions.InvalidJSONError:
+            # Decode the raw body rather than `response.json()`, which
+            # first copies it into text.
+            return success, self.codec.loads(response.content)
+        except ValueError:
             return success, {"msg": response.text}
 
     def delete(self, endpoint: str = "", **kwargs) -> tuple[bool, dict | str]:
@@ -11,6 +11,9 @@ DEVICE = "SimpleLogin CLI"
 # Max number of items the API returns in a single page.
 MAX_MODELS_PER_PAGE = 20
 
+# Max number of connections to the API kept open for reuse.
+POOL_SIZE = 10
+
 
 ENDPOINT = NS(
     LOGIN="/api/auth/login",
@@ -7,3 +7,9 @@ class UnauthenticatedError(ValueError):
     """Raised when an unauthenticated client attempts to access a protected endpoint"""
 
     pass
+
+
+class APIError(RuntimeError):
+    """Raised when the API answers a request with an error"""
+
+    pass
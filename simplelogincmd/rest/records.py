@@ -0,0 +1,250 @@
+"""
+Lightweight records of SimpleLogin API responses
+
+API responses are read into compact, immutable, tuple-backed records
+rather than into database models. Records cost a fraction of the memory
+and time of mapped model objects, which carry SQLAlchemy instrumentation
+state, and most responses are only ever displayed. When a record does
+need persisting, :meth:`Record.to_model` converts it into the matching
+model object, and
+:meth:`~simplelogincmd.database.session.SimpleLoginSession.upsert`
+accepts records directly.
+"""
+
+import hashlib
+from collections import namedtuple
+from typing import Any
+
+from simplelogincmd.database.models import (
+    Activity,
+    Alias,
+    Contact,
+    FieldAccess,
+    Mailbox,
+    Object,
+)
+
+
+class Record(FieldAccess):
+    """
+    Base class of all records
+
+    Concrete records combine this class with a named tuple of their
+    fields, and set :attr:`model` to the database model into which they
+    convert.
+    """
+
+    __slots__ = ()
+
+    #: The database model class corresponding to the record.
+    model: type[Object]
+    #: The fields of the record that are columns of :attr:`model`.
+    columns: tuple[str, ...]
+    #: Whether :attr:`model` stores :attr:`content_hash`.
+    hashed: bool
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        table = cls.model.__table__
+        cls.columns = tuple(field for field in cls._fields if field in table.columns)
+        cls.hashed = "content_hash" in table.columns
+
+    @property
+    def content_hash(self) -> int:
+        """
+        A digest of the record's :attr:`columns`
+
+        The digest is stable across processes, so comparing it with the
+        one stored in a row tells whether the row is up to date. It is
+        a signed 64-bit integer, which SQLite stores natively.
+
+        :rtype: int
+        """
+        values = repr(tuple(getattr(self, column) for column in self.columns))
+        digest = hashlib.blake2b(values.encode("utf-8"), digest_size=8).digest()
+        return int.from_bytes(digest, "big", signed=True)
+
+    @classmethod
+    def from_json(cls, info: dict) -> "Record":
+        """
+        Construct a record from an API response object
+
+        Fields missing from `info` are `None`, and keys of `info` that
+        are not fields are ignored.
+
+        :param info: The decoded JSON object
+        :type info: dict
+
+        :rtype: Record
+        """
+        return cls._make(map(info.get, cls._fields))
+
+    def to_row(self) -> dict[str, Any]:
+        """
+        Get the values of the record's :attr:`columns`
+
+        :return: Column values keyed by column name, including
+            :attr:`content_hash` if the model stores it, suitable for
+            bulk inserts into the table of :attr:`model`
+        :rtype: dict[str, Any]
+        """
+        row = {column: getattr(self, column) for column in self.columns}
+        if self.hashed:
+            row["content_hash"] = self.content_hash
+        return row
+
+    def to_model(self) -> Object:
+        """
+        Convert the record into a new, transient database model object
+
+        :rtype: Object
+        """
+        return self.model(**self.to_row())
+
+
+class MailboxRecord(
+    Record,
+    namedtuple(
+        "MailboxRecord",
+        (
+            "id",
+            "email",
+            "nb_alias",
+            "verified",
+            "default",
+            "creation_timestamp",
+        ),
+    ),
+):
+    """
+    A SimpleLogin mailbox
+    """
+
+    __slots__ = ()
+    model = Mailbox
+
+    def __str__(self) -> str:
+        return self.email
+
+
+class AliasRecord(
+    Record,
+    namedtuple(
+        "AliasRecord",
+        (
+            "id",
+            "email",
+            "name",
+            "note",
+            "nb_block",
+            "nb_forward",
+            "nb_reply",
+            "enabled",
+            "support_pgp",
+            "disable_pgp",
+            "pinned",
+            "creation_timestamp",
+            "mailboxes",
+        ),
+    ),
+):
+    """
+    A SimpleLogin alias
+
+    `mailboxes` is a tuple of partial :class:`MailboxRecord` objects,
+    as the API provides only their `id` and `email`. They are for
+    display only, and are not carried over into models or rows.
+    """
+
+    __slots__ = ()
+    model = Alias
+
+    @classmethod
+    def from_json(cls, info: dict) -> "AliasRecord":
+        record = super().from_json(info)
+        if (mailboxes := record.mailboxes) is not None:
+            mailboxes = tuple(MailboxRecord.from_json(info) for info in mailboxes)
+            record = record._replace(mailboxes=mailboxes)
+        return record
+
+    def __str__(self) -> str:
+        return self.email
+
+
+class ContactRecord(
+    Record,
+    namedtuple(
+        "ContactRecord",
+        (
+            "id",
+            "name",
+            "contact",
+            "reverse_alias",
+            "reverse_alias_address",
+            "block_forward",
+            "last_email_sent_timestamp",
+            "creation_timestamp",
+            "alias_id",
+        ),
+    ),
+):
+    """
+    An alias contact
+
+    The API does not include `alias_id`, the id of the alias to which
+    the contact belongs; it is filled in by the client.
+    """
+
+    __slots__ = ()
+    model = Contact
+
+    def __str__(self) -> str:
+        return self.contact  # email address
+
+
+class ActivityRecord(
+    Record,
+    namedtuple(
+        "ActivityRecord",
+        (
+            "id",
+            "action",
+            "sender",
+            "recipient",
+            "reverse_alias",
+            "reverse_alias_address",
+            "timestamp",
+            "alias_id",
+        ),
+    ),
+):
+    """
+    An alias activity
+
+    The API does not include `alias_id`, the id of the alias to which
+    the activity belongs; it is filled in by the client.
+    """
+
+    __slots__ = ()
+    model = Activity
+
+    @classmethod
+    def from_json(cls, info: dict) -> "ActivityRecord":
+        # SimpleLogin API sends "from" and "to" keys. Rename these to
+        # avoid problems.
+        get = info.get
+        sender = get("sender")
+        recipient = get("recipient")
+        return cls(
+            id=get("id"),
+            action=get("action"),
+            sender=get("from") if sender is None else sender,
+            recipient=get("to") if recipient is None else recipient,
+            reverse_alias=get("reverse_alias"),
+            reverse_alias_address=get("reverse_alias_address"),
+            timestamp=get("timestamp"),
+            alias_id=get("alias_id"),
+        )
+
+    def __str__(self) -> str:
+        return self.action
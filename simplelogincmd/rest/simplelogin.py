@@ -2,14 +2,17 @@
 Manage requests and responses to the SimpleLogin API
 """
 
-from simplelogincmd.database.models import (
-    Activity,
-    Alias,
-    Contact,
-    Mailbox,
-)
+from collections.abc import Iterator
+
 from simplelogincmd.rest import const, util
 from simplelogincmd.rest.client import Client
+from simplelogincmd.rest.exceptions import APIError
+from simplelogincmd.rest.records import (
+    ActivityRecord,
+    AliasRecord,
+    ContactRecord,
+    MailboxRecord,
+)
 
 
 class SimpleLogin:
@@ -174,7 +177,7 @@ class SimpleLogin:
         return success
 
     @util.require_authentication
-    def get_mailboxes(self) -> list[Mailbox]:
+    def get_mailboxes(self) -> list[MailboxRecord]:
         """
         Get all the user's mailboxes
 
@@ -182,16 +185,16 @@ class SimpleLogin:
         parameters.
 
         :return: A list, which might be empty, of mailboxes
-        :rtype: list[Mailbox]
+        :rtype: list[MailboxRecord]
         """
         endpoint = const.ENDPOINT.MAILBOXES
         success, json = self.client.get(endpoint, headers=self._auth_headers())
         info_list = json.get("mailboxes", list())
-        mailboxes = [Mailbox(**info) for info in info_list]
+        mailboxes = [MailboxRecord.from_json(info) for info in info_list]
         return mailboxes
 
     @util.require_authentication
-    def create_mailbox(self, email: str) -> tuple[bool, Mailbox | str]:
+    def create_mailbox(self, email: str) -> tuple[bool, MailboxRecord | str]:
         """
         Create a new mailbox
 
@@ -200,7 +203,7 @@ class SimpleLogin:
 
         :return: Whether creation succeeded, and either an error message
             or the new mailbox, as appropriate
-        :rtype: tuple[bool, Mailbox | str]
+        :rtype: tuple[bool, MailboxRecord | str]
         """
         endpoint = const.ENDPOINT.MAILBOXES
         headers = self._auth_headers()
@@ -210,7 +213,7 @@ class SimpleLogin:
         success, json = self.client.post(endpoint, json=body, headers=headers)
         if not success:
             return success, json.get("error", "Mailbox creation failed")
-        return success, Mailbox(**json)
+        return success, MailboxRecord.from_json(json)
 
     @util.require_authentication
     def delete_mailbox(
@@ -281,7 +284,9 @@ class SimpleLogin:
         return success, None
 
     @util.require_authentication
-    def get_aliases(self, page_id: int = 0, query: str | None = None) -> list[Alias]:
+    def get_aliases(
+        self, page_id: int = 0, query: str | None = None
+    ) -> list[AliasRecord]:
         """
         Get a page of the user's aliases
 
@@ -289,7 +294,7 @@ class SimpleLogin:
         parameters.
 
         :return: A list, which might be empty, of aliases
-        :rtype: list[Alias]
+        :rtype: list[AliasRecord]
         """
         endpoint = const.ENDPOINT.ALIASES
         headers = self._auth_headers()
@@ -305,11 +310,11 @@ class SimpleLogin:
             endpoint, params=params, json=body, headers=headers
         )
         info_list = json.get("aliases", list())
-        aliases = [Alias(**info) for info in info_list]
+        aliases = [AliasRecord.from_json(info) for info in info_list]
         return aliases
 
     @util.require_authentication
-    def get_all_aliases(self, query: str | None = None) -> list[Alias]:
+    def get_all_aliases(self, query: str | None = None) -> list[AliasRecord]:
         """
         Get a list of all the user's aliases
 
@@ -317,20 +322,46 @@ class SimpleLogin:
         parameters.
 
         :return: A list, which might be empty, of aliases
-        :rtype: list[Alias]
+        :rtype: list[AliasRecord]
         """
         all_aliases = []
-        page_id = 0
+        for aliases in self.iter_alias_pages(query=query):
+            all_aliases.extend(aliases)
+        return all_aliases
+
+    @util.require_authentication
+    def iter_alias_pages(
+        self,
+        query: str | None = None,
+        start: int = 0,
+    ) -> Iterator[list[AliasRecord]]:
+        """
+        Iterate over the pages of the user's aliases
+
+        Each page is fetched only when the previous one has been
+        consumed, so that callers can process accounts of any size in
+        constant memory.
+
+        See SimpleLogin's documentation for an explanation of the
+        parameters.
+
+        :param start: The `page_id` of the first page, defaults to 0
+        :type start: int, optional
+
+        :return: Non-empty lists of aliases, one per page
+        :rtype: Iterator[list[AliasRecord]]
+        """
+        page_id = start
         while True:
             aliases = self.get_aliases(page_id=page_id, query=query)
-            all_aliases.extend(aliases)
+            if aliases:
+                yield aliases
             if len(aliases) < const.MAX_MODELS_PER_PAGE:
                 break
             page_id += 1
-        return all_aliases
 
     @util.require_authentication
-    def get_alias(self, alias_id: int) -> tuple[bool, Alias | str]:
+    def get_alias(self, alias_id: int) -> tuple[bool, AliasRecord | str]:
         """
         Get one of a user's aliases
 
@@ -339,14 +370,14 @@ class SimpleLogin:
 
         :return: Whether the operation succeeded, and either the alias
             or an error message, as appropriate
-        :rtype: tuple[bool, Alias | str]
+        :rtype: tuple[bool, AliasRecord | str]
         """
         endpoint = const.ENDPOINT.ALIAS.format(alias_id=alias_id)
         headers = self._auth_headers()
         success, json = self.client.get(endpoint, headers=headers)
         if not success:
             return success, json.get("error", f"Failed to get alias {alias_id}")
-        return success, Alias(**json)
+        return success, AliasRecord.from_json(json)
 
     @util.require_authentication
     def get_alias_options(self, hostname: str | None = None) -> tuple[bool, dict | str]:
@@ -381,7 +412,7 @@ class SimpleLogin:
         note: str | None = None,
         name: str | None = None,
         hostname: str | None = None,
-    ) -> tuple[bool, Alias | str]:
+    ) -> tuple[bool, AliasRecord | str]:
         """
         Create a new custom alias
 
@@ -390,7 +421,7 @@ class SimpleLogin:
 
         :return: Whether the creation succeeded, and the new alias or
             an error message, as appropriate
-        :rtype: tuple[bool, Alias | str]
+        :rtype: tuple[bool, AliasRecord | str]
         """
         endpoint = const.ENDPOINT.ALIAS_CUSTOM
         headers = self._auth_headers()
@@ -409,7 +440,7 @@ class SimpleLogin:
         )
         if not success:
             return success, json.get("error", "Failed to create custom alias")
-        return success, Alias(**json)
+        return success, AliasRecord.from_json(json)
 
     @util.require_authentication
     def create_random_alias(
@@ -417,7 +448,7 @@ class SimpleLogin:
         hostname: str | None = None,
         mode: str | None = None,
         note: str | None = None,
-    ) -> tuple[bool, Alias | str]:
+    ) -> tuple[bool, AliasRecord | str]:
         """
         Create a new random alias
 
@@ -426,7 +457,7 @@ class SimpleLogin:
 
         :return: Whether the creation succeeded, and the new alias or
             an error message, as appropriate
-        :rtype: tuple[bool, Alias | str]
+        :rtype: tuple[bool, AliasRecord | str]
         """
         endpoint = const.ENDPOINT.ALIAS_RANDOM
         headers = self._auth_headers()
@@ -443,7 +474,7 @@ class SimpleLogin:
         )
         if not success:
             return success, json.get("error", "Failed to create random alias")
-        return success, Alias(**json)
+        return success, AliasRecord.from_json(json)
 
     @util.require_authentication
     def delete_alias(self, alias_id: int) -> tuple[bool, str | None]:
@@ -484,7 +515,9 @@ class SimpleLogin:
         return success, json.get("enabled")
 
     @util.require_authentication
-    def get_alias_activities(self, alias_id: int, page_id: int = 0) -> list[Activity]:
+    def get_alias_activities(
+        self, alias_id: int, page_id: int = 0
+    ) -> list[ActivityRecord]:
         """
         Get a single page of an alias's activity records
 
@@ -492,7 +525,7 @@ class SimpleLogin:
         parameters.
 
         :return: A list, which might be empty, of activities
-        :rtype: list[Activity]
+        :rtype: list[ActivityRecord]
         """
         endpoint = const.ENDPOINT.ALIAS_ACTIVITIES.format(alias_id=alias_id)
         headers = self._auth_headers()
@@ -501,11 +534,14 @@ class SimpleLogin:
         )
         success, json = self.client.get(endpoint, params=params, headers=headers)
         info_list = json.get("activities", list())
-        activities = [Activity(**info) for info in info_list]
+        activities = [
+            ActivityRecord.from_json(info)._replace(alias_id=alias_id)
+            for info in info_list
+        ]
         return activities
 
     @util.require_authentication
-    def get_all_alias_activities(self, alias_id: int) -> list[Activity]:
+    def get_all_alias_activities(self, alias_id: int) -> list[ActivityRecord]:
         """
         Get all the activity records for the given alias
 
@@ -513,7 +549,7 @@ class SimpleLogin:
         parameters.
 
         :return: A list, which might be empty, of activities
-        :rtype: list[Activity]
+        :rtype: list[ActivityRecord]
         """
         all_activities = []
         page_id = 0
@@ -525,6 +561,29 @@ class SimpleLogin:
             page_id += 1
         return all_activities
 
+    @util.require_authentication
+    def iter_alias_activity_pages(
+        self, alias_id: int
+    ) -> Iterator[list[ActivityRecord]]:
+        """
+        Iterate over the pages of an alias's activity records
+
+        Unlike :meth:`get_alias_activities`, which cannot tell an error
+        from an empty page, this raises on error responses, so that
+        callers never mistake a failed request for missing activities.
+
+        :raise APIError: If the API answers with an error
+
+        :return: Non-empty lists of activities, one per page
+        :rtype: Iterator[list[ActivityRecord]]
+        """
+        endpoint = const.ENDPOINT.ALIAS_ACTIVITIES.format(alias_id=alias_id)
+        for info_list in self.iter_json_pages(endpoint, "activities"):
+            yield [
+                ActivityRecord.from_json(info)._replace(alias_id=alias_id)
+                for info in info_list
+            ]
+
     @util.require_authentication
     def update_alias(
         self,
@@ -565,7 +624,9 @@ class SimpleLogin:
         return success, None
 
     @util.require_authentication
-    def get_alias_contacts(self, alias_id: int, page_id: int = 0) -> list[Contact]:
+    def get_alias_contacts(
+        self, alias_id: int, page_id: int = 0
+    ) -> list[ContactRecord]:
         """
         Get a single page of an alias's contacts
 
@@ -573,7 +634,7 @@ class SimpleLogin:
         parameters.
 
         :return: A list, which might be empty, of contacts
-        :rtype: list[Contact]
+        :rtype: list[ContactRecord]
         """
         endpoint = const.ENDPOINT.ALIAS_CONTACTS.format(alias_id=alias_id)
         headers = self._auth_headers()
@@ -582,11 +643,14 @@ class SimpleLogin:
         )
         success, json = self.client.get(endpoint, params=params, headers=headers)
         info_list = json.get("contacts", list())
-        contacts = [Contact(**info) for info in info_list]
+        contacts = [
+            ContactRecord.from_json(info)._replace(alias_id=alias_id)
+            for info in info_list
+        ]
         return contacts
 
     @util.require_authentication
-    def get_all_alias_contacts(self, alias_id: int) -> list[Contact]:
+    def get_all_alias_contacts(self, alias_id: int) -> list[ContactRecord]:
         """
         Get all of an alias's contacts
 
@@ -594,7 +658,7 @@ class SimpleLogin:
         parameters.
 
         :return: A list, which might be empty, of contacts
-        :rtype: list[Contact]
+        :rtype: list[ContactRecord]
         """
         all_contacts = []
         page_id = 0
@@ -607,7 +671,91 @@ class SimpleLogin:
         return all_contacts
 
     @util.require_authentication
-    def create_contact(self, alias_id: int, contact: str) -> tuple[bool, Contact | str]:
+    def iter_alias_contact_pages(self, alias_id: int) -> Iterator[list[ContactRecord]]:
+        """
+        Iterate over the pages of an alias's contacts
+
+        Unlike :meth:`get_alias_contacts`, which cannot tell an error
+        from an empty page, this raises on error responses, so that
+        callers never mistake a failed request for missing contacts.
+
+        :raise APIError: If the API answers with an error
+
+        :return: Non-empty lists of contacts, one per page
+        :rtype: Iterator[list[ContactRecord]]
+        """
+        endpoint = const.ENDPOINT.ALIAS_CONTACTS.format(alias_id=alias_id)
+        for info_list in self.iter_json_pages(endpoint, "contacts"):
+            yield [
+                ContactRecord.from_json(info)._replace(alias_id=alias_id)
+                for info in info_list
+            ]
+
+    @util.require_authentication
+    def get_json_page(
+        self, endpoint: str, key: str, page_id: int | None = 0
+    ) -> list[dict]:
+        """
+        Get a page of an endpoint as decoded JSON objects
+
+        Unlike the other methods, this does not make the objects into
+        records, so every field the API sends is kept, as exports need.
+
+        :param endpoint: The endpoint to request
+        :type endpoint: str
+        :param key: The key of the response holding the page's objects
+        :type key: str
+        :param page_id: The page, or None if the endpoint is not
+            paginated, defaults to 0
+        :type page_id: int, optional
+
+        :raise APIError: If the API answers with an error
+
+        :return: A list, which might be empty, of decoded objects
+        :rtype: list[dict]
+        """
+        params = None if page_id is None else dict(page_id=page_id)
+        success, json = self.client.get(
+            endpoint, params=params, headers=self._auth_headers()
+        )
+        if not success:
+            message = json.get("error") or json.get("msg") or "Request failed"
+            raise APIError(f"{endpoint}: {message}")
+        return json.get(key, list())
+
+    @util.require_authentication
+    def iter_json_pages(
+        self, endpoint: str, key: str, start: int = 0
+    ) -> Iterator[list[dict]]:
+        """
+        Fetch the pages of a paginated endpoint until one is not full
+
+        :param endpoint: The endpoint to request
+        :type endpoint: str
+        :param key: The key of the response holding the page's objects
+        :type key: str
+        :param start: The `page_id` of the first page, defaults to 0
+        :type start: int, optional
+
+        :raise APIError: If the API answers with an error
+
+        :return: Non-empty lists of decoded objects, one per page, as
+            returned by :meth:`get_json_page`
+        :rtype: Iterator[list[dict]]
+        """
+        page_id = start
+        while True:
+            info_list = self.get_json_page(endpoint, key, page_id)
+            if info_list:
+                yield info_list
+            if len(info_list) < const.MAX_MODELS_PER_PAGE:
+                break
+            page_id += 1
+
+    @util.require_authentication
+    def create_contact(
+        self, alias_id: int, contact: str
+    ) -> tuple[bool, ContactRecord | str]:
         """
         Create a new contact for the given alias
 
@@ -616,7 +764,7 @@ class SimpleLogin:
 
         :return: Whether the creation succeeded, and the new contact
             or an error message, as appropriate
-        :rtype: tuple[bool, Contact | str]
+        :rtype: tuple[bool, ContactRecord | str]
         """
         endpoint = const.ENDPOINT.ALIAS_CONTACTS.format(alias_id=alias_id)
         headers = self._auth_headers()
@@ -626,4 +774,4 @@ class SimpleLogin:
         success, json = self.client.post(endpoint, json=body, headers=headers)
         if not success:
             return success, json.get("error", "Failed to create contact")
-        return success, Contact(**json)
+        return success, ContactRecord.from_json(json)
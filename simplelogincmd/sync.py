@@ -0,0 +1,646 @@
+"""
+Synchronize the local database with SimpleLogin
+
+Synchronization is pipelined: a background thread fetches pages from
+the API and hands them over through a bounded queue, while the calling
+thread, which owns the database session, writes each page as it
+arrives with a single bulk statement. Network and disk work thus
+overlap, and because pages are released once written and committed in
+batches, memory use does not grow with the size of the account.
+
+Committed batches are checkpointed, so that an interrupted sync can be
+resumed rather than started over, and pages and rows that have not
+changed since the last sync are not written at all.
+
+A deep sync also fetches the contacts and activities of every alias.
+As these take at least one request per alias, they are fetched by a
+pool of worker threads, at a limited rate, and written by the calling
+thread as each alias completes. Aliases fetched one by one, as by
+`alias get`, share the same pool and limit.
+
+When each complete sync began is recorded, and when each alias was
+last fetched otherwise, so that local copies fresher than the
+`cache.max-age` config option can be used instead.
+"""
+
+import contextlib
+import functools
+import hashlib
+import itertools
+import queue
+import threading
+import time
+import uuid
+from collections import Counter
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any
+
+from sqlalchemy import delete, insert, or_, select
+from sqlalchemy.orm import Session
+
+from simplelogincmd import const
+from simplelogincmd.database import DatabaseAccessLayer
+from simplelogincmd.database.models import (
+    Activity,
+    Alias,
+    Contact,
+    Mailbox,
+    SyncCheckpoint,
+    alias_counter,
+    alias_fetched,
+    alias_rate,
+    sync_item,
+    sync_page,
+    sync_run,
+)
+from simplelogincmd.rest import SimpleLogin
+from simplelogincmd.rest import const as const_rest
+from simplelogincmd.rest.client import RateLimiter
+from simplelogincmd.rest.records import ActivityRecord, AliasRecord, MailboxRecord
+
+
+# Marks the end of the items produced by `prefetch`'s worker thread.
+_DONE = object()
+
+
+class _Raised:
+    """
+    Carry an exception from `prefetch`'s worker thread to its consumer
+    """
+
+    __slots__ = ("error",)
+
+    def __init__(self, error: BaseException) -> None:
+        self.error = error
+
+
+def prefetch(iterable: Iterable, maxsize: int = const.SYNC_QUEUE_PAGES) -> Iterator:
+    """
+    Iterate over `iterable` on a background thread
+
+    Items are produced ahead of their consumption, but never more than
+    `maxsize` of them, so that a slow consumer bounds the memory used.
+    Any exception raised while producing an item is re-raised to the
+    consumer in its place.
+
+    If the consumer stops early, the worker thread stops as soon as it
+    next tries to hand over an item. It is a daemon thread, so one
+    stuck in a slow request never holds up interpreter exit.
+
+    :param iterable: The items to produce
+    :type iterable: Iterable
+    :param maxsize: The maximum number of items produced but not yet
+        consumed, defaults to :data:`~simplelogincmd.const.SYNC_QUEUE_PAGES`
+    :type maxsize: int, optional
+
+    :rtype: Iterator
+    """
+    items = queue.Queue(maxsize)
+    stop = threading.Event()
+
+    def put(item: Any) -> bool:
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+            except queue.Full:
+                continue
+            return True
+        return False
+
+    def produce() -> None:
+        try:
+            for item in iterable:
+                if not put(item):
+                    return
+        except BaseException as error:
+            put(_Raised(error))
+        else:
+            put(_DONE)
+
+    worker = threading.Thread(target=produce, name="prefetch", daemon=True)
+    worker.start()
+    try:
+        while (item := items.get()) is not _DONE:
+            if isinstance(item, _Raised):
+                raise item.error
+            yield item
+    finally:
+        stop.set()
+
+
+@contextlib.contextmanager
+def limited(sl: SimpleLogin, rate: float) -> Iterator[None]:
+    """
+    Limit the rate of the requests a client makes within the context
+
+    :param sl: The client
+    :type sl: :class:`~simplelogincmd.rest.SimpleLogin`
+    :param rate: The most requests per second, or 0 for no limit
+    :type rate: float
+    """
+    client = sl.client
+    previous = client.limiter
+    if rate:
+        client.limiter = RateLimiter(rate)
+    try:
+        yield
+    finally:
+        client.limiter = previous
+
+
+def concurrently(
+    fetch: Callable[[Any], Any], items: Iterable, workers: int
+) -> Iterator[Any]:
+    """
+    Fetch something for each item on a pool of worker threads
+
+    No more than twice as many items as there are workers are fetched
+    ahead of being consumed, so a slow consumer bounds the memory used.
+    If the consumer stops early, items not yet fetched are dropped.
+
+    :param fetch: Fetches what is wanted for an item
+    :type fetch: Callable[[Any], Any]
+    :param items: The items
+    :type items: Iterable
+    :param workers: The number of worker threads
+    :type workers: int
+
+    :raise Exception: Whatever `fetch` raises
+
+    :return: What `fetch` returns for each item, in order of completion
+    :rtype: Iterator[Any]
+    """
+    items = iter(items)
+    pending = set()
+    with ThreadPoolExecutor(workers, thread_name_prefix="sync") as executor:
+        try:
+            while True:
+                room = 2 * workers - len(pending)
+                for item in itertools.islice(items, room):
+                    pending.add(executor.submit(fetch, item))
+                if not pending:
+                    return
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+class Synchronizer:
+    """
+    Bring the local database up to date with the user's account
+
+    The digest of every page written, and the ids of the objects on it,
+    are kept in the database. A page whose digest has not changed since
+    the last sync is skipped without writing anything, and of the pages
+    that have changed, only the rows whose content has changed are
+    rewritten. Once every page has been fetched, objects found on no
+    page, which no longer exist on SimpleLogin, are deleted.
+
+    Each committed batch of pages records a
+    :class:`~simplelogincmd.database.models.SyncCheckpoint`, in the same
+    transaction, for each endpoint. If a run is interrupted, a later one
+    can resume after the last page committed rather than starting over.
+
+    Contacts and activities, which are fetched per alias, are brought
+    up to date by :meth:`run_deep` in the same way, with all of an
+    alias's contacts, or activities, taking the place of a page.
+    """
+
+    def __init__(
+        self,
+        sl: SimpleLogin,
+        db: DatabaseAccessLayer,
+        batch_pages: int = const.SYNC_BATCH_PAGES,
+        queue_pages: int = const.SYNC_QUEUE_PAGES,
+        on_change: Callable[[str, str, str], None] | None = None,
+        workers: int = 4,
+        rate: float = 0,
+    ) -> None:
+        """
+        Constructor
+
+        :param sl: An authenticated SimpleLogin client
+        :type sl: :class:`~simplelogincmd.rest.SimpleLogin`
+        :param db: The local database
+        :type db: :class:`~simplelogincmd.database.DatabaseAccessLayer`
+        :param batch_pages: The number of pages written per commit,
+            defaults to :data:`~simplelogincmd.const.SYNC_BATCH_PAGES`
+        :type batch_pages: int, optional
+        :param queue_pages: The number of pages that may be fetched
+            ahead of being written, defaults to
+            :data:`~simplelogincmd.const.SYNC_QUEUE_PAGES`
+        :type queue_pages: int, optional
+        :param on_change: Called with the table name, the kind of change
+            ("added", "updated", or "removed"), and the string form of
+            each object that changes
+        :type on_change: Callable[[str, str, str], None], optional
+        :param workers: The number of threads fetching contacts and
+            activities in :meth:`run_deep`, defaults to 4
+        :type workers: int, optional
+        :param rate: The maximum number of requests per second made by
+            :meth:`run_deep`, or 0 for no limit, defaults to 0
+        :type rate: float, optional
+        """
+        self.sl = sl
+        self.db = db
+        self.batch_pages = batch_pages
+        self.queue_pages = queue_pages
+        self.on_change = on_change
+        self.workers = workers
+        self.rate = rate
+        self.run_id = None
+        self.started = None
+        self.resumed = False
+        self._counts = {}
+
+    def _start(self, resume: bool) -> dict[str, int]:
+        """
+        Choose the run id, and find where to start each endpoint
+
+        :return: The `page_id` of the first page to fetch, keyed by
+            endpoint
+        :rtype: dict[str, int]
+        """
+        session = self.db.session
+        checkpoints = session.scalars(select(SyncCheckpoint)).all()
+        if resume and checkpoints:
+            self.run_id = checkpoints[0].run_id
+            self.started = checkpoints[0].started
+            self.resumed = True
+            return {
+                checkpoint.id: checkpoint.page_id + 1
+                for checkpoint in checkpoints
+                if checkpoint.run_id == self.run_id
+            }
+        session.execute(delete(SyncCheckpoint))
+        self.run_id = uuid.uuid4().hex
+        self.started = int(time.time())
+        self.resumed = False
+        return {}
+
+    def _pages(self, starts: dict[str, int]) -> Iterator[tuple[str, int, list]]:
+        """
+        Fetch every remaining page, mailboxes first
+
+        Pages are requested so that errors raise, rather than pass for
+        empty pages whose objects would then be deleted.
+
+        :raise APIError: If the API answers with an error
+
+        :return: The endpoint, `page_id`, and records of each page
+        :rtype: Iterator[tuple[str, int, list]]
+        """
+        endpoint = const_rest.ENDPOINT.MAILBOXES
+        if endpoint not in starts:
+            # Mailboxes come in a single page.
+            page = self.sl.get_json_page(endpoint, "mailboxes", page_id=None)
+            yield endpoint, 0, [MailboxRecord.from_json(info) for info in page]
+        endpoint = const_rest.ENDPOINT.ALIASES
+        start = starts.get(endpoint, 0)
+        pages = self.sl.iter_json_pages(endpoint, "aliases", start)
+        for page_id, page in enumerate(pages, start):
+            yield endpoint, page_id, [AliasRecord.from_json(info) for info in page]
+
+    def _digests(self, endpoint: str) -> dict[int, int]:
+        """
+        Load the digests of the pages of an endpoint, keyed by `page_id`
+        """
+        query = select(sync_page.c.page_id, sync_page.c.digest).where(
+            sync_page.c.endpoint == endpoint
+        )
+        return dict(self.db.session.execute(query).all())
+
+    def run(self, resume: bool = False) -> dict[str, dict[str, int]]:
+        """
+        Synchronize the database
+
+        :param resume: Whether to continue the last run, if it was
+            interrupted, defaults to False. If there is no such run, a
+            new one is started
+        :type resume: bool, optional
+
+        :raise APIError: If the API answers with an error, in which case
+            nothing is deleted, and the batches already committed can be
+            resumed
+
+        :return: The number of objects added, updated, and removed by
+            this call, keyed by table name and then by kind of change
+        :rtype: dict[str, dict[str, int]]
+        """
+        starts = self._start(resume)
+        self._counts = {}
+        digests = {}
+        # The last page fetched of each endpoint, and those of them not
+        # yet committed.
+        last = {}
+        pending = {}
+        pages = 0
+        for endpoint, page_id, page in prefetch(self._pages(starts), self.queue_pages):
+            if endpoint not in digests:
+                digests[endpoint] = self._digests(endpoint)
+            self._write_page(endpoint, page_id, page, digests[endpoint])
+            last[endpoint] = pending[endpoint] = page_id
+            pages += 1
+            if pages % self.batch_pages == 0:
+                self._checkpoint(pending)
+        runs = []
+        for endpoint, model in (
+            (const_rest.ENDPOINT.MAILBOXES, Mailbox),
+            (const_rest.ENDPOINT.ALIASES, Alias),
+        ):
+            self._reconcile(
+                endpoint, model, last.get(endpoint, starts.get(endpoint, 0) - 1)
+            )
+            runs.append(dict(endpoint=endpoint, fetched=self.started))
+        self.db.session.execute(insert(sync_run).prefix_with("OR REPLACE"), runs)
+        self.db.session.execute(delete(SyncCheckpoint))
+        self.db.session.commit()
+        return self._counts
+
+    def _write_page(
+        self,
+        endpoint: str,
+        page_id: int,
+        page: list,
+        digests: dict[int, int],
+    ) -> None:
+        """
+        Write the rows of a page that have changed, and record the page
+        """
+        digest = _page_digest(page)
+        session = self.db.session
+        if digests.get(page_id) == digest:
+            # The run's `sync_run` row tells that the page is fresh.
+            return
+        added, updated = session.upsert_records(page)
+        if page:
+            table = page[0].model.__tablename__
+            self._changed(table, "added", added)
+            self._changed(table, "updated", updated)
+        where = (sync_item.c.endpoint == endpoint) & (sync_item.c.page_id == page_id)
+        session.execute(delete(sync_item).where(where))
+        if page:
+            items = [
+                dict(endpoint=endpoint, page_id=page_id, item_id=record.id)
+                for record in page
+            ]
+            session.execute(insert(sync_item).prefix_with("OR REPLACE"), items)
+        row = dict(endpoint=endpoint, page_id=page_id, digest=digest)
+        session.execute(insert(sync_page).prefix_with("OR REPLACE"), [row])
+        digests[page_id] = digest
+
+    def _changed(self, table: str, kind: str, objects: list) -> None:
+        counts = self._counts.setdefault(table, dict(added=0, updated=0, removed=0))
+        counts[kind] += len(objects)
+        if self.on_change is not None:
+            for obj in objects:
+                self.on_change(table, kind, str(obj))
+
+    def _checkpoint(self, pending: dict[str, int]) -> None:
+        """
+        Commit written pages together with their checkpoints
+        """
+        session = self.db.session
+        rows = [
+            dict(id=endpoint, run_id=self.run_id, page_id=page_id, started=self.started)
+            for endpoint, page_id in pending.items()
+        ]
+        statement = insert(SyncCheckpoint.__table__).prefix_with("OR REPLACE")
+        session.execute(statement, rows)
+        session.commit()
+        pending.clear()
+
+    def _reconcile(self, endpoint: str, model: type, last_page: int) -> None:
+        """
+        Forget pages past the last, and delete objects on no page
+        """
+        session = self.db.session
+        for table in (sync_page, sync_item):
+            where = (table.c.endpoint == endpoint) & (table.c.page_id > last_page)
+            session.execute(delete(table).where(where))
+        listed = select(sync_item.c.item_id).where(sync_item.c.endpoint == endpoint)
+        stale = session.scalars(select(model).where(model.id.not_in(listed))).all()
+        for obj in stale:
+            session.delete(obj)
+        if model is Alias:
+            # Their counters' history and rates go with them.
+            for table in (alias_fetched, alias_counter, alias_rate):
+                session.execute(delete(table).where(table.c.alias_id.not_in(listed)))
+        self._changed(model.__tablename__, "removed", stale)
+
+    def run_deep(
+        self,
+        alias_ids: Sequence[int],
+        activities: bool = False,
+        on_progress: Callable[[int], None] | None = None,
+    ) -> dict[str, dict[str, int]]:
+        """
+        Synchronize the contacts, and optionally activities, of aliases
+
+        The aliases are fetched concurrently, and their contacts and
+        activities written as each alias completes. Contacts and
+        activities of aliases no longer in the database are deleted, so
+        this is best run after :meth:`run`.
+
+        :param alias_ids: The ids of the aliases to synchronize
+        :type alias_ids: Sequence[int]
+        :param activities: Whether to also synchronize activities,
+            defaults to False
+        :type activities: bool, optional
+        :param on_progress: Called with the number of aliases completed
+            since the last call
+        :type on_progress: Callable[[int], None], optional
+
+        :return: The number of objects added, updated, and removed by
+            this call, keyed by table name and then by kind of change
+        :rtype: dict[str, dict[str, int]]
+        """
+        self._counts = {}
+        endpoints = [const_rest.ENDPOINT.ALIAS_CONTACTS]
+        if activities:
+            endpoints.append(const_rest.ENDPOINT.ALIAS_ACTIVITIES)
+        digests = {endpoint: self._digests(endpoint) for endpoint in endpoints}
+        fetch = functools.partial(self._fetch_alias, endpoints=endpoints)
+        with limited(self.sl, self.rate):
+            fetched = concurrently(fetch, alias_ids, self.workers)
+            for done, (alias_id, records) in enumerate(fetched, 1):
+                for endpoint, page in records.items():
+                    self._write_alias(endpoint, alias_id, page, digests[endpoint])
+                if done % const.SYNC_BATCH_ALIASES == 0:
+                    self.db.session.commit()
+                if on_progress is not None:
+                    on_progress(1)
+        for endpoint in endpoints:
+            self._reconcile_deep(endpoint)
+        self.db.session.commit()
+        return self._counts
+
+    def run_aliases(self, alias_ids: Sequence[int]) -> dict[int, Any]:
+        """
+        Fetch aliases one by one, concurrently, and write those found
+
+        :param alias_ids: The ids of the aliases to fetch
+        :type alias_ids: Sequence[int]
+
+        :return: The record of each alias, or the error message returned
+            for it, keyed by id, in order of completion
+        :rtype: dict[int, AliasRecord | str]
+        """
+        results = {}
+        with limited(self.sl, self.rate):
+            for alias_id, (_, result) in concurrently(
+                self._get_alias, alias_ids, self.workers
+            ):
+                results[alias_id] = result
+        found = [result for result in results.values() if not isinstance(result, str)]
+        self.db.session.upsert_records(found)
+        # Unlike a sync, nothing else records that unchanged aliases are fresh.
+        self.db.session.mark_fetched([record.id for record in found])
+        self.db.session.commit()
+        return results
+
+    def _get_alias(self, alias_id: int) -> tuple[int, tuple[bool, Any]]:
+        return alias_id, self.sl.get_alias(alias_id)
+
+    def _fetch_alias(
+        self, alias_id: int, endpoints: list[str]
+    ) -> tuple[int, dict[str, list]]:
+        iter_pages = {
+            const_rest.ENDPOINT.ALIAS_CONTACTS: self.sl.iter_alias_contact_pages,
+            const_rest.ENDPOINT.ALIAS_ACTIVITIES: self.sl.iter_alias_activity_pages,
+        }
+        records = {}
+        for endpoint in endpoints:
+            records[endpoint] = [
+                record for page in iter_pages[endpoint](alias_id) for record in page
+            ]
+        return alias_id, records
+
+    def _write_alias(
+        self,
+        endpoint: str,
+        alias_id: int,
+        records: list,
+        digests: dict[int, int],
+    ) -> None:
+        """
+        Write the records of an alias if they have changed
+
+        The digest of the records is kept like that of a page, keyed by
+        the id of the alias in place of a `page_id`.
+        """
+        digest = _page_digest(records)
+        if digests.get(alias_id) == digest:
+            return
+        if endpoint == const_rest.ENDPOINT.ALIAS_CONTACTS:
+            self._write_contacts(alias_id, records)
+        else:
+            self._write_activities(alias_id, records)
+        row = dict(endpoint=endpoint, page_id=alias_id, digest=digest)
+        self.db.session.execute(insert(sync_page).prefix_with("OR REPLACE"), [row])
+        digests[alias_id] = digest
+
+    def _write_contacts(self, alias_id: int, contacts: list) -> None:
+        session = self.db.session
+        added, updated = session.upsert_records(contacts)
+        self._changed("contact", "added", added)
+        self._changed("contact", "updated", updated)
+        ids = [contact.id for contact in contacts]
+        query = select(Contact).where(
+            (Contact.alias_id == alias_id) & Contact.id.not_in(ids)
+        )
+        stale = session.scalars(query).all()
+        for contact in stale:
+            session.delete(contact)
+        self._changed("contact", "removed", stale)
+
+    def _write_activities(self, alias_id: int, activities: list) -> None:
+        """
+        Replace the activities of an alias
+
+        Activities have no id, so they are compared by content, and
+        written by replacing all of the alias's activities at once.
+        """
+        session = self.db.session
+        table = Activity.__table__
+        columns = [column for column in ActivityRecord.columns if column != "id"]
+        query = select(*(table.c[column] for column in columns)).where(
+            table.c.alias_id == alias_id
+        )
+        stored = Counter(tuple(row) for row in session.execute(query))
+        fetched = Counter(
+            tuple(getattr(activity, column) for column in columns)
+            for activity in activities
+        )
+        # The first column is the action, which is how activities print.
+        self._changed("activity", "added", [row[0] for row in fetched - stored])
+        self._changed("activity", "removed", [row[0] for row in stored - fetched])
+        session.execute(delete(table).where(table.c.alias_id == alias_id))
+        if activities:
+            rows = [activity.to_row() for activity in activities]
+            session.execute(insert(table), rows)
+
+    def _reconcile_deep(self, endpoint: str) -> None:
+        """
+        Delete the records, and digests, of aliases no longer present
+        """
+        session = self.db.session
+        aliases = select(Alias.id)
+        where = (sync_page.c.endpoint == endpoint) & sync_page.c.page_id.not_in(aliases)
+        session.execute(delete(sync_page).where(where))
+        if endpoint == const_rest.ENDPOINT.ALIAS_CONTACTS:
+            query = select(Contact).where(Contact.alias_id.not_in(aliases))
+            stale = session.scalars(query).all()
+            for contact in stale:
+                session.delete(contact)
+            self._changed("contact", "removed", stale)
+        else:
+            table = Activity.__table__
+            query = select(table.c.action).where(table.c.alias_id.not_in(aliases))
+            stale = session.scalars(query).all()
+            session.execute(delete(table).where(table.c.alias_id.not_in(aliases)))
+            self._changed("activity", "removed", stale)
+
+
+def fetched_since(session: Session, alias_ids: Sequence[int], since: int) -> set[int]:
+    """
+    Find the aliases fetched from SimpleLogin after a time
+
+    An alias was, if it was fetched on its own or written by a sync
+    since, or is listed on a page of a complete sync begun since.
+
+    :param session: A session of the local database
+    :type session: :class:`sqlalchemy.orm.Session`
+    :param alias_ids: The ids of the aliases
+    :type alias_ids: Sequence[int]
+    :param since: The time, in seconds since the epoch
+    :type since: int
+
+    :return: The ids of the aliases that were
+    :rtype: set[int]
+    """
+    endpoint = const_rest.ENDPOINT.ALIASES
+    fetched = select(alias_fetched.c.alias_id).where(alias_fetched.c.fetched > since)
+    fresh = Alias.id.in_(fetched)
+    synced = select(sync_run.c.fetched).where(sync_run.c.endpoint == endpoint)
+    if (session.scalar(synced) or 0) > since:
+        listed = select(sync_item.c.item_id).where(sync_item.c.endpoint == endpoint)
+        fresh = or_(fresh, Alias.id.in_(listed))
+    query = select(Alias.id).where(Alias.id.in_(alias_ids), fresh)
+    return set(session.scalars(query))
+
+
+def _page_digest(page: list) -> int:
+    """
+    Digest the ids and content of the records on a page
+
+    :rtype: int
+    """
+    digest = hashlib.blake2b(digest_size=8)
+    for record in page:
+        digest.update(f"{record.id}:{record.content_hash};".encode("ascii"))
+    return int.from_bytes(digest.digest(), "big", signed=True)
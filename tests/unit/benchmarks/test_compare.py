@@ -0,0 +1,37 @@
+import pytest
+
+from benchmarks.compare import compare, regressions
+
+
+def _document(**seconds):
+    return dict(
+        meta={},
+        results={key: dict(seconds=value) for key, value in seconds.items()},
+    )
+
+
+@pytest.fixture
+def baseline():
+    return _document(fast=1.0, slow=2.0, gone=1.0)
+
+
+class TestCompare:
+
+    def test_slowdown_within_threshold_is_not_regression(self, baseline):
+        current = _document(fast=1.05, slow=2.0)
+        assert regressions(compare(baseline, current, threshold=0.10)) == []
+
+    def test_slowdown_beyond_threshold_is_regression(self, baseline):
+        current = _document(fast=1.5, slow=2.0)
+        found = regressions(compare(baseline, current, threshold=0.10))
+        assert [comparison.key for comparison in found] == ["fast"]
+        assert found[0].change == pytest.approx(0.5)
+
+    def test_speedup_is_not_regression(self, baseline):
+        current = _document(fast=0.5, slow=1.0)
+        assert regressions(compare(baseline, current)) == []
+
+    def test_only_common_results_are_compared(self, baseline):
+        current = _document(fast=1.0, new=10.0)
+        keys = [comparison.key for comparison in compare(baseline, current)]
+        assert keys == ["fast"]
@@ -0,0 +1,59 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from simplelogincmd.cli import _manifest, lazy_group
+from simplelogincmd.cli.main import cli
+
+
+@pytest.fixture
+def no_manifest(monkeypatch):
+    monkeypatch.setattr(_manifest, "COMMANDS", {})
+
+
+def _help(*args):
+    return CliRunner().invoke(cli, [*args, "--help"], terminal_width=80).output
+
+
+def test_manifest_is_current():
+    # Regenerate with `python -m simplelogincmd.cli.lazy_group`.
+    source = Path(_manifest.__file__).read_text(encoding="utf-8")
+    assert lazy_group.generate_manifest(cli) == source
+
+
+@pytest.mark.parametrize("group", ((), ("alias",), ("alias", "contact")))
+def test_help_matches_commands_on_disk(group):
+    with_manifest = _help(*group)
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(_manifest, "COMMANDS", {})
+        assert _help(*group) == with_manifest
+
+
+def test_root_help_imports_no_command(tmp_path):
+    code = (
+        "import sys\n"
+        "from simplelogincmd.cli.main import cli\n"
+        "try:\n"
+        "    cli(['--help'])\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "print(*(name for name in sys.modules if name.endswith('_commands')))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.splitlines()[-1] == ""
+
+
+@pytest.mark.usefixtures("no_manifest")
+def test_commands_missing_from_manifest_are_found_on_disk():
+    context = cli.make_context("simplelogin", ["alias"])
+    alias = cli.get_command(context, "alias")
+    assert "contact" in alias.list_commands(context)
+    assert alias.get_command(context, "toggle").name == "toggle"
+    assert alias.get_command(context, "import").name == "import"
+    assert alias.get_command(context, "nonexistent") is None
+    assert cli.get_command(context, "import-local").name == "import-local"
@@ -0,0 +1,49 @@
+import pytest
+
+from simplelogincmd import codec, const
+
+
+DOCUMENT = {"alias": "ünïcode@site.com", "ids": [1, 2, 3], "enabled": True, "x": None}
+
+
+@pytest.fixture(params=codec.available(), ids=lambda c: c.name)
+def json_codec(request):
+    return request.param
+
+
+def test_round_trip(json_codec):
+    data = json_codec.dumps(DOCUMENT)
+    assert isinstance(data, bytes)
+    assert json_codec.loads(data) == DOCUMENT
+
+
+def test_pretty_output_is_indented(json_codec):
+    data = json_codec.dumps(DOCUMENT, pretty=True)
+    assert b"\n  " in data
+    assert json_codec.loads(data) == DOCUMENT
+
+
+def test_decodes_text(json_codec):
+    assert json_codec.loads('{"a": 1}') == {"a": 1}
+
+
+@pytest.mark.parametrize("data", [b"", b"<html>", b"{", b"\xff\xfe"])
+def test_invalid_input_raises_value_error(json_codec, data):
+    with pytest.raises(ValueError):
+        json_codec.loads(data)
+
+
+def test_unknown_codec_raises():
+    with pytest.raises(KeyError):
+        codec.get("not-a-json-library")
+
+
+def test_missing_library_is_skipped(monkeypatch):
+    monkeypatch.setattr(codec, "_codecs", {})
+    monkeypatch.setattr(const, "JSON_CODECS", ("not-installed", "json"))
+    monkeypatch.setitem(codec._ADAPTERS, "not-installed", codec._orjson)
+    assert codec.default().name == "json"
+
+
+def test_standard_library_is_always_available():
+    assert codec.available()[-1].name == "json"
@@ -3,6 +3,7 @@ import json
 import jsonschema
 import pytest
 
+from simplelogincmd.cli.util import init
 from simplelogincmd.config import Config
 
 
@@ -110,6 +111,10 @@ class TestSave:
         mode = tmp_config_file.stat().st_mode
         assert mode & 0o600 == 0o600
 
+    def test_saved_file_is_indented_by_four_spaces(self, config, tmp_config_file):
+        assert config.save()
+        assert tmp_config_file.read_text().splitlines()[1].startswith('    "')
+
     def test_saved_file_merges_on_next_init(
         self, config, tmp_config_file, base, schema
     ):
@@ -117,3 +122,60 @@ class TestSave:
         config.save()
         cfg = Config(tmp_config_file, base, schema)
         assert cfg.get("api.api-key") == "newsecretkey"
+
+
+class TestStamp:
+
+    @pytest.fixture
+    def unvalidated(self, monkeypatch):
+        """
+        Make any validation fail the test
+        """
+
+        def fail(*args):
+            pytest.fail("The config was validated")
+
+        monkeypatch.setattr("simplelogincmd.config._validator", fail)
+
+    def test_saved_file_is_not_validated_again(
+        self, config, tmp_config_file, base, schema, unvalidated
+    ):
+        config.save()
+        cfg = Config(tmp_config_file, base, schema)
+        assert cfg.get("test.int") == base["test"]["int"]
+
+    def test_changed_file_is_validated_again(
+        self, config, tmp_config_file, user_invalid, base, schema
+    ):
+        config.save()
+        with tmp_config_file.open("w", encoding="utf-8") as file:
+            json.dump(user_invalid, file, indent=4)
+        cfg = Config(tmp_config_file, base, schema)
+        assert cfg.get("test.int") == base["test"]["int"]
+
+    def test_changed_schema_is_validated_again(
+        self, config, tmp_config_file, base, schema
+    ):
+        config.set("test.int", 0)
+        config.save()
+        schema["properties"]["test"]["properties"]["int"]["minimum"] = 1
+        cfg = Config(tmp_config_file, base, schema)
+        assert cfg.get("test.int") == base["test"]["int"]
+
+
+class TestShared:
+
+    @pytest.fixture(autouse=True)
+    def config_file(self, monkeypatch, tmp_config_file):
+        monkeypatch.setattr("simplelogincmd.const.FILE_CONFIG", tmp_config_file)
+        monkeypatch.setattr(init, "_configs", {})
+
+    def test_config_is_loaded_once(self):
+        assert init.cfg() is init.cfg()
+
+    def test_config_is_reloaded_after_change(self):
+        cfg = init.cfg()
+        cfg.set("display.pager-threshold", 7)
+        cfg.save()
+        assert init.cfg() is not cfg
+        assert init.cfg().get("display.pager-threshold") == 7
@@ -33,6 +33,9 @@ def db_access(db_engine):
     """
     access = DatabaseAccessLayer(engine=db_engine)
     yield access
+    # Return the session's connection to the pool, or it outlives the
+    # db file and a later test fails writing to its replacement.
+    access.session.close()
     access.destroy()
 
 
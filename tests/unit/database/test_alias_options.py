@@ -0,0 +1,65 @@
+import pytest
+
+from simplelogincmd import const
+from simplelogincmd.database import alias_options
+
+
+OPTIONS = dict(
+    can_create=True,
+    suffixes=[dict(suffix="@sl.com", signed_suffix="@sl.com.X.sig")],
+)
+WINDOW = const.SIGNED_SUFFIX_MAX_AGE - const.SIGNED_SUFFIX_MARGIN
+
+
+def test_lifetime_is_capped_by_signed_suffixes():
+    assert alias_options.lifetime(60) == 60
+    assert alias_options.lifetime(3600) == WINDOW
+
+
+def test_rejected_tells_refused_suffixes_apart():
+    assert alias_options.rejected("Alias creation time is expired, please retry")
+    assert alias_options.rejected("Tampered suffix")
+    assert alias_options.rejected("Invalid alias suffix")
+    assert not alias_options.rejected("prefix@sl.com already exists")
+    assert not alias_options.rejected("Suffix @sl.com is not available")
+
+
+@pytest.mark.usefixtures("ready_db")
+class TestAliasOptions:
+
+    def test_options_are_fresh_for_max_age(self, db_access):
+        session = db_access.session
+        alias_options.put(session, "site.com", OPTIONS, fetched=1000)
+        assert alias_options.get(session, "site.com", 300, now=1299) == OPTIONS
+        assert alias_options.get(session, "site.com", 300, now=1300) is None
+        assert alias_options.get(session, "other.com", 300, now=1000) is None
+
+    def test_options_expire_before_their_signed_suffixes(self, db_access):
+        session = db_access.session
+        alias_options.put(session, None, OPTIONS, fetched=1000)
+        assert alias_options.get(session, None, 3600, now=1000 + WINDOW - 1)
+        assert alias_options.get(session, None, 3600, now=1000 + WINDOW) is None
+
+    def test_zero_max_age_uses_nothing(self, db_access):
+        alias_options.put(db_access.session, "site.com", OPTIONS, fetched=1000)
+        assert alias_options.get(db_access.session, "site.com", 0, now=1000) is None
+
+    def test_load_returns_fresh_options_by_hostname(self, db_access):
+        session = db_access.session
+        alias_options.put(session, "old.com", OPTIONS, fetched=900)
+        alias_options.put(session, None, OPTIONS, fetched=1005)
+        assert alias_options.load(session, 100, now=1010) == {None: (OPTIONS, 1005)}
+
+    def test_unusable_options_are_dropped(self, db_access):
+        session = db_access.session
+        alias_options.put(session, "old.com", OPTIONS, fetched=1000)
+        later = 1000 + const.SIGNED_SUFFIX_MAX_AGE
+        alias_options.put(session, "new.com", OPTIONS, fetched=later)
+        assert list(alias_options.load(session, 3600, now=0)) == ["new.com"]
+
+    def test_drop_forgets_one_hostname(self, db_access):
+        session = db_access.session
+        alias_options.put(session, "site.com", OPTIONS, fetched=1000)
+        alias_options.put(session, None, OPTIONS, fetched=1000)
+        alias_options.drop(session, None)
+        assert list(alias_options.load(session, 300, now=1000)) == ["site.com"]
@@ -0,0 +1,268 @@
+import gzip
+import io
+import json
+import re
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+import responses
+from sqlalchemy import func, insert, select
+
+from simplelogincmd import archive, const
+from simplelogincmd.archive import Exporter, load, open_archive, read
+from simplelogincmd.database.models import (
+    Activity,
+    Alias,
+    Contact,
+    Mailbox,
+    alias_counter,
+    alias_fetched,
+    alias_rate,
+    sync_page,
+    sync_run,
+)
+from simplelogincmd.rest import const as const_rest
+from simplelogincmd.rest.records import AliasRecord
+
+
+PAGE = const_rest.MAX_MODELS_PER_PAGE
+
+
+def _alias(i):
+    return dict(
+        id=i,
+        email=f"alias{i}@site.com",
+        nb_block=0,
+        nb_forward=i,
+        nb_reply=0,
+        enabled=True,
+        support_pgp=False,
+        disable_pgp=False,
+        pinned=False,
+        creation_timestamp=i,
+        mailboxes=[dict(id=1, email="mailbox@site.com")],
+        # Not a field of records, but kept by exports.
+        latest_activity=None,
+    )
+
+
+def _contact(alias_id, i):
+    return dict(
+        id=alias_id * 1000 + i,
+        contact=f"contact{i}@example.com",
+        reverse_alias=f"ra{alias_id}.{i}@sl.co",
+        reverse_alias_address=f"ra{alias_id}.{i}@sl.co",
+        block_forward=False,
+        last_email_sent_timestamp=None,
+        creation_timestamp=i,
+    )
+
+
+def _activity(alias_id, i):
+    return {
+        "action": "forward",
+        "timestamp": i,
+        "from": f"sender{i}@example.com",
+        "to": f"alias{alias_id}@site.com",
+        "reverse_alias": f"ra{alias_id}.{i}@sl.co",
+        "reverse_alias_address": f"ra{alias_id}.{i}@sl.co",
+    }
+
+
+@pytest.fixture
+def account(
+    url_mailboxes,
+    url_aliases,
+    url_alias_contacts,
+    url_alias_activities,
+    sl_mailbox_a,
+):
+    """
+    Answer the requests of an export of a synthetic account
+
+    The first alias has more than a page of contacts and of activities,
+    and every other alias one of each.
+    """
+    aliases = [_alias(i) for i in range(1, PAGE + 4)]
+    contacts = {alias["id"]: [_contact(alias["id"], 1)] for alias in aliases}
+    contacts[1] = [_contact(1, i) for i in range(1, PAGE + 3)]
+    activities = {alias["id"]: [_activity(alias["id"], 1)] for alias in aliases}
+    activities[1] = [_activity(1, i) for i in range(1, 2 * PAGE + 2)]
+
+    def paged(url, key, items):
+        pattern = re.compile(re.escape(url).replace(r"\{alias_id\}", r"(\d+)"))
+
+        def callback(request):
+            match = pattern.match(request.url)
+            found = items if match.groups() == () else items[int(match.group(1))]
+            query = parse_qs(urlsplit(request.url).query)
+            start = int(query["page_id"][0]) * PAGE
+            end = start + PAGE
+            return 200, {}, json.dumps({key: found[start:end]})
+
+        mock.add_callback("GET", pattern, callback=callback)
+
+    with responses.RequestsMock() as mock:
+        mock.get(url_mailboxes, json={"mailboxes": [sl_mailbox_a]})
+        paged(url_aliases, "aliases", aliases)
+        paged(url_alias_contacts, "contacts", contacts)
+        paged(url_alias_activities, "activities", activities)
+        mock.assert_all_requests_are_fired = False
+        yield dict(aliases=aliases, contacts=contacts, activities=activities)
+
+
+def _export(sl, **kwargs):
+    buffer = io.BytesIO()
+    counts = Exporter(sl, **kwargs).run(buffer)
+    buffer.seek(0)
+    return counts, buffer
+
+
+def _archive(*objects):
+    header = dict(format=const.EXPORT_FORMAT, version=const.EXPORT_VERSION)
+    lines = [json.dumps(obj) for obj in (header, *objects)]
+    return io.BytesIO("\n".join(lines).encode("utf-8"))
+
+
+def _count(session, table, *where):
+    query = select(func.count()).select_from(table).where(*where)
+    return session.scalar(query)
+
+
+class TestExporter:
+
+    def test_writes_every_object(self, sl, account):
+        counts, buffer = _export(sl, workers=3)
+        assert counts == {
+            "mailbox": 1,
+            "alias": len(account["aliases"]),
+            "contact": sum(map(len, account["contacts"].values())),
+            "activity": sum(map(len, account["activities"].values())),
+        }
+        objects = [json.loads(line) for line in buffer]
+        assert objects[0]["format"] == const.EXPORT_FORMAT
+        assert len(objects) == 1 + sum(counts.values())
+
+    def test_keeps_every_field_and_alias_ids(self, sl, account):
+        _, buffer = _export(sl)
+        objects = [json.loads(line) for line in buffer][1:]
+        aliases = [obj["data"] for obj in objects if obj["type"] == "alias"]
+        assert aliases == account["aliases"]
+        activities = [obj for obj in objects if obj["type"] == "activity"]
+        first = [obj["data"] for obj in activities if obj["alias_id"] == 1]
+        assert sorted(first, key=lambda info: info["timestamp"]) == (
+            account["activities"][1]
+        )
+
+    def test_writes_aliases_before_their_objects(self, sl, account):
+        _, buffer = _export(sl, workers=4)
+        seen = set()
+        for obj in map(json.loads, list(buffer)[1:]):
+            if obj["type"] == "alias":
+                seen.add(obj["data"]["id"])
+            elif obj["type"] in ("contact", "activity"):
+                assert obj["alias_id"] in seen
+
+    def test_leaves_out_activities(self, sl, account):
+        counts, _ = _export(sl, activities=False)
+        assert counts["activity"] == 0
+        assert counts["contact"] > 0
+
+
+class TestOpenArchive:
+
+    def test_reads_back_what_it_writes(self, tmp_path):
+        path = tmp_path / "export.ndjson.gz"
+        with open_archive(path, "wb") as file:
+            file.write(b"line\n")
+        with gzip.open(path) as file:
+            assert file.read() == b"line\n"
+        with open_archive(path) as file:
+            assert file.read() == b"line\n"
+
+    def test_tells_compression_from_file_name(self):
+        assert archive.compression_of("export.ndjson.zst") == "zstd"
+        assert archive.compression_of("export.ndjson.gz") == "gzip"
+        assert archive.compression_of("export") == "gzip"
+
+    def test_rejects_uncompressed_files(self, tmp_path):
+        path = tmp_path / "export.ndjson"
+        path.write_bytes(b"{}\n")
+        with pytest.raises(ValueError, match="Not a gzip or zstd archive"):
+            open_archive(path)
+
+
+class TestRead:
+
+    def test_rejects_files_that_are_not_archives(self):
+        with pytest.raises(ValueError, match="Not an archive"):
+            list(read(io.BytesIO(b'{"aliases": []}\n')))
+
+    def test_rejects_later_versions(self):
+        header = dict(format=const.EXPORT_FORMAT, version=const.EXPORT_VERSION + 1)
+        with pytest.raises(ValueError, match="Unsupported archive version"):
+            list(read(io.BytesIO(json.dumps(header).encode("utf-8"))))
+
+    def test_fills_in_alias_ids(self):
+        file = _archive(dict(type="activity", alias_id=7, data=_activity(7, 1)))
+        [(type, record)] = read(file)
+        assert type == "activity"
+        assert record.alias_id == 7
+        assert record.sender == "sender1@example.com"
+
+
+@pytest.mark.usefixtures("ready_db")
+class TestLoad:
+
+    def test_loads_every_object(self, sl, db_access, account):
+        counts, buffer = _export(sl, workers=2)
+        assert load(db_access, buffer) == counts
+        session = db_access.session
+        assert _count(session, Mailbox) == 1
+        assert _count(session, Alias) == len(account["aliases"])
+        assert _count(session, Contact, Contact.alias_id == 1) == len(
+            account["contacts"][1]
+        )
+        assert _count(session, Activity, Activity.alias_id == 1) == len(
+            account["activities"][1]
+        )
+
+    def test_replaces_objects_of_loaded_aliases(self, db_access, alias):
+        session = db_access.session
+        session.add(alias)
+        session.add(Contact(**_contact(alias.id, 9), alias_id=alias.id))
+        session.add(Activity(**_activity(alias.id, 9), alias_id=alias.id))
+        session.execute(insert(alias_fetched).values(alias_id=alias.id, fetched=1))
+        session.execute(insert(sync_page).values(endpoint="e", page_id=0, digest=0))
+        session.execute(insert(sync_run).values(endpoint="e", fetched=1))
+        session.commit()
+        data = _alias(alias.id)
+        file = _archive(
+            dict(type="alias", data=data),
+            dict(type="contact", alias_id=alias.id, data=_contact(alias.id, 1)),
+        )
+        load(db_access, file)
+        session.expire_all()
+        assert session.get(Alias, alias.id).nb_forward == data["nb_forward"]
+        contacts = session.scalars(select(Contact.contact)).all()
+        assert contacts == ["contact1@example.com"]
+        assert _count(session, Activity) == 0
+        assert _count(session, alias_fetched) == 0
+        assert _count(session, sync_page) == 0
+        assert _count(session, sync_run) == 0
+
+    def test_records_no_counters_of_loaded_aliases(self, db_access, alias):
+        session = db_access.session
+        session.upsert_records([AliasRecord.from_json(_alias(alias.id))])
+        session.commit()
+        data = dict(_alias(alias.id), nb_forward=100)
+        load(db_access, _archive(dict(type="alias", data=data)))
+        assert session.get(Alias, alias.id).nb_forward == 100
+        assert _count(session, alias_counter) == 0
+        assert _count(session, alias_rate) == 0
+
+    def test_loads_nothing_from_broken_archives(self, db_access):
+        file = _archive(dict(type="alias", data=_alias(1)), dict(type="unknown"))
+        with pytest.raises(ValueError, match="Line 3"):
+            load(db_access, file)
+        assert _count(db_access.session, Alias) == 0
@@ -0,0 +1,203 @@
+import io
+import itertools
+import threading
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import select
+
+from simplelogincmd.bulk import CREATED, EXISTS, FAILED, Importer, Row, read_rows
+from simplelogincmd.database import alias_options
+from simplelogincmd.database.models import Alias, alias_fetched
+from simplelogincmd.rest.records import AliasRecord
+
+
+class _SimpleLogin:
+    """
+    Create aliases, and count the requests for alias options
+    """
+
+    def __init__(self):
+        self.client = SimpleNamespace(limiter=None)
+        self.ids = itertools.count(100)
+        self.options_requested = []
+        self.recommended = {}
+        self.existing = set()
+        self.error = None
+        self.lock = threading.Lock()
+
+    def _alias(self, email, note=None):
+        return AliasRecord.from_json(
+            dict(
+                id=next(self.ids),
+                email=email,
+                note=note,
+                nb_block=0,
+                nb_forward=0,
+                nb_reply=0,
+                enabled=True,
+                support_pgp=False,
+                disable_pgp=False,
+                pinned=False,
+                creation_timestamp=0,
+                mailboxes=[],
+            )
+        )
+
+    def get_alias_options(self, hostname=None):
+        with self.lock:
+            self.options_requested.append(hostname)
+        suffixes = [
+            dict(suffix="@sl.com", signed_suffix="@sl.com.sig"),
+            dict(suffix="@other.com", signed_suffix="@other.com.sig"),
+        ]
+        options = dict(
+            can_create=True, prefix_suggestion="suggested", suffixes=suffixes
+        )
+        if hostname in self.recommended:
+            options["recommendation"] = dict(
+                alias=self.recommended[hostname], hostname=hostname
+            )
+        return True, options
+
+    def create_custom_alias(self, *, alias_prefix, signed_suffix, **kwargs):
+        if self.error is not None:
+            return False, self.error
+        if not signed_suffix.endswith(".sig"):
+            return False, "Invalid alias suffix"
+        email = alias_prefix + signed_suffix.removesuffix(".sig")
+        if email in self.existing:
+            return False, f"{email} already exists"
+        return True, self._alias(email)
+
+    def create_random_alias(self, hostname=None, mode=None, note=None):
+        return True, self._alias(f"random{next(self.ids)}@sl.com", note)
+
+
+def _rows(text, format="csv"):
+    return list(read_rows(io.StringIO(text), format))
+
+
+def _run(db_access, rows, sl=None, **kwargs):
+    sl = sl or _SimpleLogin()
+    results = list(Importer(sl, db_access, workers=2, **kwargs).run(rows))
+    return sorted(results, key=lambda result: result.line), sl
+
+
+class TestReadRows:
+
+    def test_csv_rows_default_to_custom_if_they_have_a_prefix(self):
+        rows = _rows('prefix,mailboxes,note\nshop,"1, 2",\n,,random\n')
+        assert rows[0] == Row(
+            2, "custom", None, "shop", None, ("1", "2"), None, None, None
+        )
+        assert rows[1].kind == "random"
+        assert rows[1].note == "random"
+
+    def test_ndjson_rows_skip_blank_lines(self):
+        rows = _rows(
+            '{"kind": "random", "mode": "word"}\n\n{"prefix": "a"}\n', "ndjson"
+        )
+        assert [(row.line, row.kind, row.mode) for row in rows] == [
+            (1, "random", "word"),
+            (3, "custom", None),
+        ]
+
+    def test_unreadable_lines_are_failed_results(self):
+        rows = _rows('not json\n[1]\n{"kind": "other"}\n{"mode": "x"}\n', "ndjson")
+        assert [row.status for row in rows] == [FAILED] * 4
+        assert "Unknown kind" in rows[2].message
+
+
+@pytest.mark.usefixtures("ready_db")
+class TestImporter:
+
+    def test_creates_and_writes_aliases(self, db_access):
+        rows = _rows("prefix,mailboxes,suffix\nshop,1,\nnews,1,@other.com\n,,\n")
+        results, _ = _run(db_access, rows)
+        assert [result.status for result in results] == [CREATED] * 3
+        assert results[0].email == "shop@sl.com"
+        assert results[1].email == "news@other.com"
+        for result in results:
+            alias = db_access.session.get(Alias, result.id)
+            assert alias.email == result.email
+            assert alias.content_hash is not None
+        fetched = select(alias_fetched.c.alias_id).order_by(alias_fetched.c.alias_id)
+        assert db_access.session.scalars(fetched).all() == sorted(
+            result.id for result in results
+        )
+
+    def test_options_are_fetched_once_per_hostname(self, db_access):
+        text = "prefix,hostname,mailboxes\n" + "".join(
+            f"p{i},site{i % 2}.com,1\n" for i in range(10)
+        )
+        _, sl = _run(db_access, _rows(text))
+        assert sorted(sl.options_requested) == ["site0.com", "site1.com"]
+
+    def test_options_are_kept_for_later_runs(self, db_access):
+        rows = _rows("prefix,hostname,mailboxes\na,site.com,1\n")
+        _, sl = _run(db_access, rows, options_max_age=300)
+        assert sl.options_requested == ["site.com"]
+        rows = _rows("prefix,hostname,mailboxes\nb,site.com,1\n")
+        results, sl = _run(db_access, rows, options_max_age=300)
+        assert results[0].status == CREATED
+        assert sl.options_requested == []
+
+    def test_stale_options_kept_are_fetched_anew(self, db_access):
+        suffixes = [dict(suffix="@sl.com", signed_suffix="@sl.com.expired")]
+        options = dict(can_create=True, suffixes=suffixes)
+        alias_options.put(db_access.session, "site.com", options)
+        rows = _rows("prefix,hostname,mailboxes\na,site.com,1\n")
+        results, sl = _run(db_access, rows, options_max_age=300)
+        assert results[0].status == CREATED
+        assert sl.options_requested == ["site.com"]
+
+    def test_other_failures_with_options_kept_are_not_retried(self, db_access):
+        suffixes = [dict(suffix="@sl.com", signed_suffix="@sl.com.sig")]
+        options = dict(can_create=True, suffixes=suffixes)
+        alias_options.put(db_access.session, "site.com", options)
+        sl = _SimpleLogin()
+        sl.error = "You have reached the limitation of a free account"
+        rows = _rows("prefix,hostname,mailboxes\na,site.com,1\n")
+        results, _ = _run(db_access, rows, sl, options_max_age=300)
+        assert results[0].status == FAILED
+        assert results[0].message == sl.error
+        assert sl.options_requested == []
+
+    def test_rerun_skips_aliases_that_exist(self, db_access):
+        rows = _rows("prefix,mailboxes\nshop,1\nshop,1\n")
+        results, _ = _run(db_access, rows)
+        assert sorted(result.status for result in results) == [CREATED, EXISTS]
+        results, _ = _run(db_access, rows)
+        assert [result.status for result in results] == [EXISTS, EXISTS]
+        assert db_access.session.query(Alias).count() == 1
+
+    def test_recommendation_skips_row(self, db_access):
+        sl = _SimpleLogin()
+        sl.recommended["site.com"] = "old@sl.com"
+        rows = _rows("kind,hostname\nrandom,site.com\n")
+        results, _ = _run(db_access, rows, sl)
+        assert results[0].status == EXISTS
+        assert results[0].email == "old@sl.com"
+
+    def test_recommendation_does_not_skip_explicit_prefixes(self, db_access):
+        sl = _SimpleLogin()
+        sl.recommended["site.com"] = "old@sl.com"
+        rows = _rows("prefix,hostname,mailboxes\na,site.com,1\nb,site.com,1\n")
+        results, _ = _run(db_access, rows, sl)
+        assert [result.status for result in results] == [CREATED] * 2
+        assert [result.email for result in results] == ["a@sl.com", "b@sl.com"]
+
+    def test_aliases_that_exist_remotely_are_skipped(self, db_access):
+        sl = _SimpleLogin()
+        sl.existing.add("shop@sl.com")
+        results, _ = _run(db_access, _rows("prefix,mailboxes\nshop,1\n"), sl)
+        assert results[0].status == EXISTS
+        assert results[0].email == "shop@sl.com"
+
+    def test_row_errors_fail_only_their_rows(self, db_access):
+        rows = _rows("prefix,mailboxes,suffix\na,,\nb,x@y.com,\nc,1,@nowhere\nd,1,\n")
+        results, _ = _run(db_access, rows)
+        assert [result.status for result in results] == [FAILED] * 3 + [CREATED]
+        assert results[1].message == "No mailbox matches 'x@y.com'"
+        assert results[2].message == "Suffix @nowhere is not available"
@@ -0,0 +1,74 @@
+import random
+import subprocess
+import sys
+
+import pytest
+
+from simplelogincmd import completion
+from simplelogincmd.completion import ALIAS, MAILBOX
+from simplelogincmd.database.models import Alias
+
+
+@pytest.fixture
+def index(populated_db, db_access, tmp_path):
+    path = tmp_path / "completion.idx"
+    completion.write_index(db_access.session, path)
+    return path
+
+
+class TestComplete:
+
+    def test_alias_email_prefix_ignores_case(self, index):
+        assert completion.complete(ALIAS, "ALI", index) == [("alias@sl.com", "testing")]
+
+    def test_alias_note_prefix_offers_email(self, index):
+        assert completion.complete(ALIAS, "test", index) == [
+            ("alias@sl.com", "testing")
+        ]
+
+    def test_kinds_are_kept_apart(self, index):
+        assert completion.complete(MAILBOX, "alias", index) == []
+        assert completion.complete(MAILBOX, "", index) == [
+            ("more@tests.io", ""),
+            ("test@site.com", ""),
+        ]
+
+    def test_identifier_matching_twice_is_offered_once(self, db_access, index):
+        db_access.session.get(Alias, 1).note = "alias for shopping"
+        db_access.session.commit()
+        completion.write_index(db_access.session, index)
+        assert completion.complete(ALIAS, "alias", index) == [
+            ("alias@sl.com", "alias for shopping")
+        ]
+
+    def test_missing_or_empty_index_completes_nothing(self, tmp_path):
+        path = tmp_path / "completion.idx"
+        assert completion.complete(ALIAS, "", path) == []
+        path.write_bytes(b"")
+        assert completion.complete(ALIAS, "", path) == []
+
+
+def test_binary_search_finds_every_prefix(tmp_path):
+    rng = random.Random(0)
+    keys = sorted(
+        {"".join(rng.choices("abc", k=rng.randint(1, 6))) for _ in range(500)}
+    )
+    path = tmp_path / "completion.idx"
+    path.write_bytes(b"".join(completion._line(ALIAS, key, key, None) for key in keys))
+    for prefix in ("", "a", "ab", "cab", "bbb", "ccccccc"):
+        expected = [key for key in keys if key.startswith(prefix)][:10]
+        found = completion.complete(ALIAS, prefix, path, limit=10)
+        assert [value for value, _ in found] == expected
+
+
+def test_completion_does_not_import_the_orm():
+    code = (
+        "import sys\n"
+        "from simplelogincmd.cli import complete\n"
+        "complete.alias(None, None, 'a')\n"
+        "print('sqlalchemy' in sys.modules)\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "False"
@@ -0,0 +1,99 @@
+import itertools
+
+import pytest
+from sqlalchemy import select
+
+from simplelogincmd.database import counters
+from simplelogincmd.database.models import Alias, alias_counter
+from simplelogincmd.rest.records import AliasRecord
+
+
+DAY = counters.SECONDS_PER_DAY
+NOW = 100 * DAY
+
+
+def _row(alias_id, nb_forward=0, nb_block=0, nb_reply=0):
+    return dict(
+        id=alias_id, nb_forward=nb_forward, nb_block=nb_block, nb_reply=nb_reply
+    )
+
+
+@pytest.fixture
+def session(ready_db, db_access):
+    return db_access.session
+
+
+def _history(session, alias_id):
+    query = (
+        select(alias_counter.c.nb_forward, alias_counter.c.nb_block)
+        .where(alias_counter.c.alias_id == alias_id)
+        .order_by(alias_counter.c.taken)
+    )
+    return [tuple(row) for row in session.execute(query)]
+
+
+class TestRecord:
+
+    def test_first_counters_are_recorded_whole(self, session):
+        assert counters.record(session, [_row(1, 5, 2)], taken=NOW) == 1
+        initial = session.scalar(select(alias_counter.c.initial))
+        assert initial is True
+        assert _history(session, 1) == [(5, 2)]
+
+    def test_later_counters_are_recorded_as_changes(self, session):
+        counters.record(session, [_row(1, 5, 2)], taken=NOW)
+        counters.record(session, [_row(1, 8, 2)], taken=NOW + 1)
+        assert _history(session, 1) == [(5, 2), (3, 0)]
+
+    def test_unchanged_counters_are_not_recorded(self, session):
+        counters.record(session, [_row(1, 5, 2)], taken=NOW)
+        assert counters.record(session, [_row(1, 5, 2)], taken=NOW + 1) == 0
+        assert len(_history(session, 1)) == 1
+
+    def test_changes_in_the_same_second_add_up(self, session):
+        counters.record(session, [_row(1, 5)], taken=NOW)
+        counters.record(session, [_row(1, 6)], taken=NOW + 1)
+        counters.record(session, [_row(1, 9)], taken=NOW + 1)
+        assert _history(session, 1) == [(5, 0), (4, 0)]
+
+    def test_upserting_alias_records_records_counters(
+        self, session, alias, monkeypatch
+    ):
+        clock = itertools.count(NOW)
+        monkeypatch.setattr(counters.time, "time", lambda: next(clock))
+        info = {column: alias.get(column) for column in Alias.__table__.columns.keys()}
+        session.upsert_records([AliasRecord.from_json(info)])
+        info["nb_forward"] += 2
+        session.upsert_records([AliasRecord.from_json(info)])
+        assert [forward for forward, _ in _history(session, alias.id)] == [1, 2]
+
+
+class TestMovers:
+
+    @pytest.fixture
+    def history(self, session, alias):
+        for alias_id in (1, 2, 3):
+            session.add(
+                Alias(**(alias.__dict__ | dict(id=alias_id, email=f"{alias_id}")))
+            )
+        counters.record(session, [_row(1), _row(2), _row(3)], taken=NOW - 20 * DAY)
+        counters.record(session, [_row(1, nb_block=50)], taken=NOW - 10 * DAY)
+        counters.record(session, [_row(2, nb_block=6)], taken=NOW - DAY)
+        counters.record(session, [_row(3, nb_forward=4)], taken=NOW - DAY)
+        session.commit()
+
+    @pytest.mark.usefixtures("history")
+    def test_aliases_are_ranked_by_change_in_window(self, session):
+        movements = counters.movers(session, 7 * DAY, now=NOW)
+        assert [(m.id, m.nb_block, m.per_day) for m in movements] == [(2, 6, 0.9)]
+
+    @pytest.mark.usefixtures("history")
+    def test_longer_window_and_other_counter(self, session):
+        movements = counters.movers(session, 30 * DAY, "nb_block", now=NOW)
+        assert [m.id for m in movements] == [1, 2]
+        assert movements[0].per_day == 2.5
+        movements = counters.movers(session, 30 * DAY, "nb_forward", now=NOW)
+        assert [m.id for m in movements] == [3]
+
+    def test_no_history(self, session):
+        assert counters.movers(session, DAY) == []
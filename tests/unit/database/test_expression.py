@@ -0,0 +1,109 @@
+import pytest
+from sqlalchemy import select
+
+from simplelogincmd.database import expression
+from simplelogincmd.database.models import Alias
+
+
+def _alias(alias_id, **values):
+    fields = dict(
+        id=alias_id,
+        email=f"alias{alias_id}@sl.com",
+        name=None,
+        note=None,
+        nb_block=0,
+        nb_forward=0,
+        nb_reply=0,
+        enabled=True,
+        support_pgp=False,
+        disable_pgp=False,
+        pinned=False,
+        creation_timestamp=alias_id,
+    )
+    fields.update(values)
+    return Alias(**fields)
+
+
+@pytest.fixture
+def aliases(ready_db, db_access):
+    db_access.session.add_all(
+        [
+            _alias(1, nb_forward=150, note="Shopping site"),
+            _alias(2, nb_forward=150, note="shop", enabled=False),
+            _alias(3, nb_forward=5, note="100% news", pinned=True),
+            _alias(4, nb_forward=500, nb_block=600),
+        ]
+    )
+    db_access.session.commit()
+
+
+@pytest.fixture
+def where(aliases, db_access):
+    """
+    Find the ids of the aliases selected by a `where` expression
+    """
+
+    def where(text):
+        condition = expression.compile_where(Alias, text)
+        statement = select(Alias.id).where(condition).order_by(Alias.id)
+        return db_access.session.scalars(statement).all()
+
+    return where
+
+
+@pytest.mark.parametrize(
+    "text, ids",
+    [
+        ("nb_forward > 100", [1, 2, 4]),
+        ('nb_forward > 100 and enabled and note ~ "shop"', [1]),
+        ("not enabled or pinned", [2, 3]),
+        ("(pinned or note ~ 'SHOP') and nb_forward >= 150", [1, 2]),
+        ('note !~ "shop"', [3, 4]),
+        ("note = null", [4]),
+        ("note", [1, 2, 3]),
+        ("nb_block > nb_forward", [4]),
+        ("id != 1 and enabled = false", [2]),
+    ],
+)
+def test_where_selects_matching_aliases(where, text, ids):
+    assert where(text) == ids
+
+
+def test_where_contains_treats_wildcards_literally(where):
+    assert where('note ~ "100%"') == [3]
+    assert where('note ~ "_"') == []
+
+
+def test_where_values_are_bound_parameters():
+    condition = expression.compile_where(Alias, 'note = "x\' or 1=1 --"')
+    assert "1=1" not in str(condition)
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "nb_forwards > 1",
+        "nb_forward >",
+        "nb_forward > 'many'",
+        "enabled = 1",
+        "nb_forward ~ 'x'",
+        "(enabled",
+        "enabled pinned",
+        "note < null",
+        "note # 'x'",
+    ],
+)
+def test_invalid_where_raises(text):
+    with pytest.raises(ValueError):
+        expression.compile_where(Alias, text)
+
+
+def test_sort_orders_by_each_field(aliases, db_access):
+    ordering = expression.compile_sort(Alias, "-nb_forward, id")
+    statement = select(Alias.id).order_by(*ordering)
+    assert db_access.session.scalars(statement).all() == [4, 1, 2, 3]
+
+
+def test_sort_by_unknown_field_raises():
+    with pytest.raises(ValueError):
+        expression.compile_sort(Alias, "mailboxes")
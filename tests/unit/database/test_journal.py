@@ -0,0 +1,166 @@
+import json
+import re
+
+import click
+import pytest
+import requests
+import responses
+
+from simplelogincmd import journal
+from simplelogincmd.cli.util import offline
+from simplelogincmd.database.models import Alias, JournalEntry
+from simplelogincmd.journal import Journal
+
+
+def _alias(alias_id):
+    return dict(
+        id=alias_id,
+        email=f"alias{alias_id}@site.com",
+        name=None,
+        note=None,
+        nb_block=0,
+        nb_forward=0,
+        nb_reply=0,
+        enabled=True,
+        support_pgp=False,
+        disable_pgp=False,
+        pinned=False,
+        creation_timestamp=alias_id,
+        mailboxes=[],
+    )
+
+
+@pytest.fixture
+def server(url_base):
+    """
+    Answer alias requests from a synthetic account of three aliases
+
+    The aliases are kept in a dict by id. While `offline` is set, every
+    request fails to connect.
+    """
+
+    class Server(dict):
+        offline = False
+        mutations = 0
+
+    server = Server({alias_id: _alias(alias_id) for alias_id in (1, 2, 3)})
+    pattern = re.compile(
+        re.escape(url_base) + r"/api/aliases/(\d+)(/toggle)?(?:\?.*)?$"
+    )
+
+    def callback(request):
+        if server.offline:
+            raise requests.ConnectionError("Network is unreachable")
+        match = pattern.match(request.url)
+        alias = server.get(int(match.group(1)))
+        if alias is None:
+            return 400, {}, json.dumps({"error": "Unknown error"})
+        if request.method == "GET":
+            return 200, {}, json.dumps(alias)
+        server.mutations += 1
+        if request.method == "POST":
+            alias["enabled"] = not alias["enabled"]
+            return 200, {}, json.dumps({"enabled": alias["enabled"]})
+        if request.method == "PATCH":
+            alias.update(json.loads(request.body))
+            return 200, {}, json.dumps({"ok": True})
+        del server[alias["id"]]
+        return 200, {}, json.dumps({"deleted": True})
+
+    with responses.RequestsMock(assert_all_requests_are_fired=False) as mock:
+        for method in ("GET", "POST", "PATCH", "DELETE"):
+            mock.add_callback(method, pattern, callback=callback)
+        yield server
+
+
+@pytest.fixture
+def local(ready_db, db_access, sl, server):
+    """
+    Copy the server's aliases into the local database
+    """
+    for alias_id in server:
+        db_access.session.upsert(sl.get_alias(alias_id)[1])
+    db_access.session.commit()
+
+
+@pytest.mark.usefixtures("local")
+class TestJournal:
+
+    def test_record_applies_change_locally(self, sl, db_access):
+        Journal(sl, db_access).record(journal.UPDATE, 1, dict(note="offline"))
+        assert db_access.session.get(Alias, 1).note == "offline"
+        assert Journal(sl, db_access).pending() == 1
+
+    def test_record_toggle_stores_target_state(self, sl, db_access):
+        entry = Journal(sl, db_access).record(journal.TOGGLE, 1)
+        assert entry.changes == dict(enabled=False)
+        assert entry.base == dict(enabled=True)
+        assert db_access.session.get(Alias, 1).enabled is False
+
+    def test_record_delete_keeps_entry(self, sl, db_access):
+        Journal(sl, db_access).record(journal.DELETE, 1)
+        assert db_access.session.get(Alias, 1) is None
+        assert db_access.session.query(JournalEntry).count() == 1
+
+    def test_replay_applies_entries_in_order(self, sl, db_access, server):
+        queue = Journal(sl, db_access)
+        queue.record(journal.UPDATE, 1, dict(note="first"))
+        queue.record(journal.UPDATE, 1, dict(note="second"))
+        queue.record(journal.TOGGLE, 2)
+        queue.record(journal.DELETE, 3)
+        counts = queue.replay()
+        assert counts == dict(applied=4, conflict=0, failed=0)
+        assert server[1]["note"] == "second"
+        assert server[2]["enabled"] is False
+        assert 3 not in server
+        assert queue.pending() == 0
+        assert db_access.session.get(Alias, 1).note == "second"
+
+    def test_toggle_already_in_target_state_is_not_repeated(
+        self, sl, db_access, server
+    ):
+        queue = Journal(sl, db_access)
+        queue.record(journal.TOGGLE, 1)
+        server[1]["enabled"] = False
+        assert queue.replay()[journal.APPLIED] == 1
+        assert server.mutations == 0
+        assert server[1]["enabled"] is False
+
+    def test_change_made_elsewhere_is_a_conflict(self, sl, db_access, server):
+        queue = Journal(sl, db_access)
+        queue.record(journal.UPDATE, 1, dict(note="mine"))
+        server[1]["note"] = "theirs"
+        results = []
+        counts = queue.replay(on_result=lambda *result: results.append(result))
+        assert counts[journal.CONFLICT] == 1
+        assert results[0][:2] == ("update alias 1", journal.CONFLICT)
+        assert server[1]["note"] == "theirs"
+        assert db_access.session.get(Alias, 1).note == "theirs"
+
+    def test_offline_replay_keeps_entries(self, sl, db_access, server):
+        queue = Journal(sl, db_access)
+        queue.record(journal.UPDATE, 1, dict(note="offline"))
+        server.offline = True
+        with pytest.raises(requests.ConnectionError):
+            queue.replay()
+        assert queue.pending() == 1
+        server.offline = False
+        assert queue.replay()[journal.APPLIED] == 1
+        assert server[1]["note"] == "offline"
+
+    def test_entry_outlives_local_alias_removal(self, sl, db_access):
+        Journal(sl, db_access).record(journal.UPDATE, 2, dict(pinned=True))
+        db_access.session.remove(Alias, 2)
+        db_access.session.commit()
+        assert Journal(sl, db_access).pending() == 1
+
+    def test_unqueueable_change_is_a_clean_error(self, sl, db_access, server):
+        cfg = {"offline.queue": True, "sync.workers": 1}
+        db_access.session.remove(Alias, 3)
+        db_access.session.commit()
+        server.offline = True
+        with pytest.raises(click.ClickException, match="cannot be queued"):
+            offline.attempt(
+                cfg, sl, db_access, journal.TOGGLE, 3, lambda: sl.toggle_alias(3)
+            )
+        assert Journal(sl, db_access).pending() == 0
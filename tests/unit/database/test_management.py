@@ -1,6 +1,9 @@
-from sqlalchemy import text
+from sqlalchemy import inspect, select, text
 from sqlalchemy_utils import database_exists
 
+from simplelogincmd import const
+from simplelogincmd.database.models import JournalEntry
+
 
 class TestDatabaseInitialization:
 
@@ -23,6 +26,47 @@ class TestDatabaseInitialization:
         mode = path.stat().st_mode
         assert mode & 0o600 == 0o600
 
+    def test_schema_version_is_stored(self, db_access):
+        db_access.initialize()
+        assert db_access.schema_version() == const.DB_SCHEMA_VERSION
+
+    def test_db_of_other_schema_version_is_rebuilt(self, db_access):
+        db_access.initialize()
+        with db_access.engine.begin() as connection:
+            connection.execute(text("CREATE TABLE obsolete (id INTEGER)"))
+            connection.execute(text("PRAGMA user_version = 0"))
+        assert db_access.initialize()
+        assert db_access.schema_version() == const.DB_SCHEMA_VERSION
+        assert "obsolete" not in inspect(db_access.engine).get_table_names()
+
+    def test_queued_changes_survive_rebuilds(self, db_access):
+        db_access.initialize()
+        entry = JournalEntry(
+            object_id=1,
+            action="toggle",
+            changes={"enabled": False},
+            base={"enabled": True},
+            created=1,
+        )
+        db_access.session.add(entry)
+        db_access.session.commit()
+        db_access.session.close()
+        with db_access.engine.begin() as connection:
+            connection.execute(text("PRAGMA user_version = 0"))
+        assert db_access.initialize()
+        assert db_access.schema_version() == const.DB_SCHEMA_VERSION
+        assert db_access.pending() == 1
+        [kept] = db_access.session.scalars(select(JournalEntry)).all()
+        assert (kept.object_id, kept.changes) == (1, {"enabled": False})
+
+    def test_db_is_kept_if_queued_changes_cannot_be_carried_over(self, db_access):
+        db_access.initialize()
+        with db_access.engine.begin() as connection:
+            connection.execute(text("ALTER TABLE journal RENAME COLUMN base TO old"))
+            connection.execute(text("PRAGMA user_version = 0"))
+        assert not db_access.initialize()
+        assert db_access.schema_version() == 0
+
     def test_tables_are_created(self, db_access):
         # Test whether SELECTing from a table which should exist does
         # *not* raise any exception. No asserts are necessary. If the
@@ -34,6 +78,22 @@ class TestDatabaseInitialization:
             sql = text(f"SELECT * FROM {table.name};")
             db_access.session.execute(sql)
 
+    def test_indexes_are_created(self, db_access):
+        db_access.initialize()
+        indexes = {
+            index["name"] for index in inspect(db_access.engine).get_indexes("alias")
+        }
+        assert {"ix_alias_email_nocase", "ix_alias_pinned_created"} <= indexes
+
+    def test_analyze_gathers_statistics(self, db_access, alias):
+        db_access.initialize()
+        db_access.session.add(alias)
+        db_access.session.commit()
+        db_access.analyze()
+        with db_access.engine.connect() as connection:
+            sql = text("SELECT tbl FROM sqlite_stat1")
+            assert "alias" in connection.scalars(sql).all()
+
 
 class TestDatabaseDestruction:
 
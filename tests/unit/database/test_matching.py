@@ -0,0 +1,55 @@
+import pytest
+
+from simplelogincmd.database import matching
+
+
+@pytest.mark.parametrize(
+    "query, text, tier",
+    (
+        ("shop@sl.com", "Shop@SL.com", matching.EXACT),
+        ("shop", "shopping@sl.com", matching.PREFIX),
+        ("sl", "shopping@sl.com", matching.TOKEN),
+        ("ping", "shopping@sl.com", matching.SUBSTRING),
+        ("spg", "shopping@sl.com", matching.SUBSEQUENCE),
+        ("gps", "shopping@sl.com", 0),
+        ("shop", None, 0),
+    ),
+)
+def test_score_tiers(query, text, tier):
+    assert int(matching.score(query, text)) == tier
+
+
+def test_shorter_text_scores_higher_within_a_tier():
+    assert matching.score("shop", "shop.1@sl.com") > matching.score(
+        "shop", "shop.100@sl.com"
+    )
+
+
+def test_later_token_match_is_found():
+    # The first occurrence is inside a word, the second starts one.
+    assert int(matching.score("ab", "cab ab")) == matching.TOKEN
+
+
+def test_subsequence_pattern_escapes_wildcards():
+    assert matching.subsequence_pattern("A_%") == "%a%\\_%\\%%"
+
+
+def test_substring_pattern_escapes_wildcards():
+    assert matching.substring_pattern("A_%") == "%a\\_\\%%"
+
+
+@pytest.mark.parametrize(
+    "query, kind",
+    (
+        (12, matching.INTEGER),
+        ("12", matching.INTEGER),
+        ("99999999999999999999", matching.TEXT),
+        ("shop@sl.com", matching.EMAIL),
+        ("shop@sl", matching.FRAGMENT),
+        ("@sl.com", matching.FRAGMENT),
+        ("shop @sl.com", matching.TEXT),
+        ("shop.12", matching.TEXT),
+    ),
+)
+def test_classify(query, kind):
+    assert matching.classify(query) == kind
@@ -1,9 +1,11 @@
 import pytest
 
+from simplelogincmd.database import matching
 from simplelogincmd.database.models import (
     Alias,
     Mailbox,
 )
+from simplelogincmd.rest.records import AliasRecord
 
 
 def test_init_accepts_extra_arguments():
@@ -12,6 +14,43 @@ def test_init_accepts_extra_arguments():
     Mailbox(extratestkwarg=True)
 
 
+def test_init_leaves_missing_arguments_as_none():
+    mb = Mailbox(id=5)
+    assert mb.id == 5
+    assert mb.email is None
+
+
+@pytest.mark.usefixtures("ready_db")
+def test_constructed_object_is_persisted_with_its_values(db_access):
+    db_access.session.add(
+        Mailbox(
+            id=9,
+            email="new@site.com",
+            nb_alias=3,
+            verified=False,
+            default=True,
+            creation_timestamp=42,
+        )
+    )
+    db_access.session.commit()
+    db_access.session.expunge_all()
+    mb = db_access.session.get(Mailbox, 9)
+    assert mb.email == "new@site.com"
+    assert mb.nb_alias == 3
+    assert mb.default is True
+
+
+@pytest.mark.usefixtures("populated_db")
+def test_merge_clears_missing_arguments(db_access, alias):
+    assert db_access.session.get(Alias, 1).note == "testing"
+    fields = {key: value for key, value in vars(alias).items() if key[0] != "_"}
+    del fields["note"]
+    db_access.session.merge(Alias(**fields))
+    db_access.session.commit()
+    db_access.session.expunge_all()
+    assert db_access.session.get(Alias, 1).note is None
+
+
 class TestFieldGetters:
 
     def test_get_existing_field(self, mailbox):
@@ -34,6 +73,15 @@ class TestFieldGetters:
         assert mailbox.get_string("faketestfield") == ""
 
 
+def _copy(obj, **values):
+    """
+    Make a new object of the type and with the values of another
+    """
+    columns = type(obj).__table__.columns.keys()
+    fields = {name: getattr(obj, name) for name in columns}
+    return type(obj)(**(fields | values))
+
+
 @pytest.mark.usefixtures("populated_db")
 class TestIdentifiers:
 
@@ -45,6 +93,12 @@ class TestIdentifiers:
         results = Mailbox.resolve_identifier(db_access.session, 525600)
         assert len(results) == 0
 
+    def test_unknown_numeric_id_is_not_matched_as_text(self, db_access, mailbox):
+        db_access.session.add(_copy(mailbox, id=3, email="box10@site.com"))
+        db_access.session.commit()
+        assert Mailbox.resolve_identifier(db_access.session, "10") == []
+        assert [mb.id for mb in Mailbox.resolve_identifier(db_access.session, 3)] == [3]
+
     def test_full_mailbox_email_matches_one(self, db_access):
         results = Mailbox.resolve_identifier(db_access.session, "test@site.com")
         assert len(results) == 1
@@ -67,3 +121,63 @@ class TestIdentifiers:
     def test_alias_identifier_matches_note(self, db_access):
         results = Alias.resolve_identifier(db_access.session, "test")
         assert len(results) == 1
+
+    def test_mailbox_identifier_matches_subsequence(self, db_access):
+        results = Mailbox.resolve_identifier(db_access.session, "mtio")
+        assert [mailbox.id for mailbox in results] == [2]
+
+    def test_ranked_best_match_first(self, db_access):
+        ranked = Mailbox.rank_identifier(db_access.session, "test")
+        assert [mailbox.id for _, mailbox in ranked] == [1, 2]
+        assert ranked[0][0] > ranked[1][0]
+
+    def test_rank_limit(self, db_access):
+        ranked = Mailbox.rank_identifier(db_access.session, "s", limit=1)
+        assert len(ranked) == 1
+
+    def test_exact_email_ignoring_case_matches_alone(self, db_access):
+        ranked = Mailbox.rank_identifier(db_access.session, "TEST@Site.com")
+        assert [mailbox.id for _, mailbox in ranked] == [1]
+        assert ranked[0][0] > matching.EXACT
+
+    def test_exact_identifier_is_none_for_partial_email(self, db_access):
+        assert Mailbox.exact_identifier(db_access.session, "test") is None
+
+    def test_ranking_is_remembered_until_a_write(self, db_access, mailbox):
+        session = db_access.session
+        assert len(Mailbox.resolve_identifier(session, "test")) == 2
+        session.add(_copy(mailbox, id=3, email="tested@site.com"))
+        assert len(Mailbox.resolve_identifier(session, "test")) == 2
+        session.flush()
+        assert len(Mailbox.resolve_identifier(session, "test")) == 3
+        session.rollback()
+
+    def test_ranking_is_forgotten_on_bulk_writes(self, db_access):
+        session = db_access.session
+        assert Alias.resolve_identifier(session, "shop") == []
+        record = AliasRecord.from_json(
+            dict(
+                id=5,
+                email="shop@sl.com",
+                nb_block=0,
+                nb_forward=0,
+                nb_reply=0,
+                enabled=True,
+                support_pgp=False,
+                disable_pgp=False,
+                pinned=False,
+                creation_timestamp=5,
+            )
+        )
+        session.upsert_records([record])
+        session.commit()
+        assert [alias.id for alias in Alias.resolve_identifier(session, "shop")] == [5]
+        session.remove(Alias, 5)
+        assert Alias.resolve_identifier(session, "shop") == []
+
+    def test_email_fragment_matches_email_before_note(self, db_access, alias):
+        other = _copy(alias, id=2, email="other@site.com", note="@sl.com")
+        db_access.session.add(other)
+        db_access.session.commit()
+        results = Alias.resolve_identifier(db_access.session, "@sl.com")
+        assert [alias.id for alias in results] == [1]
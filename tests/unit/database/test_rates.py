@@ -0,0 +1,94 @@
+import pytest
+from sqlalchemy import select
+
+from simplelogincmd.database import counters, rates
+from simplelogincmd.database.models import Alias, alias_rate
+
+
+DAY = rates.SECONDS_PER_DAY
+NOW = 100 * DAY
+
+
+def _row(alias_id, nb_forward=0, nb_block=0, created=0):
+    return dict(
+        id=alias_id,
+        nb_forward=nb_forward,
+        nb_block=nb_block,
+        nb_reply=0,
+        creation_timestamp=created,
+    )
+
+
+@pytest.fixture
+def session(ready_db, db_access, alias):
+    for alias_id in (1, 2):
+        db_access.session.add(
+            Alias(**(alias.__dict__ | dict(id=alias_id, email=f"{alias_id}")))
+        )
+    return db_access.session
+
+
+def _rates(session, alias_id, counter):
+    query = select(alias_rate).where(
+        alias_rate.c.alias_id == alias_id, alias_rate.c.counter == counter
+    )
+    return session.execute(query).one()
+
+
+def test_first_rate_is_average_over_life(session):
+    counters.record(session, [_row(1, nb_block=200)], taken=NOW)
+    row = _rates(session, 1, "nb_block")
+    assert row.rate == row.baseline == 2.0
+    assert row.delta == 0
+
+
+def test_rate_moves_toward_rate_of_change(session):
+    counters.record(session, [_row(1, nb_block=200)], taken=NOW)
+    counters.record(session, [_row(1, nb_block=200 + 7 * 10)], taken=NOW + 7 * DAY)
+    row = _rates(session, 1, "nb_block")
+    # A change over a half-life weighs half.
+    assert (row.baseline, row.observed, row.rate) == (2.0, 10.0, 6.0)
+    assert row.delta == 70
+
+
+def test_unchanged_counter_keeps_its_rate(session):
+    counters.record(session, [_row(1, 100, 100)], taken=NOW)
+    counters.record(session, [_row(1, 150, 100)], taken=NOW + DAY)
+    assert _rates(session, 1, "nb_block").updated == NOW
+    assert _rates(session, 1, "nb_forward").updated == NOW + DAY
+
+
+class TestSpikes:
+
+    @pytest.fixture
+    def history(self, session):
+        counters.record(session, [_row(1, 100, 100), _row(2, 100, 100)], taken=NOW)
+        # Alias 1 blocks at its usual rate, of one email a day, while
+        # alias 2 suddenly blocks 50 in a day.
+        changed = [_row(1, 100, 101), _row(2, 105, 150)]
+        counters.record(session, changed, taken=NOW + DAY)
+        session.commit()
+
+    @pytest.mark.usefixtures("history")
+    def test_spiking_counters_are_found(self, session):
+        spikes = rates.spikes(session, NOW)
+        assert [(spike.id, spike.counter) for spike in spikes] == [(2, "nb_block")]
+        assert (spikes[0].delta, spikes[0].observed, spikes[0].baseline) == (
+            50,
+            50.0,
+            1.0,
+        )
+
+    @pytest.mark.usefixtures("history")
+    def test_thresholds(self, session):
+        assert rates.spikes(session, NOW, factor=60) == []
+        assert rates.spikes(session, NOW, min_delta=51) == []
+        spikes = rates.spikes(session, NOW, factor=4, min_delta=5)
+        assert {(spike.id, spike.counter) for spike in spikes} == {
+            (2, "nb_block"),
+            (2, "nb_forward"),
+        }
+
+    @pytest.mark.usefixtures("history")
+    def test_earlier_spikes_are_left_out(self, session):
+        assert rates.spikes(session, NOW + DAY + 1) == []
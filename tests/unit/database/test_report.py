@@ -0,0 +1,68 @@
+import pytest
+
+from simplelogincmd.database import report
+from simplelogincmd.database.models import Activity
+
+
+DAY = 24 * 60 * 60
+
+
+def _activity(action, sender, timestamp):
+    return Activity(
+        action=action,
+        sender=sender,
+        recipient="alias@sl.com",
+        reverse_alias=f"{sender} <ra@sl.com>",
+        reverse_alias_address="ra@sl.com",
+        timestamp=timestamp,
+        alias_id=1,
+    )
+
+
+@pytest.fixture
+def session(ready_db, db_access):
+    db_access.session.add_all(
+        [
+            _activity("forward", "a@x.com", 10 * DAY + 5),
+            _activity("block", "b@x.com", 10 * DAY + 6),
+            _activity("block", "b@x.com", 12 * DAY),
+            _activity("reply", "a@x.com", 12 * DAY + 1),
+            _activity("bounced", "c@x.com", 12 * DAY + 2),
+            _activity("forward", "c@x.com", 30 * DAY),
+        ]
+    )
+    db_access.session.commit()
+    return db_access.session
+
+
+def test_histogram_counts_each_interval(session):
+    buckets = report.histogram(session, 0, 20 * DAY, DAY)
+    assert [bucket.start for bucket in buckets] == [10 * DAY, 11 * DAY, 12 * DAY]
+    assert buckets[0] == (10 * DAY, 1, 1, 0, 0, 2, 0.5)
+    assert buckets[1] == (11 * DAY, 0, 0, 0, 0, 0, 0.0)
+    assert buckets[2] == (12 * DAY, 0, 1, 1, 1, 3, 0.333)
+
+
+def test_histogram_intervals_are_aligned(session):
+    buckets = report.histogram(session, 10 * DAY + 6, 13 * DAY, 2 * DAY)
+    assert [(bucket.start, bucket.total) for bucket in buckets] == [
+        (10 * DAY, 1),
+        (12 * DAY, 3),
+    ]
+
+
+def test_histogram_of_empty_window(session):
+    assert report.histogram(session, 40 * DAY, 50 * DAY, DAY) == []
+
+
+def test_senders_are_ranked_by_total(session):
+    senders = report.senders(session, 0, 20 * DAY)
+    assert [sender.sender for sender in senders] == ["a@x.com", "b@x.com", "c@x.com"]
+    assert senders[1] == ("b@x.com", 0, 2, 0, 0, 2, 1.0)
+
+
+def test_senders_are_ranked_by_action(session):
+    senders = report.senders(session, 0, 40 * DAY, by="forward", limit=1)
+    assert [(sender.sender, sender.forward) for sender in senders] == [("a@x.com", 1)]
+    senders = report.senders(session, 0, 40 * DAY, by="block")
+    assert [sender.sender for sender in senders] == ["b@x.com"]
@@ -0,0 +1,107 @@
+import click
+import pytest
+
+from simplelogincmd.cli.util.input import resolve_id, resolve_ids
+from simplelogincmd.database.models import Mailbox
+
+
+def _mailbox(id, email):
+    return Mailbox(
+        id=id,
+        email=email,
+        nb_alias=0,
+        verified=True,
+        default=False,
+        creation_timestamp=0,
+    )
+
+
+@pytest.fixture
+def tty(monkeypatch):
+    """
+    Answer the choice prompt with the second option, if there is one
+    """
+    prompts = []
+
+    def prompt(text, options):
+        prompts.append(options)
+        return min(1, len(options) - 1)
+
+    monkeypatch.setattr("simplelogincmd.cli.util.input.prompt_choice", prompt)
+    monkeypatch.setattr("sys.stdin.isatty", lambda: True, raising=False)
+    return prompts
+
+
+@pytest.mark.usefixtures("populated_db")
+class TestResolveId:
+
+    def test_unmatched_identifier_is_returned_as_is(self, db_access):
+        assert resolve_id(db_access, Mailbox, "nomatch") == "nomatch"
+
+    def test_unknown_number_is_returned_as_is(self, db_access, tty):
+        db_access.session.add(_mailbox(3, "box10@site.com"))
+        db_access.session.commit()
+        assert resolve_id(db_access, Mailbox, "10") == "10"
+        assert tty == []
+
+    def test_unknown_number_is_not_taken_for_a_subsequence(self, db_access, tty):
+        db_access.session.add(_mailbox(3, "shop.1a4b8c2d1@sl.com"))
+        db_access.session.commit()
+        assert resolve_id(db_access, Mailbox, "4821") == "4821"
+        assert resolve_id(db_access, Mailbox, "4821", first=True) == "4821"
+        assert tty == []
+
+    def test_lone_subsequence_match_is_prompted(self, db_access, tty):
+        assert resolve_id(db_access, Mailbox, "mtio") == 2
+        assert [mailbox.id for mailbox in tty[0]] == [2]
+
+    def test_lone_subsequence_match_without_terminal_fails(
+        self, db_access, monkeypatch
+    ):
+        monkeypatch.setattr("sys.stdin.isatty", lambda: False, raising=False)
+        with pytest.raises(click.UsageError, match="closely"):
+            resolve_id(db_access, Mailbox, "mtio")
+        assert resolve_id(db_access, Mailbox, "mtio", first=True) == 2
+
+    def test_lone_exact_match_is_not_prompted(self, db_access, tty):
+        assert resolve_id(db_access, Mailbox, "TEST@site.com") == 1
+        assert tty == []
+
+    def test_ambiguous_match_prompts_best_first(self, db_access, tty):
+        assert resolve_id(db_access, Mailbox, "test") == 2
+        assert [mailbox.id for mailbox in tty[0]] == [1, 2]
+
+    def test_first_takes_best_match(self, db_access, tty):
+        assert resolve_id(db_access, Mailbox, "test", first=True) == 1
+        assert tty == []
+
+    def test_ambiguous_match_without_terminal_fails(self, db_access, monkeypatch):
+        monkeypatch.setattr("sys.stdin.isatty", lambda: False, raising=False)
+        with pytest.raises(click.UsageError, match="--first"):
+            resolve_id(db_access, Mailbox, "test")
+
+
+@pytest.mark.usefixtures("populated_db")
+class TestResolveIds:
+
+    def test_ids_and_addresses_are_resolved_in_order(self, db_access, tty):
+        ids = ["2", "TEST@site.com", 1, "more@tests.io"]
+        assert resolve_ids(db_access, Mailbox, ids) == [2, 1, 1, 2]
+        assert tty == []
+
+    def test_unknown_ids_are_returned_as_is(self, db_access):
+        assert resolve_ids(db_access, Mailbox, ["99", "nomatch"]) == ["99", "nomatch"]
+
+    def test_unknown_numbers_are_not_resolved_as_text(self, db_access, monkeypatch):
+        db_access.session.add(_mailbox(3, "shop.1a4b8c2d1@sl.com"))
+        db_access.session.commit()
+
+        def resolve_id(*args, **kwargs):
+            raise AssertionError("Numbers are not to be resolved one by one")
+
+        monkeypatch.setattr("simplelogincmd.cli.util.input.resolve_id", resolve_id)
+        assert resolve_ids(db_access, Mailbox, ["4821", "999", 3]) == ["4821", "999", 3]
+
+    def test_other_identifiers_are_resolved_one_by_one(self, db_access, tty):
+        assert resolve_ids(db_access, Mailbox, ["1", "test"]) == [1, 2]
+        assert [mailbox.id for mailbox in tty[0]] == [1, 2]
@@ -2,8 +2,11 @@ import pytest
 from sqlalchemy.exc import IntegrityError
 
 from simplelogincmd.database.models import (
+    Alias,
+    Contact,
     Mailbox,
 )
+from simplelogincmd.rest.records import MailboxRecord
 
 
 @pytest.fixture
@@ -109,3 +112,90 @@ class TestUpsert:
         db_access.session.upsert(new_mailbox)
         with pytest.raises(IntegrityError):
             db_access.session.commit()
+
+    def test_record_is_converted_and_updates_db(self, db_access, mailbox):
+        record = MailboxRecord(
+            id=mailbox.id,
+            email=f"record_{mailbox.email}",
+            nb_alias=mailbox.nb_alias,
+            verified=mailbox.verified,
+            default=mailbox.default,
+            creation_timestamp=mailbox.creation_timestamp,
+        )
+        obj = db_access.session.upsert(record)
+        db_access.session.commit()
+        assert obj is mailbox
+        assert mailbox.email.startswith("record_")
+
+
+@pytest.mark.usefixtures("ready_db")
+class TestUpsertRecords:
+
+    def _record(self, **values):
+        fields = dict(
+            id=1,
+            email="mb@site.com",
+            nb_alias=1,
+            verified=True,
+            default=True,
+            creation_timestamp=1,
+        )
+        return MailboxRecord(**(fields | values))
+
+    def test_new_record_is_added(self, db_access):
+        added, updated = db_access.session.upsert_records([self._record()])
+        db_access.session.commit()
+        assert len(added) == 1 and not updated
+        assert db_access.session.get(Mailbox, 1).email == "mb@site.com"
+
+    def test_unchanged_record_is_skipped(self, db_access):
+        db_access.session.upsert_records([self._record()])
+        assert db_access.session.upsert_records([self._record()]) == ([], [])
+
+    def test_changed_record_is_updated(self, db_access):
+        db_access.session.upsert_records([self._record()])
+        changed = self._record(nb_alias=2)
+        assert db_access.session.upsert_records([changed]) == ([], [changed])
+        db_access.session.commit()
+        assert db_access.session.get(Mailbox, 1).nb_alias == 2
+
+
+@pytest.mark.usefixtures("populated_db")
+class TestWriteThrough:
+
+    def test_apply_changes_local_copy(self, db_access, alias):
+        db_access.session.apply(Alias, alias.id, enabled=False, note="new")
+        db_access.session.commit()
+        db_access.session.expire_all()
+        stored = db_access.session.get(Alias, alias.id)
+        assert stored.enabled is False
+        assert stored.note == "new"
+
+    def test_apply_clears_content_hash(self, db_access, alias):
+        alias.content_hash = 42
+        db_access.session.commit()
+        db_access.session.apply(Alias, alias.id, pinned=True)
+        assert alias.content_hash is None
+
+    def test_apply_without_local_copy_does_nothing(self, db_access):
+        assert db_access.session.apply(Alias, 12345, enabled=False) is None
+
+    def test_remove_deletes_object_and_what_belongs_to_it(self, db_access, alias):
+        contact = Contact(
+            id=1,
+            contact="c@example.com",
+            reverse_alias="ra",
+            reverse_alias_address="ra@sl.co",
+            block_forward=False,
+            creation_timestamp=1,
+            alias_id=alias.id,
+        )
+        db_access.session.add(contact)
+        db_access.session.commit()
+        assert db_access.session.remove(Alias, alias.id)
+        db_access.session.commit()
+        assert db_access.session.get(Alias, alias.id) is None
+        assert db_access.session.query(Contact).count() == 0
+
+    def test_remove_without_local_copy_returns_false(self, db_access):
+        assert not db_access.session.remove(Mailbox, 12345)
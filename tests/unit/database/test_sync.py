@@ -0,0 +1,416 @@
+import json
+import re
+import time
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+import requests
+import responses
+from sqlalchemy import select, update
+
+from simplelogincmd.database.models import (
+    Activity,
+    Alias,
+    Contact,
+    Mailbox,
+    SyncCheckpoint,
+    alias_counter,
+    alias_fetched,
+    alias_rate,
+    sync_run,
+)
+from simplelogincmd.rest import const
+from simplelogincmd.rest.exceptions import APIError
+from simplelogincmd.sync import Synchronizer, fetched_since, prefetch
+
+
+class _Aliases(list):
+    pass
+
+
+def _aliases(count):
+    return _Aliases(
+        dict(
+            id=i,
+            email=f"alias{i}@site.com",
+            nb_block=0,
+            nb_forward=0,
+            nb_reply=0,
+            enabled=True,
+            support_pgp=False,
+            disable_pgp=False,
+            pinned=False,
+            creation_timestamp=i,
+            mailboxes=[dict(id=1, email="mailbox@site.com")],
+        )
+        for i in range(1, count + 1)
+    )
+
+
+def _contact(alias_id, i):
+    return dict(
+        id=alias_id * 100 + i,
+        contact=f"contact{i}@example.com",
+        reverse_alias=f"contact{i} at example.com <ra{alias_id}.{i}@sl.co>",
+        reverse_alias_address=f"ra{alias_id}.{i}@sl.co",
+        block_forward=False,
+        last_email_sent_timestamp=None,
+        creation_timestamp=i,
+    )
+
+
+def _activity(alias_id, i):
+    return {
+        "action": "forward",
+        "timestamp": i,
+        "from": f"sender{i}@example.com",
+        "to": f"alias{alias_id}@site.com",
+        "reverse_alias": f"ra{alias_id}.{i}@sl.co",
+        "reverse_alias_address": f"ra{alias_id}.{i}@sl.co",
+    }
+
+
+def _record(changes):
+    return lambda *change: changes.append(change)
+
+
+@pytest.fixture
+def account(url_mailboxes, url_aliases, sl_mailbox_a):
+    """
+    Answer mailbox and paginated alias requests from a synthetic account
+    """
+    aliases = _aliases(2 * const.MAX_MODELS_PER_PAGE + 5)
+    # Page ids requested, those whose requests fail, and those answered
+    # with an error.
+    aliases.requested = []
+    aliases.failing = set()
+    aliases.erroring = set()
+
+    def alias_page(request):
+        query = parse_qs(urlsplit(request.url).query)
+        page_id = int(query["page_id"][0])
+        aliases.requested.append(page_id)
+        if page_id in aliases.failing:
+            raise requests.ConnectionError("Connection dropped")
+        if page_id in aliases.erroring:
+            return 500, {}, json.dumps({"error": "Internal error"})
+        start = page_id * const.MAX_MODELS_PER_PAGE
+        end = start + const.MAX_MODELS_PER_PAGE
+        page = aliases[start:end]
+        return 200, {}, json.dumps({"aliases": page})
+
+    with responses.RequestsMock() as mock:
+        mock.get(url_mailboxes, json={"mailboxes": [sl_mailbox_a]})
+        mock.add_callback(
+            "GET", re.compile(re.escape(url_aliases) + r"\?.*"), callback=alias_page
+        )
+        aliases.mock = mock
+        yield aliases
+
+
+@pytest.fixture
+def deep_account(account, url_alias_contacts, url_alias_activities):
+    """
+    Also answer contact and activity requests of the `account` aliases
+
+    Every alias has one contact and one activity, except for the first,
+    which has more than a page of contacts. Requests for the aliases
+    whose ids are in `rejected` are refused.
+    """
+    # Not every test fetches activities.
+    account.mock.assert_all_requests_are_fired = False
+    account.rejected = set()
+    account.contacts = {alias["id"]: [_contact(alias["id"], 1)] for alias in account}
+    account.contacts[1] = [
+        _contact(1, i) for i in range(1, const.MAX_MODELS_PER_PAGE + 3)
+    ]
+    account.activities = {alias["id"]: [_activity(alias["id"], 1)] for alias in account}
+
+    def paged(url, key, items):
+        pattern = re.compile(re.escape(url).replace(r"\{alias_id\}", r"(\d+)"))
+
+        def callback(request):
+            alias_id = int(pattern.match(request.url).group(1))
+            if alias_id in account.rejected:
+                return 429, {}, json.dumps({"error": "Too many requests"})
+            query = parse_qs(urlsplit(request.url).query)
+            start = int(query["page_id"][0]) * const.MAX_MODELS_PER_PAGE
+            end = start + const.MAX_MODELS_PER_PAGE
+            page = items.get(alias_id, [])[start:end]
+            return 200, {}, json.dumps({key: page})
+
+        account.mock.add_callback("GET", pattern, callback=callback)
+
+    paged(url_alias_contacts, "contacts", account.contacts)
+    paged(url_alias_activities, "activities", account.activities)
+    return account
+
+
+class TestPrefetch:
+
+    def test_yields_every_item_in_order(self):
+        assert list(prefetch(range(100), maxsize=3)) == list(range(100))
+
+    def test_producer_error_is_raised_to_consumer(self):
+        def items():
+            yield 1
+            raise ValueError("broken")
+
+        iterator = prefetch(items())
+        assert next(iterator) == 1
+        with pytest.raises(ValueError, match="broken"):
+            next(iterator)
+
+    def test_producer_runs_ahead_by_at_most_maxsize(self):
+        produced = []
+
+        def items():
+            for i in range(10):
+                produced.append(i)
+                yield i
+
+        iterator = prefetch(items(), maxsize=2)
+        assert next(iterator) == 0
+        # Give the producer time to fill the queue.
+        time.sleep(0.2)
+        # One item consumed, two queued, and one waiting to be queued.
+        assert len(produced) == 4
+        iterator.close()
+
+
+@pytest.mark.usefixtures("ready_db")
+class TestSynchronizer:
+
+    def test_writes_every_mailbox_and_alias(self, sl, db_access, account):
+        counts = Synchronizer(sl, db_access, batch_pages=1).run()
+        assert counts["mailbox"] == dict(added=1, updated=0, removed=0)
+        assert counts["alias"] == dict(added=len(account), updated=0, removed=0)
+        assert db_access.session.query(Alias).count() == len(account)
+        assert db_access.session.query(Mailbox).count() == 1
+
+    def test_removes_rows_no_longer_on_server(
+        self, sl, db_access, account, mailbox, alias
+    ):
+        mailbox.id = 999
+        alias.id = 999
+        db_access.session.add_all([mailbox, alias])
+        db_access.session.commit()
+        changes = []
+        counts = Synchronizer(sl, db_access, on_change=_record(changes)).run()
+        assert db_access.session.get(Mailbox, 999) is None
+        assert db_access.session.get(Alias, 999) is None
+        assert counts["alias"]["removed"] == 1
+        assert ("alias", "removed", alias.email) in changes
+
+    def test_counters_of_removed_aliases_are_deleted(self, sl, db_access, account):
+        Synchronizer(sl, db_access).run()
+        removed = account.pop()["id"]
+        for table in (alias_counter, alias_rate):
+            query = select(table.c.alias_id).where(table.c.alias_id == removed)
+            assert db_access.session.scalars(query).all()
+        Synchronizer(sl, db_access).run()
+        for table in (alias_counter, alias_rate):
+            query = select(table.c.alias_id).where(table.c.alias_id == removed)
+            assert db_access.session.scalars(query).all() == []
+
+    def test_interrupted_run_keeps_committed_pages(self, sl, db_access, account):
+        account.failing.add(2)
+        with pytest.raises(requests.ConnectionError):
+            Synchronizer(sl, db_access, batch_pages=1).run()
+        db_access.session.rollback()
+        checkpoint = db_access.session.get(SyncCheckpoint, const.ENDPOINT.ALIASES)
+        assert checkpoint.page_id == 1
+        assert db_access.session.query(Alias).count() == 2 * const.MAX_MODELS_PER_PAGE
+
+    def test_error_page_deletes_nothing(self, sl, db_access, account):
+        Synchronizer(sl, db_access).run()
+        account.erroring.add(2)
+        with pytest.raises(APIError, match="Internal error"):
+            Synchronizer(sl, db_access, batch_pages=1).run()
+        db_access.session.rollback()
+        assert db_access.session.query(Alias).count() == len(account)
+
+    def test_resume_continues_after_last_committed_page(self, sl, db_access, account):
+        account.failing.add(2)
+        with pytest.raises(requests.ConnectionError):
+            Synchronizer(sl, db_access, batch_pages=1).run()
+        db_access.session.rollback()
+        account.failing.clear()
+        account.requested.clear()
+        synchronizer = Synchronizer(sl, db_access, batch_pages=1)
+        counts = synchronizer.run(resume=True)
+        assert synchronizer.resumed
+        assert account.requested == [2]
+        assert counts["alias"]["added"] == 5
+        assert db_access.session.query(Alias).count() == len(account)
+        assert db_access.session.query(SyncCheckpoint).count() == 0
+
+    def test_resume_without_checkpoint_starts_over(self, sl, db_access, account):
+        synchronizer = Synchronizer(sl, db_access)
+        counts = synchronizer.run(resume=True)
+        assert not synchronizer.resumed
+        assert counts["alias"]["added"] == len(account)
+
+    def test_rows_hold_record_values(self, sl, db_access, account):
+        Synchronizer(sl, db_access).run()
+        alias = db_access.session.get(Alias, account[-1]["id"])
+        assert alias.email == account[-1]["email"]
+        assert alias.enabled is True
+
+    def test_resync_of_unchanged_account_changes_nothing(self, sl, db_access, account):
+        Synchronizer(sl, db_access).run()
+        counts = Synchronizer(sl, db_access).run()
+        for changes in counts.values():
+            assert changes == dict(added=0, updated=0, removed=0)
+
+    def test_unchanged_pages_are_not_written(self, sl, db_access, account):
+        Synchronizer(sl, db_access).run()
+        # Modify a row behind the synchronizer's back. As its page is
+        # unchanged on the server, the row is not rewritten.
+        db_access.session.execute(update(Alias).where(Alias.id == 1).values(note="x"))
+        db_access.session.commit()
+        Synchronizer(sl, db_access).run()
+        assert db_access.session.get(Alias, 1).note == "x"
+
+    def test_aliases_of_unchanged_pages_are_fresh_without_stamps(
+        self, sl, db_access, account
+    ):
+        Synchronizer(sl, db_access).run()
+        db_access.session.execute(alias_fetched.delete())
+        db_access.session.commit()
+        started = int(time.time())
+        Synchronizer(sl, db_access).run()
+        session = db_access.session
+        assert session.scalars(select(alias_fetched.c.alias_id)).all() == []
+        ids = [alias["id"] for alias in account]
+        assert fetched_since(session, ids, started - 1) == set(ids)
+        assert fetched_since(session, ids, started + 1) == set()
+
+    def test_resumed_run_is_as_fresh_as_its_start(self, sl, db_access, account):
+        account.failing.add(2)
+        with pytest.raises(requests.ConnectionError):
+            Synchronizer(sl, db_access, batch_pages=1).run()
+        db_access.session.rollback()
+        started = db_access.session.scalars(select(SyncCheckpoint.started)).first()
+        account.failing.clear()
+        Synchronizer(sl, db_access, batch_pages=1).run(resume=True)
+        fetched = db_access.session.scalars(select(sync_run.c.fetched)).all()
+        assert fetched == [started, started]
+
+    def test_only_changed_aliases_are_reported(self, sl, db_access, account):
+        Synchronizer(sl, db_access).run()
+        account[3]["note"] = "changed"
+        del account[-1]
+        changes = []
+        counts = Synchronizer(sl, db_access, on_change=_record(changes)).run()
+        assert counts["alias"] == dict(added=0, updated=1, removed=1)
+        assert sorted(changes) == [
+            ("alias", "removed", f"alias{len(account) + 1}@site.com"),
+            ("alias", "updated", "alias4@site.com"),
+        ]
+        assert db_access.session.get(Alias, 4).note == "changed"
+
+
+@pytest.mark.usefixtures("ready_db")
+class TestDeepSynchronizer:
+
+    def _run(self, sl, db_access, activities=False, **kwargs):
+        synchronizer = Synchronizer(sl, db_access, **kwargs)
+        synchronizer.run()
+        alias_ids = db_access.session.scalars(select(Alias.id)).all()
+        return synchronizer.run_deep(alias_ids, activities=activities)
+
+    def test_writes_contacts_of_every_alias(self, sl, db_access, deep_account):
+        counts = self._run(sl, db_access)
+        expected = sum(len(contacts) for contacts in deep_account.contacts.values())
+        assert counts["contact"] == dict(added=expected, updated=0, removed=0)
+        assert db_access.session.query(Contact).count() == expected
+        contact = db_access.session.get(Contact, 201)
+        assert contact.alias_id == 2
+        assert "activity" not in counts
+        assert db_access.session.query(Activity).count() == 0
+
+    def test_writes_activities_if_asked(self, sl, db_access, deep_account):
+        counts = self._run(sl, db_access, activities=True)
+        assert counts["activity"]["added"] == len(deep_account)
+        activity = db_access.session.scalars(
+            select(Activity).where(Activity.alias_id == 3)
+        ).one()
+        assert activity.sender == "sender1@example.com"
+
+    def test_resync_of_unchanged_account_changes_nothing(
+        self, sl, db_access, deep_account
+    ):
+        self._run(sl, db_access, activities=True)
+        counts = self._run(sl, db_access, activities=True)
+        for changes in counts.values():
+            assert changes == dict(added=0, updated=0, removed=0)
+        assert db_access.session.query(Activity).count() == len(deep_account)
+
+    def test_changes_are_reported(self, sl, db_access, deep_account):
+        self._run(sl, db_access, activities=True)
+        deep_account.contacts[2][0]["name"] = "Changed"
+        deep_account.contacts[3] = []
+        deep_account.activities[4].append(_activity(4, 2))
+        counts = self._run(sl, db_access, activities=True)
+        assert counts["contact"] == dict(added=0, updated=1, removed=1)
+        assert counts["activity"] == dict(added=1, updated=0, removed=0)
+        assert db_access.session.get(Contact, 201).name == "Changed"
+        assert db_access.session.get(Contact, 301) is None
+
+    def test_records_of_removed_aliases_are_deleted(self, sl, db_access, deep_account):
+        self._run(sl, db_access, activities=True)
+        removed = deep_account.pop()
+        counts = self._run(sl, db_access, activities=True)
+        assert counts["contact"]["removed"] == 1
+        assert counts["activity"]["removed"] == 1
+        query = select(Contact).where(Contact.alias_id == removed["id"])
+        assert db_access.session.scalars(query).all() == []
+
+    def test_error_response_keeps_stored_contacts(self, sl, db_access, deep_account):
+        self._run(sl, db_access)
+        deep_account.rejected.add(1)
+        with pytest.raises(APIError, match="Too many requests"):
+            self._run(sl, db_access, workers=1)
+        db_access.session.rollback()
+        query = select(Contact).where(Contact.alias_id == 1)
+        assert len(db_access.session.scalars(query).all()) == 22
+
+
+@pytest.mark.usefixtures("ready_db")
+class TestAliasSynchronizer:
+
+    @pytest.fixture
+    def single(self, url_alias):
+        """
+        Answer requests for single aliases, of which only the first two
+        exist
+        """
+        aliases = {alias["id"]: alias for alias in _aliases(2)}
+        pattern = re.compile(re.escape(url_alias).replace(r"\{alias_id\}", r"(\d+)"))
+
+        def callback(request):
+            alias_id = int(pattern.match(request.url).group(1))
+            if alias_id not in aliases:
+                return 404, {}, json.dumps({"error": "Unknown error"})
+            return 200, {}, json.dumps(aliases[alias_id])
+
+        with responses.RequestsMock() as mock:
+            mock.add_callback("GET", pattern, callback=callback)
+            yield aliases
+
+    def test_writes_aliases_found(self, sl, db_access, single):
+        results = Synchronizer(sl, db_access, workers=2).run_aliases([2, 1])
+        assert {results[1].email, results[2].email} == {
+            "alias1@site.com",
+            "alias2@site.com",
+        }
+        assert db_access.session.query(Alias).count() == 2
+        query = select(alias_fetched.c.alias_id)
+        assert sorted(db_access.session.scalars(query)) == [1, 2]
+
+    def test_returns_error_of_aliases_not_found(self, sl, db_access, single):
+        results = Synchronizer(sl, db_access).run_aliases([1, 3])
+        assert results[3] == "Unknown error"
+        assert db_access.session.get(Alias, 3) is None
+        assert db_access.session.get(Alias, 1) is not None
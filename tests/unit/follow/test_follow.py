@@ -0,0 +1,166 @@
+import threading
+
+import pytest
+
+from simplelogincmd.follow import Cursor, Follower, Interval
+from simplelogincmd.rest import const
+from simplelogincmd.rest.records import ActivityRecord
+
+
+def _activity(alias_id, timestamp, sender="sender@example.com"):
+    return ActivityRecord.from_json(
+        {
+            "action": "forward",
+            "timestamp": timestamp,
+            "from": sender,
+            "to": f"alias{alias_id}@sl.com",
+            "reverse_alias": "ra@sl.com",
+            "reverse_alias_address": "ra@sl.com",
+        }
+    )._replace(alias_id=alias_id)
+
+
+class _SimpleLogin:
+    """
+    Serve the activities of aliases, newest first, in pages
+    """
+
+    def __init__(self):
+        self.activities = {}
+        self.requested = []
+
+    def add(self, alias_id, *timestamps, sender="sender@example.com"):
+        activities = self.activities.setdefault(alias_id, [])
+        activities.extend(_activity(alias_id, t, sender) for t in timestamps)
+        activities.sort(key=lambda activity: activity.timestamp, reverse=True)
+
+    def iter_alias_activity_pages(self, alias_id):
+        activities = self.activities.get(alias_id, [])
+        size = const.MAX_MODELS_PER_PAGE
+        for start in range(0, len(activities) + 1, size):
+            self.requested.append((alias_id, start // size))
+            end = start + size
+            page = activities[start:end]
+            if page:
+                yield page
+            if len(page) < size:
+                return
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def sl():
+    return _SimpleLogin()
+
+
+@pytest.fixture
+def clock():
+    return _Clock()
+
+
+@pytest.fixture
+def follower(sl, clock):
+    sl.add(1, 10, 20)
+    sl.add(2, 15)
+    follower = Follower(
+        sl,
+        [1, 2],
+        make_interval=lambda: Interval(minimum=5, maximum=40, backoff=2),
+        clock=clock,
+        sleep=clock.sleep,
+    )
+    follower.start()
+    sl.requested.clear()
+    return follower
+
+
+def _timestamps(activities):
+    return [(activity.alias_id, activity.timestamp) for activity in activities]
+
+
+def test_cursor_tells_activities_at_the_same_time_apart():
+    cursor = Cursor()
+    cursor.advance([_activity(1, 10, "a@x.com")])
+    assert not cursor.is_new(_activity(1, 10, "a@x.com"))
+    assert not cursor.is_new(_activity(1, 9, "b@x.com"))
+    assert cursor.is_new(_activity(1, 10, "b@x.com"))
+    assert cursor.is_new(_activity(1, 11, "a@x.com"))
+
+
+def test_interval_shrinks_with_activity_and_grows_without():
+    interval = Interval(minimum=5, maximum=40, backoff=2)
+    assert [interval.update(0) for _ in range(4)] == [10, 20, 40, 40]
+    assert [interval.update(1) for _ in range(4)] == [20, 10, 5, 5]
+
+
+def test_existing_activities_are_not_new(follower, sl):
+    assert follower.poll() == []
+    assert follower.poll() == []
+
+
+def test_start_reads_only_the_newest_page(sl, clock):
+    sl.add(1, *range(1, 3 * const.MAX_MODELS_PER_PAGE))
+    follower = Follower(sl, [1], clock=clock, sleep=clock.sleep)
+    follower.start()
+    assert sl.requested == [(1, 0)]
+    assert follower.poll() == []
+
+
+def test_start_reads_aliases_at_once(sl, clock):
+    for alias_id in range(1, 4):
+        sl.add(alias_id, alias_id)
+    # Each read waits for the others, so none finishes unless all run.
+    barrier = threading.Barrier(3, timeout=5)
+    read = sl.iter_alias_activity_pages
+
+    def iter_alias_activity_pages(alias_id):
+        barrier.wait()
+        yield from read(alias_id)
+
+    sl.iter_alias_activity_pages = iter_alias_activity_pages
+    follower = Follower(sl, [1, 2, 3], clock=clock, sleep=clock.sleep, workers=3)
+    follower.start()
+    assert sorted(sl.requested) == [(1, 0), (2, 0), (3, 0)]
+    assert [cursor.timestamp for cursor in follower.cursors.values()] == [1, 2, 3]
+
+
+def test_new_activities_are_found_oldest_first(follower, sl):
+    sl.add(1, 30, 25)
+    assert _timestamps(follower.poll()) == [(1, 25), (1, 30)]
+    assert sl.requested == [(1, 0)]
+
+
+def test_reading_stops_at_the_newest_seen(follower, sl):
+    new = range(100, 100 + const.MAX_MODELS_PER_PAGE + 1)
+    sl.add(1, *new)
+    assert _timestamps(follower.poll()) == [(1, t) for t in new]
+    # The second page ends with an activity already seen.
+    assert sl.requested == [(1, 0), (1, 1)]
+
+
+def test_aliases_are_polled_when_due(follower, sl, clock):
+    follower.poll()
+    follower.poll()
+    assert clock.slept == [5]
+    # Neither alias had new activities, so each waits twice as long.
+    sl.add(2, 50)
+    assert follower.poll() == []
+    assert _timestamps(follower.poll()) == [(2, 50)]
+    assert clock.now == 15
+    # Alias 2 is polled again before alias 1, as it had activity.
+    sl.requested.clear()
+    follower.poll()
+    assert sl.requested == [(2, 0)]
+    assert clock.now == 20
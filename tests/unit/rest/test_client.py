@@ -0,0 +1,50 @@
+import time
+from unittest import mock
+
+import responses
+
+from simplelogincmd import codec
+from simplelogincmd.rest.client import Client, RateLimiter
+
+
+@responses.activate
+def test_json_response_is_decoded(url_base):
+    responses.get(url_base, json={"aliases": [{"id": 1}]})
+    success, body = Client(url_base).get()
+    assert success
+    assert body == {"aliases": [{"id": 1}]}
+
+
+@responses.activate
+def test_non_json_response_is_wrapped(url_base):
+    responses.get(url_base, body="<html>Bad Gateway</html>", status=502)
+    success, body = Client(url_base).get()
+    assert not success
+    assert body == {"msg": "<html>Bad Gateway</html>"}
+
+
+@responses.activate
+def test_given_codec_is_used(url_base):
+    responses.get(url_base, json={"a": 1})
+    client = Client(url_base, codec=codec.get("json"))
+    assert client.codec.name == "json"
+    assert client.get() == (True, {"a": 1})
+
+
+def test_rate_limiter_spaces_requests():
+    limiter = RateLimiter(rate=50)
+    start = time.monotonic()
+    for _ in range(6):
+        limiter.acquire()
+    # The first token is available at once, the other five accrue.
+    assert time.monotonic() - start >= 5 / 50 * 0.9
+
+
+@responses.activate
+def test_limiter_is_acquired_per_request(url_base):
+    responses.get(url_base, json={})
+    limiter = mock.Mock()
+    client = Client(url_base, limiter=limiter)
+    client.get()
+    client.get()
+    assert limiter.acquire.call_count == 2
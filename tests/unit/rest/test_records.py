@@ -0,0 +1,50 @@
+from simplelogincmd.database.models import (
+    Activity,
+    Alias,
+)
+from simplelogincmd.rest.records import (
+    ActivityRecord,
+    AliasRecord,
+    MailboxRecord,
+)
+
+
+def test_from_json_ignores_unknown_keys_and_defaults_to_none():
+    record = MailboxRecord.from_json(dict(id=1, unknown=True))
+    assert record.id == 1
+    assert record.email is None
+    assert not hasattr(record, "unknown")
+
+
+def test_records_have_no_instance_dict(sl_alias_a):
+    record = AliasRecord.from_json(sl_alias_a)
+    assert not hasattr(record, "__dict__")
+
+
+def test_alias_mailboxes_are_records(sl_alias_a, sl_mailbox_a):
+    record = AliasRecord.from_json(sl_alias_a)
+    assert record.mailboxes == (MailboxRecord.from_json(sl_mailbox_a),)
+    assert record.get_string("mailboxes") == sl_mailbox_a["email"]
+
+
+def test_alias_converts_to_model(sl_alias_a):
+    obj = AliasRecord.from_json(sl_alias_a).to_model()
+    assert isinstance(obj, Alias)
+    assert obj.id == sl_alias_a["id"]
+    assert obj.email == sl_alias_a["email"]
+
+
+def test_activity_renames_from_and_to(sl_activity_a):
+    record = ActivityRecord.from_json(sl_activity_a)
+    assert record.sender == sl_activity_a["from"]
+    assert record.recipient == sl_activity_a["to"]
+    obj = record.to_model()
+    assert isinstance(obj, Activity)
+    assert obj.sender == sl_activity_a["from"]
+
+
+def test_alias_row_holds_only_columns(sl_alias_a):
+    row = AliasRecord.from_json(sl_alias_a).to_row()
+    assert set(row) <= set(Alias.__table__.columns.keys())
+    assert "mailboxes" not in row
+    assert row["email"] == sl_alias_a["email"]
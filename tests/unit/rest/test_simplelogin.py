@@ -1,13 +1,14 @@
 import pytest
 import responses
 
-from simplelogincmd.database.models import (
-    Activity,
-    Alias,
-    Contact,
-    Mailbox,
+from simplelogincmd.rest import const
+from simplelogincmd.rest.exceptions import APIError, UnauthenticatedError
+from simplelogincmd.rest.records import (
+    ActivityRecord,
+    AliasRecord,
+    ContactRecord,
+    MailboxRecord,
 )
-from simplelogincmd.rest.exceptions import UnauthenticatedError
 
 
 class TestAccountEndpoints:
@@ -102,7 +103,7 @@ class TestMailboxEndpoints:
         responses.add(resp_mailbox_list)
         mailboxes = sl.get_mailboxes()
         assert len(mailboxes) > 0
-        assert mailboxes[0] == Mailbox(**sl_mailbox_a)
+        assert mailboxes[0] == MailboxRecord.from_json(sl_mailbox_a)
 
     @responses.activate
     def test_successful_creation_produces_mailbox(
@@ -111,7 +112,7 @@ class TestMailboxEndpoints:
         responses.add(resp_mailbox_create_success)
         success, obj = sl.create_mailbox(email)
         assert success is True
-        assert isinstance(obj, Mailbox)
+        assert isinstance(obj, MailboxRecord)
 
     @responses.activate
     def test_creation_failure_produces_error(
@@ -166,14 +167,14 @@ class TestAliasEndpoints:
         responses.add(resp_alias_list)
         aliases = sl.get_aliases()
         assert len(aliases) > 0
-        assert aliases[0] == Alias(**sl_alias_a)
+        assert aliases[0] == AliasRecord.from_json(sl_alias_a)
 
     @responses.activate
     def test_get_valid_id_returns_alias(self, sl, sl_alias_a, resp_alias_success):
         responses.add(resp_alias_success)
         success, obj = sl.get_alias(sl_alias_a["id"])
         assert success is True
-        assert obj == Alias(**sl_alias_a)
+        assert obj == AliasRecord.from_json(sl_alias_a)
 
     @responses.activate
     def test_invalid_id_returns_error(self, sl, sl_alias_a, resp_alias_failure):
@@ -201,14 +202,14 @@ class TestAliasEndpoints:
             mailbox_ids=[sl_mailbox_a["id"]],
         )
         assert success is True
-        assert isinstance(obj, Alias)
+        assert isinstance(obj, AliasRecord)
 
     @responses.activate
     def test_random_produces_new_alias(self, sl, resp_alias_random_success):
         responses.add(resp_alias_random_success)
         success, obj = sl.create_random_alias()
         assert success is True
-        assert isinstance(obj, Alias)
+        assert isinstance(obj, AliasRecord)
 
     @responses.activate
     def test_delete_existing_(self, sl, sl_alias_a, resp_alias_delete_success):
@@ -245,7 +246,8 @@ class TestAliasEndpoints:
         responses.add(resp_alias_activities_list)
         activities = sl.get_alias_activities(alias_id=sl_alias_a["id"])
         assert len(activities) > 0
-        assert activities[0] == Activity(**sl_activity_a)
+        expected = ActivityRecord.from_json(sl_activity_a)
+        assert activities[0] == expected._replace(alias_id=sl_alias_a["id"])
 
     @responses.activate
     def test_update_valid_id_is_successful(
@@ -272,7 +274,38 @@ class TestAliasEndpoints:
         responses.add(resp_alias_contacts_list)
         contacts = sl.get_alias_contacts(alias_id=sl_alias_a["id"])
         assert len(contacts) > 0
-        assert contacts[0] == Contact(**sl_contact_a)
+        expected = ContactRecord.from_json(sl_contact_a)
+        assert contacts[0] == expected._replace(alias_id=sl_alias_a["id"])
+
+    @responses.activate
+    def test_contact_pages_carry_alias_id(
+        self, sl, sl_alias_a, resp_alias_contacts_list
+    ):
+        responses.add(resp_alias_contacts_list)
+        pages = list(sl.iter_alias_contact_pages(sl_alias_a["id"]))
+        assert len(pages) == 1
+        assert all(contact.alias_id == sl_alias_a["id"] for contact in pages[0])
+
+    @responses.activate
+    def test_contact_pages_raise_on_error(self, sl, sl_alias_a, url_alias_contacts):
+        url = url_alias_contacts.format(alias_id=sl_alias_a["id"])
+        responses.get(url, status=429, json={"error": "Rate limit exceeded"})
+        with pytest.raises(APIError, match="Rate limit exceeded"):
+            list(sl.iter_alias_contact_pages(sl_alias_a["id"]))
+
+    @responses.activate
+    def test_json_pages_keep_every_field(self, sl, sl_alias_a, url_alias_contacts):
+        url = url_alias_contacts.format(alias_id=sl_alias_a["id"])
+        contact = dict(id=1, contact="a@b.c", unknown_field=True)
+        responses.get(url, json={"contacts": [contact]})
+        endpoint = const.ENDPOINT.ALIAS_CONTACTS.format(alias_id=sl_alias_a["id"])
+        assert sl.get_json_page(endpoint, "contacts") == [contact]
+
+    @responses.activate
+    def test_json_pages_raise_on_error(self, sl, url_mailboxes):
+        responses.get(url_mailboxes, status=401, json={"error": "Wrong api key"})
+        with pytest.raises(APIError, match="Wrong api key"):
+            sl.get_json_page(const.ENDPOINT.MAILBOXES, "mailboxes", page_id=None)
 
     @responses.activate
     def test_create_new_contact_with_valid_id(
@@ -283,7 +316,7 @@ class TestAliasEndpoints:
             alias_id=sl_alias_a["id"], contact="test@example.com"
         )
         assert success is True
-        assert isinstance(obj, Contact)
+        assert isinstance(obj, ContactRecord)
 
     @responses.activate
     def test_create_already_existing_contact_succeeds_silently(
@@ -294,7 +327,7 @@ class TestAliasEndpoints:
             alias_id=sl_alias_a["id"], contact="test@example.com"
         )
         assert success is True
-        assert isinstance(obj, Contact)
+        assert isinstance(obj, ContactRecord)
 
     @responses.activate
     def test_create_contact_without_necessary_permissions(